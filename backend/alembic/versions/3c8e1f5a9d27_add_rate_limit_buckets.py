@@ -0,0 +1,54 @@
+"""add_rate_limit_buckets
+
+Revision ID: 3c8e1f5a9d27
+Revises: bfb15195438f
+Create Date: 2026-10-18 09:12:41.208351
+
+Token bucket state for the shared (postgres) decision rate limit backend.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c8e1f5a9d27"
+down_revision: Union[str, Sequence[str], None] = "bfb15195438f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "rate_limit_buckets",
+        sa.Column("key", sa.String(length=200), nullable=False),
+        sa.Column("tokens", DOUBLE_PRECISION(), nullable=False),
+        sa.Column("allowed", sa.Boolean(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("key"),
+        schema="trading",
+    )
+    op.create_index(
+        "idx_rate_limit_bucket_updated_at",
+        "rate_limit_buckets",
+        ["updated_at"],
+        unique=False,
+        schema="trading",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "idx_rate_limit_bucket_updated_at", table_name="rate_limit_buckets", schema="trading"
+    )
+    op.drop_table("rate_limit_buckets", schema="trading")
@@ -0,0 +1,155 @@
+"""add_decision_daily_rollups
+
+Revision ID: 5b7e2d9c1f40
+Revises: a41f9e0c5d68
+Create Date: 2026-10-18 14:02:37.418226
+
+Adds the decision_daily_rollups table, incrementally maintained per (day, account,
+strategy, model) as decisions are saved and executed, and backfills it from the
+existing decisions.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b7e2d9c1f40"
+down_revision: Union[str, Sequence[str], None] = "a41f9e0c5d68"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTER_COLUMNS = [
+    ("decision_count", sa.Integer()),
+    ("validated_count", sa.Integer()),
+    ("executed_count", sa.Integer()),
+    ("confidence_sum", sa.Float()),
+    ("confidence_count", sa.Integer()),
+    ("processing_time_sum_ms", sa.Float()),
+    ("processing_le_1s", sa.Integer()),
+    ("processing_le_2s", sa.Integer()),
+    ("processing_le_5s", sa.Integer()),
+    ("processing_le_10s", sa.Integer()),
+    ("processing_le_30s", sa.Integer()),
+    ("processing_gt_30s", sa.Integer()),
+    ("api_cost_sum", sa.Float()),
+    ("action_buy", sa.Integer()),
+    ("action_sell", sa.Integer()),
+    ("action_hold", sa.Integer()),
+    ("action_adjust_position", sa.Integer()),
+    ("action_close_position", sa.Integer()),
+    ("action_adjust_orders", sa.Integer()),
+]
+
+# Per-asset actions and confidences are expanded from asset_decisions; legacy rows hold a
+# JSON null there and contribute their own action and confidence columns instead.
+BACKFILL_SQL = """
+INSERT INTO trading.decision_daily_rollups (
+    day, account_id, strategy_id, model_used,
+    decision_count, validated_count, executed_count,
+    confidence_sum, confidence_count,
+    processing_time_sum_ms,
+    processing_le_1s, processing_le_2s, processing_le_5s,
+    processing_le_10s, processing_le_30s, processing_gt_30s,
+    api_cost_sum,
+    action_buy, action_sell, action_hold,
+    action_adjust_position, action_close_position, action_adjust_orders
+)
+SELECT
+    CAST(d."timestamp" AS DATE),
+    d.account_id,
+    d.strategy_id,
+    d.model_used,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE d.validation_passed),
+    COUNT(*) FILTER (WHERE d.executed),
+    COALESCE(SUM(a.confidence_sum), 0),
+    COALESCE(SUM(a.confidence_count), 0),
+    COALESCE(SUM(d.processing_time_ms), 0),
+    COUNT(*) FILTER (WHERE COALESCE(d.processing_time_ms, 0) <= 1000),
+    COUNT(*) FILTER (WHERE d.processing_time_ms > 1000 AND d.processing_time_ms <= 2000),
+    COUNT(*) FILTER (WHERE d.processing_time_ms > 2000 AND d.processing_time_ms <= 5000),
+    COUNT(*) FILTER (WHERE d.processing_time_ms > 5000 AND d.processing_time_ms <= 10000),
+    COUNT(*) FILTER (WHERE d.processing_time_ms > 10000 AND d.processing_time_ms <= 30000),
+    COUNT(*) FILTER (WHERE d.processing_time_ms > 30000),
+    COALESCE(SUM(d.api_cost), 0),
+    COALESCE(SUM(a.action_buy), 0),
+    COALESCE(SUM(a.action_sell), 0),
+    COALESCE(SUM(a.action_hold), 0),
+    COALESCE(SUM(a.action_adjust_position), 0),
+    COALESCE(SUM(a.action_close_position), 0),
+    COALESCE(SUM(a.action_adjust_orders), 0)
+FROM trading.decisions d
+LEFT JOIN LATERAL (
+    SELECT
+        SUM(x.confidence) AS confidence_sum,
+        COUNT(x.confidence) AS confidence_count,
+        COUNT(*) FILTER (WHERE x.action = 'buy') AS action_buy,
+        COUNT(*) FILTER (WHERE x.action = 'sell') AS action_sell,
+        COUNT(*) FILTER (WHERE x.action = 'hold') AS action_hold,
+        COUNT(*) FILTER (WHERE x.action = 'adjust_position') AS action_adjust_position,
+        COUNT(*) FILTER (WHERE x.action = 'close_position') AS action_close_position,
+        COUNT(*) FILTER (WHERE x.action = 'adjust_orders') AS action_adjust_orders
+    FROM (
+        SELECT e.value ->> 'action' AS action,
+               CAST(e.value ->> 'confidence' AS DOUBLE PRECISION) AS confidence
+        FROM jsonb_array_elements(
+            CASE WHEN jsonb_typeof(d.asset_decisions) = 'array'
+                 THEN d.asset_decisions ELSE '[]'::jsonb END
+        ) AS e
+        UNION ALL
+        SELECT d.action, d.confidence WHERE d.action IS NOT NULL
+    ) x
+) a ON TRUE
+GROUP BY 1, 2, 3, 4
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "decision_daily_rollups",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("strategy_id", sa.String(length=100), nullable=False),
+        sa.Column("model_used", sa.String(length=100), nullable=False),
+        *(
+            sa.Column(name, column_type, nullable=False, server_default="0")
+            for name, column_type in COUNTER_COLUMNS
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["account_id"], ["trading.accounts.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("day", "account_id", "strategy_id", "model_used"),
+        schema="trading",
+    )
+    op.create_index(
+        "idx_decision_rollup_account_day",
+        "decision_daily_rollups",
+        ["account_id", "day"],
+        unique=False,
+        schema="trading",
+    )
+    op.create_index(
+        "idx_decision_rollup_day",
+        "decision_daily_rollups",
+        ["day"],
+        unique=False,
+        schema="trading",
+    )
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_decision_rollup_day", table_name="decision_daily_rollups", schema="trading")
+    op.drop_index(
+        "idx_decision_rollup_account_day", table_name="decision_daily_rollups", schema="trading"
+    )
+    op.drop_table("decision_daily_rollups", schema="trading")
@@ -0,0 +1,102 @@
+"""add_market_context_snapshots
+
+Revision ID: 7d2a4c6e8b13
+Revises: 3c8e1f5a9d27
+Create Date: 2026-10-18 11:02:17.553904
+
+Market context is stored once per distinct content in market_context_snapshots and
+decisions reference it by content hash. Existing decisions keep their inline
+market_context, which becomes nullable.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7d2a4c6e8b13"
+down_revision: Union[str, Sequence[str], None] = "3c8e1f5a9d27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "market_context_snapshots",
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("market_context", sa.JSON(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("content_hash"),
+        schema="trading",
+    )
+    op.create_index(
+        "idx_market_context_snapshot_created_at",
+        "market_context_snapshots",
+        ["created_at"],
+        unique=False,
+        schema="trading",
+    )
+
+    op.add_column(
+        "decisions",
+        sa.Column("market_context_hash", sa.String(length=64), nullable=True),
+        schema="trading",
+    )
+    op.create_foreign_key(
+        "fk_decisions_market_context_hash",
+        "decisions",
+        "market_context_snapshots",
+        ["market_context_hash"],
+        ["content_hash"],
+        source_schema="trading",
+        referent_schema="trading",
+    )
+    op.create_index(
+        op.f("ix_trading_decisions_market_context_hash"),
+        "decisions",
+        ["market_context_hash"],
+        unique=False,
+        schema="trading",
+    )
+    op.alter_column(
+        "decisions", "market_context", existing_type=sa.JSON(), nullable=True, schema="trading"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Inline the shared snapshots again before dropping them
+    op.execute(
+        """
+        UPDATE trading.decisions AS d
+        SET market_context = s.market_context
+        FROM trading.market_context_snapshots AS s
+        WHERE d.market_context_hash = s.content_hash AND d.market_context IS NULL
+        """
+    )
+    op.execute("UPDATE trading.decisions SET market_context = '{}' WHERE market_context IS NULL")
+    op.alter_column(
+        "decisions", "market_context", existing_type=sa.JSON(), nullable=False, schema="trading"
+    )
+    op.drop_index(
+        op.f("ix_trading_decisions_market_context_hash"), table_name="decisions", schema="trading"
+    )
+    op.drop_constraint(
+        "fk_decisions_market_context_hash", "decisions", schema="trading", type_="foreignkey"
+    )
+    op.drop_column("decisions", "market_context_hash", schema="trading")
+    op.drop_index(
+        "idx_market_context_snapshot_created_at",
+        table_name="market_context_snapshots",
+        schema="trading",
+    )
+    op.drop_table("market_context_snapshots", schema="trading")
@@ -0,0 +1,37 @@
+"""add_decision_token_counts
+
+Revision ID: 9d4b6c2e7a15
+Revises: e2f8a4b71c93
+Create Date: 2026-10-18 17:24:09.631452
+
+Prompt and output token counts of the LLM completion behind each decision, to
+measure prompt compaction savings.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4b6c2e7a15"
+down_revision: Union[str, Sequence[str], None] = "e2f8a4b71c93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "decisions", sa.Column("prompt_tokens", sa.Integer(), nullable=True), schema="trading"
+    )
+    op.add_column(
+        "decisions", sa.Column("completion_tokens", sa.Integer(), nullable=True), schema="trading"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("decisions", "completion_tokens", schema="trading")
+    op.drop_column("decisions", "prompt_tokens", schema="trading")
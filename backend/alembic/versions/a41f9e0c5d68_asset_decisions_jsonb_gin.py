@@ -0,0 +1,67 @@
+"""asset_decisions_jsonb_gin
+
+Revision ID: a41f9e0c5d68
+Revises: 7d2a4c6e8b13
+Create Date: 2026-10-18 12:24:05.910237
+
+Converts decisions.asset_decisions to JSONB with a jsonb_path_ops GIN index so symbol
+filters (asset_decisions @> '[{"asset": "BTCUSDT"}]') run in SQL, and adds an
+(account_id, timestamp) index for paginated per-account history.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a41f9e0c5d68"
+down_revision: Union[str, Sequence[str], None] = "7d2a4c6e8b13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        "decisions",
+        "asset_decisions",
+        existing_type=sa.JSON(),
+        type_=postgresql.JSONB(),
+        postgresql_using="asset_decisions::jsonb",
+        existing_nullable=True,
+        schema="trading",
+    )
+    op.create_index(
+        "idx_decision_asset_decisions_gin",
+        "decisions",
+        ["asset_decisions"],
+        unique=False,
+        schema="trading",
+        postgresql_using="gin",
+        postgresql_ops={"asset_decisions": "jsonb_path_ops"},
+    )
+    op.create_index(
+        "idx_decision_account_timestamp",
+        "decisions",
+        ["account_id", "timestamp"],
+        unique=False,
+        schema="trading",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_decision_account_timestamp", table_name="decisions", schema="trading")
+    op.drop_index("idx_decision_asset_decisions_gin", table_name="decisions", schema="trading")
+    op.alter_column(
+        "decisions",
+        "asset_decisions",
+        existing_type=postgresql.JSONB(),
+        type_=sa.JSON(),
+        postgresql_using="asset_decisions::json",
+        existing_nullable=True,
+        schema="trading",
+    )
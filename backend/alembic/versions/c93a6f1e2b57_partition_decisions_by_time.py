@@ -0,0 +1,208 @@
+"""partition_decisions_by_time
+
+Revision ID: c93a6f1e2b57
+Revises: 5b7e2d9c1f40
+Create Date: 2026-10-18 15:11:48.206391
+
+Converts decisions (on timestamp) and decision_results (on created_at) to TimescaleDB
+hypertables with 7-day chunks, like market_data, so recent-window queries and retention
+only touch the newest chunks.
+
+Hypertable unique constraints must include the time column, so the primary keys become
+(id, time column). decision_results.decision_id can then no longer reference
+decisions.id through a foreign key; the relationship is kept by the ORM.
+
+Each table is converted online: a partitioned copy is created next to it and filled in
+committed batches while the application keeps writing, then rows inserted, updated or
+deleted during the copy are reconciled under a short write lock and the tables are
+swapped. The id sequences are carried over, so ids stay stable.
+"""
+
+from typing import List, Sequence, Tuple, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c93a6f1e2b57"
+down_revision: Union[str, Sequence[str], None] = "5b7e2d9c1f40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "trading"
+BATCH_SIZE = 10000
+CHUNK_INTERVAL = "7 days"
+# Rows updated by transactions that started shortly before the copy are re-synced too
+CATCH_UP_MARGIN = "5 minutes"
+
+DECISION_INDEXES: List[Tuple[str, str]] = [
+    ("idx_decision_account_symbol", "(account_id, symbol)"),
+    ("idx_decision_timestamp", '("timestamp")'),
+    ("idx_decision_action", "(action)"),
+    ("idx_decision_strategy", "(strategy_id)"),
+    ("idx_decision_account_timestamp", '(account_id, "timestamp")'),
+    ("idx_decision_asset_decisions_gin", "USING gin (asset_decisions jsonb_path_ops)"),
+    ("ix_trading_decisions_id", "(id)"),
+    ("ix_trading_decisions_strategy_id", "(strategy_id)"),
+    ("ix_trading_decisions_symbol", "(symbol)"),
+    ("ix_trading_decisions_market_context_hash", "(market_context_hash)"),
+]
+DECISION_FOREIGN_KEYS: List[Tuple[str, str]] = [
+    ("decisions_account_id_fkey", "(account_id) REFERENCES trading.accounts(id)"),
+    (
+        "fk_decisions_market_context_hash",
+        "(market_context_hash) REFERENCES trading.market_context_snapshots(content_hash)",
+    ),
+]
+
+DECISION_RESULT_INDEXES: List[Tuple[str, str]] = [
+    ("idx_decision_result_decision", "(decision_id)"),
+    ("idx_decision_result_outcome", "(outcome)"),
+    ("idx_decision_result_closed_at", "(closed_at)"),
+    ("ix_trading_decision_results_id", "(id)"),
+]
+# Time index of the hypertable (create_hypertable's default indexes are not used)
+DECISION_RESULT_TIME_INDEX = ("idx_decision_result_created_at", "(created_at)")
+DECISION_RESULT_FOREIGN_KEY = (
+    "decision_results_decision_id_fkey",
+    "(decision_id) REFERENCES trading.decisions(id)",
+)
+
+
+def _rebuild_table(
+    table: str,
+    primary_key: List[str],
+    indexes: List[Tuple[str, str]],
+    foreign_keys: List[Tuple[str, str]],
+    time_column: Union[str, None],
+) -> None:
+    """Rebuild a table online, as a hypertable on time_column or as a plain table."""
+    bind = op.get_bind()
+    new_table = f"{table}_rebuild"
+    index_suffix = "_rebuild"
+
+    # Build and fill the new table in committed steps while the old one stays live
+    with op.get_context().autocommit_block():
+        op.execute(f"CREATE TABLE {SCHEMA}.{new_table} (LIKE {SCHEMA}.{table} INCLUDING DEFAULTS)")
+        op.execute(
+            f"ALTER TABLE {SCHEMA}.{new_table} ADD CONSTRAINT {new_table}_pkey "
+            f"PRIMARY KEY ({', '.join(primary_key)})"
+        )
+        for name, definition in foreign_keys:
+            op.execute(
+                f"ALTER TABLE {SCHEMA}.{new_table} ADD CONSTRAINT {name} FOREIGN KEY {definition}"
+            )
+        if time_column:
+            op.execute(
+                f"SELECT create_hypertable('{SCHEMA}.{new_table}', '{time_column}', "
+                f"chunk_time_interval => INTERVAL '{CHUNK_INTERVAL}', "
+                f"create_default_indexes => FALSE)"
+            )
+        for name, definition in indexes:
+            op.execute(f"CREATE INDEX {name}{index_suffix} ON {SCHEMA}.{new_table} {definition}")
+
+        copy_started = bind.execute(
+            sa.text(f"SELECT clock_timestamp() - INTERVAL '{CATCH_UP_MARGIN}'")
+        ).scalar_one()
+        last_id = 0
+        while True:
+            copied, max_id = bind.execute(
+                sa.text(
+                    f"""
+                    WITH moved AS (
+                        INSERT INTO {SCHEMA}.{new_table}
+                        SELECT * FROM {SCHEMA}.{table}
+                        WHERE id > :last_id ORDER BY id LIMIT :batch_size
+                        RETURNING id
+                    )
+                    SELECT count(*), max(id) FROM moved
+                    """
+                ),
+                {"last_id": last_id, "batch_size": BATCH_SIZE},
+            ).one()
+            if not copied:
+                break
+            last_id = max_id
+
+    # Reconcile changes made during the copy and swap the tables; reads continue
+    op.execute(f"LOCK TABLE {SCHEMA}.{table} IN SHARE ROW EXCLUSIVE MODE")
+    params = {"last_id": last_id, "copy_started": copy_started}
+    bind.execute(
+        sa.text(
+            f"INSERT INTO {SCHEMA}.{new_table} SELECT * FROM {SCHEMA}.{table} WHERE id > :last_id"
+        ),
+        params,
+    )
+    bind.execute(
+        sa.text(
+            f"""
+            DELETE FROM {SCHEMA}.{new_table} WHERE id IN (
+                SELECT id FROM {SCHEMA}.{table}
+                WHERE updated_at >= :copy_started AND id <= :last_id
+            )
+            """
+        ),
+        params,
+    )
+    bind.execute(
+        sa.text(
+            f"""
+            INSERT INTO {SCHEMA}.{new_table}
+            SELECT * FROM {SCHEMA}.{table} WHERE updated_at >= :copy_started AND id <= :last_id
+            """
+        ),
+        params,
+    )
+    op.execute(
+        f"""
+        DELETE FROM {SCHEMA}.{new_table} AS n
+        WHERE NOT EXISTS (SELECT 1 FROM {SCHEMA}.{table} AS o WHERE o.id = n.id)
+        """
+    )
+
+    op.execute(f"ALTER SEQUENCE {SCHEMA}.{table}_id_seq OWNED BY {SCHEMA}.{new_table}.id")
+    op.execute(f"DROP TABLE {SCHEMA}.{table}")
+    op.execute(f"ALTER TABLE {SCHEMA}.{new_table} RENAME TO {table}")
+    op.execute(f"ALTER TABLE {SCHEMA}.{table} RENAME CONSTRAINT {new_table}_pkey TO {table}_pkey")
+    for name, _ in indexes:
+        op.execute(f"ALTER INDEX {SCHEMA}.{name}{index_suffix} RENAME TO {name}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint(
+        DECISION_RESULT_FOREIGN_KEY[0], "decision_results", type_="foreignkey", schema=SCHEMA
+    )
+    _rebuild_table(
+        "decisions",
+        ["id", '"timestamp"'],
+        DECISION_INDEXES,
+        DECISION_FOREIGN_KEYS,
+        time_column="timestamp",
+    )
+    _rebuild_table(
+        "decision_results",
+        ["id", "created_at"],
+        [*DECISION_RESULT_INDEXES, DECISION_RESULT_TIME_INDEX],
+        [],
+        time_column="created_at",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rebuild_table(
+        "decisions",
+        ["id"],
+        DECISION_INDEXES,
+        DECISION_FOREIGN_KEYS,
+        time_column=None,
+    )
+    _rebuild_table(
+        "decision_results",
+        ["id"],
+        DECISION_RESULT_INDEXES,
+        [DECISION_RESULT_FOREIGN_KEY],
+        time_column=None,
+    )
@@ -0,0 +1,54 @@
+"""add_llm_response_cache
+
+Revision ID: e2f8a4b71c93
+Revises: c93a6f1e2b57
+Create Date: 2026-10-18 16:02:37.514820
+
+Cached LLM decision responses for the shared (postgres) response cache backend.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e2f8a4b71c93"
+down_revision: Union[str, Sequence[str], None] = "c93a6f1e2b57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "llm_response_cache",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("model", sa.String(length=100), nullable=False),
+        sa.Column("response", sa.JSON(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("key"),
+        schema="trading",
+    )
+    op.create_index(
+        "idx_llm_response_cache_expires_at",
+        "llm_response_cache",
+        ["expires_at"],
+        unique=False,
+        schema="trading",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "idx_llm_response_cache_expires_at", table_name="llm_response_cache", schema="trading"
+    )
+    op.drop_table("llm_response_cache", schema="trading")
@@ -250,15 +250,25 @@ CREATE TABLE IF NOT EXISTS trading.performance_metrics (
 CREATE INDEX IF NOT EXISTS idx_performance_account_id ON trading.performance_metrics (account_id);
 CREATE INDEX IF NOT EXISTS idx_performance_period ON trading.performance_metrics (period);
 
+-- Market context snapshots, stored once per distinct content and shared by decisions
+CREATE TABLE IF NOT EXISTS trading.market_context_snapshots (
+    content_hash VARCHAR(64) PRIMARY KEY,
+    market_context JSON NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_market_context_snapshot_created_at ON trading.market_context_snapshots (created_at);
+
 -- Decisions table (supports both single-asset and multi-asset decisions)
+-- TimescaleDB hypertable on "timestamp"; unique constraints must include the time column
 CREATE TABLE IF NOT EXISTS trading.decisions (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT NOW(),
     account_id INTEGER NOT NULL REFERENCES trading.accounts(id),
     strategy_id VARCHAR(100) NOT NULL,
     -- Multi-asset decision fields
-    asset_decisions JSON,
+    asset_decisions JSONB,
     portfolio_rationale TEXT,
     total_allocation_usd DOUBLE PRECISION,
     portfolio_risk_level VARCHAR(10),
@@ -277,29 +287,40 @@ CREATE TABLE IF NOT EXISTS trading.decisions (
     order_adjustment JSON,
     model_used VARCHAR(100) NOT NULL,
     api_cost DOUBLE PRECISION,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
     processing_time_ms DOUBLE PRECISION NOT NULL,
     validation_passed BOOLEAN NOT NULL DEFAULT FALSE,
     validation_errors JSON,
     validation_warnings JSON,
-    market_context JSON NOT NULL,
+    market_context_hash VARCHAR(64) REFERENCES trading.market_context_snapshots(content_hash),
+    market_context JSON,
     account_context JSON NOT NULL,
     risk_metrics JSON,
     executed BOOLEAN NOT NULL DEFAULT FALSE,
     executed_at TIMESTAMP WITHOUT TIME ZONE,
     execution_price DOUBLE PRECISION,
-    execution_errors JSON
+    execution_errors JSON,
+    PRIMARY KEY (id, "timestamp")
 );
+SELECT create_hypertable('trading.decisions', 'timestamp', chunk_time_interval => INTERVAL '7 days', create_default_indexes => FALSE, if_not_exists => TRUE);
+CREATE INDEX IF NOT EXISTS ix_trading_decisions_id ON trading.decisions (id);
 CREATE INDEX IF NOT EXISTS idx_decision_account_symbol ON trading.decisions (account_id, symbol);
 CREATE INDEX IF NOT EXISTS idx_decision_timestamp ON trading.decisions ("timestamp");
 CREATE INDEX IF NOT EXISTS idx_decision_action ON trading.decisions (action);
 CREATE INDEX IF NOT EXISTS idx_decision_strategy ON trading.decisions (strategy_id);
+CREATE INDEX IF NOT EXISTS idx_decision_account_timestamp ON trading.decisions (account_id, "timestamp");
+CREATE INDEX IF NOT EXISTS idx_decision_asset_decisions_gin ON trading.decisions USING gin (asset_decisions jsonb_path_ops);
+CREATE INDEX IF NOT EXISTS ix_trading_decisions_market_context_hash ON trading.decisions (market_context_hash);
 
 -- Decision Results table
+-- TimescaleDB hypertable on created_at; decision_id is not a foreign key because
+-- decisions is a hypertable whose id is only unique together with its timestamp
 CREATE TABLE IF NOT EXISTS trading.decision_results (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT NOW(),
-    decision_id INTEGER NOT NULL REFERENCES trading.decisions(id),
+    decision_id INTEGER NOT NULL,
     outcome VARCHAR(20),
     realized_pnl DOUBLE PRECISION,
     unrealized_pnl DOUBLE PRECISION,
@@ -318,12 +339,47 @@ CREATE TABLE IF NOT EXISTS trading.decision_results (
     hit_sl BOOLEAN,
     manual_close BOOLEAN NOT NULL DEFAULT FALSE,
     market_conditions JSON,
-    notes TEXT
+    notes TEXT,
+    PRIMARY KEY (id, created_at)
 );
+SELECT create_hypertable('trading.decision_results', 'created_at', chunk_time_interval => INTERVAL '7 days', create_default_indexes => FALSE, if_not_exists => TRUE);
+CREATE INDEX IF NOT EXISTS ix_trading_decision_results_id ON trading.decision_results (id);
+CREATE INDEX IF NOT EXISTS idx_decision_result_created_at ON trading.decision_results (created_at);
 CREATE INDEX IF NOT EXISTS idx_decision_result_decision ON trading.decision_results (decision_id);
 CREATE INDEX IF NOT EXISTS idx_decision_result_outcome ON trading.decision_results (outcome);
 CREATE INDEX IF NOT EXISTS idx_decision_result_closed_at ON trading.decision_results (closed_at);
 
+-- Daily decision rollups, incremented as decisions are saved and executed
+CREATE TABLE IF NOT EXISTS trading.decision_daily_rollups (
+    day DATE NOT NULL,
+    account_id INTEGER NOT NULL REFERENCES trading.accounts(id) ON DELETE CASCADE,
+    strategy_id VARCHAR(100) NOT NULL,
+    model_used VARCHAR(100) NOT NULL,
+    decision_count INTEGER NOT NULL DEFAULT 0,
+    validated_count INTEGER NOT NULL DEFAULT 0,
+    executed_count INTEGER NOT NULL DEFAULT 0,
+    confidence_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    confidence_count INTEGER NOT NULL DEFAULT 0,
+    processing_time_sum_ms DOUBLE PRECISION NOT NULL DEFAULT 0,
+    processing_le_1s INTEGER NOT NULL DEFAULT 0,
+    processing_le_2s INTEGER NOT NULL DEFAULT 0,
+    processing_le_5s INTEGER NOT NULL DEFAULT 0,
+    processing_le_10s INTEGER NOT NULL DEFAULT 0,
+    processing_le_30s INTEGER NOT NULL DEFAULT 0,
+    processing_gt_30s INTEGER NOT NULL DEFAULT 0,
+    api_cost_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    action_buy INTEGER NOT NULL DEFAULT 0,
+    action_sell INTEGER NOT NULL DEFAULT 0,
+    action_hold INTEGER NOT NULL DEFAULT 0,
+    action_adjust_position INTEGER NOT NULL DEFAULT 0,
+    action_close_position INTEGER NOT NULL DEFAULT 0,
+    action_adjust_orders INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (day, account_id, strategy_id, model_used)
+);
+CREATE INDEX IF NOT EXISTS idx_decision_rollup_account_day ON trading.decision_daily_rollups (account_id, day);
+CREATE INDEX IF NOT EXISTS idx_decision_rollup_day ON trading.decision_daily_rollups (day);
+
 -- Market Data table
 -- Note: Using DOUBLE PRECISION for all numeric columns for consistency and precision.
 -- This is a high-volume TimescaleDB hypertable; if storage becomes a concern,
@@ -351,6 +407,25 @@ CREATE INDEX IF NOT EXISTS idx_market_data_id ON trading.market_data (id);
 -- Convert market_data to hypertable for time-series optimization (TimescaleDB)
 SELECT create_hypertable('trading.market_data', 'time', if_not_exists => TRUE);
 
+-- Rate limit token buckets shared by all API workers
+CREATE TABLE IF NOT EXISTS trading.rate_limit_buckets (
+    key VARCHAR(200) PRIMARY KEY,
+    tokens DOUBLE PRECISION NOT NULL,
+    allowed BOOLEAN NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_rate_limit_bucket_updated_at ON trading.rate_limit_buckets (updated_at);
+
+-- LLM decision responses shared by all API workers
+CREATE TABLE IF NOT EXISTS trading.llm_response_cache (
+    key VARCHAR(64) PRIMARY KEY,
+    model VARCHAR(100) NOT NULL,
+    response JSON NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_expires_at ON trading.llm_response_cache (expires_at);
+
 -- Grant permissions
 GRANT ALL PRIVILEGES ON SCHEMA trading TO trading_user;
 GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA trading TO trading_user;
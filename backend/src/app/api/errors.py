@@ -0,0 +1,19 @@
+"""Shared helpers for API error responses."""
+
+import math
+from typing import Dict, Optional
+
+
+def retry_after_headers(retry_after: Optional[float]) -> Optional[Dict[str, str]]:
+    """
+    Build the Retry-After header of a rejected request.
+
+    Args:
+        retry_after: Seconds until the request may be retried, if known
+
+    Returns:
+        Headers with Retry-After in whole seconds, or None when the delay is unknown
+    """
+    if retry_after is None:
+        return None
+    return {"Retry-After": str(math.ceil(retry_after))}
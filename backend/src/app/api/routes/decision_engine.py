@@ -13,11 +13,13 @@ from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, WebSocket
 from pydantic import BaseModel, Field
 
 from ...schemas.trading_decision import DecisionResult, HealthStatus, TradingDecision, UsageMetrics
+from ...services.llm.admission import AdmissionRejectedError
 from ...services.llm.decision_engine import (
     DecisionEngineError,
     RateLimitExceededError,
     get_decision_engine,
 )
+from ..errors import retry_after_headers
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +79,9 @@ class CacheStats(BaseModel):
     memory_usage_mb: float
     active_decisions: int
     max_concurrent_decisions: int
+    coalesced_decisions: int = 0
+    llm_calls_saved: int = 0
+    llm_cost_saved_usd: float = 0.0
 
 
 # API Endpoints
@@ -125,7 +130,13 @@ async def generate_decision(request: DecisionRequest) -> DecisionResult:
         return result
 
     except RateLimitExceededError as e:
-        raise HTTPException(status_code=429, detail=str(e)) from e
+        raise HTTPException(
+            status_code=429, detail=str(e), headers=retry_after_headers(e.retry_after)
+        ) from e
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers=retry_after_headers(e.retry_after)
+        ) from e
     except DecisionEngineError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
@@ -163,7 +174,13 @@ async def generate_batch_decisions(request: BatchDecisionRequest) -> List[Decisi
         return results
 
     except RateLimitExceededError as e:
-        raise HTTPException(status_code=429, detail=str(e)) from e
+        raise HTTPException(
+            status_code=429, detail=str(e), headers=retry_after_headers(e.retry_after)
+        ) from e
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers=retry_after_headers(e.retry_after)
+        ) from e
     except DecisionEngineError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
@@ -216,13 +233,14 @@ async def get_decision_history(
             limit=limit,
             start_date=start_date,
             end_date=end_date,
+            offset=offset,
+        )
+        total_count = await decision_engine.count_decision_history(
+            account_id=account_id, symbol=symbol, start_date=start_date, end_date=end_date
         )
-
-        # Apply pagination (simplified - in real implementation, this would be done in the database)
-        paginated_decisions = decisions[offset : offset + limit]
 
         return DecisionHistoryResponse(
-            decisions=paginated_decisions, total_count=len(decisions), page=page, page_size=limit
+            decisions=decisions, total_count=total_count, page=page, page_size=limit
         )
 
     except Exception as e:
@@ -525,6 +543,58 @@ async def clear_cache(
         raise HTTPException(status_code=500, detail="Internal server error") from e
 
 
+@router.get("/admission/stats")
+async def get_admission_stats() -> Dict[str, Any]:
+    """
+    Get admission queue statistics.
+
+    Returns active slots, queue depth, rejections and wait-time
+    percentiles for manual and scheduled decisions.
+    """
+    try:
+        decision_engine = get_decision_engine()
+        return decision_engine.get_admission_stats()
+
+    except Exception as e:
+        logger.error(f"Error getting admission stats: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error") from e
+
+
+@router.get("/persistence/stats")
+async def get_persistence_stats() -> Dict[str, Any]:
+    """
+    Get decision persistence statistics.
+
+    Returns write-behind buffer depth, batch counts, synchronous
+    write-throughs, failed writes and the last retention run.
+    """
+    try:
+        decision_engine = get_decision_engine()
+        return decision_engine.get_persistence_stats()
+
+    except Exception as e:
+        logger.error(f"Error getting persistence stats: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error") from e
+
+
+@router.get("/scheduler/status")
+async def get_scheduler_status() -> Dict[str, Any]:
+    """
+    Get the status of the candle-driven decision scheduler.
+
+    Returns per-cycle account counts, throughput and latency percentiles
+    for the most recent scheduling cycles.
+    """
+    try:
+        from ...services.llm.decision_scheduler import get_decision_scheduler
+
+        return get_decision_scheduler().get_status()
+
+    except Exception as e:
+        logger.error(f"Error getting scheduler status: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error") from e
+
+
 @router.post("/metrics/reset")
 async def reset_metrics() -> Dict[str, Any]:
     """
@@ -111,6 +111,8 @@ async def get_system_health() -> SystemHealthResponse:
                 "response_time_ms": llm_health.response_time_ms,
                 "consecutive_failures": llm_health.consecutive_failures,
                 "circuit_breaker_open": llm_health.circuit_breaker_open,
+                "open_circuits": llm_service.circuit_breakers.open_breakers(),
+                "circuit_breakers": llm_service.circuit_breakers.get_stats(),
                 "error_message": llm_health.error_message,
             }
             if not llm_health.is_healthy:
@@ -209,16 +211,38 @@ async def get_performance_metrics(
         llm_service = get_llm_service()
         llm_metrics = llm_service.get_usage_metrics(timeframe_hours)
 
-        llm_service_metrics = {
+        llm_service_metrics: Dict[str, Any] = {
             "total_requests": llm_metrics.total_requests,
             "successful_requests": llm_metrics.successful_requests,
             "failed_requests": llm_metrics.failed_requests,
             "avg_response_time_ms": llm_metrics.avg_response_time_ms,
+            "avg_time_to_first_decision_ms": llm_metrics.avg_time_to_first_decision_ms,
             "total_cost_usd": llm_metrics.total_cost_usd,
             "cost_per_request": llm_metrics.cost_per_request,
             "requests_per_hour": llm_metrics.requests_per_hour,
             "error_rate": llm_metrics.error_rate,
+            "cache_hits": llm_metrics.cache_hits,
+            "cache_misses": llm_metrics.cache_misses,
+            "cache_hit_rate": llm_metrics.cache_hit_rate,
+            "cost_saved_usd": llm_metrics.cost_saved_usd,
+            "cached_prompt_tokens": llm_metrics.cached_prompt_tokens,
+            "prompt_cache_rate": llm_metrics.prompt_cache_rate,
+            "prompt_cache_savings_usd": llm_metrics.prompt_cache_savings_usd,
+            "avg_response_time_prompt_cached_ms": llm_metrics.avg_response_time_prompt_cached_ms,
+            "hedged_requests": llm_metrics.hedged_requests,
+            "hedge_rate": llm_metrics.hedge_rate,
+            "hedge_win_rate": llm_metrics.hedge_win_rate,
+            "hedge_cost_overhead_usd": llm_metrics.hedge_cost_overhead_usd,
         }
+        if llm_service.model_router:
+            llm_service_metrics["model_routing"] = llm_service.model_router.get_status()
+        if llm_service.model_scheduler:
+            llm_service_metrics["model_scheduler"] = llm_service.model_scheduler.get_stats()
+        if llm_service.market_analysis_cache:
+            llm_service_metrics["two_stage"] = {
+                **llm_service.two_stage_metrics,
+                "analysis_cache": llm_service.market_analysis_cache.get_stats(),
+            }
 
         # Context Builder metrics (placeholder - would implement actual metrics)
         context_builder_metrics = {
@@ -461,13 +485,18 @@ async def get_analytics_summary(
         llm_service = get_llm_service()
         llm_metrics = llm_service.get_usage_metrics(timeframe_hours)
 
+        # Persisted decisions over the covered days, read from the daily rollup
+        period_end = datetime.now(timezone.utc)
+        period_start = period_end - timedelta(hours=timeframe_hours)
+        daily_rollup = await decision_engine.get_rollup_summary(
+            start_day=period_start.date(), end_day=period_end.date()
+        )
+
         # Calculate summary metrics
         summary = {
             "timeframe_hours": timeframe_hours,
-            "period_start": (
-                datetime.now(timezone.utc) - timedelta(hours=timeframe_hours)
-            ).isoformat(),
-            "period_end": datetime.now(timezone.utc).isoformat(),
+            "period_start": period_start.isoformat(),
+            "period_end": period_end.isoformat(),
             "decisions": {
                 "total_generated": engine_metrics.total_requests,
                 "successful": engine_metrics.successful_requests,
@@ -490,6 +519,11 @@ async def get_analytics_summary(
                 "requests_per_hour": engine_metrics.requests_per_hour,
                 "error_rate": engine_metrics.error_rate,
             },
+            "daily_rollup": {
+                "start_day": period_start.date().isoformat(),
+                "end_day": period_end.date().isoformat(),
+                **daily_rollup,
+            },
             "strategies": {
                 "total_active": 0,  # Would calculate from strategy manager
                 "switches_performed": 0,  # Would track actual switches
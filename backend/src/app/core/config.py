@@ -5,12 +5,22 @@ Supports multiple environments (development, testing, production) with
 environment-specific settings and multi-account configuration.
 """
 
-from typing import List
+from typing import Dict, List, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
+def _parse_scores(value: str, default: float) -> Dict[str, float]:
+    """Parse comma-separated key=score entries; keys without a score get the default."""
+    scores = {}
+    for entry in value.split(","):
+        key, _, score = entry.partition("=")
+        if key.strip():
+            scores[key.strip()] = float(score) if score.strip() else default
+    return scores
+
+
 class BaseConfig(BaseSettings):
     """Base configuration with common settings for all environments."""
 
@@ -74,6 +84,253 @@ class BaseConfig(BaseSettings):
         default=10000.0, description="Maximum position size in USD"
     )
 
+    # LLM Prompt Budget
+    LLM_PROMPT_TOKEN_BUDGET: int = Field(
+        default=8000,
+        description="Estimated prompt tokens before market data is compacted (0 = no limit)",
+    )
+
+    # LLM Prompt Caching
+    LLM_PROMPT_CACHE_CONTROL_ENABLED: bool = Field(
+        default=True,
+        description="Mark the static decision prompt prefix as cacheable for providers "
+        "that require explicit cache_control breakpoints",
+    )
+
+    # LLM Model Routing
+    LLM_ROUTER_ENABLED: bool = Field(
+        default=False, description="Route each decision to the best model of the pool"
+    )
+    LLM_ROUTER_MODELS: str = Field(
+        default="",
+        description="Routed model pool with quality scores (comma-separated model=quality)",
+    )
+    LLM_ROUTER_QUALITY_FLOORS: str = Field(
+        default="",
+        description="Minimum model quality per strategy id or type (comma-separated key=quality)",
+    )
+    LLM_ROUTER_WINDOW_MINUTES: float = Field(
+        default=15.0, description="Rolling window of routing latency, cost and error statistics"
+    )
+    LLM_ROUTER_MAX_ERROR_RATE: float = Field(
+        default=50.0, description="Error rate (%) above which a model is only used as a fallback"
+    )
+    LLM_ROUTER_LATENCY_WEIGHT: float = Field(
+        default=1.0, description="Routing weight of normalized p95 latency"
+    )
+    LLM_ROUTER_COST_WEIGHT: float = Field(
+        default=1.0, description="Routing weight of normalized cost per call"
+    )
+    LLM_ROUTER_ERROR_WEIGHT: float = Field(default=1.0, description="Routing weight of error rate")
+
+    # LLM Circuit Breakers
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = Field(
+        default=5, description="Failed or slow calls in the window before a model circuit opens"
+    )
+    LLM_CIRCUIT_FAILURE_RATE_THRESHOLD: float = Field(
+        default=50.0, description="Failure rate (%) in the window that opens a model circuit"
+    )
+    LLM_CIRCUIT_WINDOW_SECONDS: float = Field(
+        default=60.0, description="Rolling window of circuit breaker failure and slow-call rates"
+    )
+    LLM_CIRCUIT_RECOVERY_TIMEOUT: int = Field(
+        default=60, description="Seconds before an open circuit is probed again"
+    )
+    LLM_CIRCUIT_HALF_OPEN_MAX_CALLS: int = Field(
+        default=2,
+        description="Concurrent probe calls of a half-open circuit; it closes after that many "
+        "succeed",
+    )
+    LLM_CIRCUIT_SLOW_CALL_SECONDS: float = Field(
+        default=120.0, description="Duration from which a decision call counts as slow (0 = off)"
+    )
+    LLM_CIRCUIT_SLOW_CALL_RATE_THRESHOLD: float = Field(
+        default=80.0, description="Slow-call rate (%) in the window that opens a circuit"
+    )
+    LLM_CIRCUIT_ENDPOINT_FAILURE_THRESHOLD: int = Field(
+        default=10, description="Failed or slow calls in the window before the endpoint opens"
+    )
+    LLM_CIRCUIT_ENDPOINT_FAILURE_RATE_THRESHOLD: float = Field(
+        default=80.0,
+        description="Failure rate (%) across all models that opens the endpoint circuit",
+    )
+
+    # LLM Model Scheduling
+    LLM_SCHEDULER_ENABLED: bool = Field(
+        default=True, description="Limit concurrent calls and tokens per minute per model"
+    )
+    LLM_SCHEDULER_MAX_CONCURRENCY: int = Field(
+        default=8, description="Concurrent decision calls allowed per model"
+    )
+    LLM_SCHEDULER_TOKENS_PER_MINUTE: int = Field(
+        default=200000,
+        description="Estimated prompt+completion tokens allowed per model per minute",
+    )
+    LLM_SCHEDULER_CONCURRENCY_LIMITS: str = Field(
+        default="",
+        description="Per-model concurrency limits (comma-separated model=limit)",
+    )
+    LLM_SCHEDULER_TOKENS_PER_MINUTE_LIMITS: str = Field(
+        default="",
+        description="Per-model tokens-per-minute limits (comma-separated model=limit)",
+    )
+    LLM_SCHEDULER_MAX_WAIT_SECONDS: float = Field(
+        default=30.0, description="Longest a call may queue for a model slot and tokens"
+    )
+    LLM_SCHEDULER_COMPLETION_TOKENS_ESTIMATE: int = Field(
+        default=2000, description="Completion tokens reserved per call before usage is known"
+    )
+
+    # LLM Request Hedging
+    LLM_HEDGING_ENABLED: bool = Field(
+        default=False, description="Send a second decision request when the first is slow"
+    )
+    LLM_HEDGE_PERCENTILE: float = Field(
+        default=95.0, description="Latency percentile of the primary model after which to hedge"
+    )
+    LLM_HEDGE_WINDOW_MINUTES: float = Field(
+        default=60.0, description="Window of response times the hedge percentile is taken over"
+    )
+    LLM_HEDGE_MIN_SAMPLES: int = Field(
+        default=20, description="Response times needed before the hedge percentile is used"
+    )
+    LLM_HEDGE_DEFAULT_DELAY_SECONDS: float = Field(
+        default=30.0, description="Hedge delay for models with too few response time samples"
+    )
+    LLM_HEDGE_MODEL: str = Field(
+        default="",
+        description="Model of hedge requests (empty = next routed model, else the same model)",
+    )
+
+    # LLM Streaming
+    LLM_STREAMING_ENABLED: bool = Field(
+        default=True,
+        description="Stream decision completions and stop once the decision JSON is complete",
+    )
+
+    # Two-Stage Decisions
+    LLM_TWO_STAGE_ENABLED: bool = Field(
+        default=False,
+        description="Share one market analysis per strategy family and candle across "
+        "accounts and allocate per account without another LLM call",
+    )
+    LLM_TWO_STAGE_MIN_CONVICTION: float = Field(
+        default=60.0, description="Signal conviction needed to open or close a position"
+    )
+    LLM_TWO_STAGE_MAX_BALANCE_FRACTION: float = Field(
+        default=0.5, description="Largest share of the available balance one position may use"
+    )
+    LLM_TWO_STAGE_ANALYSIS_TTL_SECONDS: float = Field(
+        default=3600.0,
+        description="Maximum lifetime of a shared market analysis; never past the candle close",
+    )
+
+    # LLM Record/Replay
+    LLM_REPLAY_MODE: str = Field(
+        default="off",
+        description="Record LLM calls to a cassette or replay them from it: off, record or replay",
+    )
+    LLM_REPLAY_CASSETTE: str = Field(
+        default="llm_cassette.jsonl", description="JSONL cassette of recorded LLM calls"
+    )
+    LLM_REPLAY_LATENCY: str = Field(
+        default="recorded",
+        description="Replay latency: recorded, none, fixed:<ms>, normal:<mean>,<stddev> "
+        "or lognormal:<median>,<sigma>",
+    )
+    LLM_REPLAY_STRICT: bool = Field(
+        default=False,
+        description="Fail on unrecorded requests instead of replaying in recording order",
+    )
+    LLM_REPLAY_SEED: Optional[int] = Field(
+        default=None, description="Seed of the simulated replay latency"
+    )
+
+    # LLM Response Cache
+    LLM_RESPONSE_CACHE_ENABLED: bool = Field(
+        default=True, description="Reuse LLM responses for identical decision prompts"
+    )
+    LLM_RESPONSE_CACHE_TTL_SECONDS: float = Field(
+        default=300.0,
+        description="Maximum lifetime of a cached response; never past the next candle close",
+    )
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = Field(
+        default=1000, description="Maximum cached responses kept per process"
+    )
+    LLM_RESPONSE_CACHE_BACKEND: str = Field(
+        default="memory",
+        description="Response cache storage: memory (per process) or postgres (shared)",
+    )
+
+    # Decision Rate Limiting
+    DECISION_RATE_LIMIT_PER_MINUTE: int = Field(
+        default=60, description="Decision requests allowed per account per minute"
+    )
+    DECISION_RATE_LIMIT_BACKEND: str = Field(
+        default="memory",
+        description="Rate limit bucket storage: memory (per process) or postgres (shared)",
+    )
+    DECISION_RATE_LIMIT_IDLE_SECONDS: int = Field(
+        default=60, description="Idle seconds after which a shared rate limit bucket is evicted"
+    )
+
+    # Decision Admission Control
+    DECISION_MAX_CONCURRENT: int = Field(
+        default=10, description="Maximum decisions processed concurrently"
+    )
+    DECISION_ADMISSION_QUEUE_SIZE: int = Field(
+        default=100, description="Maximum decisions waiting for a processing slot"
+    )
+    DECISION_ADMISSION_MANUAL_WAIT_SECONDS: float = Field(
+        default=10.0, description="Maximum queue wait for API-triggered decisions"
+    )
+    DECISION_ADMISSION_SCHEDULED_WAIT_SECONDS: float = Field(
+        default=120.0, description="Maximum queue wait for scheduler-triggered decisions"
+    )
+
+    # Decision Persistence
+    DECISION_WRITE_BEHIND_ENABLED: bool = Field(
+        default=True, description="Persist decisions from a background batch writer"
+    )
+    DECISION_WRITE_BUFFER_SIZE: int = Field(
+        default=1000, description="Maximum decisions buffered before writes become synchronous"
+    )
+    DECISION_WRITE_BATCH_SIZE: int = Field(
+        default=100, description="Maximum decisions inserted per batch"
+    )
+    DECISION_WRITE_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=0.5, description="Maximum time a partial batch waits before it is written"
+    )
+
+    # Decision Retention
+    DECISION_RETENTION_ENABLED: bool = Field(
+        default=False, description="Periodically delete decisions older than the retention period"
+    )
+    DECISION_RETENTION_DAYS: int = Field(default=90, description="Days of decisions to keep")
+    DECISION_RETENTION_BATCH_SIZE: int = Field(
+        default=1000, description="Maximum decisions deleted per retention transaction"
+    )
+    DECISION_RETENTION_BATCH_PAUSE_SECONDS: float = Field(
+        default=0.1, description="Pause between retention batches to throttle database load"
+    )
+    DECISION_RETENTION_INTERVAL_HOURS: float = Field(
+        default=24.0, description="Hours between retention runs"
+    )
+
+    # Decision Scheduler Configuration
+    DECISION_SCHEDULER_ENABLED: bool = Field(
+        default=False, description="Run decisions for all active accounts on each candle close"
+    )
+    DECISION_SCHEDULER_WORKERS: int = Field(
+        default=8, description="Maximum concurrent scheduled decisions"
+    )
+    DECISION_SCHEDULER_DEADLINE_FRACTION: float = Field(
+        default=0.8, description="Fraction of the primary interval each decision must finish in"
+    )
+    DECISION_SCHEDULER_JITTER_SECONDS: float = Field(
+        default=5.0, description="Maximum random start offset for scheduled decisions"
+    )
+
     # Multi-Account Configuration
     MULTI_ACCOUNT_MODE: bool = Field(default=False, description="Enable multi-account mode")
     ACCOUNT_IDS: str = Field(default="", description="Account IDs (comma-separated)")
@@ -83,6 +340,38 @@ class BaseConfig(BaseSettings):
         """Parse CORS origins from comma-separated string."""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
 
+    @property
+    def llm_router_models_map(self) -> Dict[str, float]:
+        """Parse the routed model pool; models without a score get quality 100."""
+        return _parse_scores(self.LLM_ROUTER_MODELS, default=100.0)
+
+    @property
+    def llm_router_quality_floors_map(self) -> Dict[str, float]:
+        """Parse the per-strategy model quality floors."""
+        return _parse_scores(self.LLM_ROUTER_QUALITY_FLOORS, default=0.0)
+
+    @property
+    def llm_scheduler_concurrency_limits_map(self) -> Dict[str, int]:
+        """Parse the per-model concurrency limits."""
+        return {
+            model: int(limit)
+            for model, limit in _parse_scores(
+                self.LLM_SCHEDULER_CONCURRENCY_LIMITS,
+                default=self.LLM_SCHEDULER_MAX_CONCURRENCY,
+            ).items()
+        }
+
+    @property
+    def llm_scheduler_tokens_per_minute_limits_map(self) -> Dict[str, int]:
+        """Parse the per-model tokens-per-minute limits."""
+        return {
+            model: int(limit)
+            for model, limit in _parse_scores(
+                self.LLM_SCHEDULER_TOKENS_PER_MINUTE_LIMITS,
+                default=self.LLM_SCHEDULER_TOKENS_PER_MINUTE,
+            ).items()
+        }
+
     # JWT Settings
     SECRET_KEY: str = Field(
         default="a_very_secret_key", description="Secret key for signing JWT tokens"
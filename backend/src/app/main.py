@@ -13,6 +13,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from .api.errors import retry_after_headers
 from .api.routes import (
     accounts,
     analysis,
@@ -33,7 +34,9 @@ from .core.config_manager import get_config_manager
 from .core.exceptions import ConfigurationError, ValidationError
 from .core.logging import get_logger, setup_logging
 from .middleware import AdminOnlyMiddleware
+from .services.llm.admission import AdmissionRejectedError
 from .services.llm.decision_engine import DecisionEngineError, RateLimitExceededError
+from .services.market_data.events import EventType
 
 # Initialize logging
 setup_logging(config)
@@ -241,6 +244,20 @@ async def rate_limit_exception_handler(
     return JSONResponse(
         status_code=429,
         content={"detail": str(exc), "error_type": "rate_limit_exceeded"},
+        headers=retry_after_headers(exc.retry_after),
+    )
+
+
+@app.exception_handler(AdmissionRejectedError)
+async def admission_rejected_exception_handler(
+    request: Request, exc: AdmissionRejectedError
+) -> JSONResponse:
+    """Handle decisions rejected by the admission queue."""
+    logger.warning(f"Decision admission rejected ({exc.reason}): {exc}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc), "error_type": f"admission_{exc.reason}"},
+        headers=retry_after_headers(exc.retry_after),
     )
 
 
@@ -310,6 +327,11 @@ async def startup_event() -> None:
         await decision_engine.strategy_manager.initialize()
         logger.info("Strategy Manager initialized")
 
+        # Delete expired decisions in throttled batches while the system runs
+        if config.DECISION_RETENTION_ENABLED:
+            decision_engine.start_retention()
+            logger.info("Decision retention started")
+
     except Exception as e:
         logger.error(f"Failed to initialize database or services: {e}")
         raise
@@ -320,6 +342,21 @@ async def startup_event() -> None:
 
         market_data_service = get_market_data_service()
 
+        # Supersede shared market snapshots whenever a candle closes
+        market_data_service.register_event_handler(
+            EventType.CANDLE_CLOSE, decision_engine.context_builder.on_candle_close
+        )
+
+        # Run decisions for all active accounts on each primary candle close
+        if config.DECISION_SCHEDULER_ENABLED:
+            from .services.llm.decision_scheduler import get_decision_scheduler
+
+            decision_scheduler = get_decision_scheduler(decision_engine)
+            market_data_service.register_event_handler(
+                EventType.CANDLE_CLOSE, decision_scheduler.on_candle_close, config.INTERVAL
+            )
+            decision_scheduler.start()
+
         # Start the scheduler for both intervals
         await market_data_service.start_scheduler()
         logger.info("Candle-close scheduler started")
@@ -357,6 +394,16 @@ async def shutdown_event() -> None:
     except Exception as e:
         logger.error(f"Error stopping market data scheduler: {e}")
 
+    # Stop the decision scheduler before the engine it dispatches to
+    if config.DECISION_SCHEDULER_ENABLED:
+        try:
+            from .services.llm.decision_scheduler import get_decision_scheduler
+
+            await get_decision_scheduler().stop()
+            logger.info("Decision scheduler stopped")
+        except Exception as e:
+            logger.error(f"Error stopping decision scheduler: {e}")
+
     # Shutdown decision engine
     try:
         from .services.llm.decision_engine import get_decision_engine
@@ -8,15 +8,18 @@ from .account import Account, User
 from .base import Base, BaseModel
 from .challenge import Challenge
 from .diary_entry import DiaryEntry
+from .llm_response_cache import LLMResponseCacheEntry
 from .market_data import MarketData
 from .order import Order
 from .performance_metric import PerformanceMetric
 from .position import Position
+from .rate_limit import RateLimitBucket
 from .trade import Trade
 
 # Import new models if they exist
 try:
-    from .decision import Decision, DecisionResult
+    from .decision import Decision, DecisionResult, MarketContextSnapshot
+    from .decision_rollup import DecisionDailyRollup
     from .strategy import Strategy, StrategyAssignment, StrategyPerformance
 
     __all__ = [
@@ -26,10 +29,14 @@ try:
         "User",
         "Challenge",
         "Decision",
+        "DecisionDailyRollup",
         "DecisionResult",
+        "MarketContextSnapshot",
+        "LLMResponseCacheEntry",
         "MarketData",
         "Position",
         "Order",
+        "RateLimitBucket",
         "Strategy",
         "StrategyAssignment",
         "StrategyPerformance",
@@ -44,9 +51,11 @@ except ImportError:
         "Account",
         "User",
         "Challenge",
+        "LLMResponseCacheEntry",
         "MarketData",
         "Position",
         "Order",
+        "RateLimitBucket",
         "Trade",
         "DiaryEntry",
         "PerformanceMetric",
@@ -11,20 +11,54 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    func,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import BaseModel
+from .base import Base, BaseModel
 
 if TYPE_CHECKING:
     from .account import Account
 
 
+class MarketContextSnapshot(Base):
+    """Market context a decision was made on, stored once per distinct content.
+
+    Every account deciding on the same candle sees the same market context, so
+    decisions reference the snapshot by the SHA-256 of its canonical JSON instead of
+    each carrying a full copy.
+    """
+
+    __tablename__ = "market_context_snapshots"
+    __table_args__ = (
+        Index("idx_market_context_snapshot_created_at", "created_at"),
+        {"schema": "trading"},
+    )
+
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    market_context: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<MarketContextSnapshot(content_hash={self.content_hash[:12]}, "
+            f"size_bytes={self.size_bytes})>"
+        )
+
+
 class Decision(BaseModel):
     """Trading decision model for storing LLM-generated decisions.
 
     Supports both single-asset (legacy) and multi-asset decision structures.
     For multi-asset decisions, asset_decisions contains the list of per-asset decisions.
+
+    Stored as a TimescaleDB hypertable partitioned on timestamp, so the primary key
+    includes the timestamp.
     """
 
     __tablename__ = "decisions"
@@ -33,9 +67,20 @@ class Decision(BaseModel):
         Index("idx_decision_timestamp", "timestamp"),
         Index("idx_decision_action", "action"),
         Index("idx_decision_strategy", "strategy_id"),
+        Index("idx_decision_account_timestamp", "account_id", "timestamp"),
+        # Containment (@>) lookups such as [{"asset": "BTCUSDT"}] for symbol filtering
+        Index(
+            "idx_decision_asset_decisions_gin",
+            "asset_decisions",
+            postgresql_using="gin",
+            postgresql_ops={"asset_decisions": "jsonb_path_ops"},
+        ),
         {"schema": "trading"},
     )
 
+    # Part of the composite primary key with timestamp, as required by TimescaleDB
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True, autoincrement=True)
+
     # Foreign key relationships
     account_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("trading.accounts.id"), nullable=False
@@ -44,7 +89,7 @@ class Decision(BaseModel):
 
     # Multi-asset decision fields
     asset_decisions: Mapped[Optional[List[Dict[str, Any]]]] = mapped_column(
-        JSON, nullable=True
+        JSONB, nullable=True
     )  # List of AssetDecision objects
     portfolio_rationale: Mapped[Optional[str]] = mapped_column(
         Text, nullable=True
@@ -76,7 +121,9 @@ class Decision(BaseModel):
     risk_level: Mapped[Optional[str]] = mapped_column(
         String(10), nullable=True
     )  # low, medium, high
-    timestamp: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    timestamp: Mapped[datetime] = mapped_column(
+        DateTime, primary_key=True, nullable=False, default=datetime.utcnow
+    )
 
     # Position and order adjustments (stored as JSON)
     position_adjustment: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
@@ -85,6 +132,8 @@ class Decision(BaseModel):
     # LLM metadata
     model_used: Mapped[str] = mapped_column(String(100), nullable=False)
     api_cost: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    prompt_tokens: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    completion_tokens: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     processing_time_ms: Mapped[float] = mapped_column(Float, nullable=False)
 
     # Validation results
@@ -96,8 +145,15 @@ class Decision(BaseModel):
         JSON, nullable=True
     )  # List of warning messages
 
-    # Context data (stored as JSON for flexibility)
-    market_context: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    # Context data (stored as JSON for flexibility). New decisions reference a shared
+    # market context snapshot; market_context is only populated on older rows.
+    market_context_hash: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        ForeignKey("trading.market_context_snapshots.content_hash"),
+        nullable=True,
+        index=True,
+    )
+    market_context: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
     account_context: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
     risk_metrics: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
 
@@ -109,8 +165,15 @@ class Decision(BaseModel):
 
     # Relationships
     account: Mapped["Account"] = relationship("Account", back_populates="decisions")
+    market_context_snapshot: Mapped[Optional["MarketContextSnapshot"]] = relationship(
+        "MarketContextSnapshot"
+    )
+    # Hypertables cannot be referenced by a foreign key on id alone, so the join is explicit
     decision_results: Mapped[List["DecisionResult"]] = relationship(
-        "DecisionResult", back_populates="decision", cascade="all, delete-orphan"
+        "DecisionResult",
+        primaryjoin="Decision.id == foreign(DecisionResult.decision_id)",
+        back_populates="decision",
+        cascade="all, delete-orphan",
     )
 
     def __repr__(self) -> str:
@@ -121,6 +184,18 @@ class Decision(BaseModel):
             f"confidence={self.confidence})>"
         )
 
+    @property
+    def full_market_context(self) -> Dict[str, Any]:
+        """Market context of the decision, whether inline or in a shared snapshot.
+
+        The snapshot relationship must be eager-loaded when used with async sessions.
+        """
+        if self.market_context:
+            return self.market_context
+        if self.market_context_snapshot is not None:
+            return self.market_context_snapshot.market_context
+        return {}
+
     @property
     def is_multi_asset(self) -> bool:
         """Check if this is a multi-asset decision."""
@@ -194,21 +269,30 @@ class Decision(BaseModel):
 
 
 class DecisionResult(BaseModel):
-    """Model for tracking decision outcomes and performance."""
+    """Model for tracking decision outcomes and performance.
+
+    Stored as a TimescaleDB hypertable partitioned on created_at, so the primary key
+    includes created_at.
+    """
 
     __tablename__ = "decision_results"
     __table_args__ = (
         Index("idx_decision_result_decision", "decision_id"),
         Index("idx_decision_result_outcome", "outcome"),
         Index("idx_decision_result_closed_at", "closed_at"),
+        Index("idx_decision_result_created_at", "created_at"),
         {"schema": "trading"},
     )
 
-    # Foreign key relationships
-    decision_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("trading.decisions.id"), nullable=False
+    # Composite primary key, as required by TimescaleDB
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True, autoincrement=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False
     )
 
+    # Decision this result belongs to (joined by id, see Decision.decision_results)
+    decision_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
     # Outcome tracking
     outcome: Mapped[Optional[str]] = mapped_column(
         String(20), nullable=True
@@ -249,7 +333,11 @@ class DecisionResult(BaseModel):
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relationships
-    decision: Mapped["Decision"] = relationship("Decision", back_populates="decision_results")
+    decision: Mapped["Decision"] = relationship(
+        "Decision",
+        primaryjoin="foreign(DecisionResult.decision_id) == Decision.id",
+        back_populates="decision_results",
+    )
 
     def __repr__(self) -> str:
         """String representation."""
@@ -0,0 +1,71 @@
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+class DecisionDailyRollup(Base):
+    """Daily decision aggregates per account, strategy and model.
+
+    Rows are incremented in the same transaction that saves decisions or marks them
+    executed, so analytics over long ranges can read one row per day instead of
+    scanning raw decisions. All counters are additive.
+    """
+
+    __tablename__ = "decision_daily_rollups"
+    __table_args__ = (
+        Index("idx_decision_rollup_account_day", "account_id", "day"),
+        Index("idx_decision_rollup_day", "day"),
+        {"schema": "trading"},
+    )
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    account_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("trading.accounts.id", ondelete="CASCADE"), primary_key=True
+    )
+    strategy_id: Mapped[str] = mapped_column(String(100), primary_key=True)
+    model_used: Mapped[str] = mapped_column(String(100), primary_key=True)
+
+    # Decision counts
+    decision_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    validated_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    executed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # Confidence over per-asset decisions (and legacy single-asset decisions)
+    confidence_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    confidence_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # Processing time total and histogram
+    processing_time_sum_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    processing_le_1s: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    processing_le_2s: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    processing_le_5s: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    processing_le_10s: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    processing_le_30s: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    processing_gt_30s: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # LLM cost
+    api_cost_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+    # Action counts over per-asset decisions (and legacy single-asset decisions)
+    action_buy: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    action_sell: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    action_hold: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    action_adjust_position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    action_close_position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    action_adjust_orders: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<DecisionDailyRollup(day={self.day}, account_id={self.account_id}, "
+            f"strategy_id={self.strategy_id}, model_used={self.model_used}, "
+            f"decision_count={self.decision_count})>"
+        )
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import JSON, DateTime, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+class LLMResponseCacheEntry(Base):
+    """LLM decision response shared by all API workers.
+
+    Rows are keyed by a hash of the model, prompts and temperature, written by the
+    Postgres response cache backend and evicted once they expire.
+    """
+
+    __tablename__ = "llm_response_cache"
+    __table_args__ = (
+        Index("idx_llm_response_cache_expires_at", "expires_at"),
+        {"schema": "trading"},
+    )
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    response: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
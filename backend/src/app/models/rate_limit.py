@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, Float, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+class RateLimitBucket(Base):
+    """Token bucket state shared by all API workers.
+
+    Rows are updated atomically by the Postgres rate limit backend and evicted once
+    they have been idle long enough to have refilled completely.
+    """
+
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = (
+        Index("idx_rate_limit_bucket_updated_at", "updated_at"),
+        {"schema": "trading"},
+    )
+
+    key: Mapped[str] = mapped_column(String(200), primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    allowed: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
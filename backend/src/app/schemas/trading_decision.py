@@ -32,6 +32,9 @@ from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
+Action = Literal["buy", "sell", "hold", "adjust_position", "close_position", "adjust_orders"]
+RiskLevel = Literal["low", "medium", "high"]
+
 
 class PositionAdjustment(BaseModel):
     """Position adjustment details."""
@@ -68,9 +71,7 @@ class AssetDecision(BaseModel):
     """Trading decision for a single asset."""
 
     asset: str = Field(..., description="Trading pair symbol")
-    action: Literal["buy", "sell", "hold", "adjust_position", "close_position", "adjust_orders"] = (
-        Field(..., description="Trading action")
-    )
+    action: Action = Field(..., description="Trading action")
     allocation_usd: float = Field(..., ge=0, description="Allocation amount in USD")
     position_adjustment: Optional[PositionAdjustment] = Field(
         None, description="Position adjustment details (for adjust_position action)"
@@ -83,7 +84,7 @@ class AssetDecision(BaseModel):
     exit_plan: str = Field(..., description="Exit strategy description")
     rationale: str = Field(..., description="Decision reasoning")
     confidence: float = Field(..., ge=0, le=100, description="Confidence score")
-    risk_level: Literal["low", "medium", "high"] = Field(..., description="Risk assessment")
+    risk_level: RiskLevel = Field(..., description="Risk assessment")
 
     def validate_action_requirements(self) -> List[str]:
         """Validate that required fields are present for specific actions."""
@@ -135,9 +136,7 @@ class TradingDecision(BaseModel):
         ..., description="Overall trading strategy and reasoning across assets"
     )
     total_allocation_usd: float = Field(..., ge=0, description="Total allocation across all assets")
-    portfolio_risk_level: Literal["low", "medium", "high"] = Field(
-        ..., description="Overall portfolio risk assessment"
-    )
+    portfolio_risk_level: RiskLevel = Field(..., description="Overall portfolio risk assessment")
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
     def validate_portfolio_allocation(self) -> List[str]:
@@ -848,6 +847,19 @@ class UsageMetrics(BaseModel):
     uptime_percentage: float = Field(..., ge=0, le=100)
     period_start: datetime
     period_end: datetime
+    cache_hits: int = Field(default=0, ge=0)
+    cache_misses: int = Field(default=0, ge=0)
+    cache_hit_rate: float = Field(default=0.0, ge=0, le=100)
+    cost_saved_usd: float = Field(default=0.0, ge=0)
+    avg_time_to_first_decision_ms: Optional[float] = Field(default=None, ge=0)
+    cached_prompt_tokens: int = Field(default=0, ge=0)
+    prompt_cache_rate: float = Field(default=0.0, ge=0, le=100)
+    prompt_cache_savings_usd: float = Field(default=0.0, ge=0)
+    avg_response_time_prompt_cached_ms: Optional[float] = Field(default=None, ge=0)
+    hedged_requests: int = Field(default=0, ge=0)
+    hedge_rate: float = Field(default=0.0, ge=0, le=100)
+    hedge_win_rate: float = Field(default=0.0, ge=0, le=100)
+    hedge_cost_overhead_usd: float = Field(default=0.0, ge=0)
 
 
 class HealthStatus(BaseModel):
@@ -873,3 +885,9 @@ class DecisionResult(BaseModel):
     processing_time_ms: float
     model_used: str
     api_cost: Optional[float] = None
+    prompt_tokens: Optional[int] = Field(
+        default=None, ge=0, description="Prompt tokens of the final LLM completion"
+    )
+    completion_tokens: Optional[int] = Field(
+        default=None, ge=0, description="Output tokens of the final LLM completion"
+    )
@@ -156,12 +156,12 @@ class DecisionAnalyticsService:
         end_date = datetime.now(timezone.utc)
         start_date = end_date - timedelta(days=lookback_days)
 
-        # Get recent decisions
-        decisions = await self.decision_repo.get_decisions_by_account(
-            account_id=account_id, start_date=start_date, end_date=end_date, limit=1000
+        # Aggregate the period (whole days come from the daily rollup)
+        analytics = await self.decision_repo.get_decision_analytics(
+            account_id=account_id, start_date=start_date, end_date=end_date
         )
 
-        if not decisions:
+        if analytics["total_decisions"] == 0:
             return TradingInsights(
                 most_profitable_action="insufficient_data",
                 most_confident_decisions=[],
@@ -175,11 +175,9 @@ class DecisionAnalyticsService:
         most_profitable_action = max(action_pnl.items(), key=lambda x: x[1], default=("hold", 0))[0]
 
         # Find most confident decisions
-        high_confidence_decisions = [
-            f"{d.symbol} {d.action}"
-            for d in decisions
-            if d.confidence is not None and d.confidence >= 80 and d.validation_passed
-        ][:5]
+        high_confidence_decisions = await self.decision_repo.get_high_confidence_decisions(
+            account_id=account_id, start_date=start_date, end_date=end_date
+        )
 
         # Get common validation errors
         error_summary = await self.decision_repo.get_validation_errors_summary(
@@ -193,7 +191,7 @@ class DecisionAnalyticsService:
 
         # Generate recommendations
         recommendations = await self._generate_recommendations(
-            decisions, action_pnl, error_summary, performance_trend
+            analytics, action_pnl, error_summary, performance_trend
         )
 
         return TradingInsights(
@@ -260,61 +258,9 @@ class DecisionAnalyticsService:
         end_date: Optional[datetime] = None,
     ) -> Dict[str, Dict[str, Any]]:
         """Compare performance of different LLM models."""
-
-        query = select(Decision).where(Decision.account_id == account_id)
-
-        if start_date:
-            query = query.where(Decision.timestamp >= start_date)
-        if end_date:
-            query = query.where(Decision.timestamp <= end_date)
-
-        async with self.session_factory() as session:
-            result = await session.execute(query)
-            decisions = result.scalars().all()
-
-        model_stats: Dict[str, Dict[str, Any]] = {}
-
-        for decision in decisions:
-            model = decision.model_used
-
-            if model not in model_stats:
-                model_stats[model] = {
-                    "total_decisions": 0,
-                    "validation_rate": 0,
-                    "avg_confidence": 0,
-                    "avg_processing_time": 0,
-                    "total_cost": 0,
-                    "confidences": [],
-                    "processing_times": [],
-                    "validated_count": 0,
-                }
-
-            stats = model_stats[model]
-            stats["total_decisions"] += 1
-            stats["confidences"].append(decision.confidence)
-            stats["processing_times"].append(decision.processing_time_ms)
-            stats["total_cost"] += decision.api_cost or 0
-
-            if decision.validation_passed:
-                stats["validated_count"] += 1
-
-        # Calculate averages
-        for _, stats in model_stats.items():
-            if stats["confidences"]:
-                stats["avg_confidence"] = sum(stats["confidences"]) / len(stats["confidences"])
-                stats["avg_processing_time"] = sum(stats["processing_times"]) / len(
-                    stats["processing_times"]
-                )
-                stats["validation_rate"] = (
-                    stats["validated_count"] / stats["total_decisions"]
-                ) * 100
-
-            # Clean up raw data
-            del stats["confidences"]
-            del stats["processing_times"]
-            del stats["validated_count"]
-
-        return model_stats
+        return await self.decision_repo.get_model_performance(
+            account_id=account_id, start_date=start_date, end_date=end_date
+        )
 
     async def _get_symbol_performance_for_strategy(
         self,
@@ -442,29 +388,25 @@ class DecisionAnalyticsService:
         most_common_error = max(error_summary.items(), key=lambda x: x[1])[0]
         return [f"Address validation issue: {most_common_error}"]
 
-    def _get_confidence_recommendations(self, decisions: List[Decision]) -> List[str]:
+    def _get_confidence_recommendations(self, avg_confidence: float) -> List[str]:
         """Get confidence-based recommendations."""
-        if not decisions:
-            return []
-        confidences = [d.confidence for d in decisions if d.confidence is not None]
-        avg_confidence = sum(confidences) / len(confidences) if confidences else 0
         if avg_confidence < 60:
             return ["Low average confidence - consider adjusting strategy parameters"]
         if avg_confidence > 85:
             return ["High confidence decisions - consider increasing position sizes"]
         return []
 
-    def _get_volume_recommendations(self, decisions: List[Decision]) -> List[str]:
+    def _get_volume_recommendations(self, total_decisions: int) -> List[str]:
         """Get volume-based recommendations."""
-        if len(decisions) < 10:
+        if total_decisions < 10:
             return ["Low decision volume - consider more active strategy"]
-        if len(decisions) > 100:
+        if total_decisions > 100:
             return ["High decision volume - ensure quality over quantity"]
         return []
 
     async def _generate_recommendations(
         self,
-        decisions: List[Decision],
+        analytics: Dict[str, Any],
         action_pnl: Dict[str, float],
         error_summary: Dict[str, int],
         performance_trend: str,
@@ -474,6 +416,6 @@ class DecisionAnalyticsService:
         recommendations.extend(self._get_performance_recommendations(performance_trend))
         recommendations.extend(self._get_action_recommendations(action_pnl))
         recommendations.extend(self._get_error_recommendations(error_summary))
-        recommendations.extend(self._get_confidence_recommendations(decisions))
-        recommendations.extend(self._get_volume_recommendations(decisions))
+        recommendations.extend(self._get_confidence_recommendations(analytics["avg_confidence"]))
+        recommendations.extend(self._get_volume_recommendations(analytics["total_decisions"]))
         return recommendations[:5]
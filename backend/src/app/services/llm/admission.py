@@ -0,0 +1,262 @@
+"""
+Admission control for the LLM Decision Engine.
+
+Limits how many decisions run at once and queues the rest for a bounded time
+instead of rejecting them outright. Waiters are served by priority class first
+(manual requests ahead of scheduled cycles) and round-robin across accounts within
+a class, so one account submitting a burst cannot starve the others.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from ...core.logging import get_logger
+from ...utils.stats import percentile
+
+logger = get_logger(__name__)
+
+
+class AdmissionPriority(IntEnum):
+    """Priority classes for decision admission (lower is served first)."""
+
+    MANUAL = 0
+    SCHEDULED = 1
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a decision cannot be admitted within its queue deadline."""
+
+    def __init__(self, message: str, reason: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Waiter:
+    account_id: int
+    priority: AdmissionPriority
+    future: "asyncio.Future[None]"
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class AdmissionController:
+    """Bounded, fair wait queue in front of the decision pipeline."""
+
+    def __init__(
+        self,
+        max_concurrent: int = 10,
+        max_queue_size: int = 100,
+        max_wait_seconds: Optional[Dict[AdmissionPriority, float]] = None,
+    ):
+        """
+        Initialize the admission controller.
+
+        Args:
+            max_concurrent: Maximum number of decisions running at once
+            max_queue_size: Maximum number of waiting decisions across all classes
+            max_wait_seconds: Queue-time deadline per priority class
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue_size = max_queue_size
+        self.max_wait_seconds = max_wait_seconds or {
+            AdmissionPriority.MANUAL: 10.0,
+            AdmissionPriority.SCHEDULED: 120.0,
+        }
+
+        self._active = 0
+        # Per class: account_id -> FIFO of that account's waiters, in round-robin order
+        self._queues: Dict[AdmissionPriority, "OrderedDict[int, Deque[_Waiter]]"] = {
+            priority: OrderedDict() for priority in AdmissionPriority
+        }
+        self._queue_depth: Dict[AdmissionPriority, int] = dict.fromkeys(AdmissionPriority, 0)
+        self._wait_times_ms: Dict[AdmissionPriority, Deque[float]] = {
+            p: deque(maxlen=1000) for p in AdmissionPriority
+        }
+        self._avg_hold_seconds = 0.0
+        self.metrics: Dict[str, Any] = {}
+        self.reset_metrics()
+
+    def reset_metrics(self) -> None:
+        """Reset admission counters."""
+        self.metrics = {
+            "admitted": 0,
+            "admitted_without_wait": 0,
+            "rejected_queue_full": 0,
+            "rejected_timeout": 0,
+            "peak_queue_depth": 0,
+            "peak_active": 0,
+        }
+        for wait_times in self._wait_times_ms.values():
+            wait_times.clear()
+
+    @property
+    def active(self) -> int:
+        """Number of decisions currently holding a slot."""
+        return self._active
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of decisions waiting for a slot."""
+        return sum(self._queue_depth.values())
+
+    def _estimate_retry_after(self) -> float:
+        hold = self._avg_hold_seconds or 1.0
+        return hold * (self.queue_depth + 1) / self.max_concurrent
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        account_id: int,
+        priority: AdmissionPriority = AdmissionPriority.MANUAL,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[float]:
+        """
+        Hold a decision slot for the duration of the context.
+
+        Args:
+            account_id: Account the decision is for
+            priority: Priority class of the request
+            timeout: Optional queue-time deadline, capped by the class deadline
+
+        Yields:
+            Time spent waiting in the queue, in milliseconds
+
+        Raises:
+            AdmissionRejectedError: If the queue is full or the deadline passes
+        """
+        wait_ms = await self._acquire(account_id, priority, timeout)
+        started = time.monotonic()
+        try:
+            yield wait_ms
+        finally:
+            hold = time.monotonic() - started
+            self._avg_hold_seconds = (
+                hold if self._avg_hold_seconds == 0 else 0.9 * self._avg_hold_seconds + 0.1 * hold
+            )
+            self._release()
+
+    def _grant(self) -> None:
+        self._active += 1
+        self.metrics["admitted"] += 1
+        self.metrics["peak_active"] = max(self.metrics["peak_active"], self._active)
+
+    async def _acquire(
+        self, account_id: int, priority: AdmissionPriority, timeout: Optional[float]
+    ) -> float:
+        if self._active < self.max_concurrent and self.queue_depth == 0:
+            self._grant()
+            self.metrics["admitted_without_wait"] += 1
+            self._wait_times_ms[priority].append(0.0)
+            return 0.0
+
+        if self.queue_depth >= self.max_queue_size:
+            self.metrics["rejected_queue_full"] += 1
+            raise AdmissionRejectedError(
+                f"Decision queue is full ({self.queue_depth} waiting)",
+                reason="queue_full",
+                retry_after=self._estimate_retry_after(),
+            )
+
+        waiter = _Waiter(
+            account_id=account_id,
+            priority=priority,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._enqueue(waiter)
+
+        max_wait = self.max_wait_seconds[priority]
+        wait_limit = min(max_wait, timeout) if timeout is not None else max_wait
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=max(0.0, wait_limit))
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # The slot was granted as the deadline passed; hand it back
+                self._release()
+            else:
+                waiter.future.cancel()
+                self._remove(waiter)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.metrics["rejected_timeout"] += 1
+            raise AdmissionRejectedError(
+                f"Decision for account {account_id} waited {wait_limit:.1f}s without a slot",
+                reason="timeout",
+                retry_after=self._estimate_retry_after(),
+            ) from e
+
+        wait_ms = (time.monotonic() - waiter.enqueued_at) * 1000
+        self._wait_times_ms[priority].append(wait_ms)
+        return wait_ms
+
+    def _enqueue(self, waiter: _Waiter) -> None:
+        account_queues = self._queues[waiter.priority]
+        if waiter.account_id not in account_queues:
+            account_queues[waiter.account_id] = deque()
+        account_queues[waiter.account_id].append(waiter)
+        self._queue_depth[waiter.priority] += 1
+        self.metrics["peak_queue_depth"] = max(self.metrics["peak_queue_depth"], self.queue_depth)
+
+    def _remove(self, waiter: _Waiter) -> None:
+        account_queues = self._queues[waiter.priority]
+        waiters = account_queues.get(waiter.account_id)
+        if waiters is None or waiter not in waiters:
+            return
+        waiters.remove(waiter)
+        self._queue_depth[waiter.priority] -= 1
+        if not waiters:
+            del account_queues[waiter.account_id]
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        for priority in AdmissionPriority:
+            account_queues = self._queues[priority]
+            if not account_queues:
+                continue
+            account_id, waiters = next(iter(account_queues.items()))
+            waiter = waiters.popleft()
+            self._queue_depth[priority] -= 1
+            if waiters:
+                # Rotate the account to the back so other accounts go next
+                account_queues.move_to_end(account_id)
+            else:
+                del account_queues[account_id]
+            return waiter
+        return None
+
+    def _release(self) -> None:
+        self._active -= 1
+        while self._active < self.max_concurrent:
+            waiter = self._next_waiter()
+            if waiter is None:
+                break
+            if waiter.future.done():
+                continue
+            self._grant()
+            waiter.future.set_result(None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, wait time and rejection metrics."""
+        wait_stats: Dict[str, Dict[str, float]] = {}
+        for priority, wait_times in self._wait_times_ms.items():
+            values = sorted(wait_times)
+            wait_stats[priority.name.lower()] = {
+                "queue_depth": self._queue_depth[priority],
+                "wait_p50_ms": percentile(values, 50),
+                "wait_p95_ms": percentile(values, 95),
+                "wait_p99_ms": percentile(values, 99),
+                "wait_max_ms": values[-1] if values else 0.0,
+            }
+        return {
+            **self.metrics,
+            "active": self._active,
+            "max_concurrent": self.max_concurrent,
+            "queue_depth": self.queue_depth,
+            "max_queue_size": self.max_queue_size,
+            "avg_hold_seconds": self._avg_hold_seconds,
+            "classes": wait_stats,
+        }
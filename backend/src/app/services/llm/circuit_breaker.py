@@ -1,18 +1,26 @@
 """
 Circuit breaker pattern implementation for LLM API calls.
 
-Provides fault tolerance and prevents cascading failures.
+Provides fault tolerance and prevents cascading failures. Each breaker opens
+when the failure rate or slow-call rate of its calls over a rolling time window
+crosses a threshold, and recovers through a limited number of half-open probe
+calls, so one flaky model or endpoint neither takes the others down nor gets
+a thundering herd once it recovers.
 """
 
 import time
+from collections import deque
 from enum import Enum
-from typing import Any, Callable, Optional, Type
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Type
 
 from ...core.logging import get_logger
 from .llm_exceptions import CircuitBreakerError
 
 logger = get_logger(__name__)
 
+# State transitions kept for the health endpoint, per breaker
+_MAX_RECENT_TRANSITIONS = 20
+
 
 class CircuitState(Enum):
     """Circuit breaker states."""
@@ -23,30 +31,68 @@ class CircuitState(Enum):
 
 
 class CircuitBreaker:
-    """Circuit breaker for API calls."""
+    """Sliding-window circuit breaker for API calls."""
 
     def __init__(
         self,
         failure_threshold: int = 5,
         recovery_timeout: int = 60,
         expected_exception: Type[Exception] = Exception,
+        name: str = "default",
+        failure_rate_threshold: float = 50.0,
+        window_seconds: float = 60.0,
+        half_open_max_calls: int = 1,
+        slow_call_seconds: float = 0.0,
+        slow_call_rate_threshold: float = 100.0,
     ) -> None:
         """
         Initialize circuit breaker.
 
         Args:
-            failure_threshold: Number of failures before opening circuit
+            failure_threshold: Failed (or slow) calls in the window before the circuit may open
             recovery_timeout: Time in seconds before attempting recovery
             expected_exception: Exception type to count as failure
+            name: Name of the protected model or endpoint, for logs and metrics
+            failure_rate_threshold: Failure rate (%) in the window that opens the circuit
+            window_seconds: Rolling window the failure and slow-call rates are taken over
+            half_open_max_calls: Concurrent probe calls allowed while half-open; the
+                circuit closes once that many probes succeeded
+            slow_call_seconds: Duration from which a call counts as slow (0 = disabled)
+            slow_call_rate_threshold: Slow-call rate (%) in the window that opens the circuit
         """
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
         self.expected_exception = expected_exception
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_seconds = window_seconds
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
 
         self.failure_count = 0
         self.last_failure_time: Optional[float] = None
         self.state = CircuitState.CLOSED
 
+        # (finished at, failed, slow) of the calls in the window
+        self._calls: Deque[Tuple[float, bool, bool]] = deque()
+        self._opened_at: Optional[float] = None
+        self._state_changed_at = time.monotonic()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        # Bumped on every transition, so calls started in an earlier state are not
+        # counted as probes
+        self._generation = 0
+
+        self.metrics: Dict[str, Any] = {
+            "calls": 0,
+            "failures": 0,
+            "slow_calls": 0,
+            "rejected_calls": 0,
+            "state_changes": {},
+        }
+        self.recent_transitions: Deque[Dict[str, Any]] = deque(maxlen=_MAX_RECENT_TRANSITIONS)
+
     async def call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
         """
         Execute function with circuit breaker protection.
@@ -60,53 +106,211 @@ class CircuitBreaker:
             Function result
 
         Raises:
-            CircuitBreakerError: When circuit is open
+            CircuitBreakerError: When circuit is open or all half-open probe slots are taken
         """
         if self.state == CircuitState.OPEN:
             if self._should_attempt_reset():
-                self.state = CircuitState.HALF_OPEN
-                logger.info("Circuit breaker transitioning to HALF_OPEN")
+                self._transition(CircuitState.HALF_OPEN, "recovery timeout elapsed")
             else:
-                raise CircuitBreakerError("Circuit breaker is OPEN")
+                self.metrics["rejected_calls"] += 1
+                raise CircuitBreakerError(f"Circuit breaker '{self.name}' is OPEN")
 
+        probe = self.state == CircuitState.HALF_OPEN
+        if probe:
+            if self._probes_in_flight >= self.half_open_max_calls:
+                self.metrics["rejected_calls"] += 1
+                raise CircuitBreakerError(
+                    f"Circuit breaker '{self.name}' is HALF_OPEN with all probe slots in use"
+                )
+            self._probes_in_flight += 1
+        generation = self._generation
+
+        start = time.monotonic()
         try:
             result = await func(*args, **kwargs)
-            self._on_success()
-            return result
         except self.expected_exception as e:
-            self._on_failure()
+            self._on_failure(time.monotonic() - start, probe and generation == self._generation)
             raise e
+        finally:
+            if probe and generation == self._generation:
+                self._probes_in_flight -= 1
+        self._on_success(time.monotonic() - start, probe and generation == self._generation)
+        return result
 
     def _should_attempt_reset(self) -> bool:
         """Check if circuit should attempt reset."""
-        if self.last_failure_time is None:
+        if self._opened_at is None:
             return False
-        return time.time() - self.last_failure_time >= self.recovery_timeout
+        return time.monotonic() - self._opened_at >= self.recovery_timeout
 
-    def _on_success(self) -> None:
+    def _on_success(self, duration: float, probe: bool) -> None:
         """Handle successful call."""
-        self.failure_count = 0
-        self.state = CircuitState.CLOSED
-        if self.state == CircuitState.HALF_OPEN:
-            logger.info("Circuit breaker reset to CLOSED")
+        slow = self._is_slow(duration)
+        self._record(failed=False, slow=slow)
+        if probe:
+            if slow:
+                self._transition(CircuitState.OPEN, f"slow probe call ({duration:.1f}s)")
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_max_calls:
+                self._transition(CircuitState.CLOSED, f"{self._probe_successes} probes succeeded")
+        elif self.state == CircuitState.CLOSED:
+            self._evaluate_window()
 
-    def _on_failure(self) -> None:
+    def _on_failure(self, duration: float, probe: bool) -> None:
         """Handle failed call."""
-        self.failure_count += 1
         self.last_failure_time = time.time()
+        self._record(failed=True, slow=self._is_slow(duration))
+        if probe:
+            self._transition(CircuitState.OPEN, "probe call failed")
+        elif self.state == CircuitState.CLOSED:
+            self._evaluate_window()
+
+    def _is_slow(self, duration: float) -> bool:
+        return self.slow_call_seconds > 0 and duration >= self.slow_call_seconds
+
+    def _record(self, failed: bool, slow: bool) -> None:
+        self.metrics["calls"] += 1
+        self.metrics["failures"] += failed
+        self.metrics["slow_calls"] += slow
+        self._calls.append((time.monotonic(), failed, slow))
+        self._prune()
 
-        if self.failure_count >= self.failure_threshold:
-            self.state = CircuitState.OPEN
-            logger.warning(f"Circuit breaker OPENED after {self.failure_count} failures")
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.window_seconds
+        while self._calls and self._calls[0][0] < cutoff:
+            self._calls.popleft()
+        self.failure_count = sum(1 for _, failed, _ in self._calls if failed)
+
+    def _window_rates(self) -> Tuple[int, int, int]:
+        """Get the calls, failures and slow calls in the window."""
+        self._prune()
+        slow_calls = sum(1 for _, _, slow in self._calls if slow)
+        return len(self._calls), self.failure_count, slow_calls
+
+    def _evaluate_window(self) -> None:
+        """Open the circuit when the window's failure or slow-call rate is too high."""
+        calls, failures, slow_calls = self._window_rates()
+        if failures >= self.failure_threshold:
+            failure_rate = failures / calls * 100
+            if failure_rate >= self.failure_rate_threshold:
+                self._transition(
+                    CircuitState.OPEN,
+                    f"{failures}/{calls} calls failed ({failure_rate:.0f}%) "
+                    f"in {self.window_seconds:.0f}s",
+                )
+                return
+        if self.slow_call_seconds > 0 and slow_calls >= self.failure_threshold:
+            slow_rate = slow_calls / calls * 100
+            if slow_rate >= self.slow_call_rate_threshold:
+                self._transition(
+                    CircuitState.OPEN,
+                    f"{slow_calls}/{calls} calls slower than {self.slow_call_seconds:.0f}s",
+                )
+
+    def _transition(self, state: CircuitState, reason: str) -> None:
+        """Move to a state and record the transition."""
+        previous = self.state
+        if previous == state:
+            return
+        now = time.monotonic()
+        self.state = state
+        self._generation += 1
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if state == CircuitState.OPEN:
+            self._opened_at = now
+        elif state == CircuitState.CLOSED:
+            # Start over, so failures from before the outage do not reopen it
+            self._opened_at = None
+            self._calls.clear()
+            self.failure_count = 0
+
+        key = f"{previous.value}_to_{state.value}"
+        self.metrics["state_changes"][key] = self.metrics["state_changes"].get(key, 0) + 1
+        self.recent_transitions.append(
+            {
+                "from": previous.value,
+                "to": state.value,
+                "reason": reason,
+                "at": time.time(),
+                "seconds_in_previous_state": round(now - self._state_changed_at, 3),
+            }
+        )
+        self._state_changed_at = now
+
+        if state == CircuitState.OPEN:
+            logger.warning(f"Circuit breaker '{self.name}' OPENED: {reason}")
+        else:
+            logger.info(f"Circuit breaker '{self.name}' {state.name}: {reason}")
 
     @property
     def is_open(self) -> bool:
         """Check if circuit is open."""
         return self.state == CircuitState.OPEN
 
+    @property
+    def allows_calls(self) -> bool:
+        """Check if a call would be attempted (closed, due for a probe or a free probe slot)."""
+        if self.state == CircuitState.OPEN:
+            return self._should_attempt_reset()
+        if self.state == CircuitState.HALF_OPEN:
+            return self._probes_in_flight < self.half_open_max_calls
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the state, window rates and state-change metrics of the breaker.
+
+        Returns:
+            Dictionary of breaker statistics
+        """
+        calls, failures, slow_calls = self._window_rates()
+        return {
+            "name": self.name,
+            "state": self.state.value,
+            "allows_calls": self.allows_calls,
+            "seconds_in_state": round(time.monotonic() - self._state_changed_at, 3),
+            "window_calls": calls,
+            "window_failure_rate": round(failures / calls * 100, 2) if calls else 0.0,
+            "window_slow_call_rate": round(slow_calls / calls * 100, 2) if calls else 0.0,
+            "half_open_probes_in_flight": self._probes_in_flight,
+            **self.metrics,
+            "state_changes": dict(self.metrics["state_changes"]),
+            "recent_transitions": list(self.recent_transitions),
+        }
+
     def reset(self) -> None:
         """Manually reset circuit breaker."""
+        self._transition(CircuitState.CLOSED, "manual reset")
         self.failure_count = 0
         self.last_failure_time = None
-        self.state = CircuitState.CLOSED
-        logger.info("Circuit breaker manually reset")
+        self._calls.clear()
+        logger.info(f"Circuit breaker '{self.name}' manually reset")
+
+
+class CircuitBreakerRegistry:
+    """Named circuit breakers (per model or endpoint) sharing default settings."""
+
+    def __init__(self, **settings: Any) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            **settings: CircuitBreaker arguments of breakers created by the registry
+        """
+        self.settings = settings
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str, **overrides: Any) -> CircuitBreaker:
+        """Get the breaker of a name, creating it with the settings and overrides on first use."""
+        if name not in self.breakers:
+            self.breakers[name] = CircuitBreaker(name=name, **{**self.settings, **overrides})
+        return self.breakers[name]
+
+    def open_breakers(self) -> List[str]:
+        """Get the names of the breakers that currently reject calls."""
+        return [name for name, breaker in self.breakers.items() if not breaker.allows_calls]
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the statistics of every breaker by name."""
+        return {name: breaker.get_stats() for name, breaker in self.breakers.items()}
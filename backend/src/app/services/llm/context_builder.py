@@ -19,6 +19,7 @@ All code should now import schemas from app.schemas.trading_decision.
 KEY METHODS:
 - build_trading_context(): Build complete trading context for decision making
 - get_market_context(): Get market data and technical indicators
+- get_shared_market_context(): Get the market snapshot shared across accounts
 - get_account_context(): Get account state and positions
 - validate_context_data_availability(): Validate data freshness and availability
 - clear_cache(): Clear cached context data
@@ -53,7 +54,9 @@ from ...schemas.trading_decision import (
     TradingContext,
     TradingStrategy,
 )
+from ...services.llm.market_snapshot import MarketSnapshotStore
 from ...services.llm.strategy_manager import StrategyManager
+from ...services.market_data.events import CandleCloseEvent
 from ...services.market_data.service import get_market_data_service
 from ...services.technical_analysis.exceptions import (
     InsufficientDataError as TAInsufficientDataError,
@@ -102,6 +105,7 @@ class ContextBuilderService:
         self.technical_analysis_service = TechnicalAnalysisService()
         self._cache: Dict[str, Tuple[datetime, Any]] = {}
         self._cache_ttl_seconds = 300  # 5 minutes cache TTL
+        self.market_snapshots = MarketSnapshotStore(ttl_seconds=self._cache_ttl_seconds)
         self._session_factory = session_factory
         self.strategy_manager = StrategyManager(session_factory=session_factory)
 
@@ -282,7 +286,7 @@ class ContextBuilderService:
         self.cleanup_expired_cache()
         all_errors: List[str] = []
 
-        market_context_task = self.get_market_context(symbols, timeframes, force_refresh)
+        market_context_task = self.get_shared_market_context(symbols, timeframes, force_refresh)
         account_context_task = self.get_account_context(account_id, force_refresh)
         recent_trades_tasks = [self.get_recent_trades(account_id, symbol) for symbol in symbols]
 
@@ -301,7 +305,7 @@ class ContextBuilderService:
 
         risk_metrics = self._calculate_portfolio_risk_metrics(account_context, market_context)
 
-        successful_symbols = list(market_context.assets.keys())
+        successful_symbols = [symbol for symbol in symbols if symbol in market_context.assets]
         context = TradingContext(
             symbols=successful_symbols,
             account_id=account_id,
@@ -428,6 +432,50 @@ class ContextBuilderService:
 
         return market_context, errors
 
+    async def get_shared_market_context(
+        self,
+        symbols: List[str],
+        timeframes: List[str],
+        force_refresh: bool = False,
+    ) -> Tuple[MarketContext, List[str]]:
+        """Get the market context snapshot shared by all accounts for these symbols.
+
+        The snapshot is built once per candle close per timeframe pair and returned by
+        reference, so callers must not mutate it.
+
+        Args:
+            symbols: List of trading pair symbols
+            timeframes: List of two timeframes to analyze
+            force_refresh: Force a rebuild of the shared snapshot
+
+        Returns:
+            Tuple of (shared MarketContext, list of error messages for failed assets)
+        """
+        snapshot = await self.market_snapshots.get_or_build(
+            symbols,
+            timeframes,
+            lambda: self.get_market_context(symbols, timeframes, force_refresh),
+            force_refresh=force_refresh,
+        )
+        return snapshot.market_context, list(snapshot.errors)
+
+    def is_market_context_current(self, market_context: MarketContext) -> bool:
+        """Check whether a market context is still the current shared snapshot."""
+        return self.market_snapshots.is_current(market_context)
+
+    def invalidate_market_snapshots(self, symbol: Optional[str] = None) -> None:
+        """Drop shared market snapshots containing a symbol, or all if no symbol is given."""
+        self.market_snapshots.invalidate(symbol)
+
+    async def on_candle_close(self, event: CandleCloseEvent) -> None:
+        """Supersede market data for a symbol when one of its candles closes.
+
+        Args:
+            event: Candle close event from the market data service
+        """
+        self.market_snapshots.advance(event.symbol, event.interval)
+        self.clear_cache(f"market_context_{event.symbol}_")
+
     def _get_cached_data(self, cache_key: str) -> Optional[Any]:
         if cache_key in self._cache:
             cached_time, cached_data = self._cache[cache_key]
@@ -835,6 +883,7 @@ class ContextBuilderService:
         """
         if pattern is None:
             self._cache.clear()
+            self.market_snapshots.invalidate()
             logger.info("Cleared all context cache")
         else:
             keys_to_remove = [key for key in self._cache.keys() if pattern in key]
@@ -0,0 +1,34 @@
+"""
+Request-scoped model selection of a trading decision.
+
+``LLMService`` is a process-wide singleton, so the model picked for one decision
+(A/B test assignment, routing, failover) must not live on the service. Each
+decision carries its own ``DecisionCall`` through the LLM calls, the response
+cache and the metrics instead.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass
+class DecisionCall:
+    """Model choice of one decision request."""
+
+    # Models to try, best first
+    models: List[str]
+    account_id: Optional[int] = None
+    # Model assigned by the A/B test, when it differs from the default model
+    ab_test_model: Optional[str] = None
+    # Model that answered, set once an LLM call succeeds
+    answered_model: Optional[str] = None
+
+    @property
+    def model(self) -> str:
+        """Get the primary model of the request."""
+        return self.models[0]
+
+    @property
+    def model_used(self) -> str:
+        """Get the model that answered, or the primary model before any answer."""
+        return self.answered_model or self.model
@@ -26,9 +26,11 @@ import hashlib
 import json
 import logging
 import time
-from collections import defaultdict
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import date, datetime, timezone
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
@@ -45,10 +47,18 @@ from ...schemas.trading_decision import (
     TradingStrategy,
     UsageMetrics,
 )
+from .admission import AdmissionController, AdmissionPriority, AdmissionRejectedError
 from .context_builder import get_context_builder_service
-from .decision_repository import DecisionRepository
+from .decision_repository import (
+    DecisionRepository,
+    RetentionProgress,
+    build_market_context_snapshot,
+)
 from .decision_validator import get_decision_validator
+from .decision_writer import DecisionWriteBehindQueue
 from .llm_service import get_llm_service
+from .rate_limiter import PostgresRateLimitBackend, RateLimiter
+from .response_cache import PostgresResponseCacheBackend
 from .strategy_manager import StrategyManager
 
 logger = logging.getLogger(__name__)
@@ -58,6 +68,9 @@ logger = logging.getLogger(__name__)
 # where full context data is not available
 _MINIMAL_VALID_MAX_POSITION_SIZE = 1.0  # Must be > 0 per AccountContext constraint
 
+# Market context snapshots kept for reuse; one context is shared per candle
+_MAX_MARKET_CONTEXT_SNAPSHOTS = 16
+
 
 class DecisionEngineError(Exception):
     """Base exception for decision engine errors."""
@@ -68,7 +81,9 @@ class DecisionEngineError(Exception):
 class RateLimitExceededError(DecisionEngineError):
     """Raised when rate limit is exceeded."""
 
-    pass
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
 
 
 class CacheEntry:
@@ -93,48 +108,6 @@ class CacheEntry:
         return self.data
 
 
-class RateLimiter:
-    """Rate limiter for decision requests."""
-
-    def __init__(self, max_requests: int = 60, window_seconds: int = 60):
-        self.max_requests = max_requests
-        self.window_seconds = window_seconds
-        self.requests: Dict[str, List[datetime]] = defaultdict(list)
-
-    def is_allowed(self, key: str) -> bool:
-        """Check if request is allowed under rate limit."""
-        now = datetime.now(timezone.utc)
-        cutoff = now - timedelta(seconds=self.window_seconds)
-
-        # Clean old requests
-        self.requests[key] = [req_time for req_time in self.requests[key] if req_time > cutoff]
-
-        # Check if under limit
-        return len(self.requests[key]) < self.max_requests
-
-    def record_request(self, key: str) -> None:
-        """Record a new request."""
-        self.requests[key].append(datetime.now(timezone.utc))
-
-    def get_remaining_requests(self, key: str) -> int:
-        """Get remaining requests for key."""
-        now = datetime.now(timezone.utc)
-        cutoff = now - timedelta(seconds=self.window_seconds)
-
-        # Clean old requests
-        self.requests[key] = [req_time for req_time in self.requests[key] if req_time > cutoff]
-
-        return max(0, self.max_requests - len(self.requests[key]))
-
-    def get_reset_time(self, key: str) -> Optional[datetime]:
-        """Get when rate limit resets for key."""
-        if not self.requests[key]:
-            return None
-
-        oldest_request = min(self.requests[key])
-        return oldest_request + timedelta(seconds=self.window_seconds)
-
-
 class DecisionEngine:
     """
     Main orchestrator for LLM-powered trading decisions.
@@ -152,15 +125,61 @@ class DecisionEngine:
         self.strategy_manager = StrategyManager(session_factory=session_factory)
         self.decision_repository = DecisionRepository(session_factory) if session_factory else None
 
+        from ...core.config import config
+
+        # Decisions are persisted off the request path by a batching writer
+        self.decision_writer = (
+            DecisionWriteBehindQueue(
+                self.decision_repository,
+                max_buffer=config.DECISION_WRITE_BUFFER_SIZE,
+                batch_size=config.DECISION_WRITE_BATCH_SIZE,
+                flush_interval_seconds=config.DECISION_WRITE_FLUSH_INTERVAL_SECONDS,
+            )
+            if self.decision_repository and config.DECISION_WRITE_BEHIND_ENABLED
+            else None
+        )
+
+        # Periodic retention of old decisions
+        self.retention_days = config.DECISION_RETENTION_DAYS
+        self.retention_batch_size = config.DECISION_RETENTION_BATCH_SIZE
+        self.retention_pause_seconds = config.DECISION_RETENTION_BATCH_PAUSE_SECONDS
+        self.retention_interval_seconds = config.DECISION_RETENTION_INTERVAL_HOURS * 3600
+        self._retention_task: Optional[asyncio.Task[None]] = None
+        self.retention_stats: Dict[str, Any] = {"runs": 0, "last_run": None, "last_error": None}
+
+        # Serialized market contexts by object identity, shared by accounts on a candle
+        self._market_context_snapshots: "OrderedDict[int, Tuple[MarketContext, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+
         # Caching system
         self._decision_cache: Dict[str, CacheEntry] = {}
         self._context_cache: Dict[str, CacheEntry] = {}
         self.cache_ttl_seconds = 300  # 5 minutes default
 
         # Rate limiting
+        rate_limit_backend = (
+            PostgresRateLimitBackend(
+                session_factory, idle_seconds=config.DECISION_RATE_LIMIT_IDLE_SECONDS
+            )
+            if config.DECISION_RATE_LIMIT_BACKEND == "postgres" and session_factory
+            else None
+        )
         self.rate_limiter = RateLimiter(
-            max_requests=60, window_seconds=60
-        )  # 60 requests per minute
+            max_requests=config.DECISION_RATE_LIMIT_PER_MINUTE,
+            window_seconds=60,
+            backend=rate_limit_backend,
+        )
+
+        # Share LLM responses to identical prompts across workers
+        if (
+            self.llm_service.response_cache is not None
+            and config.LLM_RESPONSE_CACHE_BACKEND == "postgres"
+            and session_factory
+        ):
+            self.llm_service.response_cache.shared_backend = PostgresResponseCacheBackend(
+                session_factory
+            )
 
         # Performance metrics
         self.metrics: Dict[str, Any] = {
@@ -171,12 +190,23 @@ class DecisionEngine:
             "cache_misses": 0,
             "avg_processing_time_ms": 0.0,
             "rate_limit_rejections": 0,
+            "coalesced_decisions": 0,
+            "llm_calls_saved": 0,
+            "llm_cost_saved_usd": 0.0,
             "last_reset": datetime.now(timezone.utc),
         }
 
-        # Concurrent processing limits
-        self.max_concurrent_decisions = 10
+        # Concurrent processing limits; excess requests wait in the admission queue
+        self.max_concurrent_decisions = config.DECISION_MAX_CONCURRENT
         self._active_decisions: Dict[str, asyncio.Task[Any]] = {}
+        self.admission = AdmissionController(
+            max_concurrent=self.max_concurrent_decisions,
+            max_queue_size=config.DECISION_ADMISSION_QUEUE_SIZE,
+            max_wait_seconds={
+                AdmissionPriority.MANUAL: config.DECISION_ADMISSION_MANUAL_WAIT_SECONDS,
+                AdmissionPriority.SCHEDULED: config.DECISION_ADMISSION_SCHEDULED_WAIT_SECONDS,
+            },
+        )
 
         logger.info("Decision Engine initialized")
 
@@ -187,6 +217,7 @@ class DecisionEngine:
         strategy_override: Optional[str] = None,
         force_refresh: bool = False,
         ab_test_name: Optional[str] = None,
+        priority: AdmissionPriority = AdmissionPriority.MANUAL,
     ) -> DecisionResult:
         """
         Generate a multi-asset trading decision for the given symbols and account.
@@ -198,12 +229,14 @@ class DecisionEngine:
             strategy_override: Optional strategy to override account strategy
             force_refresh: Force refresh of cached data
             ab_test_name: Optional A/B test name for model selection
+            priority: Admission priority class (manual requests ahead of scheduled ones)
 
         Returns:
             DecisionResult with the multi-asset trading decision and metadata
 
         Raises:
             RateLimitExceededError: If rate limit is exceeded
+            AdmissionRejectedError: If no processing slot frees up within the queue deadline
             DecisionEngineError: If decision generation fails
         """
         # Default to ASSETS environment variable if symbols not provided or empty
@@ -224,19 +257,15 @@ class DecisionEngine:
         decision_key = f"{'_'.join(sorted(symbols))}_{account_id}_{strategy_override or 'default'}"
 
         try:
-            # Check rate limits
-            rate_limit_key = f"account_{account_id}"
-            if not self.rate_limiter.is_allowed(rate_limit_key):
-                self.metrics["rate_limit_rejections"] += 1
-                remaining = self.rate_limiter.get_remaining_requests(rate_limit_key)
-                reset_time = self.rate_limiter.get_reset_time(rate_limit_key)
-                raise RateLimitExceededError(
-                    f"Rate limit exceeded for account {account_id}. "
-                    f"Remaining: {remaining}, Reset: {reset_time}"
-                )
+            # Attach to an identical decision that is already running; joining takes
+            # neither a rate limit token nor an admission slot. Forced refreshes always
+            # run their own pipeline.
+            if not force_refresh:
+                in_flight = self._active_decisions.get(decision_key)
+                if in_flight is not None and not in_flight.done():
+                    return await self._join_in_flight_decision(decision_key, in_flight)
 
-            # Record the request
-            self.rate_limiter.record_request(rate_limit_key)
+            await self._check_rate_limit(account_id)
 
             # Check cache first (unless force refresh)
             if not force_refresh:
@@ -248,50 +277,41 @@ class DecisionEngine:
 
             self.metrics["cache_misses"] += 1
 
-            # Check concurrent processing limits
-            if len(self._active_decisions) >= self.max_concurrent_decisions:
-                raise DecisionEngineError(
-                    "Maximum concurrent decisions reached. Please try again later."
-                )
-
-            # Create processing task
+            # Create processing task; it waits for an admission slot before running
             task = asyncio.create_task(
-                self._process_multi_asset_decision(
-                    symbols, account_id, strategy_override, force_refresh, ab_test_name
+                self._admit_and_process_decision(
+                    symbols, account_id, strategy_override, force_refresh, ab_test_name, priority
                 )
             )
             self._active_decisions[decision_key] = task
+            task.add_done_callback(partial(self._finish_shared_decision, decision_key))
 
-            try:
-                result = await task
-
-                # Cache the result
-                self._cache_decision(decision_key, result)
-
-                # Update metrics
-                self.metrics["total_decisions"] += 1
-                self.metrics["successful_decisions"] += 1
-
-                processing_time_ms = (time.time() - start_time) * 1000
-                self._update_avg_processing_time(processing_time_ms)
-
-                logger.info(
-                    "Multi-asset decision generated successfully",
-                    extra={
-                        "symbols": symbols,
-                        "account_id": account_id,
-                        "num_assets": len(symbols),
-                        "processing_time_ms": processing_time_ms,
-                        "cached": False,
-                    },
-                )
+            # Shielded like the joiners: cancelling this request must not cancel the
+            # decision for the requests that joined it
+            result = await asyncio.shield(task)
 
-                return result
+            # Update metrics
+            self.metrics["total_decisions"] += 1
+            self.metrics["successful_decisions"] += 1
+
+            processing_time_ms = (time.time() - start_time) * 1000
+            self._update_avg_processing_time(processing_time_ms)
+
+            logger.info(
+                "Multi-asset decision generated successfully",
+                extra={
+                    "symbols": symbols,
+                    "account_id": account_id,
+                    "num_assets": len(symbols),
+                    "processing_time_ms": processing_time_ms,
+                    "cached": False,
+                },
+            )
 
-            finally:
-                # Clean up active task
-                self._active_decisions.pop(decision_key, None)
+            return result
 
+        except (RateLimitExceededError, AdmissionRejectedError):
+            raise
         except Exception as e:
             self.metrics["total_decisions"] += 1
             self.metrics["failed_decisions"] += 1
@@ -309,6 +329,75 @@ class DecisionEngine:
 
             raise DecisionEngineError(f"Decision generation failed: {str(e)}") from e
 
+    async def _check_rate_limit(self, account_id: int) -> None:
+        """Take a rate limit token for the account, raising when none is left."""
+        rate_limit = await self.rate_limiter.acquire(f"account_{account_id}")
+        if not rate_limit.allowed:
+            self.metrics["rate_limit_rejections"] += 1
+            raise RateLimitExceededError(
+                f"Rate limit exceeded for account {account_id}. "
+                f"Remaining: {rate_limit.remaining}, Reset: {rate_limit.reset_time}",
+                retry_after=rate_limit.retry_after_seconds,
+            )
+
+    def _finish_shared_decision(
+        self, decision_key: str, task: "asyncio.Task[DecisionResult]"
+    ) -> None:
+        """Drop a finished decision from the in-flight map and cache its result.
+
+        Runs as a done-callback, so it also happens when every request waiting for
+        the decision was cancelled.
+        """
+        if self._active_decisions.get(decision_key) is task:
+            del self._active_decisions[decision_key]
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is None:
+            self._cache_decision(decision_key, task.result())
+        else:
+            logger.debug(f"Shared decision {decision_key} failed: {error}")
+
+    async def _join_in_flight_decision(
+        self, decision_key: str, in_flight: "asyncio.Task[DecisionResult]"
+    ) -> DecisionResult:
+        """
+        Wait for an identical in-flight decision instead of running the pipeline again.
+
+        The shared task is shielded so that a cancelled joiner does not cancel the
+        decision for the request that started it.
+        """
+        self.metrics["coalesced_decisions"] += 1
+        logger.debug(f"Joining in-flight decision {decision_key}")
+        try:
+            result = await asyncio.shield(in_flight)
+        except asyncio.CancelledError:
+            if in_flight.cancelled():
+                raise DecisionEngineError(
+                    f"In-flight decision {decision_key} was cancelled"
+                ) from None
+            raise
+        self.metrics["llm_calls_saved"] += 1
+        self.metrics["llm_cost_saved_usd"] += result.api_cost or 0.0
+        return result
+
+    async def _admit_and_process_decision(
+        self,
+        symbols: List[str],
+        account_id: int,
+        strategy_override: Optional[str],
+        force_refresh: bool,
+        ab_test_name: Optional[str],
+        priority: AdmissionPriority,
+    ) -> DecisionResult:
+        # Wait for a processing slot instead of rejecting bursts outright
+        async with self.admission.admit(account_id, priority) as queue_wait_ms:
+            if queue_wait_ms > 0:
+                logger.debug(f"Decision for account {account_id} queued {queue_wait_ms:.0f}ms")
+            return await self._process_multi_asset_decision(
+                symbols, account_id, strategy_override, force_refresh, ab_test_name
+            )
+
     async def _process_multi_asset_decision(
         self,
         symbols: List[str],
@@ -495,12 +584,16 @@ class DecisionEngine:
             raise DecisionEngineError(f"Failed to build multi-asset context: {str(e)}") from e
 
     def _get_cached_decision(self, key: str) -> Optional[DecisionResult]:
-        """Get cached decision if available and not expired."""
+        """Get cached decision if available, not expired and made on the current market snapshot."""
         entry = self._decision_cache.get(key)
-        if entry and not entry.is_expired():
+        if (
+            entry
+            and not entry.is_expired()
+            and self.context_builder.is_market_context_current(entry.data.context.market_data)
+        ):
             return entry.access()
         elif entry:
-            # Remove expired entry
+            # Remove expired or superseded entry
             del self._decision_cache[key]
         return None
 
@@ -522,12 +615,16 @@ class DecisionEngine:
         self._decision_cache[key] = CacheEntry(result, ttl)
 
     def _get_cached_context(self, key: str) -> Optional[TradingContext]:
-        """Get cached context if available and not expired."""
+        """Get cached context if available, not expired and built on the current market snapshot."""
         entry = self._context_cache.get(key)
-        if entry and not entry.is_expired():
+        if (
+            entry
+            and not entry.is_expired()
+            and self.context_builder.is_market_context_current(entry.data.market_data)
+        ):
             return entry.access()
         elif entry:
-            # Remove expired entry
+            # Remove expired or superseded entry
             del self._context_cache[key]
         return None
 
@@ -575,9 +672,7 @@ class DecisionEngine:
         try:
             # Extract market and account context for storage
             # Use mode='json' to ensure all values are JSON-serializable (e.g., datetime -> str)
-            market_context_dict = (
-                context.market_data.model_dump(mode="json") if context.market_data else {}
-            )
+            market_snapshot = self._get_market_context_snapshot(context.market_data)
             account_context_dict = (
                 context.account_state.model_dump(mode="json") if context.account_state else {}
             )
@@ -587,20 +682,31 @@ class DecisionEngine:
 
             # Save decision to database if repository is available
             if self.decision_repository:
-                await self.decision_repository.save_decision(
-                    account_id=account_id,
-                    strategy_id=strategy_id,
-                    trading_decision=decision_result.decision,
-                    model_used=decision_result.model_used,
-                    processing_time_ms=decision_result.processing_time_ms,
-                    validation_passed=decision_result.validation_passed,
-                    validation_errors=decision_result.validation_errors,
-                    validation_warnings=None,  # Add if available in decision_result
-                    market_context=market_context_dict,
-                    account_context=account_context_dict,
-                    risk_metrics=risk_metrics_dict,
-                    api_cost=None,  # Add if available in decision_result
-                )
+                decision_fields: Dict[str, Any] = {
+                    "account_id": account_id,
+                    "strategy_id": strategy_id,
+                    "trading_decision": decision_result.decision,
+                    "model_used": decision_result.model_used,
+                    "processing_time_ms": decision_result.processing_time_ms,
+                    "validation_passed": decision_result.validation_passed,
+                    "validation_errors": decision_result.validation_errors,
+                    "validation_warnings": None,  # Add if available in decision_result
+                    "account_context": account_context_dict,
+                    "risk_metrics": risk_metrics_dict,
+                    "api_cost": decision_result.api_cost,
+                    "prompt_tokens": decision_result.prompt_tokens,
+                    "completion_tokens": decision_result.completion_tokens,
+                }
+                if self.decision_writer:
+                    # Buffered and inserted in a batch by the background writer
+                    row = self.decision_repository.build_decision_row(
+                        **decision_fields, market_context_hash=market_snapshot["content_hash"]
+                    )
+                    await self.decision_writer.submit(row, market_snapshot)
+                else:
+                    await self.decision_repository.save_decision(
+                        **decision_fields, market_context=market_snapshot["market_context"]
+                    )
 
             logger.info(
                 f"Persisted multi-asset decision for account {account_id} with "
@@ -611,6 +717,28 @@ class DecisionEngine:
             logger.error(f"Failed to persist decision: {e}", exc_info=True)
             raise
 
+    def _get_market_context_snapshot(self, market_data: Optional[MarketContext]) -> Dict[str, Any]:
+        """
+        Get the content-addressed snapshot row for a market context.
+
+        Accounts deciding on the same candle share one MarketContext object, so its
+        serialized form and hash are computed once and reused by identity. Entries
+        hold a reference to the context, which keeps its id from being reused.
+        """
+        if market_data is None:
+            return build_market_context_snapshot({})
+
+        entry = self._market_context_snapshots.get(id(market_data))
+        if entry is not None and entry[0] is market_data:
+            self._market_context_snapshots.move_to_end(id(market_data))
+            return entry[1]
+
+        snapshot = build_market_context_snapshot(market_data.model_dump(mode="json"))
+        self._market_context_snapshots[id(market_data)] = (market_data, snapshot)
+        while len(self._market_context_snapshots) > _MAX_MARKET_CONTEXT_SNAPSHOTS:
+            self._market_context_snapshots.popitem(last=False)
+        return snapshot
+
     async def batch_decisions(
         self,
         symbols: List[str],
@@ -651,6 +779,7 @@ class DecisionEngine:
         limit: int = 100,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
+        offset: int = 0,
     ) -> List[DecisionResult]:
         """
         Get decision history for an account with optional symbol filtering.
@@ -661,6 +790,7 @@ class DecisionEngine:
             limit: Maximum number of decisions to return
             start_date: Optional start date filter
             end_date: Optional end date filter
+            offset: Number of matching decisions to skip (for pagination)
 
         Returns:
             List of historical DecisionResult objects
@@ -682,6 +812,9 @@ class DecisionEngine:
                 account_id=account_id,
                 limit=limit,
                 symbol=symbol,
+                offset=offset,
+                start_date=start_date,
+                end_date=end_date,
             )
 
             # Convert Decision models to DecisionResult objects
@@ -767,6 +900,54 @@ class DecisionEngine:
             logger.error(f"Failed to get decision history: {e}", exc_info=True)
             return []
 
+    async def count_decision_history(
+        self,
+        account_id: int,
+        symbol: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> int:
+        """
+        Count the decisions matching a history query.
+
+        Args:
+            account_id: Account identifier
+            symbol: Optional symbol filter
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+
+        Returns:
+            Number of matching decisions, or 0 without a repository
+        """
+        if not self.decision_repository:
+            return 0
+        return await self.decision_repository.count_decision_history(
+            account_id=account_id, symbol=symbol, start_date=start_date, end_date=end_date
+        )
+
+    async def get_rollup_summary(
+        self,
+        start_day: date,
+        end_day: date,
+        account_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get persisted decision analytics for whole days from the daily rollup.
+
+        Args:
+            start_day: First day to include
+            end_day: Last day to include
+            account_id: Optional account filter (all accounts when omitted)
+
+        Returns:
+            Dictionary with analytics data, or an empty dictionary without a repository
+        """
+        if not self.decision_repository:
+            return {}
+        return await self.decision_repository.get_rollup_summary(
+            start_day=start_day, end_day=end_day, account_id=account_id
+        )
+
     async def switch_strategy(
         self,
         account_id: int,
@@ -840,6 +1021,7 @@ class DecisionEngine:
 
         # Invalidate context builder caches using the new clear_cache method
         self.context_builder.clear_cache(f"market_context_{symbol}")
+        self.context_builder.invalidate_market_snapshots(symbol)
 
         logger.debug(f"Invalidated caches for symbol {symbol}")
 
@@ -1061,6 +1243,9 @@ class DecisionEngine:
             "memory_usage_mb": memory_usage_mb,
             "active_decisions": len(self._active_decisions),
             "max_concurrent_decisions": self.max_concurrent_decisions,
+            "coalesced_decisions": self.metrics["coalesced_decisions"],
+            "llm_calls_saved": self.metrics["llm_calls_saved"],
+            "llm_cost_saved_usd": self.metrics["llm_cost_saved_usd"],
         }
 
     def _cleanup_expired_cache(self) -> None:
@@ -1088,9 +1273,75 @@ class DecisionEngine:
         """Clear all caches."""
         self._decision_cache.clear()
         self._context_cache.clear()
+        self._market_context_snapshots.clear()
         self.context_builder.clear_cache()
         logger.info("All caches cleared")
 
+    def get_admission_stats(self) -> Dict[str, Any]:
+        """
+        Get admission queue statistics.
+
+        Returns:
+            Dictionary with active slots, queue depth and wait-time percentiles per class
+        """
+        return self.admission.get_stats()
+
+    def get_persistence_stats(self) -> Dict[str, Any]:
+        """
+        Get decision write-behind and retention statistics.
+
+        Returns:
+            Dictionary with buffer depth and write counters (or the synchronous mode)
+            and the progress of the last retention run
+        """
+        if not self.decision_writer:
+            stats = {"mode": "synchronous" if self.decision_repository else "disabled"}
+        else:
+            stats = {"mode": "write_behind", **self.decision_writer.get_stats()}
+        return {**stats, "retention": dict(self.retention_stats)}
+
+    async def run_decision_retention(self) -> Dict[str, Any]:
+        """
+        Delete decisions older than the retention period in throttled batches.
+
+        Returns:
+            Progress of the run, also kept in retention_stats
+        """
+        if not self.decision_repository:
+            return {}
+
+        def record_progress(progress: RetentionProgress) -> None:
+            self.retention_stats["current_run"] = asdict(progress)
+
+        try:
+            await self.decision_repository.cleanup_old_decisions(
+                days_to_keep=self.retention_days,
+                batch_size=self.retention_batch_size,
+                pause_seconds=self.retention_pause_seconds,
+                progress_callback=record_progress,
+            )
+            self.retention_stats["last_error"] = None
+        except Exception as e:
+            self.retention_stats["last_error"] = str(e)
+            raise
+        finally:
+            self.retention_stats["runs"] += 1
+            self.retention_stats["last_run"] = self.retention_stats.pop("current_run", None)
+        return self.retention_stats["last_run"] or {}
+
+    def start_retention(self) -> None:
+        """Start the periodic retention task if it is not running."""
+        if self._retention_task is None or self._retention_task.done():
+            self._retention_task = asyncio.create_task(self._run_retention_loop())
+
+    async def _run_retention_loop(self) -> None:
+        while True:
+            try:
+                await self.run_decision_retention()
+            except Exception as e:
+                logger.error(f"Decision retention run failed: {e}", exc_info=True)
+            await asyncio.sleep(self.retention_interval_seconds)
+
     def reset_metrics(self) -> None:
         """Reset performance metrics."""
         self.metrics = {
@@ -1101,8 +1352,12 @@ class DecisionEngine:
             "cache_misses": 0,
             "avg_processing_time_ms": 0.0,
             "rate_limit_rejections": 0,
+            "coalesced_decisions": 0,
+            "llm_calls_saved": 0,
+            "llm_cost_saved_usd": 0.0,
             "last_reset": datetime.now(timezone.utc),
         }
+        self.admission.reset_metrics()
         logger.info("Decision engine metrics reset")
 
     async def shutdown(self) -> None:
@@ -1125,6 +1380,16 @@ class DecisionEngine:
             except asyncio.TimeoutError:
                 logger.warning("Some decisions did not complete within shutdown timeout")
 
+        # Stop retention between batches; every finished batch is already committed
+        if self._retention_task:
+            self._retention_task.cancel()
+            await asyncio.gather(self._retention_task, return_exceptions=True)
+            self._retention_task = None
+
+        # Flush decisions still waiting to be written
+        if self.decision_writer:
+            await self.decision_writer.stop()
+
         # Clear caches
         self.clear_all_caches()
 
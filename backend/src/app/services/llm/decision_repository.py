@@ -4,20 +4,83 @@ Decision Repository for database persistence operations.
 Handles CRUD operations for trading decisions with multi-asset support.
 """
 
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
-
-from sqlalchemy import and_, desc, func, select
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
+
+from sqlalchemy import (
+    CursorResult,
+    Float,
+    and_,
+    column,
+    delete,
+    desc,
+    func,
+    insert,
+    or_,
+    select,
+    true,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import selectinload
 
 from ...core.logging import get_logger
-from ...models.decision import Decision, DecisionResult
+from ...models.decision import Decision, DecisionResult, MarketContextSnapshot
+from ...models.decision_rollup import DecisionDailyRollup
 from ...schemas.trading_decision import TradingDecision
+from .decision_rollup import (
+    ACTION_COLUMNS,
+    COUNTER_COLUMNS,
+    PROCESSING_TIME_BUCKETS,
+    apply_rollup_increments,
+    build_rollup_increments,
+    executed_increment,
+    split_rollup_range,
+    to_naive_utc,
+)
 
 logger = get_logger(__name__)
 
 
+def build_market_context_snapshot(market_context: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a content-addressed market context snapshot row.
+
+    The hash is taken over canonical JSON (sorted keys, no whitespace), so the same
+    market context always maps to the same row regardless of key order.
+
+    Args:
+        market_context: JSON-serializable market context
+
+    Returns:
+        Dictionary of MarketContextSnapshot column values
+    """
+    payload = json.dumps(market_context, sort_keys=True, separators=(",", ":"), default=str)
+    return {
+        "content_hash": hashlib.sha256(payload.encode("utf-8")).hexdigest(),
+        "market_context": market_context,
+        "size_bytes": len(payload),
+    }
+
+
+@dataclass
+class RetentionProgress:
+    """Progress of a decision retention run."""
+
+    cutoff: datetime
+    batches: int = 0
+    decisions_deleted: int = 0
+    results_deleted: int = 0
+    snapshots_deleted: int = 0
+    done: bool = False
+
+
 class DecisionRepository:
     """Repository for decision database operations."""
 
@@ -29,6 +92,88 @@ class DecisionRepository:
         """
         self.session_factory = session_factory
 
+    def build_decision_row(
+        self,
+        account_id: int,
+        strategy_id: str,
+        trading_decision: TradingDecision,
+        model_used: str,
+        processing_time_ms: float,
+        validation_passed: bool,
+        validation_errors: Optional[List[str]] = None,
+        validation_warnings: Optional[List[str]] = None,
+        market_context_hash: Optional[str] = None,
+        account_context: Optional[Dict[str, Any]] = None,
+        risk_metrics: Optional[Dict[str, Any]] = None,
+        api_cost: Optional[float] = None,
+        prompt_tokens: Optional[int] = None,
+        completion_tokens: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build the column values of a decision row.
+
+        Args:
+            account_id: Account ID
+            strategy_id: Strategy ID
+            trading_decision: TradingDecision object
+            model_used: LLM model used
+            processing_time_ms: Processing time in milliseconds
+            validation_passed: Whether validation passed
+            validation_errors: List of validation errors
+            validation_warnings: List of validation warnings
+            market_context_hash: Content hash of the stored market context snapshot
+            account_context: Account context data
+            risk_metrics: Risk metrics data
+            api_cost: API cost for this decision
+            prompt_tokens: Prompt tokens of the LLM completion
+            completion_tokens: Output tokens of the LLM completion
+
+        Returns:
+            Dictionary of Decision column values
+        """
+        # Convert timezone-aware timestamp to naive UTC for database storage
+        timestamp = trading_decision.timestamp
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.replace(tzinfo=None)
+
+        return {
+            "account_id": account_id,
+            "strategy_id": strategy_id,
+            # Multi-asset fields
+            "asset_decisions": [ad.model_dump() for ad in trading_decision.decisions],
+            "portfolio_rationale": trading_decision.portfolio_rationale,
+            "total_allocation_usd": trading_decision.total_allocation_usd,
+            "portfolio_risk_level": trading_decision.portfolio_risk_level,
+            # Legacy fields (set to None for multi-asset decisions)
+            "symbol": None,
+            "action": None,
+            "allocation_usd": None,
+            "tp_price": None,
+            "sl_price": None,
+            "exit_plan": None,
+            "rationale": None,
+            "confidence": None,
+            "risk_level": None,
+            # Metadata
+            "timestamp": timestamp,
+            "model_used": model_used,
+            "api_cost": api_cost,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "processing_time_ms": processing_time_ms,
+            # Validation
+            "validation_passed": validation_passed,
+            "validation_errors": validation_errors,
+            "validation_warnings": validation_warnings,
+            # Context
+            "market_context_hash": market_context_hash,
+            "market_context": None,
+            "account_context": account_context or {},
+            "risk_metrics": risk_metrics,
+            # Execution
+            "executed": False,
+        }
+
     async def save_decision(
         self,
         account_id: int,
@@ -43,6 +188,8 @@ class DecisionRepository:
         account_context: Optional[Dict[str, Any]] = None,
         risk_metrics: Optional[Dict[str, Any]] = None,
         api_cost: Optional[float] = None,
+        prompt_tokens: Optional[int] = None,
+        completion_tokens: Optional[int] = None,
     ) -> Decision:
         """
         Save a trading decision to the database.
@@ -60,54 +207,37 @@ class DecisionRepository:
             account_context: Account context data
             risk_metrics: Risk metrics data
             api_cost: API cost for this decision
+            prompt_tokens: Prompt tokens of the LLM completion
+            completion_tokens: Output tokens of the LLM completion
 
         Returns:
             Saved Decision object
         """
+        snapshot = build_market_context_snapshot(market_context or {})
+
         async with self.session_factory() as session:
             try:
-                # Convert timezone-aware timestamp to naive UTC for database storage
-                timestamp = trading_decision.timestamp
-                if timestamp.tzinfo is not None:
-                    timestamp = timestamp.replace(tzinfo=None)
-
-                # Convert TradingDecision to database model
-                decision = Decision(
+                await self._store_market_context_snapshots(session, [snapshot])
+                row = self.build_decision_row(
                     account_id=account_id,
                     strategy_id=strategy_id,
-                    # Multi-asset fields
-                    asset_decisions=[ad.model_dump() for ad in trading_decision.decisions],
-                    portfolio_rationale=trading_decision.portfolio_rationale,
-                    total_allocation_usd=trading_decision.total_allocation_usd,
-                    portfolio_risk_level=trading_decision.portfolio_risk_level,
-                    # Legacy fields (set to None for multi-asset decisions)
-                    symbol=None,
-                    action=None,
-                    allocation_usd=None,
-                    tp_price=None,
-                    sl_price=None,
-                    exit_plan=None,
-                    rationale=None,
-                    confidence=None,
-                    risk_level=None,
-                    # Metadata
-                    timestamp=timestamp,
+                    trading_decision=trading_decision,
                     model_used=model_used,
-                    api_cost=api_cost,
                     processing_time_ms=processing_time_ms,
-                    # Validation
                     validation_passed=validation_passed,
                     validation_errors=validation_errors,
                     validation_warnings=validation_warnings,
-                    # Context
-                    market_context=market_context or {},
-                    account_context=account_context or {},
+                    market_context_hash=snapshot["content_hash"],
+                    account_context=account_context,
                     risk_metrics=risk_metrics,
-                    # Execution
-                    executed=False,
+                    api_cost=api_cost,
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens,
                 )
+                decision = Decision(**row)
 
                 session.add(decision)
+                await apply_rollup_increments(session, build_rollup_increments([row]))
                 await session.commit()
                 await session.refresh(decision)
 
@@ -123,6 +253,52 @@ class DecisionRepository:
                 logger.error(f"Failed to save decision: {e}")
                 raise
 
+    async def _store_market_context_snapshots(
+        self, session: AsyncSession, snapshots: List[Dict[str, Any]]
+    ) -> None:
+        if not snapshots:
+            return
+        # Snapshots are immutable and keyed by content, so an existing row is already correct
+        await session.execute(
+            pg_insert(MarketContextSnapshot)
+            .values(snapshots)
+            .on_conflict_do_nothing(index_elements=["content_hash"])
+        )
+
+    async def save_decisions_batch(
+        self,
+        rows: List[Dict[str, Any]],
+        snapshots: Optional[List[Dict[str, Any]]] = None,
+    ) -> int:
+        """
+        Insert several decision rows in one statement and transaction.
+
+        Args:
+            rows: Column values built with build_decision_row
+            snapshots: Market context snapshots referenced by the rows that may not be
+                stored yet, built with build_market_context_snapshot
+
+        Returns:
+            Number of inserted decisions
+        """
+        if not rows:
+            return 0
+
+        async with self.session_factory() as session:
+            try:
+                await self._store_market_context_snapshots(session, snapshots or [])
+                # A list of parameter sets is sent as multi-row INSERT ... VALUES batches
+                await session.execute(insert(Decision), rows)
+                await apply_rollup_increments(session, build_rollup_increments(rows))
+                await session.commit()
+                logger.debug(f"Saved batch of {len(rows)} decisions")
+                return len(rows)
+
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"Failed to save batch of {len(rows)} decisions: {e}")
+                raise
+
     async def get_decision_by_id(self, decision_id: int) -> Optional[Decision]:
         """
         Get a decision by ID.
@@ -138,28 +314,70 @@ class DecisionRepository:
                 result = await session.execute(
                     select(Decision)
                     .where(Decision.id == decision_id)
-                    .options(selectinload(Decision.decision_results))
+                    .options(
+                        selectinload(Decision.decision_results),
+                        selectinload(Decision.market_context_snapshot),
+                    )
                 )
                 return result.scalar_one_or_none()
             except Exception as e:
                 logger.error(f"Failed to get decision {decision_id}: {e}")
                 raise
 
+    def _period_filters(
+        self,
+        account_id: int,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+    ) -> List[Any]:
+        filters: List[Any] = [Decision.account_id == account_id]
+        if start_date:
+            filters.append(Decision.timestamp >= start_date)
+        if end_date:
+            filters.append(Decision.timestamp <= end_date)
+        return filters
+
+    def _history_filters(
+        self,
+        account_id: int,
+        symbol: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+    ) -> List[Any]:
+        filters = self._period_filters(account_id, start_date, end_date)
+        # Multi-asset decisions match by GIN-indexed JSONB containment, legacy
+        # single-asset decisions by their symbol column
+        if symbol:
+            filters.append(
+                or_(
+                    Decision.asset_decisions.contains([{"asset": symbol}]),
+                    Decision.symbol == symbol,
+                )
+            )
+        return filters
+
     async def get_decision_history(
         self,
         account_id: int,
         limit: int = 100,
         symbol: Optional[str] = None,
         offset: int = 0,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
     ) -> List[Decision]:
         """
         Get decision history for an account.
 
+        Filters are applied in SQL before LIMIT/OFFSET, so every page is full and
+        offsets count only matching decisions.
+
         Args:
             account_id: Account ID
             limit: Maximum number of decisions to return
             symbol: Optional symbol filter
             offset: Offset for pagination
+            start_date: Optional start date filter
+            end_date: Optional end date filter
 
         Returns:
             List of Decision objects
@@ -168,45 +386,51 @@ class DecisionRepository:
             try:
                 query = (
                     select(Decision)
-                    .where(Decision.account_id == account_id)
+                    .where(*self._history_filters(account_id, symbol, start_date, end_date))
                     .order_by(Decision.timestamp.desc())
                     .limit(limit)
                     .offset(offset)
                     .options(selectinload(Decision.decision_results))
                 )
-
-                # If symbol filter is provided, we need to filter decisions that contain this symbol
-                # For multi-asset decisions, check if symbol is in asset_decisions
-                # For legacy single-asset decisions, check the symbol field
-                if symbol:
-                    # Note: This requires PostgreSQL JSON operators
-                    # We'll filter in Python for now, but this should be optimized with proper SQL
-                    result = await session.execute(query)
-                    all_decisions = result.scalars().all()
-
-                    # Filter decisions that contain the symbol
-                    filtered_decisions = []
-                    for decision in all_decisions:
-                        if decision.is_multi_asset:
-                            # Check if symbol is in any asset decision
-                            if decision.asset_decisions:  # Check if asset_decisions is not None
-                                if any(
-                                    ad.get("asset") == symbol for ad in decision.asset_decisions
-                                ):
-                                    filtered_decisions.append(decision)
-                        elif decision.symbol == symbol:
-                            # Legacy single-asset decision
-                            filtered_decisions.append(decision)
-
-                    return filtered_decisions[:limit]
-                else:
-                    result = await session.execute(query)
-                    return list(result.scalars().all())
+                result = await session.execute(query)
+                return list(result.scalars().all())
 
             except Exception as e:
                 logger.error(f"Failed to get decision history for account {account_id}: {e}")
                 raise
 
+    async def count_decision_history(
+        self,
+        account_id: int,
+        symbol: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> int:
+        """
+        Count the decisions matching a history query.
+
+        Args:
+            account_id: Account ID
+            symbol: Optional symbol filter
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+
+        Returns:
+            Number of matching decisions
+        """
+        async with self.session_factory() as session:
+            try:
+                result = await session.execute(
+                    select(func.count(Decision.id)).where(
+                        *self._history_filters(account_id, symbol, start_date, end_date)
+                    )
+                )
+                return int(result.scalar_one())
+
+            except Exception as e:
+                logger.error(f"Failed to count decision history for account {account_id}: {e}")
+                raise
+
     async def mark_decision_executed(
         self,
         decision_id: int,
@@ -237,6 +461,20 @@ class DecisionRepository:
                 if not decision:
                     raise ValueError(f"Decision {decision_id} not found")
 
+                if not decision.executed:
+                    await apply_rollup_increments(
+                        session,
+                        [
+                            executed_increment(
+                                (
+                                    to_naive_utc(decision.timestamp).date(),
+                                    decision.account_id,
+                                    decision.strategy_id,
+                                    decision.model_used,
+                                )
+                            )
+                        ],
+                    )
                 decision.mark_executed(execution_price, execution_errors)
 
                 await session.commit()
@@ -442,78 +680,352 @@ class DecisionRepository:
         """
         Get analytics for decisions in a time period.
 
+        Whole days are read from the daily rollup table and only the partial days at
+        the edges of the range are aggregated from raw decisions, so the cost of a
+        query grows with the number of days rather than the number of decisions.
+
         Args:
             account_id: Account ID
             start_date: Optional start date
-            end_date: Optional end date
+            end_date: Optional end date (defaults to now)
             strategy_id: Optional strategy filter
 
         Returns:
             Dictionary with analytics data
         """
+        first_day, last_day, raw_ranges = split_rollup_range(
+            start_date, end_date or datetime.now(timezone.utc)
+        )
+
         async with self.session_factory() as session:
             try:
-                query = select(Decision).where(Decision.account_id == account_id)
+                counters = await self._sum_rollups(
+                    session, first_day, last_day, account_id, strategy_id
+                )
+                for range_start, range_end in raw_ranges:
+                    filters = [
+                        Decision.account_id == account_id,
+                        Decision.timestamp >= range_start,
+                        Decision.timestamp < range_end,
+                    ]
+                    if strategy_id:
+                        filters.append(Decision.strategy_id == strategy_id)
+                    raw_counters = await self._aggregate_decisions(session, filters)
+                    for name in COUNTER_COLUMNS:
+                        counters[name] += raw_counters[name]
 
-                if start_date:
-                    query = query.where(Decision.timestamp >= start_date)
-                if end_date:
-                    query = query.where(Decision.timestamp <= end_date)
-                if strategy_id:
-                    query = query.where(Decision.strategy_id == strategy_id)
+                return self._format_analytics(counters)
 
-                result = await session.execute(query)
-                decisions = result.scalars().all()
-
-                if not decisions:
-                    return {
-                        "total_decisions": 0,
-                        "validation_rate": 0.0,
-                        "execution_rate": 0.0,
-                        "action_breakdown": {},
-                        "avg_confidence": 0.0,
-                        "avg_processing_time": 0.0,
-                        "total_api_cost": 0.0,
-                    }
+            except Exception as e:
+                logger.error(f"Failed to get decision analytics for account {account_id}: {e}")
+                raise
 
-                total_decisions = len(decisions)
-                validated_decisions = sum(1 for d in decisions if d.validation_passed)
-                executed_decisions = sum(1 for d in decisions if d.executed)
-
-                action_counts: Dict[str, int] = {}
-                for decision in decisions:
-                    action = decision.action
-                    if action is not None:
-                        action_counts[action] = action_counts.get(action, 0) + 1
-
-                avg_confidence = (
-                    sum(d.confidence for d in decisions if d.confidence is not None)
-                    / total_decisions
-                    if total_decisions > 0
-                    else 0.0
+    async def get_rollup_summary(
+        self,
+        start_day: date,
+        end_day: date,
+        account_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get decision analytics for whole days from the daily rollup table only.
+
+        Args:
+            start_day: First day to include
+            end_day: Last day to include
+            account_id: Optional account filter (all accounts when omitted)
+
+        Returns:
+            Dictionary with analytics data
+        """
+        async with self.session_factory() as session:
+            try:
+                counters = await self._sum_rollups(
+                    session, start_day, end_day + timedelta(days=1), account_id
                 )
-                avg_processing_time = (
-                    sum(d.processing_time_ms for d in decisions if d.processing_time_ms is not None)
-                    / total_decisions
-                    if total_decisions > 0
-                    else 0.0
+                return self._format_analytics(counters)
+
+            except Exception as e:
+                logger.error(f"Failed to get decision rollup summary: {e}")
+                raise
+
+    async def _sum_rollups(
+        self,
+        session: AsyncSession,
+        first_day: Optional[date],
+        last_day: date,
+        account_id: Optional[int] = None,
+        strategy_id: Optional[str] = None,
+    ) -> Dict[str, float]:
+        """Sum rollup counters over [first_day, last_day)."""
+        counters: Dict[str, float] = dict.fromkeys(COUNTER_COLUMNS, 0)
+        if first_day is not None and first_day >= last_day:
+            return counters
+
+        filters: List[Any] = [DecisionDailyRollup.day < last_day]
+        if first_day is not None:
+            filters.append(DecisionDailyRollup.day >= first_day)
+        if account_id is not None:
+            filters.append(DecisionDailyRollup.account_id == account_id)
+        if strategy_id:
+            filters.append(DecisionDailyRollup.strategy_id == strategy_id)
+
+        table = DecisionDailyRollup.__table__
+        row = (
+            await session.execute(
+                select(
+                    *(
+                        func.coalesce(func.sum(table.c[name]), 0).label(name)
+                        for name in COUNTER_COLUMNS
+                    )
+                ).where(*filters)
+            )
+        ).one()
+        return {name: getattr(row, name) for name in COUNTER_COLUMNS}
+
+    async def _aggregate_decisions(
+        self, session: AsyncSession, filters: List[Any]
+    ) -> Dict[str, float]:
+        """Aggregate raw decisions into the same counters as the daily rollup."""
+        bucket_counts = []
+        lower_bound: Optional[float] = None
+        for name, upper_bound in PROCESSING_TIME_BUCKETS:
+            conditions = []
+            if lower_bound is not None:
+                conditions.append(Decision.processing_time_ms > lower_bound)
+            if upper_bound is not None:
+                conditions.append(Decision.processing_time_ms <= upper_bound)
+            bucket_counts.append(func.count(Decision.id).filter(*conditions).label(name))
+            lower_bound = upper_bound
+
+        totals = (
+            await session.execute(
+                select(
+                    func.count(Decision.id).label("decision_count"),
+                    func.count(Decision.id)
+                    .filter(Decision.validation_passed)
+                    .label("validated_count"),
+                    func.count(Decision.id).filter(Decision.executed).label("executed_count"),
+                    func.coalesce(func.sum(Decision.processing_time_ms), 0.0).label(
+                        "processing_time_sum_ms"
+                    ),
+                    *bucket_counts,
+                    func.coalesce(func.sum(Decision.api_cost), 0.0).label("api_cost_sum"),
+                ).where(*filters)
+            )
+        ).one()
+
+        counters: Dict[str, float] = dict.fromkeys(COUNTER_COLUMNS, 0)
+        for name in (
+            "decision_count",
+            "validated_count",
+            "executed_count",
+            "processing_time_sum_ms",
+            *(bucket for bucket, _ in PROCESSING_TIME_BUCKETS),
+            "api_cost_sum",
+        ):
+            counters[name] = getattr(totals, name)
+        if not counters["decision_count"]:
+            return counters
+
+        for action, count, confidence_sum, confidence_count in await self._count_actions(
+            session, filters
+        ):
+            if action in ACTION_COLUMNS:
+                counters[ACTION_COLUMNS[action]] += count
+            counters["confidence_sum"] += confidence_sum
+            counters["confidence_count"] += confidence_count
+        return counters
+
+    def _format_analytics(self, counters: Dict[str, float]) -> Dict[str, Any]:
+        """Turn summed counters into the analytics response."""
+        total_decisions = int(counters["decision_count"])
+        if total_decisions == 0:
+            return {
+                "total_decisions": 0,
+                "validation_rate": 0.0,
+                "execution_rate": 0.0,
+                "action_breakdown": {},
+                "avg_confidence": 0.0,
+                "avg_processing_time": 0.0,
+                "processing_time_histogram": {},
+                "total_api_cost": 0.0,
+            }
+
+        confidence_count = counters["confidence_count"]
+        return {
+            "total_decisions": total_decisions,
+            "validation_rate": (counters["validated_count"] / total_decisions) * 100,
+            "execution_rate": (counters["executed_count"] / total_decisions) * 100,
+            "action_breakdown": {
+                action: int(counters[name])
+                for action, name in ACTION_COLUMNS.items()
+                if counters[name]
+            },
+            "avg_confidence": (
+                float(counters["confidence_sum"]) / confidence_count if confidence_count else 0.0
+            ),
+            "avg_processing_time": float(counters["processing_time_sum_ms"]) / total_decisions,
+            "processing_time_histogram": {
+                name: int(counters[name]) for name, _ in PROCESSING_TIME_BUCKETS
+            },
+            "total_api_cost": float(counters["api_cost_sum"]),
+        }
+
+    async def _count_actions(
+        self, session: AsyncSession, filters: List[Any]
+    ) -> List[Tuple[Optional[str], int, float, int]]:
+        """
+        Count actions and sum confidences across per-asset and legacy decisions.
+
+        Returns:
+            Rows of (action, count, confidence sum, confidence count)
+        """
+        asset = (
+            func.jsonb_array_elements(Decision.asset_decisions)
+            .table_valued(column("value", JSONB))
+            .alias("asset")
+        )
+        asset_actions = (
+            select(
+                asset.c.value["action"].astext.label("action"),
+                asset.c.value["confidence"].astext.cast(Float).label("confidence"),
+            )
+            .select_from(Decision)
+            .join(asset, true())
+            # Legacy rows hold a JSON null rather than an array
+            .where(*filters, func.jsonb_typeof(Decision.asset_decisions) == "array")
+        )
+        legacy_actions = select(
+            Decision.action.label("action"), Decision.confidence.label("confidence")
+        ).where(*filters, Decision.action.isnot(None))
+        actions = union_all(asset_actions, legacy_actions).subquery()
+
+        result = await session.execute(
+            select(
+                actions.c.action,
+                func.count(),
+                func.coalesce(func.sum(actions.c.confidence), 0.0),
+                func.count(actions.c.confidence),
+            ).group_by(actions.c.action)
+        )
+        return [
+            (action, int(count), float(confidence_sum), int(confidence_count))
+            for action, count, confidence_sum, confidence_count in result
+        ]
+
+    async def get_model_performance(
+        self,
+        account_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get decision counts, validation rate, latency and cost per LLM model.
+
+        Args:
+            account_id: Account ID
+            start_date: Optional start date
+            end_date: Optional end date
+
+        Returns:
+            Dictionary mapping model names to their aggregate metrics
+        """
+        async with self.session_factory() as session:
+            try:
+                result = await session.execute(
+                    select(
+                        Decision.model_used,
+                        func.count(Decision.id).label("total"),
+                        func.count(Decision.id)
+                        .filter(Decision.validation_passed)
+                        .label("validated"),
+                        func.avg(Decision.confidence).label("avg_confidence"),
+                        func.avg(Decision.processing_time_ms).label("avg_processing_time"),
+                        func.coalesce(func.sum(Decision.api_cost), 0.0).label("total_cost"),
+                    )
+                    .where(*self._period_filters(account_id, start_date, end_date))
+                    .group_by(Decision.model_used)
                 )
-                total_api_cost = sum(d.api_cost or 0 for d in decisions)
 
                 return {
-                    "total_decisions": total_decisions,
-                    "validation_rate": (validated_decisions / total_decisions) * 100,
-                    "execution_rate": (
-                        (executed_decisions / total_decisions) * 100 if total_decisions > 0 else 0
-                    ),
-                    "action_breakdown": action_counts,
-                    "avg_confidence": avg_confidence,
-                    "avg_processing_time": avg_processing_time,
-                    "total_api_cost": total_api_cost,
+                    row.model_used: {
+                        "total_decisions": int(row.total),
+                        "validation_rate": (row.validated / row.total) * 100 if row.total else 0,
+                        "avg_confidence": float(row.avg_confidence or 0),
+                        "avg_processing_time": float(row.avg_processing_time or 0),
+                        "total_cost": float(row.total_cost),
+                    }
+                    for row in result
                 }
 
             except Exception as e:
-                logger.error(f"Failed to get decision analytics for account {account_id}: {e}")
+                logger.error(f"Failed to get model performance for account {account_id}: {e}")
+                raise
+
+    async def get_high_confidence_decisions(
+        self,
+        account_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        min_confidence: float = 80.0,
+        limit: int = 5,
+    ) -> List[str]:
+        """
+        Get the most recent validated high-confidence asset decisions.
+
+        Args:
+            account_id: Account ID
+            start_date: Optional start date
+            end_date: Optional end date
+            min_confidence: Minimum confidence to include
+            limit: Maximum number of decisions to return
+
+        Returns:
+            List of "SYMBOL action" strings, newest first
+        """
+        filters = [
+            *self._period_filters(account_id, start_date, end_date),
+            Decision.validation_passed,
+        ]
+        asset = (
+            func.jsonb_array_elements(Decision.asset_decisions)
+            .table_valued(column("value", JSONB))
+            .alias("asset")
+        )
+        asset_decisions = (
+            select(
+                Decision.timestamp.label("timestamp"),
+                asset.c.value["asset"].astext.label("symbol"),
+                asset.c.value["action"].astext.label("action"),
+            )
+            .select_from(Decision)
+            .join(asset, true())
+            .where(
+                *filters,
+                func.jsonb_typeof(Decision.asset_decisions) == "array",
+                asset.c.value["confidence"].astext.cast(Float) >= min_confidence,
+            )
+        )
+        legacy_decisions = select(
+            Decision.timestamp.label("timestamp"),
+            Decision.symbol.label("symbol"),
+            Decision.action.label("action"),
+        ).where(*filters, Decision.confidence >= min_confidence)
+        decisions = union_all(asset_decisions, legacy_decisions).subquery()
+
+        async with self.session_factory() as session:
+            try:
+                result = await session.execute(
+                    select(decisions.c.symbol, decisions.c.action)
+                    .order_by(decisions.c.timestamp.desc())
+                    .limit(limit)
+                )
+                return [f"{symbol} {action}" for symbol, action in result]
+
+            except Exception as e:
+                logger.error(
+                    f"Failed to get high-confidence decisions for account {account_id}: {e}"
+                )
                 raise
 
     async def get_performance_by_strategy(
@@ -634,31 +1146,26 @@ class DecisionRepository:
         Returns:
             Dictionary mapping error messages to counts
         """
+        error = (
+            func.json_array_elements_text(Decision.validation_errors)
+            .table_valued("value")
+            .alias("error")
+        )
+
         async with self.session_factory() as session:
             try:
-                query = select(Decision).where(
-                    and_(
-                        Decision.account_id == account_id,
+                result = await session.execute(
+                    select(error.c.value, func.count())
+                    .select_from(Decision)
+                    .join(error, true())
+                    .where(
+                        *self._period_filters(account_id, start_date, end_date),
                         ~Decision.validation_passed,
-                        Decision.validation_errors.isnot(None),
+                        func.json_typeof(Decision.validation_errors) == "array",
                     )
+                    .group_by(error.c.value)
                 )
-
-                if start_date:
-                    query = query.where(Decision.timestamp >= start_date)
-                if end_date:
-                    query = query.where(Decision.timestamp <= end_date)
-
-                result = await session.execute(query)
-                failed_decisions = list(result.scalars().all())
-
-                error_counts: Dict[str, int] = {}
-                for decision in failed_decisions:
-                    if decision.validation_errors:
-                        for error in decision.validation_errors:
-                            error_counts[error] = error_counts.get(error, 0) + 1
-
-                return error_counts
+                return {message: int(count) for message, count in result}
 
             except Exception as e:
                 logger.error(
@@ -771,47 +1278,150 @@ class DecisionRepository:
                 logger.error(f"Failed to update decision result {result_id}: {e}")
                 raise
 
-    async def cleanup_old_decisions(self, days_to_keep: int = 90) -> int:
+    async def cleanup_old_decisions(
+        self,
+        days_to_keep: int = 90,
+        batch_size: int = 1000,
+        pause_seconds: float = 0.0,
+        max_batches: Optional[int] = None,
+        progress_callback: Optional[Callable[[RetentionProgress], None]] = None,
+    ) -> int:
         """
         Clean up old decisions beyond retention period.
 
+        Decisions are deleted oldest first in batches of ``batch_size``, each with its
+        decision results in its own short transaction, so locks are held briefly and
+        memory use is bounded. Every batch commits, so an interrupted run loses nothing
+        and the next run resumes where it stopped. Market context snapshots no longer
+        referenced by any decision are removed afterwards. Daily rollups are kept.
+
         Args:
             days_to_keep: Number of days to retain
+            batch_size: Maximum decisions deleted per transaction
+            pause_seconds: Pause between batches to throttle load on a live database
+            max_batches: Optional limit on decision batches for this run
+            progress_callback: Called with the progress after every batch
 
         Returns:
             Number of deleted decisions
         """
-        async with self.session_factory() as session:
-            try:
-                cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_to_keep)
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days_to_keep)
+        progress = RetentionProgress(cutoff=cutoff)
 
-                # First delete associated decision results
-                query_result = await session.execute(
-                    select(DecisionResult).join(Decision).where(Decision.timestamp < cutoff_date)
+        try:
+            while max_batches is None or progress.batches < max_batches:
+                decisions_deleted, results_deleted = await self._delete_decision_batch(
+                    cutoff, batch_size
                 )
-                old_results = query_result.scalars().all()
+                if decisions_deleted == 0:
+                    progress.done = True
+                    break
+                progress.batches += 1
+                progress.decisions_deleted += decisions_deleted
+                progress.results_deleted += results_deleted
+                self._report_retention_progress(progress, progress_callback)
+                if pause_seconds > 0:
+                    await asyncio.sleep(pause_seconds)
+
+            if progress.done:
+                while True:
+                    snapshots_deleted = await self._delete_snapshot_batch(cutoff, batch_size)
+                    if snapshots_deleted == 0:
+                        break
+                    progress.snapshots_deleted += snapshots_deleted
+                    self._report_retention_progress(progress, progress_callback)
+                    if pause_seconds > 0:
+                        await asyncio.sleep(pause_seconds)
 
-                for res in old_results:
-                    await session.delete(res)
+        except Exception as e:
+            logger.error(
+                f"Failed to cleanup old decisions after {progress.decisions_deleted} deleted: {e}"
+            )
+            raise
 
-                # Then delete old decisions
-                query_result = await session.execute(
-                    select(Decision).where(Decision.timestamp < cutoff_date)
+        logger.info(
+            f"Cleaned up {progress.decisions_deleted} old decisions, "
+            f"{progress.results_deleted} decision results and "
+            f"{progress.snapshots_deleted} market context snapshots"
+            + ("" if progress.done else " (more remain)")
+        )
+        return progress.decisions_deleted
+
+    def _report_retention_progress(
+        self,
+        progress: RetentionProgress,
+        progress_callback: Optional[Callable[[RetentionProgress], None]],
+    ) -> None:
+        logger.debug(
+            f"Retention batch {progress.batches}: {progress.decisions_deleted} decisions, "
+            f"{progress.results_deleted} results, {progress.snapshots_deleted} snapshots deleted"
+        )
+        if progress_callback:
+            progress_callback(progress)
+
+    async def _delete_decision_batch(self, cutoff: datetime, batch_size: int) -> Tuple[int, int]:
+        """Delete the oldest batch of expired decisions and their results."""
+        async with self.session_factory() as session:
+            try:
+                # Rows locked by a concurrent transaction are left for the next batch
+                result = await session.execute(
+                    select(Decision.id)
+                    .where(Decision.timestamp < cutoff)
+                    .order_by(Decision.timestamp)
+                    .limit(batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+                decision_ids = list(result.scalars().all())
+                if not decision_ids:
+                    return 0, 0
+
+                results_deleted = cast(
+                    CursorResult[Any],
+                    await session.execute(
+                        delete(DecisionResult).where(DecisionResult.decision_id.in_(decision_ids))
+                    ),
                 )
-                old_decisions = query_result.scalars().all()
+                decisions_deleted = cast(
+                    CursorResult[Any],
+                    await session.execute(delete(Decision).where(Decision.id.in_(decision_ids))),
+                )
+                await session.commit()
+                return decisions_deleted.rowcount, results_deleted.rowcount
 
-                deleted_count = len(old_decisions)
+            except Exception:
+                await session.rollback()
+                raise
 
-                for decision in old_decisions:
-                    await session.delete(decision)
+    async def _delete_snapshot_batch(self, cutoff: datetime, batch_size: int) -> int:
+        """Delete a batch of expired market context snapshots no decision references."""
+        referenced = select(Decision.id).where(
+            Decision.market_context_hash == MarketContextSnapshot.content_hash
+        )
+        expired_hashes = (
+            select(MarketContextSnapshot.content_hash)
+            .where(
+                MarketContextSnapshot.created_at < cutoff.replace(tzinfo=timezone.utc),
+                ~referenced.exists(),
+            )
+            .limit(batch_size)
+            .scalar_subquery()
+        )
 
+        async with self.session_factory() as session:
+            try:
+                result = cast(
+                    CursorResult[Any],
+                    await session.execute(
+                        delete(MarketContextSnapshot).where(
+                            MarketContextSnapshot.content_hash.in_(expired_hashes)
+                        )
+                    ),
+                )
                 await session.commit()
-                logger.info(f"Cleaned up {deleted_count} old decisions")
-                return deleted_count
+                return result.rowcount
 
-            except Exception as e:
+            except Exception:
                 await session.rollback()
-                logger.error(f"Failed to cleanup old decisions: {e}")
                 raise
 
     async def get_decision_count_by_period(self, account_id: int, period_hours: int = 24) -> int:
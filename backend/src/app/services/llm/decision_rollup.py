@@ -0,0 +1,182 @@
+"""
+Incremental daily decision rollups.
+
+Decision rows are folded into per-(day, account, strategy, model) counters in the
+same transaction that inserts them. Counters are only ever added to, through an
+``INSERT ... ON CONFLICT DO UPDATE SET col = col + excluded.col`` upsert, so
+concurrent writers never lose increments.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from ...models.decision_rollup import DecisionDailyRollup
+
+# Histogram column and inclusive upper bound in milliseconds (None is unbounded)
+PROCESSING_TIME_BUCKETS: Tuple[Tuple[str, Optional[float]], ...] = (
+    ("processing_le_1s", 1000.0),
+    ("processing_le_2s", 2000.0),
+    ("processing_le_5s", 5000.0),
+    ("processing_le_10s", 10000.0),
+    ("processing_le_30s", 30000.0),
+    ("processing_gt_30s", None),
+)
+
+ACTION_COLUMNS: Dict[str, str] = {
+    "buy": "action_buy",
+    "sell": "action_sell",
+    "hold": "action_hold",
+    "adjust_position": "action_adjust_position",
+    "close_position": "action_close_position",
+    "adjust_orders": "action_adjust_orders",
+}
+
+COUNTER_COLUMNS: Tuple[str, ...] = (
+    "decision_count",
+    "validated_count",
+    "executed_count",
+    "confidence_sum",
+    "confidence_count",
+    "processing_time_sum_ms",
+    *(name for name, _ in PROCESSING_TIME_BUCKETS),
+    "api_cost_sum",
+    *ACTION_COLUMNS.values(),
+)
+
+RollupKey = Tuple[date, int, str, str]
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """Convert a datetime to the naive UTC form decision timestamps are stored in."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def processing_time_bucket(processing_time_ms: float) -> str:
+    """Get the histogram column for a processing time."""
+    for name, upper_bound in PROCESSING_TIME_BUCKETS:
+        if upper_bound is None or processing_time_ms <= upper_bound:
+            return name
+    return PROCESSING_TIME_BUCKETS[-1][0]
+
+
+def _empty_increment(key: RollupKey) -> Dict[str, Any]:
+    day, account_id, strategy_id, model_used = key
+    increment: Dict[str, Any] = dict.fromkeys(COUNTER_COLUMNS, 0)
+    increment.update(day=day, account_id=account_id, strategy_id=strategy_id, model_used=model_used)
+    return increment
+
+
+def rollup_key(row: Dict[str, Any]) -> RollupKey:
+    """Get the rollup key of a decision row."""
+    return (
+        to_naive_utc(row["timestamp"]).date(),
+        row["account_id"],
+        row["strategy_id"],
+        row["model_used"],
+    )
+
+
+def build_rollup_increments(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Fold decision rows into one rollup increment per key.
+
+    Args:
+        rows: Decision column values, as built by DecisionRepository.build_decision_row
+
+    Returns:
+        Rollup rows holding the counter increments, unique by key
+    """
+    increments: Dict[RollupKey, Dict[str, Any]] = {}
+    for row in rows:
+        key = rollup_key(row)
+        if key not in increments:
+            increments[key] = _empty_increment(key)
+        increment = increments[key]
+
+        increment["decision_count"] += 1
+        increment["validated_count"] += 1 if row.get("validation_passed") else 0
+        increment["executed_count"] += 1 if row.get("executed") else 0
+        increment["api_cost_sum"] += row.get("api_cost") or 0.0
+
+        processing_time_ms = row.get("processing_time_ms") or 0.0
+        increment["processing_time_sum_ms"] += processing_time_ms
+        increment[processing_time_bucket(processing_time_ms)] += 1
+
+        asset_decisions = row.get("asset_decisions") or []
+        if row.get("action") is not None:
+            asset_decisions = [*asset_decisions, row]
+        for asset_decision in asset_decisions:
+            column = ACTION_COLUMNS.get(asset_decision.get("action"))
+            if column:
+                increment[column] += 1
+            if asset_decision.get("confidence") is not None:
+                increment["confidence_sum"] += asset_decision["confidence"]
+                increment["confidence_count"] += 1
+
+    return list(increments.values())
+
+
+def executed_increment(key: RollupKey) -> Dict[str, Any]:
+    """Get the rollup increment for a decision being marked executed."""
+    increment = _empty_increment(key)
+    increment["executed_count"] = 1
+    return increment
+
+
+async def apply_rollup_increments(session: AsyncSession, increments: List[Dict[str, Any]]) -> None:
+    """
+    Add rollup increments within the caller's transaction.
+
+    Args:
+        session: Session whose transaction also writes the decisions
+        increments: Rollup rows from build_rollup_increments or executed_increment
+    """
+    if not increments:
+        return
+    statement = pg_insert(DecisionDailyRollup).values(increments)
+    table = DecisionDailyRollup.__table__
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=["day", "account_id", "strategy_id", "model_used"],
+            set_={
+                **{name: table.c[name] + statement.excluded[name] for name in COUNTER_COLUMNS},
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+def split_rollup_range(
+    start: Optional[datetime], end: datetime
+) -> Tuple[Optional[date], date, List[Tuple[datetime, datetime]]]:
+    """
+    Split an inclusive time range into whole days served by the rollup and raw edges.
+
+    Args:
+        start: Inclusive range start (None for all history)
+        end: Inclusive range end
+
+    Returns:
+        Tuple of (first rollup day or None for all history, exclusive last rollup day,
+        half-open [start, end) raw ranges covering the partial days)
+    """
+    end_exclusive = to_naive_utc(end) + timedelta(microseconds=1)
+    last_day = end_exclusive.date()
+    last_day_start = datetime.combine(last_day, time.min)
+
+    if start is None:
+        return None, last_day, [(last_day_start, end_exclusive)]
+
+    start = to_naive_utc(start)
+    first_day = start.date() if start.time() == time.min else start.date() + timedelta(days=1)
+    if first_day >= last_day:
+        return first_day, first_day, [(start, end_exclusive)]
+
+    raw_ranges = [(start, datetime.combine(first_day, time.min)), (last_day_start, end_exclusive)]
+    return first_day, last_day, [(a, b) for a, b in raw_ranges if a < b]
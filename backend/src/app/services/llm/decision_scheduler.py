@@ -0,0 +1,352 @@
+"""
+Candle-driven Decision Scheduler for LLM Decision Engine.
+
+Runs a decision for every account with an active strategy assignment after each
+primary-interval candle close. Decisions are dispatched through a bounded worker pool
+with per-account deadlines, priorities and start jitter, and every cycle reports its
+throughput and tail latency.
+"""
+
+import asyncio
+import heapq
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Deque, Dict, List, Optional
+
+from ...services.market_data.events import CandleCloseEvent
+from ...services.market_data.utils import get_interval_seconds
+from ...utils.stats import percentile
+from .admission import AdmissionPriority
+
+logger = logging.getLogger(__name__)
+
+# Lower value runs first
+PRIORITY_RETRY = 0
+PRIORITY_NORMAL = 10
+
+
+@dataclass(order=True)
+class ScheduledDecision:
+    """A single account decision queued within a cycle."""
+
+    priority: int
+    not_before: float
+    account_id: int = field(compare=False)
+    strategy_id: str = field(compare=False)
+    deadline: float = field(compare=False)
+
+
+@dataclass
+class DecisionCycleReport:
+    """Outcome, throughput and latency of one scheduling cycle."""
+
+    cycle_id: int
+    interval: str
+    close_time: datetime
+    started_at: datetime
+    accounts: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    expired: int = 0
+    duration_seconds: float = 0.0
+    latencies_ms: List[float] = field(default_factory=list, repr=False)
+    finished_at: Optional[datetime] = None
+
+    @property
+    def throughput_per_second(self) -> float:
+        completed = self.succeeded + self.failed + self.timed_out
+        return completed / self.duration_seconds if self.duration_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the report with latency percentiles."""
+        latencies = sorted(self.latencies_ms)
+        return {
+            "cycle_id": self.cycle_id,
+            "interval": self.interval,
+            "close_time": self.close_time.isoformat(),
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "accounts": self.accounts,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "expired": self.expired,
+            "duration_seconds": self.duration_seconds,
+            "throughput_per_second": self.throughput_per_second,
+            "latency_p50_ms": percentile(latencies, 50),
+            "latency_p95_ms": percentile(latencies, 95),
+            "latency_p99_ms": percentile(latencies, 99),
+            "latency_max_ms": latencies[-1] if latencies else 0.0,
+        }
+
+
+class DecisionScheduler:
+    """
+    Runs decisions for all active accounts after each primary candle close.
+
+    Candle close events arrive once per symbol; the first event for a new close time
+    opens a cycle after a short settle delay so that every symbol's candle is stored
+    before context building starts. Later events for the same close time are ignored.
+    """
+
+    def __init__(
+        self,
+        decision_engine: Any,
+        interval: str,
+        max_workers: int = 8,
+        deadline_fraction: float = 0.8,
+        jitter_seconds: float = 5.0,
+        settle_seconds: float = 2.0,
+        history_size: int = 50,
+    ):
+        """
+        Initialize the Decision Scheduler.
+
+        Args:
+            decision_engine: DecisionEngine used to generate decisions
+            interval: Primary candle interval that triggers a cycle
+            max_workers: Maximum number of decisions processed concurrently
+            deadline_fraction: Fraction of the interval each account must finish within
+            jitter_seconds: Maximum random start offset used to spread LLM load
+            settle_seconds: Delay after the first candle close event before dispatching
+            history_size: Number of cycle reports to keep
+        """
+        self.decision_engine = decision_engine
+        self.interval = interval
+        self.max_workers = max(1, min(max_workers, decision_engine.max_concurrent_decisions))
+        self.deadline_seconds = get_interval_seconds(interval) * deadline_fraction
+        self.jitter_seconds = max(0.0, min(jitter_seconds, self.deadline_seconds / 4))
+        self.settle_seconds = settle_seconds
+
+        self._priorities: Dict[int, int] = {}
+        self._last_close_time: Optional[datetime] = None
+        self._cycle_task: Optional[asyncio.Task[Any]] = None
+        self._cycle_count = 0
+        self._running = False
+        self.history: Deque[DecisionCycleReport] = deque(maxlen=history_size)
+        self.skipped_cycles = 0
+
+        logger.info(
+            f"Decision scheduler initialized for {interval} with {self.max_workers} workers, "
+            f"{self.deadline_seconds:.0f}s deadline"
+        )
+
+    def start(self) -> None:
+        """Start accepting candle close events."""
+        self._running = True
+        logger.info("Decision scheduler started")
+
+    async def stop(self) -> None:
+        """Stop the scheduler and cancel the running cycle, if any."""
+        self._running = False
+        if self._cycle_task and not self._cycle_task.done():
+            self._cycle_task.cancel()
+            try:
+                await self._cycle_task
+            except asyncio.CancelledError:
+                pass
+        logger.info("Decision scheduler stopped")
+
+    def set_account_priority(self, account_id: int, priority: int) -> None:
+        """Set a standing priority for an account (lower runs first)."""
+        self._priorities[account_id] = priority
+
+    async def on_candle_close(self, event: CandleCloseEvent) -> None:
+        """
+        Open a decision cycle for a primary-interval candle close.
+
+        Args:
+            event: Candle close event from the market data service
+        """
+        if not self._running or event.interval != self.interval:
+            return
+        if self._last_close_time is not None and event.close_time <= self._last_close_time:
+            return
+        self._last_close_time = event.close_time
+
+        if self._cycle_task and not self._cycle_task.done():
+            self.skipped_cycles += 1
+            logger.warning(
+                f"Previous decision cycle still running, skipping cycle for {event.close_time}"
+            )
+            return
+
+        self._cycle_task = asyncio.create_task(self._run_cycle_after_settle(event.close_time))
+
+    async def _run_cycle_after_settle(self, close_time: datetime) -> None:
+        await asyncio.sleep(self.settle_seconds)
+        try:
+            await self.run_cycle(close_time)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Decision cycle for {close_time} failed: {e}", exc_info=True)
+
+    async def run_cycle(self, close_time: Optional[datetime] = None) -> DecisionCycleReport:
+        """
+        Run decisions for all accounts with an active strategy assignment.
+
+        Args:
+            close_time: Candle close time that triggered the cycle
+
+        Returns:
+            DecisionCycleReport for the cycle
+        """
+        self._cycle_count += 1
+        started_at = datetime.now(timezone.utc)
+        report = DecisionCycleReport(
+            cycle_id=self._cycle_count,
+            interval=self.interval,
+            close_time=close_time or started_at,
+            started_at=started_at,
+        )
+
+        assignments = await self.decision_engine.strategy_manager.get_strategy_assignments()
+        queue = self._build_queue(assignments, time.monotonic())
+        report.accounts = len(queue)
+
+        cycle_start = time.monotonic()
+        if queue:
+            workers = [
+                asyncio.create_task(self._worker(queue, report))
+                for _ in range(min(self.max_workers, len(queue)))
+            ]
+            try:
+                await asyncio.gather(*workers)
+            except asyncio.CancelledError:
+                for worker in workers:
+                    worker.cancel()
+                raise
+
+        report.duration_seconds = time.monotonic() - cycle_start
+        report.finished_at = datetime.now(timezone.utc)
+        self.history.append(report)
+
+        summary = report.to_dict()
+        logger.info(
+            f"Decision cycle {report.cycle_id} finished: {report.succeeded}/{report.accounts} "
+            f"succeeded in {report.duration_seconds:.1f}s "
+            f"({summary['throughput_per_second']:.2f}/s, p95 {summary['latency_p95_ms']:.0f}ms, "
+            f"p99 {summary['latency_p99_ms']:.0f}ms)",
+            extra=summary,
+        )
+        return report
+
+    def _build_queue(self, assignments: Dict[int, str], now: float) -> List[ScheduledDecision]:
+        deadline = now + self.deadline_seconds
+        queue = [
+            ScheduledDecision(
+                priority=self._priorities.get(account_id, PRIORITY_NORMAL),
+                not_before=now + random.uniform(0, self.jitter_seconds),
+                account_id=account_id,
+                strategy_id=strategy_id,
+                deadline=deadline,
+            )
+            for account_id, strategy_id in assignments.items()
+        ]
+        heapq.heapify(queue)
+        return queue
+
+    async def _worker(self, queue: List[ScheduledDecision], report: DecisionCycleReport) -> None:
+        while queue:
+            job = heapq.heappop(queue)
+
+            delay = job.not_before - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            remaining = job.deadline - time.monotonic()
+            if remaining <= 0:
+                report.expired += 1
+                self._priorities[job.account_id] = PRIORITY_RETRY
+                logger.warning(f"Deadline passed before account {job.account_id} was dispatched")
+                continue
+
+            await self._run_decision(job, remaining, report)
+
+    async def _run_decision(
+        self, job: ScheduledDecision, timeout: float, report: DecisionCycleReport
+    ) -> None:
+        start = time.monotonic()
+        decision = asyncio.ensure_future(
+            self.decision_engine.make_trading_decision(
+                account_id=job.account_id,
+                strategy_override=job.strategy_id,
+                priority=AdmissionPriority.SCHEDULED,
+            )
+        )
+        try:
+            # Shielded: the decision may be shared with coalesced callers, so missing
+            # the deadline must not cancel it for them
+            await asyncio.wait_for(asyncio.shield(decision), timeout=timeout)
+            report.succeeded += 1
+            # Accounts that succeed return to their normal position in the queue
+            self._priorities.pop(job.account_id, None)
+        except asyncio.TimeoutError:
+            report.timed_out += 1
+            self._priorities[job.account_id] = PRIORITY_RETRY
+            logger.warning(f"Scheduled decision for account {job.account_id} exceeded deadline")
+        except Exception as e:
+            report.failed += 1
+            self._priorities[job.account_id] = PRIORITY_RETRY
+            logger.error(f"Scheduled decision for account {job.account_id} failed: {e}")
+        finally:
+            report.latencies_ms.append((time.monotonic() - start) * 1000)
+            if not decision.done():
+                # Still running for coalesced callers; collect its outcome when it ends
+                decision.add_done_callback(partial(self._log_late_decision, job.account_id))
+
+    @staticmethod
+    def _log_late_decision(account_id: int, decision: "asyncio.Future[Any]") -> None:
+        """Retrieve the outcome of a decision that finished after the scheduler stopped waiting."""
+        if decision.cancelled():
+            return
+        error = decision.exception()
+        if error is not None:
+            logger.warning(
+                f"Scheduled decision for account {account_id} failed after its deadline: {error}"
+            )
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get scheduler status and recent cycle reports."""
+        return {
+            "running": self._running,
+            "interval": self.interval,
+            "max_workers": self.max_workers,
+            "deadline_seconds": self.deadline_seconds,
+            "jitter_seconds": self.jitter_seconds,
+            "cycle_in_progress": bool(self._cycle_task and not self._cycle_task.done()),
+            "cycles_completed": len(self.history),
+            "skipped_cycles": self.skipped_cycles,
+            "last_close_time": (
+                self._last_close_time.isoformat() if self._last_close_time else None
+            ),
+            "recent_cycles": [report.to_dict() for report in self.history],
+        }
+
+
+# Global service instance
+_decision_scheduler: Optional[DecisionScheduler] = None
+
+
+def get_decision_scheduler(decision_engine: Optional[Any] = None) -> DecisionScheduler:
+    """Get or create the decision scheduler instance."""
+    global _decision_scheduler
+    if _decision_scheduler is None:
+        from ...core.config import config
+        from .decision_engine import get_decision_engine
+
+        _decision_scheduler = DecisionScheduler(
+            decision_engine=decision_engine or get_decision_engine(),
+            interval=config.INTERVAL,
+            max_workers=config.DECISION_SCHEDULER_WORKERS,
+            deadline_fraction=config.DECISION_SCHEDULER_DEADLINE_FRACTION,
+            jitter_seconds=config.DECISION_SCHEDULER_JITTER_SECONDS,
+        )
+    return _decision_scheduler
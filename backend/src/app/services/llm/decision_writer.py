@@ -0,0 +1,228 @@
+"""
+Write-behind persistence for LLM trading decisions.
+
+Decisions are queued in memory and inserted by a background task in batches, so
+the request path no longer waits for a database round trip. The buffer is bounded;
+when it is full a decision is written through synchronously instead of being dropped.
+Pending decisions are flushed on shutdown.
+
+Each batch carries the market context snapshots its decisions reference. Snapshots
+already written by this process are not sent again, so the shared market context for a
+candle is transferred once no matter how many accounts decide on it.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ...core.logging import get_logger
+from .decision_repository import DecisionRepository
+
+logger = get_logger(__name__)
+
+# Decision row and the market context snapshot it references
+_PendingDecision = Tuple[Dict[str, Any], Optional[Dict[str, Any]]]
+
+
+class DecisionWriteBehindQueue:
+    """Bounded buffer of decision rows flushed to the database in batches."""
+
+    def __init__(
+        self,
+        repository: DecisionRepository,
+        max_buffer: int = 1000,
+        batch_size: int = 100,
+        flush_interval_seconds: float = 0.5,
+        max_retries: int = 3,
+    ):
+        """
+        Initialize the write-behind queue.
+
+        Args:
+            repository: Repository used to insert decision batches
+            max_buffer: Maximum number of decisions waiting to be written
+            batch_size: Maximum number of decisions per INSERT
+            flush_interval_seconds: Maximum time a partial batch waits for more decisions
+            max_retries: Attempts per batch before its decisions are dropped
+        """
+        self.repository = repository
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_retries = max(1, max_retries)
+
+        self._queue: "asyncio.Queue[_PendingDecision]" = asyncio.Queue(maxsize=max_buffer)
+        self._stored_snapshots: "OrderedDict[str, None]" = OrderedDict()
+        self._max_stored_snapshots = 1024
+        self._worker_task: Optional[asyncio.Task[None]] = None
+        self._stopping = False
+        self.metrics: Dict[str, Any] = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "written_through": 0,
+            "failed": 0,
+            "snapshots_written": 0,
+            "snapshots_deduplicated": 0,
+            "peak_buffer_depth": 0,
+            "last_flush_ms": 0.0,
+        }
+
+    @property
+    def max_buffer(self) -> int:
+        """Maximum number of decisions held in the buffer."""
+        return self._queue.maxsize
+
+    @property
+    def buffer_depth(self) -> int:
+        """Number of decisions waiting to be written."""
+        return self._queue.qsize()
+
+    @property
+    def running(self) -> bool:
+        """Whether the background writer is running."""
+        return self._worker_task is not None and not self._worker_task.done()
+
+    def start(self) -> None:
+        """Start the background writer if it is not running."""
+        if self.running:
+            return
+        self._stopping = False
+        self._worker_task = asyncio.create_task(self._run())
+        logger.info(
+            f"Decision write-behind queue started (buffer {self.max_buffer}, "
+            f"batch {self.batch_size})"
+        )
+
+    async def submit(self, row: Dict[str, Any], snapshot: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Queue a decision row for writing.
+
+        Returns as soon as the row is buffered. If the buffer is full or the queue
+        is shutting down, the row is written synchronously instead.
+
+        Args:
+            row: Column values built with DecisionRepository.build_decision_row
+            snapshot: Market context snapshot referenced by the row
+        """
+        if not self._stopping:
+            self.start()
+            try:
+                self._queue.put_nowait((row, snapshot))
+                self.metrics["enqueued"] += 1
+                self.metrics["peak_buffer_depth"] = max(
+                    self.metrics["peak_buffer_depth"], self._queue.qsize()
+                )
+                return
+            except asyncio.QueueFull:
+                logger.warning("Decision write buffer is full, writing decision synchronously")
+
+        await self._save([(row, snapshot)])
+        self.metrics["written_through"] += 1
+
+    async def _run(self) -> None:
+        while not (self._stopping and self._queue.empty()):
+            batch = await self._collect_batch()
+            if not batch:
+                continue
+            try:
+                await self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _collect_batch(self) -> List[_PendingDecision]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval_seconds
+        batch: List[_PendingDecision] = []
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            # Partial batches linger for more rows, except while draining on shutdown
+            remaining = deadline - loop.time()
+            if self._stopping or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _save(self, batch: List[_PendingDecision]) -> None:
+        snapshots: Dict[str, Dict[str, Any]] = {}
+        for _, snapshot in batch:
+            if snapshot is None:
+                continue
+            content_hash = snapshot["content_hash"]
+            if content_hash in self._stored_snapshots or content_hash in snapshots:
+                self.metrics["snapshots_deduplicated"] += 1
+            else:
+                snapshots[content_hash] = snapshot
+
+        await self.repository.save_decisions_batch(
+            [row for row, _ in batch], list(snapshots.values())
+        )
+
+        self.metrics["written"] += len(batch)
+        self.metrics["snapshots_written"] += len(snapshots)
+        # Remember referenced snapshots in recently-used order
+        for _, snapshot in batch:
+            if snapshot is not None:
+                self._stored_snapshots[snapshot["content_hash"]] = None
+                self._stored_snapshots.move_to_end(snapshot["content_hash"])
+        while len(self._stored_snapshots) > self._max_stored_snapshots:
+            self._stored_snapshots.popitem(last=False)
+
+    async def _write_batch(self, batch: List[_PendingDecision]) -> None:
+        start = time.monotonic()
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                await self._save(batch)
+                self.metrics["batches"] += 1
+                self.metrics["last_flush_ms"] = (time.monotonic() - start) * 1000
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.metrics["failed"] += len(batch)
+                    logger.error(
+                        f"Dropping {len(batch)} decisions after {attempt} failed writes: {e}"
+                    )
+                    return
+                logger.warning(f"Decision batch write failed (attempt {attempt}): {e}")
+                await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Flush buffered decisions and stop the background writer.
+
+        Args:
+            timeout: Maximum time to wait for the flush
+        """
+        self._stopping = True
+        if self._worker_task is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._worker_task), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._worker_task.cancel()
+            lost = self._queue.qsize()
+            self.metrics["failed"] += lost
+            logger.error(f"Decision flush timed out, {lost} buffered decisions were not written")
+        finally:
+            self._worker_task = None
+        logger.info(f"Decision write-behind queue stopped ({self.metrics['written']} written)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer depth and write counters."""
+        return {
+            **self.metrics,
+            "running": self.running,
+            "buffer_depth": self.buffer_depth,
+            "max_buffer": self.max_buffer,
+            "batch_size": self.batch_size,
+        }
@@ -0,0 +1,210 @@
+"""
+Hedged LLM requests.
+
+When a decision call has not finished by a percentile of the model's recent
+latency, a second request is sent. The first valid response wins and the other
+request is cancelled, which closes its stream. Hedge rate, hedge wins and the
+cost of the losing requests are recorded.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from ...core.logging import get_logger
+from .llm_metrics import LLMMetricsTracker
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class HedgeOutcome:
+    """Result of a hedged call."""
+
+    result: Any
+    hedged: bool = False
+    hedge_won: bool = False
+    # Response of the losing request when it finished before the winner was chosen
+    loser_result: Optional[Any] = None
+    # Whether the losing request was still running and was cancelled
+    loser_cancelled: bool = False
+
+
+class RequestHedger:
+    """Sends a backup request when the primary is slower than its latency percentile."""
+
+    def __init__(
+        self,
+        metrics_tracker: LLMMetricsTracker,
+        percentile: float = 95.0,
+        window_minutes: float = 60.0,
+        min_samples: int = 20,
+        default_delay_seconds: float = 30.0,
+    ):
+        """
+        Initialize the hedger.
+
+        Args:
+            metrics_tracker: Source of per-model response times
+            percentile: Latency percentile of the primary model after which to hedge
+            window_minutes: Window of response times the percentile is taken over
+            min_samples: Response times needed before the percentile is trusted
+            default_delay_seconds: Hedge delay while a model has too few samples
+        """
+        self.metrics_tracker = metrics_tracker
+        self.percentile = percentile
+        self.window_minutes = window_minutes
+        self.min_samples = min_samples
+        self.default_delay_seconds = default_delay_seconds
+
+        self.metrics = {
+            "requests": 0,
+            "hedged_requests": 0,
+            "hedge_wins": 0,
+            "cancelled_requests": 0,
+            "cost_overhead_usd": 0.0,
+        }
+
+    def hedge_delay(self, model: str) -> float:
+        """Get the seconds to wait for a model before sending a hedge request."""
+        response_time_ms = self.metrics_tracker.get_response_time_percentile(
+            model, self.percentile, self.window_minutes, min_samples=self.min_samples
+        )
+        if response_time_ms is None:
+            return self.default_delay_seconds
+        return response_time_ms / 1000
+
+    async def run(
+        self,
+        primary_call: Callable[[], Awaitable[Any]],
+        hedge_call: Callable[[], Awaitable[Any]],
+        model: str,
+        is_valid: Callable[[Any], bool] = lambda result: True,
+    ) -> HedgeOutcome:
+        """
+        Run a call, hedging it with a second call once the model's deadline passes.
+
+        Args:
+            primary_call: Starts the primary request
+            hedge_call: Starts the hedge request
+            model: Model of the primary request, whose latency sets the deadline
+            is_valid: Whether a response can be used
+
+        Returns:
+            HedgeOutcome with the first valid response (or the primary's invalid one)
+
+        Raises:
+            Exception: The primary's error when no request produced a response
+        """
+        self.metrics["requests"] += 1
+        delay = self.hedge_delay(model)
+
+        primary = asyncio.ensure_future(primary_call())
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        if done:
+            return HedgeOutcome(result=primary.result())
+
+        hedge = self._launch_hedge(hedge_call, model, delay)
+        return await self._collect_winner(primary, hedge, is_valid)
+
+    def _launch_hedge(
+        self, hedge_call: Callable[[], Awaitable[Any]], model: str, delay: float
+    ) -> asyncio.Future[Any]:
+        """Start the hedge request of a primary that missed its deadline."""
+        logger.info(f"No response from {model} after {delay:.1f}s, sending hedge request")
+        self.metrics["hedged_requests"] += 1
+        return asyncio.ensure_future(hedge_call())
+
+    async def _collect_winner(
+        self,
+        primary: asyncio.Future[Any],
+        hedge: asyncio.Future[Any],
+        is_valid: Callable[[Any], bool],
+    ) -> HedgeOutcome:
+        """Take the first valid response of the primary and hedge requests."""
+        winner, invalid, errors, pending = await self._race(primary, hedge, is_valid)
+
+        if winner is None:
+            if invalid:
+                return HedgeOutcome(
+                    result=invalid.get(primary, invalid.get(hedge)),
+                    hedged=True,
+                    hedge_won=primary not in invalid,
+                )
+            raise errors[primary]
+
+        loser = hedge if winner is primary else primary
+        loser_cancelled = loser in pending
+        loser_result = None
+        if not loser_cancelled and loser.exception() is None:
+            loser_result = loser.result()
+
+        if loser_cancelled:
+            self.metrics["cancelled_requests"] += 1
+        if winner is hedge:
+            self.metrics["hedge_wins"] += 1
+        return HedgeOutcome(
+            result=winner.result(),
+            hedged=True,
+            hedge_won=winner is hedge,
+            loser_result=loser_result,
+            loser_cancelled=loser_cancelled,
+        )
+
+    @staticmethod
+    async def _race(
+        primary: asyncio.Future[Any],
+        hedge: asyncio.Future[Any],
+        is_valid: Callable[[Any], bool],
+    ) -> Tuple[
+        Optional[asyncio.Future[Any]],
+        Dict[asyncio.Future[Any], Any],
+        Dict[asyncio.Future[Any], BaseException],
+        Set[asyncio.Future[Any]],
+    ]:
+        """Wait until a request returns a valid response or both requests finished.
+
+        Returns:
+            Tuple of (winner, invalid responses, errors, requests cancelled unfinished)
+        """
+        winner: Optional[asyncio.Future[Any]] = None
+        invalid: Dict[asyncio.Future[Any], Any] = {}
+        errors: Dict[asyncio.Future[Any], BaseException] = {}
+        pending = {primary, hedge}
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # The primary wins ties
+                for task in sorted(done, key=lambda task: task is hedge):
+                    exc = task.exception()
+                    if exc is not None:
+                        errors[task] = exc
+                    elif is_valid(task.result()):
+                        winner = task
+                        break
+                    else:
+                        invalid[task] = task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        return winner, invalid, errors, pending
+
+    def record_overhead(self, cost: float) -> None:
+        """Record the cost of a hedged request that did not produce the response."""
+        self.metrics["cost_overhead_usd"] += cost
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hedging statistics."""
+        requests = self.metrics["requests"]
+        hedged = self.metrics["hedged_requests"]
+        return {
+            **self.metrics,
+            "hedge_rate": (hedged / requests) * 100 if requests else 0.0,
+            "hedge_win_rate": (self.metrics["hedge_wins"] / hedged) * 100 if hedged else 0.0,
+        }
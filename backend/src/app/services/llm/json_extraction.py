@@ -0,0 +1,107 @@
+"""
+Linear-time extraction of the decision JSON object from LLM response text.
+
+Reasoning models surround the decision JSON with prose, code fences and thinking
+blocks. One pass over the text pairs up braces, skipping braces inside JSON strings.
+Each outermost balanced span is then decoded once with ``JSONDecoder.raw_decode``.
+Spans that do not decode, such as prose like ``{range}`` or ``\\boxed{...}``, are
+retried through their nested spans. Total work is proportional to the text length
+times the brace nesting depth.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Delimited thinking blocks may hold draft decisions that are not the answer
+_THINKING_BLOCK_PATTERN = re.compile(
+    r"<(think|thinking)>.*?</\1>|<\|im_start\|>thinking.*?<\|im_end\|>",
+    re.DOTALL | re.IGNORECASE,
+)
+# Characters that change brace-pairing state; everything else is skipped by the regex engine
+_STRUCTURAL_PATTERN = re.compile(r'[{}"\\\n]')
+_DECODER = json.JSONDecoder()
+
+# (start, exclusive end, nested spans)
+BraceSpan = Tuple[int, int, List["BraceSpan"]]
+
+
+def find_brace_spans(text: str) -> List[BraceSpan]:
+    """
+    Pair up braces in one pass, ignoring braces inside JSON strings.
+
+    Quotes only start strings inside braces, so apostrophes and quotes in prose are
+    harmless. A raw newline cannot occur in a JSON string, so one inside a "string"
+    means the quote was prose: the open braces are discarded and pairing restarts.
+
+    Args:
+        text: Response text
+
+    Returns:
+        Outermost balanced ``{...}`` spans in text order
+    """
+    roots: List[BraceSpan] = []
+    stack: List[Tuple[int, List[BraceSpan]]] = []
+    in_string = False
+    escaped_index = -1
+
+    for match in _STRUCTURAL_PATTERN.finditer(text):
+        index = match.start()
+        char = text[index]
+
+        if in_string:
+            if index == escaped_index:
+                continue
+            if char == "\\":
+                escaped_index = index + 1
+            elif char == '"':
+                in_string = False
+            elif char == "\n":
+                in_string = False
+                stack.clear()
+            continue
+
+        if char == "{":
+            stack.append((index, []))
+        elif char == "}" and stack:
+            start, children = stack.pop()
+            span = (start, index + 1, children)
+            (stack[-1][1] if stack else roots).append(span)
+        elif char == '"' and stack:
+            in_string = True
+
+    return roots
+
+
+def extract_json_object(text: str, key: str = "decisions") -> Optional[Dict[str, Any]]:
+    """
+    Extract the decision JSON object from response text.
+
+    Args:
+        text: Response text
+        key: Key identifying the decision object
+
+    Returns:
+        The first object holding ``key``, otherwise the largest object found, or None
+    """
+    text = _THINKING_BLOCK_PATTERN.sub("", text)
+
+    best: Optional[Dict[str, Any]] = None
+    best_length = 0
+    pending = list(reversed(find_brace_spans(text)))
+    while pending:
+        start, end, children = pending.pop()
+        try:
+            # Decode the span alone: a decode error computes its line number by
+            # scanning the document up to the error, which is quadratic over the text
+            value, length = _DECODER.raw_decode(text[start:end])
+        except json.JSONDecodeError:
+            pending.extend(reversed(children))
+            continue
+
+        if key in value:
+            return value
+        if length > best_length:
+            best, best_length = value, length
+
+    return best
@@ -51,3 +51,9 @@ class AuthenticationError(DecisionEngineError):
     """Authentication failures with LLM server."""
 
     pass
+
+
+class ModelCapacityError(DecisionEngineError):
+    """Model concurrency or tokens-per-minute budget exhausted before the call deadline."""
+
+    pass
@@ -10,6 +10,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
 from ...core.logging import get_logger
+from ...utils.stats import percentile
 
 logger = get_logger(__name__)
 
@@ -27,6 +28,8 @@ class APICall:
     cost: Optional[float] = None
     success: bool = True
     error: Optional[str] = None
+    time_to_first_decision_ms: Optional[float] = None
+    cached_tokens: int = 0
 
 
 @dataclass
@@ -41,6 +44,12 @@ class UsageMetrics:
     avg_response_time_ms: float = 0.0
     calls_per_model: Dict[str, int] = field(default_factory=dict)
     error_rate: float = 0.0
+    avg_time_to_first_decision_ms: Optional[float] = None
+    prompt_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    prompt_cache_rate: float = 0.0
+    prompt_cache_savings: float = 0.0
+    avg_response_time_prompt_cached_ms: Optional[float] = None
 
 
 @dataclass
@@ -67,12 +76,14 @@ class LLMMetricsTracker:
         """
         self.max_history = max_history
         self.api_calls: deque[APICall] = deque(maxlen=max_history)
+        # Per 1K tokens; cached_input is the price of prompt tokens read from the
+        # provider's prompt cache (input price when absent)
         self.model_costs = {
-            "openai/gpt-4": {"input": 0.03, "output": 0.06},  # per 1K tokens
+            "openai/gpt-4": {"input": 0.03, "output": 0.06},
             "openai/gpt-3.5-turbo": {"input": 0.001, "output": 0.002},
-            "anthropic/claude-3-sonnet": {"input": 0.003, "output": 0.015},
+            "anthropic/claude-3-sonnet": {"input": 0.003, "cached_input": 0.0003, "output": 0.015},
             "x-ai/grok-beta": {"input": 0.005, "output": 0.015},
-            "deepseek/deepseek-r1": {"input": 0.0014, "output": 0.0028},
+            "deepseek/deepseek-r1": {"input": 0.0014, "cached_input": 0.00014, "output": 0.0028},
         }
 
     def record_api_call(
@@ -83,6 +94,8 @@ class LLMMetricsTracker:
         response_time_ms: float,
         success: bool = True,
         error: Optional[str] = None,
+        time_to_first_decision_ms: Optional[float] = None,
+        cached_tokens: int = 0,
     ) -> APICall:
         """
         Record an API call.
@@ -94,12 +107,14 @@ class LLMMetricsTracker:
             response_time_ms: Response time in milliseconds
             success: Whether the call was successful
             error: Error message if call failed
+            time_to_first_decision_ms: Time until the first asset decision was streamed
+            cached_tokens: Prompt tokens served from the provider's prompt cache
 
         Returns:
             APICall record
         """
         total_tokens = prompt_tokens + completion_tokens
-        cost = self._calculate_cost(model, prompt_tokens, completion_tokens)
+        cost = self._calculate_cost(model, prompt_tokens, completion_tokens, cached_tokens)
 
         call = APICall(
             timestamp=datetime.now(timezone.utc),
@@ -111,6 +126,8 @@ class LLMMetricsTracker:
             cost=cost,
             success=success,
             error=error,
+            time_to_first_decision_ms=time_to_first_decision_ms,
+            cached_tokens=cached_tokens,
         )
 
         self.api_calls.append(call)
@@ -153,6 +170,31 @@ class LLMMetricsTracker:
 
         error_rate = (failed_calls / total_calls) * 100 if total_calls > 0 else 0
 
+        first_decision_times = [
+            call.time_to_first_decision_ms
+            for call in recent_calls
+            if call.time_to_first_decision_ms is not None
+        ]
+        avg_time_to_first_decision = (
+            sum(first_decision_times) / len(first_decision_times) if first_decision_times else None
+        )
+
+        prompt_tokens = sum(call.prompt_tokens for call in recent_calls)
+        cached_prompt_tokens = sum(call.cached_tokens for call in recent_calls)
+        prompt_cache_rate = (
+            (cached_prompt_tokens / prompt_tokens) * 100 if prompt_tokens > 0 else 0.0
+        )
+        prompt_cache_savings = sum(
+            self._calculate_prompt_cache_savings(call.model, call.cached_tokens)
+            for call in recent_calls
+        )
+        prompt_cached_times = [
+            call.response_time_ms for call in recent_calls if call.success and call.cached_tokens
+        ]
+        avg_response_time_prompt_cached = (
+            sum(prompt_cached_times) / len(prompt_cached_times) if prompt_cached_times else None
+        )
+
         return UsageMetrics(
             total_calls=total_calls,
             successful_calls=successful_calls,
@@ -162,6 +204,12 @@ class LLMMetricsTracker:
             avg_response_time_ms=avg_response_time,
             calls_per_model=dict(calls_per_model),
             error_rate=error_rate,
+            avg_time_to_first_decision_ms=avg_time_to_first_decision,
+            prompt_tokens=prompt_tokens,
+            cached_prompt_tokens=cached_prompt_tokens,
+            prompt_cache_rate=prompt_cache_rate,
+            prompt_cache_savings=prompt_cache_savings,
+            avg_response_time_prompt_cached_ms=avg_response_time_prompt_cached,
         )
 
     def get_health_status(self) -> HealthStatus:
@@ -217,16 +265,34 @@ class LLMMetricsTracker:
             error_rate_1h=error_rate_1h,
         )
 
+    def estimate_cost(
+        self, model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0
+    ) -> Optional[float]:
+        """
+        Estimate the cost of a call without recording it.
+
+        Args:
+            model: Model used
+            prompt_tokens: Number of prompt tokens, including cached ones
+            completion_tokens: Number of completion tokens
+            cached_tokens: Prompt tokens served from the provider's prompt cache
+
+        Returns:
+            Cost in USD or None if model not found
+        """
+        return self._calculate_cost(model, prompt_tokens, completion_tokens, cached_tokens)
+
     def _calculate_cost(
-        self, model: str, prompt_tokens: int, completion_tokens: int
+        self, model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0
     ) -> Optional[float]:
         """
         Calculate cost for API call.
 
         Args:
             model: Model used
-            prompt_tokens: Number of prompt tokens
+            prompt_tokens: Number of prompt tokens, including cached ones
             completion_tokens: Number of completion tokens
+            cached_tokens: Prompt tokens served from the provider's prompt cache
 
         Returns:
             Cost in USD or None if model not found
@@ -238,7 +304,24 @@ class LLMMetricsTracker:
         input_cost = (prompt_tokens / 1000) * costs["input"]
         output_cost = (completion_tokens / 1000) * costs["output"]
 
-        return input_cost + output_cost
+        return input_cost + output_cost - self._calculate_prompt_cache_savings(model, cached_tokens)
+
+    def _calculate_prompt_cache_savings(self, model: str, cached_tokens: int) -> float:
+        """
+        Calculate how much cheaper cached prompt tokens were than uncached ones.
+
+        Args:
+            model: Model used
+            cached_tokens: Prompt tokens served from the provider's prompt cache
+
+        Returns:
+            Savings in USD (0 when the model has no cached input price)
+        """
+        costs = self.model_costs.get(model)
+        if not costs or not cached_tokens:
+            return 0.0
+        discount = costs["input"] - costs.get("cached_input", costs["input"])
+        return (cached_tokens / 1000) * discount
 
     def get_model_performance(self, model: str, timeframe_hours: int = 24) -> Dict[str, Any]:
         """
@@ -271,6 +354,72 @@ class LLMMetricsTracker:
             "total_cost": sum(call.cost or 0 for call in model_calls),
         }
 
+    def get_model_window_stats(self, model: str, window_minutes: float = 15.0) -> Dict[str, Any]:
+        """
+        Get rolling latency, error and cost statistics for a model.
+
+        Args:
+            model: Model to analyze
+            window_minutes: Minutes to look back
+
+        Returns:
+            Dictionary with calls, p95_response_time_ms and cost_per_call (None
+            without successful calls) and error_rate (percent)
+        """
+        cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=window_minutes)
+        model_calls = [
+            call for call in self.api_calls if call.model == model and call.timestamp >= cutoff_time
+        ]
+        successful_calls = [call for call in model_calls if call.success]
+
+        p95_response_time = None
+        cost_per_call = None
+        if successful_calls:
+            p95_response_time = percentile(
+                sorted(call.response_time_ms for call in successful_calls), 95
+            )
+            cost_per_call = sum(call.cost or 0 for call in successful_calls) / len(successful_calls)
+
+        error_rate = 0.0
+        if model_calls:
+            error_rate = (1 - len(successful_calls) / len(model_calls)) * 100
+
+        return {
+            "calls": len(model_calls),
+            "p95_response_time_ms": p95_response_time,
+            "error_rate": error_rate,
+            "cost_per_call": cost_per_call,
+        }
+
+    def get_response_time_percentile(
+        self,
+        model: str,
+        pct: float,
+        window_minutes: float = 60.0,
+        min_samples: int = 1,
+    ) -> Optional[float]:
+        """
+        Get a response time percentile of a model's successful calls.
+
+        Args:
+            model: Model to analyze
+            pct: Percentile (0-100)
+            window_minutes: Minutes to look back
+            min_samples: Successful calls required for a result
+
+        Returns:
+            Response time in milliseconds, or None with fewer than min_samples calls
+        """
+        cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=window_minutes)
+        response_times = [
+            call.response_time_ms
+            for call in self.api_calls
+            if call.model == model and call.success and call.timestamp >= cutoff_time
+        ]
+        if len(response_times) < max(min_samples, 1):
+            return None
+        return percentile(sorted(response_times), pct)
+
     def clear_old_records(self, days: int = 7) -> None:
         """
         Clear records older than specified days.
@@ -0,0 +1,311 @@
+"""
+Record/replay of LLM calls at the client boundary.
+
+``RecordingClient`` wraps the OpenAI client and appends every chat completion,
+including streamed chunks and their arrival times, to a JSONL cassette.
+``ReplayClient`` serves a cassette back without network access, either with the
+recorded timing or with a simulated latency distribution, so the decision
+pipeline can be benchmarked offline and reproducibly.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Union
+
+from ...core.logging import get_logger
+from .llm_exceptions import LLMAPIError
+
+logger = get_logger(__name__)
+
+
+def _to_data(value: Any) -> Any:
+    """Convert an API object (pydantic model or namespace) to JSON-compatible data."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if isinstance(value, SimpleNamespace):
+        value = vars(value)
+    if isinstance(value, dict):
+        return {key: _to_data(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_data(item) for item in value]
+    return value
+
+
+def _to_object(value: Any) -> Any:
+    """Convert recorded data back to an object with attribute access."""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: _to_object(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [_to_object(item) for item in value]
+    return value
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """Get the key a chat completion request is recorded and replayed under."""
+    keyed = {
+        name: request.get(name) for name in ("model", "messages", "tools", "stream", "max_tokens")
+    }
+    payload = json.dumps(_to_data(keyed), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LatencyModel:
+    """Latency of replayed calls.
+
+    Specs:
+        ``recorded`` replays the recorded timing, ``none`` answers immediately,
+        ``fixed:<ms>``, ``normal:<mean_ms>,<stddev_ms>`` and
+        ``lognormal:<median_ms>,<sigma>`` sample the total call duration.
+    """
+
+    def __init__(self, spec: str = "recorded", seed: Optional[int] = None):
+        name, _, params = spec.partition(":")
+        self.name = name.strip().lower()
+        self.params = [float(param) for param in params.split(",") if param.strip()]
+        if self.name not in ("recorded", "none", "fixed", "normal", "lognormal"):
+            raise ValueError(f"Unknown replay latency model: {spec}")
+        self._random = random.Random(seed)
+
+    def duration_ms(self, recorded_ms: float) -> float:
+        """Get the duration of a replayed call that took ``recorded_ms`` when recorded."""
+        if self.name == "recorded":
+            return recorded_ms
+        if self.name == "none":
+            return 0.0
+        if self.name == "fixed":
+            return self.params[0]
+        if self.name == "normal":
+            return max(0.0, self._random.gauss(self.params[0], self.params[1]))
+        return self.params[0] * self._random.lognormvariate(0.0, self.params[1])
+
+
+class Cassette:
+    """JSONL file of recorded chat completion interactions."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def append(self, interaction: Dict[str, Any]) -> None:
+        """Append an interaction to the cassette."""
+        line = json.dumps(interaction, default=str)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Load all recorded interactions in recording order."""
+        with self.path.open(encoding="utf-8") as handle:
+            return [json.loads(line) for line in handle if line.strip()]
+
+
+class _RecordingStream:
+    """Passes a stream through while recording its chunks and their arrival times."""
+
+    def __init__(self, stream: Any, cassette: Cassette, request: Dict[str, Any], started: float):
+        self._stream = stream
+        self._iterator = stream.__aiter__()
+        self._cassette = cassette
+        self._request = request
+        self._started = started
+        self._chunks: List[Dict[str, Any]] = []
+        self._saved = False
+
+    def __aiter__(self) -> "_RecordingStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            chunk = await self._iterator.__anext__()
+        except StopAsyncIteration:
+            self._save(complete=True)
+            raise
+        offset_ms = (time.perf_counter() - self._started) * 1000
+        self._chunks.append({"offset_ms": offset_ms, "chunk": _to_data(chunk)})
+        return chunk
+
+    async def close(self) -> None:
+        self._save(complete=False)
+        await self._stream.close()
+
+    def _save(self, complete: bool) -> None:
+        # A stream closed early is recorded as far as it was consumed
+        if self._saved:
+            return
+        self._saved = True
+        self._cassette.append(
+            {
+                "key": request_key(self._request),
+                "request": _to_data(self._request),
+                "stream": True,
+                "complete": complete,
+                "duration_ms": (time.perf_counter() - self._started) * 1000,
+                "chunks": self._chunks,
+            }
+        )
+
+
+class _RecordingCompletions:
+    def __init__(self, completions: Any, cassette: Cassette):
+        self._completions = completions
+        self._cassette = cassette
+
+    async def create(self, **request: Any) -> Any:
+        started = time.perf_counter()
+        response = await self._completions.create(**request)
+        if request.get("stream"):
+            return _RecordingStream(response, self._cassette, request, started)
+        self._cassette.append(
+            {
+                "key": request_key(request),
+                "request": _to_data(request),
+                "stream": False,
+                "duration_ms": (time.perf_counter() - started) * 1000,
+                "response": _to_data(response),
+            }
+        )
+        return response
+
+
+class RecordingClient:
+    """OpenAI-compatible client that records chat completions of a wrapped client."""
+
+    def __init__(self, client: Any, cassette_path: Union[str, Path]):
+        """
+        Initialize the recording client.
+
+        Args:
+            client: Client whose calls are passed through and recorded
+            cassette_path: JSONL file the interactions are appended to
+        """
+        self._client = client
+        self.cassette = Cassette(cassette_path)
+        self.chat = SimpleNamespace(
+            completions=_RecordingCompletions(client.chat.completions, self.cassette)
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+class _ReplayStream:
+    """Yields recorded chunks at their recorded (or rescaled) offsets."""
+
+    def __init__(self, chunks: List[Dict[str, Any]], scale: float):
+        self._chunks = chunks
+        self._scale = scale
+        self._index = 0
+        self._started = time.perf_counter()
+        self.closed = False
+
+    def __aiter__(self) -> "_ReplayStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        if self.closed or self._index >= len(self._chunks):
+            raise StopAsyncIteration
+        entry = self._chunks[self._index]
+        self._index += 1
+        delay = entry["offset_ms"] * self._scale / 1000 - (time.perf_counter() - self._started)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return _to_object(entry["chunk"])
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _ReplayCompletions:
+    def __init__(self, client: "ReplayClient"):
+        self._client = client
+
+    async def create(self, **request: Any) -> Any:
+        return await self._client._replay(request)
+
+
+class ReplayClient:
+    """OpenAI-compatible client that serves chat completions from a cassette."""
+
+    def __init__(
+        self,
+        cassette_path: Union[str, Path],
+        latency: Union[str, LatencyModel] = "recorded",
+        strict: bool = False,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the replay client.
+
+        Args:
+            cassette_path: JSONL file of recorded interactions
+            latency: Latency model or spec of replayed calls
+            strict: Fail on requests that were not recorded instead of serving
+                the next recorded interaction
+            seed: Seed of the simulated latency distribution
+        """
+        self.cassette = Cassette(cassette_path)
+        self.latency = latency if isinstance(latency, LatencyModel) else LatencyModel(latency, seed)
+        self.strict = strict
+        self._interactions = self.cassette.load()
+        self._by_key: Dict[str, List[int]] = {}
+        for index, interaction in enumerate(self._interactions):
+            self._by_key.setdefault(interaction["key"], []).append(index)
+        self._used: Dict[str, int] = {}
+        self._next = 0
+
+        self.metrics = {"calls": 0, "exact_matches": 0, "fallback_matches": 0}
+        self.chat = SimpleNamespace(completions=_ReplayCompletions(self))
+        self.models = SimpleNamespace(list=self._list_models)
+
+    async def _list_models(self) -> Any:
+        models = sorted({item["request"].get("model") for item in self._interactions} - {None})
+        return SimpleNamespace(data=[SimpleNamespace(id=model) for model in models])
+
+    def _match(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        key = request_key(request)
+        indexes = self._by_key.get(key)
+        if indexes:
+            # Repeated identical requests cycle through their recordings
+            used = self._used.get(key, 0)
+            self._used[key] = used + 1
+            self.metrics["exact_matches"] += 1
+            return self._interactions[indexes[used % len(indexes)]]
+        if self.strict or not self._interactions:
+            raise LLMAPIError(f"No recorded interaction for request {key[:12]}")
+
+        # Prompts carry timestamps and live data; fall back to recording order
+        candidates = [
+            item for item in self._interactions if item.get("stream") == bool(request.get("stream"))
+        ] or self._interactions
+        interaction = candidates[self._next % len(candidates)]
+        self._next += 1
+        self.metrics["fallback_matches"] += 1
+        return interaction
+
+    async def _replay(self, request: Dict[str, Any]) -> Any:
+        self.metrics["calls"] += 1
+        interaction = self._match(request)
+
+        if interaction.get("stream"):
+            if not request.get("stream"):
+                raise LLMAPIError("Recorded interaction is streamed but the request is not")
+            # Chunk offsets are rescaled so the last chunk arrives after the sampled duration
+            chunks = interaction["chunks"]
+            last_offset_ms = chunks[-1]["offset_ms"] if chunks else 0.0
+            duration_ms = self.latency.duration_ms(last_offset_ms)
+            scale = duration_ms / last_offset_ms if last_offset_ms > 0 else 0.0
+            return _ReplayStream(chunks, scale)
+
+        if request.get("stream"):
+            raise LLMAPIError("Recorded interaction is not streamed but the request is")
+        duration_ms = self.latency.duration_ms(interaction.get("duration_ms", 0.0))
+        if duration_ms > 0:
+            await asyncio.sleep(duration_ms / 1000)
+        return _to_object(interaction["response"])
@@ -8,10 +8,12 @@ and comprehensive error handling.
 
 import asyncio
 import json
-import re
 import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 from pydantic import ValidationError as PydanticValidationError
 
@@ -24,19 +26,95 @@ from ...schemas.trading_decision import (
     TradingDecision,
     UsageMetrics,
 )
+from ..market_data.utils import calculate_next_candle_close
 from .ab_testing import get_ab_test_manager
-from .circuit_breaker import CircuitBreaker
+from .circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+from .decision_call import DecisionCall
+from .hedging import RequestHedger
+from .json_extraction import extract_json_object
 from .llm_exceptions import (
     AuthenticationError,
+    CircuitBreakerError,
     InsufficientDataError,
     LLMAPIError,
+    ModelCapacityError,
     ModelSwitchError,
     ValidationError,
 )
 from .llm_metrics import get_metrics_tracker
+from .llm_replay import RecordingClient, ReplayClient
+from .market_analysis import MarketAnalysis, PortfolioAllocator, parse_market_analysis
+from .model_router import ModelRouter
+from .model_scheduler import ModelReservation, ModelScheduler
+from .prompt_compiler import (
+    SERIES_LEGENDS,
+    CompiledPrompt,
+    PromptCompiler,
+    estimate_tokens,
+    format_series,
+)
+from .response_cache import LLMResponseCache
+from .stream_parser import DecisionStreamParser
 
 logger = get_logger(__name__)
 
+# (label, compact label, indicator attribute, decimals) of indicator series in prompts
+_INDICATOR_SERIES: Tuple[Tuple[str, str, str, int], ...] = (
+    ("EMA-20", "EMA20", "ema_20", 2),
+    ("EMA-50", "EMA50", "ema_50", 2),
+    ("RSI", "RSI", "rsi", 2),
+    ("MACD", "MACD", "macd", 4),
+    ("Bollinger Bands Upper", "BBU", "bb_upper", 2),
+    ("Bollinger Bands Middle", "BBM", "bb_middle", 2),
+    ("Bollinger Bands Lower", "BBL", "bb_lower", 2),
+)
+# MACD is only given for the primary interval
+_LONG_INTERVAL_SERIES = tuple(series for series in _INDICATOR_SERIES if series[2] != "macd")
+# Prompt sections that only change with the strategy; they lead the system message
+_STATIC_PROMPT_SECTIONS = ("instructions", "strategy")
+# Providers that only cache prompt prefixes marked with a cache_control breakpoint;
+# OpenAI, DeepSeek and Grok models cache repeated prefixes automatically
+_CACHE_CONTROL_MODEL_PREFIXES = ("anthropic/", "google/")
+
+
+@dataclass
+class _StreamedCompletion:
+    """Parts of a streamed decision completion, collected chunk by chunk."""
+
+    parser: DecisionStreamParser = field(default_factory=DecisionStreamParser)
+    reasoning_parts: List[str] = field(default_factory=list)
+    # Tool call index -> id, name and arguments assembled from the fragments
+    tool_calls: Dict[int, Dict[str, str]] = field(default_factory=dict)
+    usage: Any = None
+    time_to_first_decision_ms: Optional[float] = None
+
+    def add_delta(self, delta: Any) -> None:
+        """Collect the reasoning and tool call fragments of a chunk."""
+        reasoning = getattr(delta, "reasoning_content", None) or getattr(delta, "reasoning", None)
+        if reasoning:
+            self.reasoning_parts.append(reasoning)
+
+        for tool_call in getattr(delta, "tool_calls", None) or []:
+            entry = self.tool_calls.setdefault(
+                tool_call.index, {"id": "", "name": "", "arguments": ""}
+            )
+            if tool_call.id:
+                entry["id"] = tool_call.id
+            if tool_call.function:
+                entry["name"] += tool_call.function.name or ""
+                entry["arguments"] += tool_call.function.arguments or ""
+
+    def add_content(self, content: str, start_time: float) -> bool:
+        """Feed decision text to the parser, timing the first completed asset decision.
+
+        Returns:
+            Whether the decision JSON object is complete
+        """
+        complete = self.parser.feed(content)
+        if self.time_to_first_decision_ms is None and self.parser.assets_completed:
+            self.time_to_first_decision_ms = (time.time() - start_time) * 1000
+        return complete
+
 
 class LLMService:
     """Service for LLM-powered market analysis and trading decisions."""
@@ -55,9 +133,104 @@ class LLMService:
         # Enhanced features
         self.metrics_tracker = get_metrics_tracker()
         self.ab_test_manager = get_ab_test_manager()
-        self.circuit_breaker = CircuitBreaker(
-            failure_threshold=5, recovery_timeout=60, expected_exception=LLMAPIError
+
+        # Sliding-window circuit breakers per model, plus one for the provider
+        # endpoint that opens only when calls fail across models
+        self.circuit_breakers = CircuitBreakerRegistry(
+            failure_threshold=config.LLM_CIRCUIT_FAILURE_THRESHOLD,
+            failure_rate_threshold=config.LLM_CIRCUIT_FAILURE_RATE_THRESHOLD,
+            window_seconds=config.LLM_CIRCUIT_WINDOW_SECONDS,
+            recovery_timeout=config.LLM_CIRCUIT_RECOVERY_TIMEOUT,
+            half_open_max_calls=config.LLM_CIRCUIT_HALF_OPEN_MAX_CALLS,
+            slow_call_seconds=config.LLM_CIRCUIT_SLOW_CALL_SECONDS,
+            slow_call_rate_threshold=config.LLM_CIRCUIT_SLOW_CALL_RATE_THRESHOLD,
+            expected_exception=LLMAPIError,
+        )
+        self.endpoint_circuit_breaker = self.circuit_breakers.get(
+            f"endpoint:{self.base_url}",
+            failure_threshold=config.LLM_CIRCUIT_ENDPOINT_FAILURE_THRESHOLD,
+            failure_rate_threshold=config.LLM_CIRCUIT_ENDPOINT_FAILURE_RATE_THRESHOLD,
+        )
+
+        # Per-request routing across a model pool, with failover between models
+        self.model_router: Optional[ModelRouter] = None
+        if config.LLM_ROUTER_ENABLED and config.llm_router_models_map:
+            self.model_router = ModelRouter(
+                models=config.llm_router_models_map,
+                metrics_tracker=self.metrics_tracker,
+                quality_floors=config.llm_router_quality_floors_map,
+                window_minutes=config.LLM_ROUTER_WINDOW_MINUTES,
+                max_error_rate=config.LLM_ROUTER_MAX_ERROR_RATE,
+                latency_weight=config.LLM_ROUTER_LATENCY_WEIGHT,
+                cost_weight=config.LLM_ROUTER_COST_WEIGHT,
+                error_weight=config.LLM_ROUTER_ERROR_WEIGHT,
+                circuit_breakers=self.circuit_breakers,
+            )
+
+        # Per-model concurrency and tokens-per-minute limits on decision calls
+        self.model_scheduler: Optional[ModelScheduler] = (
+            ModelScheduler(
+                default_max_concurrency=config.LLM_SCHEDULER_MAX_CONCURRENCY,
+                default_tokens_per_minute=config.LLM_SCHEDULER_TOKENS_PER_MINUTE,
+                concurrency_limits=config.llm_scheduler_concurrency_limits_map,
+                tokens_per_minute_limits=config.llm_scheduler_tokens_per_minute_limits_map,
+                max_wait_seconds=config.LLM_SCHEDULER_MAX_WAIT_SECONDS,
+            )
+            if config.LLM_SCHEDULER_ENABLED
+            else None
+        )
+
+        # Opt-in hedging of slow decision calls with a second request
+        self.hedge_model: Optional[str] = config.LLM_HEDGE_MODEL or None
+        self.request_hedger: Optional[RequestHedger] = (
+            RequestHedger(
+                metrics_tracker=self.metrics_tracker,
+                percentile=config.LLM_HEDGE_PERCENTILE,
+                window_minutes=config.LLM_HEDGE_WINDOW_MINUTES,
+                min_samples=config.LLM_HEDGE_MIN_SAMPLES,
+                default_delay_seconds=config.LLM_HEDGE_DEFAULT_DELAY_SECONDS,
+            )
+            if config.LLM_HEDGING_ENABLED
+            else None
+        )
+
+        # Identical decision prompts (e.g. accounts sharing a strategy) reuse one response
+        self.decision_temperature = 0.3
+        self.stream_decisions = config.LLM_STREAMING_ENABLED
+        self.prompt_cache_control = config.LLM_PROMPT_CACHE_CONTROL_ENABLED
+        self.response_cache: Optional[LLMResponseCache] = (
+            LLMResponseCache(
+                ttl_seconds=config.LLM_RESPONSE_CACHE_TTL_SECONDS,
+                interval=config.INTERVAL,
+                max_entries=config.LLM_RESPONSE_CACHE_MAX_ENTRIES,
+            )
+            if config.LLM_RESPONSE_CACHE_ENABLED
+            else None
+        )
+
+        # Optional two-stage decisions: one market analysis per strategy family and
+        # candle, shared by its accounts and allocated per account without an LLM call
+        self.two_stage_decisions = config.LLM_TWO_STAGE_ENABLED
+        self.portfolio_allocator = PortfolioAllocator(
+            min_conviction=config.LLM_TWO_STAGE_MIN_CONVICTION,
+            max_balance_fraction=config.LLM_TWO_STAGE_MAX_BALANCE_FRACTION,
+        )
+        self.market_analysis_cache: Optional[LLMResponseCache] = (
+            LLMResponseCache(
+                ttl_seconds=config.LLM_TWO_STAGE_ANALYSIS_TTL_SECONDS, interval=config.INTERVAL
+            )
+            if self.two_stage_decisions
+            else None
         )
+        self._market_analysis_inflight: Dict[
+            str, asyncio.Future[Tuple[MarketAnalysis, Dict[str, Any]]]
+        ] = {}
+        self.two_stage_metrics = {
+            "analysis_calls": 0,
+            "analysis_cache_hits": 0,
+            "analysis_shared_inflight": 0,
+            "allocations": 0,
+        }
 
         # Supported models
         self.supported_models = {
@@ -72,11 +245,26 @@ class LLMService:
         self.max_retries = 3
         self.base_delay = 1.0  # Base delay for exponential backoff
 
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Get the circuit breaker of the current model."""
+        return self.circuit_breakers.get(self.model)
+
     @property
     def client(self):
         # type: () -> Any  # Return type depends on imported client
         """Lazy load OpenRouter client."""
         if self._client is None:
+            replay_mode = config.LLM_REPLAY_MODE.lower()
+            if replay_mode == "replay":
+                self._client = ReplayClient(
+                    config.LLM_REPLAY_CASSETTE,
+                    latency=config.LLM_REPLAY_LATENCY,
+                    strict=config.LLM_REPLAY_STRICT,
+                    seed=config.LLM_REPLAY_SEED,
+                )
+                logger.info(f"Replaying LLM calls from {config.LLM_REPLAY_CASSETTE}")
+                return self._client
             try:
                 import openai
 
@@ -89,6 +277,9 @@ class LLMService:
                     },
                 )
                 logger.info(f"OpenRouter client initialized with model: {self.model}")
+                if replay_mode == "record":
+                    self._client = RecordingClient(self._client, config.LLM_REPLAY_CASSETTE)
+                    logger.info(f"Recording LLM calls to {config.LLM_REPLAY_CASSETTE}")
             except Exception as e:
                 logger.error(f"Failed to initialize OpenRouter client: {e}")
                 raise
@@ -348,33 +539,41 @@ Provide:
             InsufficientDataError: When context is insufficient
         """
         start_time = time.time()
-        original_model = self.model
+        # The model choice belongs to this request; the service is shared by
+        # concurrent decisions, so self.model is only read as the default
+        call = DecisionCall(models=[self.model], account_id=context.account_id)
 
         try:
             # Check for A/B test model override
             if ab_test_name:
-                test_model = self.get_ab_test_model(ab_test_name, context.account_id)
-                if test_model:
-                    self.model = test_model
-                    logger.debug(f"Using A/B test model: {test_model}")
+                ab_test_model = self.get_ab_test_model(ab_test_name, context.account_id)
+                if ab_test_model and ab_test_model != call.model:
+                    call.ab_test_model = ab_test_model
+                    call.models = [ab_test_model]
+                    logger.debug(f"Using A/B test model: {ab_test_model}")
 
             # Validate context
             if not self._validate_context(context):
                 raise InsufficientDataError("Insufficient context for decision generation")
 
-            # Build multi-asset decision prompt
-            prompt = self._build_multi_asset_decision_prompt(symbols, context, strategy_override)
-
-            # Generate decision with circuit breaker protection
-            decision_data = await self.circuit_breaker.call(self._call_llm_for_decision, prompt)
+            # Without an A/B override, route the request across the model pool
+            if self.model_router and not call.ab_test_model:
+                strategy = context.account_state.active_strategy
+                call.models = self.model_router.route(strategy.strategy_id, strategy.strategy_type)
 
-            # Parse and validate multi-asset decision
-            decision = self._parse_multi_asset_decision_response(decision_data, symbols)
+            if self.two_stage_decisions:
+                decision, decision_data = await self._generate_two_stage_decision(
+                    symbols, context, call
+                )
+            else:
+                decision, decision_data = await self._generate_single_stage_decision(
+                    symbols, context, strategy_override, call
+                )
 
             processing_time_ms = (time.time() - start_time) * 1000
 
             # Record A/B testing metrics if applicable
-            if ab_test_name and self.model != original_model:
+            if call.ab_test_model:
                 # Calculate average confidence across all asset decisions
                 avg_confidence = (
                     sum(d.confidence for d in decision.decisions) / len(decision.decisions)
@@ -382,7 +581,7 @@ Provide:
                     else 0
                 )
                 self.ab_test_manager.record_decision_performance(
-                    model_name=self.model,
+                    model_name=call.model_used,
                     confidence=avg_confidence,
                     response_time_ms=processing_time_ms,
                     cost=decision_data.get("cost"),
@@ -396,8 +595,10 @@ Provide:
                 validation_passed=True,
                 validation_errors=[],
                 processing_time_ms=processing_time_ms,
-                model_used=self.model,
+                model_used=call.model_used,
                 api_cost=decision_data.get("cost"),
+                prompt_tokens=getattr(decision_data.get("usage"), "prompt_tokens", None),
+                completion_tokens=getattr(decision_data.get("usage"), "completion_tokens", None),
             )
 
             logger.info(f"Multi-asset trading decision generated for {len(symbols)} assets")
@@ -408,9 +609,9 @@ Provide:
             logger.error(f"Error generating multi-asset trading decision: {e}")
 
             # Record A/B testing failure if applicable
-            if ab_test_name and self.model != original_model:
+            if call.ab_test_model:
                 self.ab_test_manager.record_decision_performance(
-                    model_name=self.model,
+                    model_name=call.model_used,
                     confidence=0,
                     response_time_ms=processing_time_ms,
                     success=False,
@@ -427,12 +628,77 @@ Provide:
                 validation_passed=False,
                 validation_errors=[str(e)],
                 processing_time_ms=processing_time_ms,
-                model_used=self.model,
+                model_used=call.model_used,
             )
-        finally:
-            # Restore original model if it was changed for A/B testing
-            if ab_test_name and self.model != original_model:
-                self.model = original_model
+
+    async def _generate_two_stage_decision(
+        self, symbols: List[str], context: TradingContext, call: DecisionCall
+    ) -> Tuple[TradingDecision, Dict[str, Any]]:
+        """Allocate from the strategy family's shared market analysis of this candle.
+
+        Returns:
+            Tuple of (decision, response data of the analysis call)
+        """
+        analysis, decision_data = await self._get_market_analysis(symbols, context, call)
+        decision = self.portfolio_allocator.allocate(analysis, symbols, context)
+        self.two_stage_metrics["allocations"] += 1
+        return decision, decision_data
+
+    async def _generate_single_stage_decision(
+        self,
+        symbols: List[str],
+        context: TradingContext,
+        strategy_override: Optional[str],
+        call: DecisionCall,
+    ) -> Tuple[TradingDecision, Dict[str, Any]]:
+        """Ask the LLM for the decision directly, reusing cached responses.
+
+        Returns:
+            Tuple of (decision, response data of the decision call)
+        """
+        # Build multi-asset decision prompt within the token budget. The static
+        # strategy sections extend the system prompt so that every decision of the
+        # strategy shares a cacheable prefix; market data follows in the user message.
+        compiled = self._compile_multi_asset_decision_prompt(symbols, context, strategy_override)
+        system_prompt = self._get_decision_system_prompt()
+        if compiled.prefix:
+            system_prompt = f"{system_prompt}\n\n{compiled.prefix}"
+        prompt = compiled.suffix
+
+        # Reuse the response to an identical prompt, otherwise call the LLM
+        # with circuit breaker protection
+        response_cache = self.response_cache
+        cache_key = self._get_response_cache_key(prompt, system_prompt, call.model)
+        cached = await response_cache.get(cache_key) if response_cache and cache_key else None
+        if cached is not None:
+            decision_data = {"content": cached["content"], "usage": None, "cost": 0.0}
+            logger.debug(f"Using cached LLM response for {call.model}")
+        else:
+            # Failover or a winning hedge may answer with another model
+            decision_data = await self._call_llm_with_failover(
+                prompt,
+                system_prompt,
+                call,
+                is_valid=lambda data: self._is_valid_decision_response(data, symbols),
+            )
+
+        # Parse and validate multi-asset decision
+        decision = self._parse_multi_asset_decision_response(decision_data, symbols)
+
+        # Only responses that parse into a valid decision are reused, keyed by
+        # the model that answered
+        if (
+            response_cache
+            and cached is None
+            and (key := self._get_response_cache_key(prompt, system_prompt, call.model_used))
+        ):
+            await response_cache.set(
+                key,
+                call.model_used,
+                {"content": decision_data["content"], "cost": decision_data.get("cost")},
+            )
+
+        return decision, decision_data
 
     async def switch_model(self, model_name: str) -> bool:
         """Switch to a different LLM model.
@@ -454,17 +720,16 @@ Provide:
                 )
 
             old_model = self.model
-            self.model = self.supported_models[model_name]
+            new_model = self.supported_models[model_name]
 
-            # Test the new model with a simple call
-            test_successful = await self._test_model_connection()
+            # Test the new model with a simple call before decisions can pick it up
+            test_successful = await self._test_model_connection(new_model)
 
             if test_successful:
+                self.model = new_model
                 logger.info(f"Successfully switched from {old_model} to {self.model}")
                 return True
             else:
-                # Revert to old model
-                self.model = old_model
                 raise ModelSwitchError(f"Failed to connect to model {model_name}")
 
         except Exception as e:
@@ -480,6 +745,13 @@ Provide:
         try:
             tracker_status = self.metrics_tracker.get_health_status()
             circuit_open = self.circuit_breaker.is_open
+            if self.model_router:
+                # Routed decisions fail over, so only all circuits open is unhealthy
+                circuit_open = not any(
+                    self.model_router.circuit_breaker(model).allows_calls
+                    for model in self.model_router.models
+                )
+            circuit_open = circuit_open or not self.endpoint_circuit_breaker.allows_calls
 
             # Test connectivity if needed
             if tracker_status.consecutive_failures > 3:
@@ -528,6 +800,8 @@ Provide:
             if tracker_metrics.total_calls > 0
             else 0.0
         )
+        cache_stats = self.response_cache.get_stats() if self.response_cache else {}
+        hedge_stats = self.request_hedger.get_stats() if self.request_hedger else {}
 
         return UsageMetrics(
             total_requests=tracker_metrics.total_calls,
@@ -538,9 +812,22 @@ Provide:
             cost_per_request=cost_per_req,
             requests_per_hour=requests_per_hour,
             error_rate=tracker_metrics.error_rate,
+            avg_time_to_first_decision_ms=tracker_metrics.avg_time_to_first_decision_ms,
             uptime_percentage=100.0 - tracker_metrics.error_rate,
             period_start=datetime.now(timezone.utc) - timedelta(hours=timeframe_hours),
             period_end=datetime.now(timezone.utc),
+            cache_hits=cache_stats.get("hits", 0),
+            cache_misses=cache_stats.get("misses", 0),
+            cache_hit_rate=cache_stats.get("hit_rate", 0.0),
+            cost_saved_usd=cache_stats.get("cost_saved_usd", 0.0),
+            cached_prompt_tokens=tracker_metrics.cached_prompt_tokens,
+            prompt_cache_rate=tracker_metrics.prompt_cache_rate,
+            prompt_cache_savings_usd=tracker_metrics.prompt_cache_savings,
+            avg_response_time_prompt_cached_ms=tracker_metrics.avg_response_time_prompt_cached_ms,
+            hedged_requests=hedge_stats.get("hedged_requests", 0),
+            hedge_rate=hedge_stats.get("hedge_rate", 0.0),
+            hedge_win_rate=hedge_stats.get("hedge_win_rate", 0.0),
+            hedge_cost_overhead_usd=hedge_stats.get("cost_overhead_usd", 0.0),
         )
 
     def start_ab_test(
@@ -600,28 +887,314 @@ Provide:
         """
         return self.ab_test_manager.get_active_tests()
 
-    async def _call_llm_for_decision(self, prompt: str) -> Dict[str, Any]:
+    def _get_response_cache_key(
+        self, prompt: str, system_prompt: Optional[str] = None, model: Optional[str] = None
+    ) -> Optional[str]:
+        """Get the response cache key of a decision prompt, or None when caching is off.
+
+        Args:
+            prompt: Decision generation prompt
+            system_prompt: System prompt sent with it (defaults to the decision system prompt)
+            model: Model of the request (defaults to the current model)
+
+        Returns:
+            Cache key over the model, system prompt, prompt and temperature
+        """
+        if self.response_cache is None:
+            return None
+        return self.response_cache.build_key(
+            model or self.model,
+            system_prompt or self._get_decision_system_prompt(),
+            prompt,
+            self.decision_temperature,
+        )
+
+    def _build_decision_messages(
+        self, system_prompt: str, prompt: str, model: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Build the decision messages with the static system prompt first.
+
+        Models whose provider only caches explicitly marked prefixes get a
+        cache_control breakpoint at the end of the system prompt.
+
+        Args:
+            system_prompt: Static system prompt, identical across decisions of a strategy
+            prompt: Volatile decision prompt
+            model: Model the messages are sent to (defaults to the current model)
+
+        Returns:
+            Chat messages for the decision call
+        """
+        model = model or self.model
+        system_content: Any = system_prompt
+        if self.prompt_cache_control and model.startswith(_CACHE_CONTROL_MODEL_PREFIXES):
+            system_content = [
+                {
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ]
+        return [
+            {"role": "system", "content": system_content},
+            {"role": "user", "content": prompt},
+        ]
+
+    @staticmethod
+    def _get_cached_tokens(usage: Any) -> int:
+        """Get the number of prompt tokens the provider served from its prompt cache."""
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None)
+        return cached_tokens if isinstance(cached_tokens, int) else 0
+
+    async def _get_market_analysis(
+        self, symbols: List[str], context: TradingContext, call: DecisionCall
+    ) -> Tuple[MarketAnalysis, Dict[str, Any]]:
+        """Get the strategy family's market analysis of the current candle.
+
+        Concurrent requests for the same analysis share one LLM call; later ones are
+        served from the analysis cache until the next candle close.
+
+        Args:
+            symbols: Trading pair symbols to analyse
+            context: Trading context of the requesting account
+            call: Model choice of the requesting decision; its answered model is set
+
+        Returns:
+            The analysis and the LLM response data; cost and usage are only set
+            for the request that made the call
+        """
+        cache = self.market_analysis_cache
+        assert cache is not None, "market analysis requires two-stage decisions"
+
+        family = context.account_state.active_strategy.strategy_type
+        candle_close = calculate_next_candle_close(config.INTERVAL, datetime.now(timezone.utc))
+        key = cache.build_key(
+            "market-analysis",
+            family,
+            f"{','.join(sorted(symbols))}|{candle_close.isoformat()}",
+            self.decision_temperature,
+        )
+
+        cached = await cache.get(key)
+        if cached is not None:
+            self.two_stage_metrics["analysis_cache_hits"] += 1
+            analysis = MarketAnalysis.from_dict(cached["analysis"])
+            call.answered_model = cached.get("model") or call.answered_model
+            return analysis, {"usage": None, "cost": 0.0, "model": cached.get("model")}
+
+        inflight = self._market_analysis_inflight.get(key)
+        if inflight is not None:
+            self.two_stage_metrics["analysis_shared_inflight"] += 1
+            analysis, data = await asyncio.shield(inflight)
+            call.answered_model = data.get("model") or call.answered_model
+            return analysis, {"usage": None, "cost": 0.0, "model": data.get("model")}
+
+        future: asyncio.Future[Tuple[MarketAnalysis, Dict[str, Any]]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._market_analysis_inflight[key] = future
+        try:
+            compiled = self._compile_market_analysis_prompt(symbols, context)
+            system_prompt = f"{self._get_market_analysis_system_prompt()}\n\n{compiled.prefix}"
+            data = await self._call_llm_with_failover(
+                compiled.suffix,
+                system_prompt,
+                call,
+                is_valid=lambda response: self._is_valid_market_analysis(response, symbols),
+            )
+            analysis = parse_market_analysis(data["content"], symbols, family)
+            self.two_stage_metrics["analysis_calls"] += 1
+            await cache.set(
+                key,
+                call.model_used,
+                {
+                    "analysis": analysis.to_dict(),
+                    "model": data.get("model"),
+                    "cost": data.get("cost"),
+                },
+            )
+            future.set_result((analysis, data))
+            return analysis, data
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the error retrieved; there may be no request waiting on it
+            future.exception()
+            raise
+        finally:
+            self._market_analysis_inflight.pop(key, None)
+
+    async def _call_llm_with_failover(
+        self,
+        prompt: str,
+        system_prompt: str,
+        call: DecisionCall,
+        is_valid: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Dict[str, Any]:
+        """Call the decision models of a request in order until one answers.
+
+        Without a model router the first model is called through the service
+        circuit breaker. With one, each model is called through its own circuit
+        breaker and a failed or open-circuit model hands over to the next.
+
+        Args:
+            prompt: Decision generation prompt
+            system_prompt: System prompt
+            call: Model choice of the request; its answered model is set
+            is_valid: Whether a response holds a usable decision (for hedging)
+
+        Returns:
+            LLM response data, with the model that answered under "model"
+
+        Raises:
+            LLMAPIError: When every model fails
+            CircuitBreakerError: When the circuit of the only model is open
+        """
+        if self.model_router is None:
+            result = await self._call_through_circuit_breakers(
+                prompt,
+                system_prompt,
+                call.model,
+                self.hedge_model or call.model,
+                is_valid,
+            )
+            call.answered_model = result.get("model", call.model)
+            return result
+
+        last_error: Optional[Exception] = None
+        models = call.models
+        for index, model in enumerate(models):
+            # Hedge with the next candidate, or the same model when it is the last
+            fallback = models[index + 1] if index + 1 < len(models) else model
+            try:
+                result = await self._call_through_circuit_breakers(
+                    prompt,
+                    system_prompt,
+                    model,
+                    self.hedge_model or fallback,
+                    is_valid,
+                )
+                call.answered_model = result.get("model", model)
+                return result
+            except (LLMAPIError, CircuitBreakerError, ModelCapacityError) as e:
+                last_error = e
+                self.model_router.record_failover(model, e)
+        raise LLMAPIError(f"All routed models failed: {last_error}")
+
+    async def _call_through_circuit_breakers(
+        self,
+        prompt: str,
+        system_prompt: str,
+        model: str,
+        hedge_model: str,
+        is_valid: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Dict[str, Any]:
+        """Call a decision model through its own and the endpoint's circuit breaker.
+
+        A call the open endpoint circuit rejects does not count against the model.
+
+        Args:
+            prompt: Decision generation prompt
+            system_prompt: System prompt
+            model: Model of the primary request
+            hedge_model: Model of the hedge request
+            is_valid: Whether a response holds a usable decision
+
+        Returns:
+            LLM response data, with the model that answered under "model"
+
+        Raises:
+            CircuitBreakerError: When the model or endpoint circuit rejects the call
+        """
+        return await self.circuit_breakers.get(model).call(
+            self.endpoint_circuit_breaker.call,
+            self._call_decision_model,
+            prompt,
+            system_prompt,
+            model,
+            hedge_model,
+            is_valid,
+        )
+
+    async def _call_decision_model(
+        self,
+        prompt: str,
+        system_prompt: str,
+        model: str,
+        hedge_model: str,
+        is_valid: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Dict[str, Any]:
+        """Call a decision model, hedging the call when hedging is enabled.
+
+        Args:
+            prompt: Decision generation prompt
+            system_prompt: System prompt
+            model: Model of the primary request
+            hedge_model: Model of the hedge request
+            is_valid: Whether a response holds a usable decision
+
+        Returns:
+            LLM response data, with the model that answered under "model"
+        """
+        if self.request_hedger is None:
+            result = await self._call_llm_for_decision(prompt, system_prompt, model)
+            return {**result, "model": model}
+
+        outcome = await self.request_hedger.run(
+            lambda: self._call_llm_for_decision(prompt, system_prompt, model),
+            lambda: self._call_llm_for_decision(prompt, system_prompt, hedge_model),
+            model,
+            is_valid or (lambda result: True),
+        )
+        answered_model = hedge_model if outcome.hedge_won else model
+
+        if outcome.hedged:
+            loser_model = model if outcome.hedge_won else hedge_model
+            overhead = 0.0
+            if outcome.loser_result:
+                overhead = outcome.loser_result.get("cost") or 0.0
+            elif outcome.loser_cancelled:
+                # Usage of a cancelled stream is unknown; count at least its prompt
+                prompt_tokens = estimate_tokens(system_prompt + prompt)
+                overhead = self.metrics_tracker.estimate_cost(loser_model, prompt_tokens, 0) or 0.0
+            self.request_hedger.record_overhead(overhead)
+            logger.info(
+                f"Hedged decision answered by {answered_model} "
+                f"({'hedge' if outcome.hedge_won else 'primary'}), overhead ${overhead:.4f}"
+            )
+
+        return {**outcome.result, "model": answered_model}
+
+    async def _call_llm_for_decision(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Make LLM API call for decision generation with retry logic.
 
         Args:
             prompt: Decision generation prompt
+            system_prompt: System prompt (defaults to the decision system prompt)
+            model: Model to call (defaults to the current model)
 
         Returns:
             LLM response data
 
         Raises:
             LLMAPIError: When API call fails after retries
+            ModelCapacityError: When the model has no capacity for the call
         """
         last_exception = None
+        model = model or self.model
 
         # Initialize messages history
-        messages = [
-            {
-                "role": "system",
-                "content": self._get_decision_system_prompt(),
-            },
-            {"role": "user", "content": prompt},
-        ]
+        messages = self._build_decision_messages(
+            system_prompt or self._get_decision_system_prompt(), prompt, model
+        )
 
         # Max loop for tool calls to prevent infinite loops
         max_tool_loops = 20
@@ -638,7 +1211,7 @@ Provide:
                         result,
                         updated_messages,
                         should_continue,
-                    ) = await self._execute_decision_loop_step(current_messages)
+                    ) = await self._execute_decision_loop_step(current_messages, model)
 
                     if not should_continue:
                         return result
@@ -650,13 +1223,16 @@ Provide:
                 logger.error("Max tool loops reached without final content")
                 raise LLMAPIError("Max tool loops reached without final content")
 
+            except ModelCapacityError:
+                # Rejected before reaching the provider: not a provider failure to retry
+                raise
             except Exception as e:
                 last_exception = e
                 response_time_ms = (time.time() - attempt_start_time) * 1000
 
                 # Record failed API call
                 self.metrics_tracker.record_api_call(
-                    model=self.model,
+                    model=model,
                     prompt_tokens=0,
                     completion_tokens=0,
                     response_time_ms=response_time_ms,
@@ -676,32 +1252,70 @@ Provide:
 
         raise LLMAPIError(f"API call failed after {self.max_retries} attempts: {last_exception}")
 
+    @asynccontextmanager
+    async def _model_call_slot(
+        self, model: str, messages: List[Dict[str, Any]]
+    ) -> AsyncIterator[Optional[ModelReservation]]:
+        """Hold a model call slot and the call's estimated tokens while it runs.
+
+        Args:
+            model: Model the call is sent to
+            messages: Messages of the call, used to estimate its prompt tokens
+
+        Yields:
+            Reservation to settle with the reported usage (None without a scheduler)
+
+        Raises:
+            ModelCapacityError: When the model has no capacity before the wait deadline
+        """
+        if self.model_scheduler is None:
+            yield None
+            return
+        tokens = (
+            estimate_tokens(json.dumps(messages, default=str))
+            + config.LLM_SCHEDULER_COMPLETION_TOKENS_ESTIMATE
+        )
+        async with self.model_scheduler.reserve(model, tokens) as reservation:
+            yield reservation
+
     async def _execute_decision_loop_step(
-        self, current_messages: List[Dict[str, Any]]
+        self, current_messages: List[Dict[str, Any]], model: Optional[str] = None
     ) -> tuple[Dict[str, Any], List[Dict[str, Any]], bool]:
         """Execute a single step of the decision loop.
 
+        Args:
+            current_messages: Conversation so far
+            model: Model to call (defaults to the current model)
+
         Returns:
             Tuple of (result, updated_messages, should_continue)
         """
-        start_time = time.time()
+        model = model or self.model
+        if self.stream_decisions:
+            return await self._execute_streaming_decision_step(current_messages, model)
 
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=current_messages,
-            temperature=0.3,
-            max_tokens=10000,
-        )
+        async with self._model_call_slot(model, current_messages) as reservation:
+            start_time = time.time()
+
+            response = await self.client.chat.completions.create(
+                model=model,
+                messages=current_messages,
+                temperature=self.decision_temperature,
+                max_tokens=10000,
+            )
 
-        response_time_ms = (time.time() - start_time) * 1000
+            response_time_ms = (time.time() - start_time) * 1000
+            if reservation:
+                reservation.settle(response.usage.prompt_tokens + response.usage.completion_tokens)
 
         # Record successful API call
         self.metrics_tracker.record_api_call(
-            model=self.model,
+            model=model,
             prompt_tokens=response.usage.prompt_tokens,
             completion_tokens=response.usage.completion_tokens,
             response_time_ms=response_time_ms,
             success=True,
+            cached_tokens=self._get_cached_tokens(response.usage),
         )
 
         message = response.choices[0].message
@@ -715,14 +1329,146 @@ Provide:
             return await self._handle_tool_calls(message, current_messages)
 
         # Handle Content and Native Reasoning
-        return await self._handle_content_response(message, current_messages, response)
+        return await self._handle_content_response(message, current_messages, response, model)
+
+    async def _execute_streaming_decision_step(
+        self, current_messages: List[Dict[str, Any]], model: Optional[str] = None
+    ) -> tuple[Dict[str, Any], List[Dict[str, Any]], bool]:
+        """Execute a single step of the decision loop over a streamed completion.
+
+        The stream is closed as soon as the decision JSON object is complete, so
+        tokens the model generates after it are not waited for.
+
+        Args:
+            current_messages: Conversation so far
+            model: Model to call (defaults to the current model)
+
+        Returns:
+            Tuple of (result, updated_messages, should_continue)
+        """
+        model = model or self.model
+        async with self._model_call_slot(model, current_messages) as reservation:
+            start_time = time.time()
+
+            stream = await self.client.chat.completions.create(
+                model=model,
+                messages=current_messages,
+                temperature=self.decision_temperature,
+                max_tokens=10000,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+
+            streamed = await self._read_decision_stream(stream, start_time)
+            response_time_ms = (time.time() - start_time) * 1000
+
+            usage = streamed.usage
+            if usage is None:
+                # The stream was closed before the final usage chunk arrived
+                usage = SimpleNamespace(
+                    prompt_tokens=estimate_tokens(json.dumps(current_messages, default=str)),
+                    completion_tokens=estimate_tokens(
+                        streamed.parser.text + "".join(streamed.reasoning_parts)
+                    ),
+                )
+            if reservation:
+                reservation.settle(usage.prompt_tokens + usage.completion_tokens)
+
+        self.metrics_tracker.record_api_call(
+            model=model,
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            response_time_ms=response_time_ms,
+            success=True,
+            time_to_first_decision_ms=streamed.time_to_first_decision_ms,
+            cached_tokens=self._get_cached_tokens(usage),
+        )
+        logger.debug(
+            f"Streamed LLM response in {response_time_ms:.0f}ms "
+            f"(decision complete: {streamed.parser.complete})"
+        )
+
+        if streamed.tool_calls:
+            return await self._handle_streamed_tool_calls(streamed, current_messages)
+
+        message = SimpleNamespace(
+            content=streamed.parser.result or streamed.parser.text,
+            reasoning_content="".join(streamed.reasoning_parts),
+            reasoning=None,
+        )
+        return await self._handle_content_response(
+            message, current_messages, SimpleNamespace(usage=usage), model
+        )
+
+    async def _read_decision_stream(self, stream: Any, start_time: float) -> _StreamedCompletion:
+        """Read a streamed completion until the decision JSON object is complete.
+
+        Args:
+            stream: Streamed chat completion
+            start_time: Time the request was sent, for the time to the first decision
+
+        Returns:
+            Content, reasoning, tool calls and usage collected from the stream
+        """
+        streamed = _StreamedCompletion()
+        try:
+            async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    streamed.usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                streamed.add_delta(delta)
+                if delta.content and streamed.add_content(delta.content, start_time):
+                    break
+        finally:
+            # Closing the stream cancels the rest of the generation
+            await stream.close()
+        return streamed
+
+    async def _handle_streamed_tool_calls(
+        self, streamed: _StreamedCompletion, current_messages: List[Dict[str, Any]]
+    ) -> tuple[Dict[str, Any], List[Dict[str, Any]], bool]:
+        """Process tool calls assembled from a streamed completion."""
+        calls = [streamed.tool_calls[index] for index in sorted(streamed.tool_calls)]
+        message = SimpleNamespace(
+            tool_calls=[
+                SimpleNamespace(
+                    id=call["id"],
+                    function=SimpleNamespace(name=call["name"], arguments=call["arguments"]),
+                )
+                for call in calls
+            ]
+        )
+        assistant_message = {
+            "role": "assistant",
+            "content": streamed.parser.text or None,
+            "tool_calls": [
+                {
+                    "id": call["id"],
+                    "type": "function",
+                    "function": {"name": call["name"], "arguments": call["arguments"]},
+                }
+                for call in calls
+            ],
+        }
+        return await self._handle_tool_calls(message, current_messages, assistant_message)
 
     async def _handle_tool_calls(
-        self, message: Any, current_messages: List[Dict[str, Any]]
+        self,
+        message: Any,
+        current_messages: List[Dict[str, Any]],
+        assistant_message: Optional[Dict[str, Any]] = None,
     ) -> tuple[Dict[str, Any], List[Dict[str, Any]], bool]:
-        """Process tool calls from the LLM."""
+        """Process tool calls from the LLM.
+
+        Args:
+            message: Assistant message holding the tool calls
+            current_messages: Conversation so far
+            assistant_message: Message to append instead of ``message`` (streamed responses)
+        """
         # Append the assistant's message with tool calls
-        current_messages.append(message)
+        current_messages.append(assistant_message if assistant_message is not None else message)
 
         for tool_call in message.tool_calls:
             if tool_call.function.name == "deepseek_reasoner":
@@ -753,9 +1499,14 @@ Provide:
         return {}, current_messages, True
 
     async def _handle_content_response(
-        self, message: Any, current_messages: List[Dict[str, Any]], response: Any
+        self,
+        message: Any,
+        current_messages: List[Dict[str, Any]],
+        response: Any,
+        model: Optional[str] = None,
     ) -> tuple[Dict[str, Any], List[Dict[str, Any]], bool]:
         """Process content response from the LLM."""
+        model = model or self.model
         content = getattr(message, "content", None) or ""
         reasoning_content = (
             getattr(message, "reasoning_content", None) or getattr(message, "reasoning", None) or ""
@@ -775,10 +1526,12 @@ Provide:
                     {
                         "content": content,
                         "usage": response.usage,
-                        "cost": self.metrics_tracker._calculate_cost(
-                            self.model,
+                        "model": model,
+                        "cost": self.metrics_tracker.estimate_cost(
+                            model,
                             response.usage.prompt_tokens,
                             response.usage.completion_tokens,
+                            self._get_cached_tokens(response.usage),
                         ),
                     },
                     current_messages,
@@ -863,6 +1616,29 @@ Provide:
         Returns:
             Formatted prompt string for multi-asset analysis
         """
+        return self._compile_multi_asset_decision_prompt(symbols, context, strategy_override).text
+
+    def _compile_multi_asset_decision_prompt(
+        self,
+        symbols: List[str],
+        context: TradingContext,
+        strategy_override: Optional[str] = None,
+    ) -> CompiledPrompt:
+        """Compile the multi-asset decision prompt within the prompt token budget.
+
+        Market data series are encoded more compactly when the full prompt exceeds
+        the budget. The strategy instructions and parameters form the static prefix;
+        market, account and risk data form the volatile suffix.
+
+        Args:
+            symbols: List of trading pair symbols
+            context: Multi-asset trading context
+            strategy_override: Optional strategy override
+
+        Returns:
+            CompiledPrompt with the prompt text, its prefix and suffix, and
+            per-section token counts
+        """
         strategy = context.account_state.active_strategy
         if strategy_override:
             prompt_template = self._get_strategy_template(strategy_override)
@@ -871,47 +1647,6 @@ Provide:
 
         account_state = context.account_state
 
-        # Build market data section for all assets
-        assets_data = []
-        for symbol in symbols:
-            asset_data = context.market_data.get_asset_data(symbol)
-            if asset_data:
-                # Format technical indicators for this asset
-                indicators = asset_data.technical_indicators
-                indicators_text = f"""
-  Primary Interval ({context.timeframes[0]}):
-    EMA-20: {", ".join([f"{v:.2f}" for v in indicators.interval.ema_20[-10:]]) if indicators.interval.ema_20 else "N/A"}
-    EMA-50: {", ".join([f"{v:.2f}" for v in indicators.interval.ema_50[-10:]]) if indicators.interval.ema_50 else "N/A"}
-    RSI: {", ".join([f"{v:.2f}" for v in indicators.interval.rsi[-10:]]) if indicators.interval.rsi else "N/A"}
-    MACD: {", ".join([f"{v:.4f}" for v in indicators.interval.macd[-10:]]) if indicators.interval.macd else "N/A"}
-    Bollinger Bands Upper: {", ".join([f"{v:.2f}" for v in indicators.interval.bb_upper[-10:]]) if indicators.interval.bb_upper else "N/A"}
-    Bollinger Bands Middle: {", ".join([f"{v:.2f}" for v in indicators.interval.bb_middle[-10:]]) if indicators.interval.bb_middle else "N/A"}
-    Bollinger Bands Lower: {", ".join([f"{v:.2f}" for v in indicators.interval.bb_lower[-10:]]) if indicators.interval.bb_lower else "N/A"}
-  Long-Term Interval ({context.timeframes[1]}):
-    EMA-20: {", ".join([f"{v:.2f}" for v in indicators.long_interval.ema_20[-10:]]) if indicators.long_interval.ema_20 else "N/A"}
-    EMA-50: {", ".join([f"{v:.2f}" for v in indicators.long_interval.ema_50[-10:]]) if indicators.long_interval.ema_50 else "N/A"}
-    RSI: {", ".join([f"{v:.2f}" for v in indicators.long_interval.rsi[-10:]]) if indicators.long_interval.rsi else "N/A"}
-    Bollinger Bands Upper: {", ".join([f"{v:.2f}" for v in indicators.long_interval.bb_upper[-10:]]) if indicators.long_interval.bb_upper else "N/A"}
-    Bollinger Bands Middle: {", ".join([f"{v:.2f}" for v in indicators.long_interval.bb_middle[-10:]]) if indicators.long_interval.bb_middle else "N/A"}
-    Bollinger Bands Lower: {", ".join([f"{v:.2f}" for v in indicators.long_interval.bb_lower[-10:]]) if indicators.long_interval.bb_lower else "N/A"}
-"""
-
-                # Format funding rate if available
-                funding_rate_text = ""
-                if asset_data.funding_rate is not None:
-                    funding_rate_text = f"Funding Rate: {asset_data.funding_rate * 100:.4f}%\n"
-
-                asset_text = f"""
---- {symbol} ---
-Current Price: ${asset_data.current_price:.2f}
-24h Change: {asset_data.price_change_24h:.2f}%
-24h Volume: ${asset_data.volume_24h:,.2f}
-Volatility: {asset_data.volatility:.2f}%
-{funding_rate_text}Trend: {asset_data.get_price_trend()}
-{indicators_text}
-"""
-                assets_data.append(asset_text)
-
         # Format account performance
         perf = account_state.recent_performance
         performance_text = f"""
@@ -922,6 +1657,7 @@ Max Drawdown: {perf.max_drawdown:.1f}%
 
         # Format risk metrics
         risk_metrics = f"""
+=== RISK METRICS ===
 Value at Risk (95%): ${context.risk_metrics.var_95:.2f}
 Max Drawdown: ${context.risk_metrics.max_drawdown:.2f}
 Correlation Risk: {context.risk_metrics.correlation_risk:.1f}%
@@ -951,31 +1687,19 @@ Max Leverage: {strategy.risk_parameters.max_leverage}x
 Max Positions: {strategy.max_positions}
 """
 
-        # Build the complete prompt
-        prompt = f"""
+        header = f"""
 === MULTI-ASSET PORTFOLIO ANALYSIS ===
 Analyze the following {len(symbols)} perpetual futures assets and provide a comprehensive portfolio-level trading strategy.
+"""
 
-=== MARKET DATA FOR ALL ASSETS ===
-{"".join(assets_data)}
-
-Market Sentiment: {context.market_data.market_sentiment or "neutral"}
-
+        account_info = f"""
 === ACCOUNT INFO ===
 Balance: ${account_state.balance_usd:,.2f}
 Available: ${account_state.available_balance:,.2f}
 Risk Exposure: {account_state.risk_exposure:.1f}%
+{performance_text}"""
 
-{performance_text}
-
-=== OPEN POSITIONS ===
-{positions_text}
-
-=== RISK METRICS ===
-{risk_metrics}
-
-{strategy_params}
-
+        instructions = f"""
 === INSTRUCTIONS ===
 {prompt_template}
 
@@ -989,7 +1713,155 @@ IMPORTANT: Analyze ALL assets and provide decisions for each. Consider:
 Provide a portfolio-level rationale explaining your overall trading strategy across all assets.
 """
 
-        return prompt.strip()
+        def render(encoding: str) -> List[Tuple[str, str]]:
+            return [
+                ("instructions", instructions),
+                ("strategy", strategy_params),
+                ("header", header),
+                ("market_data", self._format_market_data_section(symbols, context, encoding)),
+                ("account", account_info),
+                ("positions", f"=== OPEN POSITIONS ===\n{positions_text}"),
+                ("risk_metrics", risk_metrics),
+            ]
+
+        compiled = PromptCompiler(config.LLM_PROMPT_TOKEN_BUDGET).compile(
+            render, static_sections=_STATIC_PROMPT_SECTIONS
+        )
+        if not compiled.within_budget:
+            logger.warning(
+                f"Decision prompt for {len(symbols)} assets is ~{compiled.tokens} tokens, "
+                f"over the {compiled.token_budget} token budget"
+            )
+        logger.debug(
+            f"Compiled decision prompt: ~{compiled.tokens} tokens "
+            f"(~{compiled.prefix_tokens} in the static prefix), "
+            f"{compiled.encoding} series, sections {compiled.section_tokens()}"
+        )
+        return compiled
+
+    def _compile_market_analysis_prompt(
+        self, symbols: List[str], context: TradingContext
+    ) -> CompiledPrompt:
+        """Compile the account-independent market analysis prompt of two-stage decisions.
+
+        Args:
+            symbols: List of trading pair symbols
+            context: Multi-asset trading context; only its market data is used
+
+        Returns:
+            CompiledPrompt with the instructions as static prefix
+        """
+        family = context.account_state.active_strategy.strategy_type
+        instructions = f"""
+=== INSTRUCTIONS ===
+Analyze the following {len(symbols)} perpetual futures assets for {family} strategies.
+Rate each asset's directional bias and your conviction in it, and give take-profit and
+stop-loss levels for a position in that direction. Do not size positions: the analysis
+is shared by every account running a {family} strategy.
+"""
+
+        def render(encoding: str) -> List[Tuple[str, str]]:
+            return [
+                ("instructions", instructions),
+                ("market_data", self._format_market_data_section(symbols, context, encoding)),
+            ]
+
+        compiled = PromptCompiler(config.LLM_PROMPT_TOKEN_BUDGET).compile(
+            render, static_sections=("instructions",)
+        )
+        logger.debug(
+            f"Compiled market analysis prompt: ~{compiled.tokens} tokens, "
+            f"{compiled.encoding} series"
+        )
+        return compiled
+
+    def _format_market_data_section(
+        self, symbols: List[str], context: TradingContext, encoding: str
+    ) -> str:
+        """Format market data for all assets with the given series encoding."""
+        assets_data = []
+        for symbol in symbols:
+            asset_data = context.market_data.get_asset_data(symbol)
+            if asset_data:
+                # Format technical indicators for this asset
+                indicators = asset_data.technical_indicators
+                indicators_text = (
+                    f"  Primary Interval ({context.timeframes[0]}):\n"
+                    + self._format_indicator_series(
+                        indicators.interval, _INDICATOR_SERIES, encoding
+                    )
+                    + f"  Long-Term Interval ({context.timeframes[1]}):\n"
+                    + self._format_indicator_series(
+                        indicators.long_interval, _LONG_INTERVAL_SERIES, encoding
+                    )
+                )
+
+                # Format funding rate if available
+                funding_rate_text = ""
+                if asset_data.funding_rate is not None:
+                    funding_rate_text = f"Funding Rate: {asset_data.funding_rate * 100:.4f}%\n"
+
+                asset_text = f"""
+--- {symbol} ---
+Current Price: ${asset_data.current_price:.2f}
+24h Change: {asset_data.price_change_24h:.2f}%
+24h Volume: ${asset_data.volume_24h:,.2f}
+Volatility: {asset_data.volatility:.2f}%
+{funding_rate_text}Trend: {asset_data.get_price_trend()}
+{indicators_text}"""
+                assets_data.append(asset_text)
+
+        legend = SERIES_LEGENDS[encoding]
+        return f"""
+=== MARKET DATA FOR ALL ASSETS ===
+{legend}
+{"".join(assets_data)}
+
+Market Sentiment: {context.market_data.market_sentiment or "neutral"}
+"""
+
+    @staticmethod
+    def _format_indicator_series(
+        indicator_set: Any,
+        series: Tuple[Tuple[str, str, str, int], ...],
+        encoding: str,
+    ) -> str:
+        """Format one timeframe's indicator series, one line per indicator."""
+        lines = []
+        for label, compact_label, attribute, decimals in series:
+            name = label if encoding == "full" else compact_label
+            values = getattr(indicator_set, attribute)
+            lines.append(f"    {name}: {format_series(values, decimals, encoding)}\n")
+        return "".join(lines)
+
+    def _get_market_analysis_system_prompt(self) -> str:
+        """Get system prompt for the shared market analysis of two-stage decisions."""
+        return """You are an expert cryptocurrency market analyst for perpetual futures.
+
+CRITICAL: You must respond with ONLY valid JSON. No explanations, no thinking, no text before or after the JSON.
+
+Your response must be valid JSON with the following structure:
+{
+  "signals": [
+    {
+      "asset": "BTCUSDT",
+      "bias": "long|short|neutral",
+      "conviction": 75,
+      "tp_price": 50000.0,
+      "sl_price": 45000.0,
+      "risk_level": "low|medium|high",
+      "rationale": "Detailed reasoning for this asset's bias"
+    }
+  ],
+  "market_summary": "Overall market read across all assets",
+  "market_risk_level": "low|medium|high"
+}
+
+Rules:
+- Respond with ONLY JSON - no text before, no text after
+- Provide a signal for ALL assets in the analysis
+- conviction is 0-100; use "neutral" with low conviction when there is no clear setup
+- tp_price and sl_price must be on the correct side of the current price for the bias"""
 
     def _get_decision_system_prompt(self) -> str:
         """Get system prompt for multi-asset decision generation."""
@@ -1109,184 +1981,42 @@ Rules:
             logger.error(f"Multi-asset decision validation failed: {e}")
             raise ValidationError(f"Invalid multi-asset decision format: {e}") from e
 
-    def _remove_thinking_content(self, text: str) -> str:
-        """Remove thinking/reasoning content from LLM responses.
+    def _is_valid_market_analysis(self, response_data: Dict[str, Any], symbols: List[str]) -> bool:
+        """Check whether LLM response data parses into a market analysis."""
+        try:
+            parse_market_analysis(response_data.get("content") or "", symbols, "")
+        except ValidationError:
+            return False
+        return True
+
+    def _is_valid_decision_response(
+        self, response_data: Dict[str, Any], symbols: List[str]
+    ) -> bool:
+        """Check whether LLM response data parses into a valid decision."""
+        try:
+            self._parse_multi_asset_decision_response(response_data, symbols)
+        except ValidationError:
+            return False
+        return True
 
-        Reasoning models like deepseek-r1 often include thinking content before
-        the actual JSON response. This method strips that content.
+    def _extract_json_from_text(self, text: str) -> Dict[str, Any]:
+        """Extract the decision JSON object from text response.
 
         Args:
-            text: Raw LLM response text
+            text: Raw LLM response text, possibly with prose, code fences or thinking
 
         Returns:
-            Text with thinking content removed
-        """
+            Parsed JSON object
 
-        original_length = len(text)
-        logger.debug(
-            f"Processing response for thinking removal (original length: {original_length})"
-        )
-
-        patterns = [
-            (r"<thinking>.*?</thinking>", re.DOTALL | re.IGNORECASE),
-            (r"\\boxed\{[^}]*\}", 0),
-            (r"(?:Reasoning|Thinking)[:\s]+.*?(?=\{|```json|$)", re.IGNORECASE | re.DOTALL),
-            (r"<\|reserved_\d+\|>.*?<\|reserved_\d+\|>", re.DOTALL | re.IGNORECASE),
-            (r"<\|im_start\|>thinking.*?<\|im_end\|>", re.DOTALL | re.IGNORECASE),
-            (r"Answer[:\s]+.*?(?=\{|```json|$)", re.IGNORECASE | re.DOTALL),
-            (
-                r"^(?:We are|Let me|Based on|Considering|After|I will|I can|First|Seeing that|For this|In this|As we|The |To )[^\n{]*(?=\n(?:```json|\{))",
-                re.IGNORECASE | re.MULTILINE,
-            ),
-            (r"### Thinking.*?###", re.DOTALL | re.IGNORECASE),
-            (r"\*\*Thinking:.*?\*\*", re.DOTALL | re.IGNORECASE),
-            (r"Thinking Process:.*?(?=\{|```)", re.DOTALL | re.IGNORECASE),
-            (
-                r"\n\s*(?:Let me|Here's|Now|Based on|After|First|Seeing that|In summary)[^.]*\n(?=```)",
-                re.IGNORECASE,
-            ),
-        ]
-
-        for pattern, flags in patterns:
-            text = re.sub(pattern, "", text, flags=flags)
-
-        # Clean up extra whitespace and newlines
-        text = re.sub(r"\n{3,}", "\n\n", text)
-        text = text.strip()
-
-        removed_length = original_length - len(text)
-        logger.debug(f"Removed {removed_length} characters of thinking content")
-
-        return text
-
-    def _extract_json_from_text(self, text: str) -> Dict[str, Any]:
-        """Extract JSON from text response."""
+        Raises:
+            ValidationError: When no JSON object is found
+        """
         logger.debug(f"Extracting JSON from text (length: {len(text)} chars)")
 
-        # 0. Clean thinking content first to avoid false positives
-        text = self._remove_thinking_content(text)
-
-        # 1. Try to extract JSON from code blocks (most reliable)
-        code_block_json = self._extract_json_from_code_blocks(text)
-        if code_block_json:
-            return code_block_json
-
-        # 2. Comprehensive search for JSON objects
-        scanned_json = self._scan_for_json_objects(text)
-        if scanned_json:
-            return scanned_json
-
-        # 3. Fall back to regex for small/nested structures if the above failed
-        regex_json = self._extract_json_via_regex(text)
-        if regex_json:
-            return regex_json
-
-        raise ValidationError("No valid JSON found in response")
-
-    def _extract_json_from_code_blocks(self, text: str) -> Optional[Dict[str, Any]]:
-        """Try to extract JSON from markdown code blocks."""
-
-        code_block_patterns = [
-            r"```(?:json)?\s*(\{[\s\S]*?\})\s*```",  # Code block with JSON
-            r"```(?:json)?\s*(\[.*?\]\n)\s*```",  # Code block with JSON array
-        ]
-
-        for pattern in code_block_patterns:
-            matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
-            for match in matches:
-                try:
-                    parsed = json.loads(match)
-                    logger.debug("Successfully parsed JSON from code block")
-                    return parsed
-                except json.JSONDecodeError as e:
-                    logger.debug(f"Failed to parse JSON from code block: {e}")
-                    continue
-        return None
-
-    def _extract_json_via_regex(self, text: str) -> Optional[Dict[str, Any]]:
-        """Extract JSON using regex as a last resort."""
-
-        logger.debug("Falling back to regex extraction")
-        json_pattern = r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}"
-        matches = re.findall(json_pattern, text, re.DOTALL)
-
-        for match in matches:
-            try:
-                parsed = json.loads(match)
-                if isinstance(parsed, dict) and "decisions" in parsed:
-                    logger.debug("Found JSON with 'decisions' key via regex")
-                    return parsed
-            except json.JSONDecodeError:
-                continue
-
-        # Return any valid JSON from regex if no 'decisions' found
-        for match in matches:
-            try:
-                parsed = json.loads(match)
-                logger.debug(f"Found JSON keys: {list(parsed.keys())} via regex")
-                return parsed
-            except json.JSONDecodeError:
-                continue
-        return None
-
-    def _scan_for_json_objects(self, text: str) -> Optional[Dict[str, Any]]:
-        """Scan text for valid JSON objects by finding braces."""
-
-        valid_objects = []
-        start_indices = [m.start() for m in re.finditer(r"\{", text)]
-
-        if len(start_indices) > 50:
-            logger.debug(f"Found {len(start_indices)} start positions, checking all")
-
-        for start_idx in start_indices:
-            obj = self._parse_json_at_start_index(text, start_idx)
-            if obj:
-                valid_objects.append(obj)
-                if obj["has_decisions"]:
-                    break
-
-        if valid_objects:
-            valid_objects.sort(key=lambda x: x["score"], reverse=True)
-            best_match = valid_objects[0]
-            logger.debug(
-                f"Found {len(valid_objects)} valid JSON objects. Best match score: {best_match['score']}"
-            )
-            return best_match["parsed"]
-
-        return None
-
-    def _parse_json_at_start_index(self, text: str, start_idx: int) -> Optional[Dict[str, Any]]:
-        """Try to parse a JSON object starting at a specific index."""
-        end_idx = text.rfind("}")
-        if end_idx == -1 or end_idx <= start_idx or (end_idx - start_idx < 10):
-            return None
-
-        current_end = end_idx
-        max_shrink_attempts = 20
-        attempts = 0
-
-        while current_end > start_idx and attempts < max_shrink_attempts:
-            potential_json = text[start_idx : current_end + 1]
-            try:
-                parsed = json.loads(potential_json)
-                score = 0
-                has_decisions = False
-                if isinstance(parsed, dict):
-                    if "decisions" in parsed:
-                        score += 1000
-                        has_decisions = True
-                    score += len(potential_json)
-
-                return {
-                    "parsed": parsed,
-                    "score": score,
-                    "has_decisions": has_decisions,
-                    "length": len(potential_json),
-                }
-            except json.JSONDecodeError:
-                current_end = text.rfind("}", start_idx, current_end)
-                attempts += 1
-        return None
+        extracted = extract_json_object(text)
+        if extracted is None:
+            raise ValidationError("No valid JSON found in response")
+        return extracted
 
     def _create_multi_asset_fallback_decision(self, symbols: List[str]) -> TradingDecision:
         """Create conservative multi-asset fallback decision when LLM fails.
@@ -1396,15 +2126,18 @@ Generate an aggressive trading decision.
 
         return templates.get(strategy_type, templates["conservative"])
 
-    async def _test_model_connection(self) -> bool:
-        """Test connection to current model.
+    async def _test_model_connection(self, model: Optional[str] = None) -> bool:
+        """Test connection to a model.
+
+        Args:
+            model: Model to test (defaults to the current model)
 
         Returns:
             True if connection successful
         """
         try:
             response = await self.client.chat.completions.create(
-                model=self.model,
+                model=model or self.model,
                 messages=[{"role": "user", "content": "Test connection. Respond with 'OK'."}],
                 max_tokens=10,
                 temperature=0,
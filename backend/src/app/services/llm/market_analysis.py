@@ -0,0 +1,284 @@
+"""
+Two-stage decisions: a shared market analysis and a per-account allocation.
+
+The market half of a decision prompt is identical for every account running a
+strategy family, so in two-stage mode it is analysed once per candle into a
+per-asset signal summary. ``PortfolioAllocator`` then turns that summary into a
+``TradingDecision`` for each account from its balance, positions and risk
+parameters without another LLM call, so cost grows with assets plus accounts
+rather than assets times accounts.
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+from ...core.logging import get_logger
+from ...schemas.trading_decision import (
+    Action,
+    AssetDecision,
+    RiskLevel,
+    StrategyRiskParameters,
+    TradingContext,
+    TradingDecision,
+)
+from .json_extraction import extract_json_object
+from .llm_exceptions import ValidationError
+
+logger = get_logger(__name__)
+
+_BIASES = ("long", "short", "neutral")
+_RISK_LEVELS = ("low", "medium", "high")
+# Stop distance used when a strategy does not set one
+_DEFAULT_STOP_LOSS_PERCENTAGE = 2.0
+
+
+@dataclass
+class AssetSignal:
+    """Direction and conviction of one asset from the market analysis."""
+
+    asset: str
+    bias: str = "neutral"
+    conviction: float = 0.0
+    tp_price: Optional[float] = None
+    sl_price: Optional[float] = None
+    risk_level: RiskLevel = "medium"
+    rationale: str = ""
+
+
+@dataclass
+class MarketAnalysis:
+    """Per-asset signal summary shared by the accounts of a strategy family."""
+
+    strategy_family: str
+    signals: Dict[str, AssetSignal] = field(default_factory=dict)
+    market_summary: str = ""
+    market_risk_level: RiskLevel = "medium"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to JSON-serializable data for the analysis cache."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MarketAnalysis":
+        """Rebuild an analysis from to_dict data."""
+        return cls(
+            strategy_family=data["strategy_family"],
+            signals={
+                asset: AssetSignal(**signal) for asset, signal in data.get("signals", {}).items()
+            },
+            market_summary=data.get("market_summary", ""),
+            market_risk_level=data.get("market_risk_level", "medium"),
+        )
+
+
+def _optional_price(value: Any) -> Optional[float]:
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return None
+    return price if price > 0 else None
+
+
+def _risk_level(value: Any) -> RiskLevel:
+    level = str(value).lower()
+    return cast(RiskLevel, level) if level in _RISK_LEVELS else "medium"
+
+
+def parse_market_analysis(content: str, symbols: List[str], strategy_family: str) -> MarketAnalysis:
+    """
+    Parse the market analysis response.
+
+    Assets missing from the response get a neutral signal.
+
+    Args:
+        content: Raw LLM response text
+        symbols: Symbols the analysis was requested for
+        strategy_family: Strategy family the analysis was made for
+
+    Returns:
+        MarketAnalysis with a signal for every symbol
+
+    Raises:
+        ValidationError: When the response holds no signal for any symbol
+    """
+    data = extract_json_object(content, key="signals")
+    if not data or not isinstance(data.get("signals"), list):
+        raise ValidationError("Market analysis response has no signals list")
+
+    signals: Dict[str, AssetSignal] = {}
+    for entry in data["signals"]:
+        if not isinstance(entry, dict) or entry.get("asset") not in symbols:
+            continue
+        bias = str(entry.get("bias", "neutral")).lower()
+        try:
+            conviction = min(100.0, max(0.0, float(entry.get("conviction", 0))))
+        except (TypeError, ValueError):
+            conviction = 0.0
+        signals[entry["asset"]] = AssetSignal(
+            asset=entry["asset"],
+            bias=bias if bias in _BIASES else "neutral",
+            conviction=conviction,
+            tp_price=_optional_price(entry.get("tp_price")),
+            sl_price=_optional_price(entry.get("sl_price")),
+            risk_level=_risk_level(entry.get("risk_level", "medium")),
+            rationale=str(entry.get("rationale", "")),
+        )
+    if not signals:
+        raise ValidationError(f"Market analysis has no signal for any of {symbols}")
+
+    for symbol in symbols:
+        signals.setdefault(symbol, AssetSignal(asset=symbol, rationale="Not analysed"))
+
+    return MarketAnalysis(
+        strategy_family=strategy_family,
+        signals=signals,
+        market_summary=str(data.get("market_summary", "")),
+        market_risk_level=_risk_level(data.get("market_risk_level", "medium")),
+    )
+
+
+class PortfolioAllocator:
+    """Deterministically sizes an account's positions from a shared market analysis."""
+
+    def __init__(self, min_conviction: float = 60.0, max_balance_fraction: float = 0.5):
+        """
+        Initialize the allocator.
+
+        Args:
+            min_conviction: Signal conviction needed to open or close a position
+            max_balance_fraction: Largest share of the available balance one position may use
+        """
+        self.min_conviction = min_conviction
+        self.max_balance_fraction = max_balance_fraction
+
+    def allocate(
+        self, analysis: MarketAnalysis, symbols: List[str], context: TradingContext
+    ) -> TradingDecision:
+        """
+        Turn a market analysis into an account's multi-asset decision.
+
+        Open positions are closed when the signal turned against them with enough
+        conviction. Free position slots go to the strongest long or short signals,
+        each sized so a stop-out loses at most the strategy's risk per trade,
+        scaled by conviction and capped by the account's position and balance limits.
+
+        Args:
+            analysis: Shared market analysis
+            symbols: Symbols to decide on
+            context: Trading context of the account
+
+        Returns:
+            TradingDecision with a decision for every symbol
+        """
+        account = context.account_state
+        strategy = account.active_strategy
+        decisions: Dict[str, AssetDecision] = {}
+
+        for symbol in symbols:
+            position = account.get_position_for_symbol(symbol)
+            if position is None:
+                continue
+            signal = analysis.signals.get(symbol) or AssetSignal(asset=symbol)
+            against = "short" if position.side == "long" else "long"
+            if signal.bias == against and signal.conviction >= self.min_conviction:
+                decisions[symbol] = self._decision(
+                    signal, "close_position", exit_plan=f"Close the {position.side} position"
+                )
+            else:
+                decisions[symbol] = self._hold(signal, f"Keep the {position.side} position")
+
+        candidates = sorted(
+            (
+                analysis.signals[symbol]
+                for symbol in symbols
+                if symbol not in decisions
+                and symbol in analysis.signals
+                and analysis.signals[symbol].bias != "neutral"
+                and analysis.signals[symbol].conviction >= self.min_conviction
+            ),
+            key=lambda signal: signal.conviction,
+            reverse=True,
+        )
+        open_slots = max(0, strategy.max_positions - len(account.open_positions))
+        remaining = account.available_balance
+        for signal in candidates:
+            asset_data = context.market_data.get_asset_data(signal.asset)
+            if open_slots == 0 or asset_data is None:
+                continue
+            price = asset_data.current_price
+            tp_price, sl_price = self._exit_prices(signal, price, strategy.risk_parameters)
+            stop_fraction = abs(price - sl_price) / price
+            risk_budget = account.balance_usd * strategy.risk_parameters.max_risk_per_trade / 100
+            allocation = round(
+                min(
+                    risk_budget / stop_fraction * signal.conviction / 100,
+                    account.max_position_size,
+                    account.available_balance * self.max_balance_fraction,
+                    remaining,
+                ),
+                2,
+            )
+            if allocation <= 0:
+                continue
+            remaining -= allocation
+            open_slots -= 1
+            decisions[signal.asset] = self._decision(
+                signal,
+                "buy" if signal.bias == "long" else "sell",
+                allocation_usd=allocation,
+                tp_price=tp_price,
+                sl_price=sl_price,
+                exit_plan=f"Take profit at {tp_price:.2f}, stop loss at {sl_price:.2f}",
+            )
+
+        ordered = [
+            decisions.get(symbol)
+            or self._hold(analysis.signals.get(symbol) or AssetSignal(asset=symbol))
+            for symbol in symbols
+        ]
+        total_allocation = round(sum(decision.allocation_usd for decision in ordered), 2)
+        return TradingDecision(
+            decisions=ordered,
+            portfolio_rationale=(
+                f"{analysis.market_summary} New positions: "
+                f"{sum(1 for d in ordered if d.action in ('buy', 'sell'))} "
+                f"(${total_allocation:,.2f} allocated)."
+            ).strip(),
+            total_allocation_usd=total_allocation,
+            portfolio_risk_level=analysis.market_risk_level,
+        )
+
+    @staticmethod
+    def _exit_prices(
+        signal: AssetSignal, price: float, risk: StrategyRiskParameters
+    ) -> Tuple[float, float]:
+        """Get take-profit and stop-loss prices, preferring the analysis' own levels."""
+        direction = 1 if signal.bias == "long" else -1
+        sl_price = signal.sl_price
+        if sl_price is None or (price - sl_price) * direction <= 0:
+            stop_percentage = risk.stop_loss_percentage or _DEFAULT_STOP_LOSS_PERCENTAGE
+            sl_price = price * (1 - direction * stop_percentage / 100)
+        tp_price = signal.tp_price
+        if tp_price is None or (tp_price - price) * direction <= 0:
+            tp_price = price + direction * abs(price - sl_price) * risk.take_profit_ratio
+        return round(tp_price, 8), round(sl_price, 8)
+
+    @staticmethod
+    def _decision(
+        signal: AssetSignal, action: Action, exit_plan: str, **values: Any
+    ) -> AssetDecision:
+        return AssetDecision(
+            asset=signal.asset,
+            action=action,
+            allocation_usd=values.pop("allocation_usd", 0.0),
+            exit_plan=exit_plan,
+            rationale=signal.rationale or f"{signal.bias} bias",
+            confidence=signal.conviction,
+            risk_level=signal.risk_level,
+            **values,
+        )
+
+    def _hold(
+        self, signal: AssetSignal, exit_plan: str = "Wait for a stronger signal"
+    ) -> AssetDecision:
+        return self._decision(signal, "hold", exit_plan=exit_plan)
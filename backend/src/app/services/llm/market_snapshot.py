@@ -0,0 +1,221 @@
+"""
+Shared market context snapshots for the LLM Decision Engine.
+
+The market half of a TradingContext (prices, indicators, sentiment) is identical for
+every account trading the same symbols and timeframes. The MarketSnapshotStore builds it
+once per candle close and hands the same immutable snapshot to every account's context,
+so only the account and risk parts are built per account.
+
+Snapshots are versioned by a per-(symbol, interval) candle counter that is advanced on
+every CandleCloseEvent. A snapshot stays valid until one of its symbols closes a candle
+on one of its timeframes, or until the TTL fallback expires (for deployments where the
+candle scheduler is not running).
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ...schemas.trading_decision import MarketContext
+
+logger = logging.getLogger(__name__)
+
+SnapshotKey = Tuple[Tuple[str, ...], Tuple[str, ...]]
+MarketContextBuilder = Callable[[], Awaitable[Tuple[MarketContext, List[str]]]]
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """Immutable, versioned market context shared by reference across accounts.
+
+    The wrapped MarketContext is shared by every TradingContext built from this
+    snapshot and must be treated as read-only.
+    """
+
+    symbols: Tuple[str, ...]
+    timeframes: Tuple[str, ...]
+    version: Tuple[int, ...]
+    market_context: MarketContext
+    errors: Tuple[str, ...] = ()
+    built_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @property
+    def key(self) -> SnapshotKey:
+        """Key identifying the symbol set and timeframe pair of this snapshot."""
+        return (self.symbols, self.timeframes)
+
+    def age_seconds(self) -> float:
+        """Seconds elapsed since the snapshot was built."""
+        return (datetime.now(timezone.utc) - self.built_at).total_seconds()
+
+
+class MarketSnapshotStore:
+    """Versioned store of shared market context snapshots.
+
+    Concurrent requests for the same symbol set and timeframe pair are coalesced so
+    that the market context is built once per candle close regardless of how many
+    accounts ask for it.
+    """
+
+    def __init__(self, ttl_seconds: int = 300):
+        """Initialize the snapshot store.
+
+        Args:
+            ttl_seconds: Fallback lifetime of a snapshot when no candle close arrives
+        """
+        self.ttl_seconds = ttl_seconds
+        self._snapshots: Dict[SnapshotKey, MarketSnapshot] = {}
+        self._candle_versions: Dict[Tuple[str, str], int] = {}
+        self._build_locks: Dict[SnapshotKey, asyncio.Lock] = {}
+        # Requests holding or waiting for each build lock; a lock is dropped with its
+        # last user, since symbol sets come from requests and are open-ended
+        self._build_lock_users: Dict[SnapshotKey, int] = {}
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "builds": 0,
+            "invalidations": 0,
+        }
+
+    @staticmethod
+    def make_key(symbols: List[str], timeframes: List[str]) -> SnapshotKey:
+        """Build the snapshot key for a symbol set and timeframe pair."""
+        return (tuple(sorted(set(symbols))), tuple(timeframes))
+
+    def current_version(self, key: SnapshotKey) -> Tuple[int, ...]:
+        """Get the current candle version for a snapshot key."""
+        symbols, timeframes = key
+        return tuple(
+            self._candle_versions.get((symbol, timeframe), 0)
+            for symbol in symbols
+            for timeframe in timeframes
+        )
+
+    def _is_valid(self, snapshot: MarketSnapshot) -> bool:
+        return (
+            snapshot.version == self.current_version(snapshot.key)
+            and snapshot.age_seconds() < self.ttl_seconds
+        )
+
+    def get(self, symbols: List[str], timeframes: List[str]) -> Optional[MarketSnapshot]:
+        """Get the current snapshot for a symbol set and timeframe pair, if still valid.
+
+        Args:
+            symbols: Trading pair symbols
+            timeframes: Timeframe pair of the snapshot
+
+        Returns:
+            The shared MarketSnapshot, or None if missing or superseded
+        """
+        key = self.make_key(symbols, timeframes)
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            return None
+        if not self._is_valid(snapshot):
+            del self._snapshots[key]
+            return None
+        return snapshot
+
+    async def get_or_build(
+        self,
+        symbols: List[str],
+        timeframes: List[str],
+        builder: MarketContextBuilder,
+        force_refresh: bool = False,
+    ) -> MarketSnapshot:
+        """Get the current snapshot, building it once if it is missing or superseded.
+
+        Args:
+            symbols: Trading pair symbols
+            timeframes: Timeframe pair of the snapshot
+            builder: Coroutine factory returning (MarketContext, errors)
+            force_refresh: Rebuild the snapshot even if the current one is valid
+
+        Returns:
+            The shared MarketSnapshot
+        """
+        key = self.make_key(symbols, timeframes)
+        if not force_refresh and (snapshot := self.get(symbols, timeframes)):
+            self.stats["hits"] += 1
+            return snapshot
+
+        lock = self._build_locks.setdefault(key, asyncio.Lock())
+        self._build_lock_users[key] = self._build_lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                # Another request may have built the snapshot while we waited
+                if not force_refresh and (snapshot := self.get(symbols, timeframes)):
+                    self.stats["hits"] += 1
+                    return snapshot
+
+                # Capture the version before building so that a candle closing mid-build
+                # leaves the new snapshot already superseded
+                version = self.current_version(key)
+                market_context, errors = await builder()
+                snapshot = MarketSnapshot(
+                    symbols=key[0],
+                    timeframes=key[1],
+                    version=version,
+                    market_context=market_context,
+                    errors=tuple(errors),
+                )
+                self._snapshots[key] = snapshot
+                self.stats["builds"] += 1
+                logger.debug(f"Built market snapshot for {key[0]} {key[1]} at version {version}")
+                return snapshot
+        finally:
+            self._release_build_lock(key)
+
+    def _release_build_lock(self, key: SnapshotKey) -> None:
+        """Drop the build lock of a key once no request holds or waits for it."""
+        users = self._build_lock_users[key] - 1
+        if users:
+            self._build_lock_users[key] = users
+        else:
+            del self._build_lock_users[key]
+            del self._build_locks[key]
+
+    def is_current(self, market_context: MarketContext) -> bool:
+        """Check whether a market context is the one held by a valid snapshot."""
+        return any(
+            snapshot.market_context is market_context and self._is_valid(snapshot)
+            for snapshot in self._snapshots.values()
+        )
+
+    def advance(self, symbol: str, interval: str) -> None:
+        """Advance the candle version of a symbol and interval after a candle close.
+
+        Args:
+            symbol: Symbol whose candle closed
+            interval: Candle interval that closed
+        """
+        version_key = (symbol, interval)
+        self._candle_versions[version_key] = self._candle_versions.get(version_key, 0) + 1
+
+        stale_keys = [key for key in self._snapshots if symbol in key[0] and interval in key[1]]
+        for key in stale_keys:
+            del self._snapshots[key]
+        if stale_keys:
+            self.stats["invalidations"] += len(stale_keys)
+            logger.debug(f"Superseded {len(stale_keys)} market snapshots on {symbol} {interval}")
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Drop snapshots containing a symbol, or all snapshots if no symbol is given."""
+        if symbol is None:
+            removed = len(self._snapshots)
+            self._snapshots.clear()
+        else:
+            stale_keys = [key for key in self._snapshots if symbol in key[0]]
+            for key in stale_keys:
+                del self._snapshots[key]
+            removed = len(stale_keys)
+        self.stats["invalidations"] += removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get snapshot store statistics."""
+        return {
+            **self.stats,
+            "snapshots": len(self._snapshots),
+            "tracked_candles": len(self._candle_versions),
+        }
@@ -0,0 +1,210 @@
+"""
+Latency- and cost-aware routing of decision requests across a model pool.
+
+Each request is routed to the configured model with the best rolling score over
+p95 latency, cost per call and error rate, among the models whose quality meets
+the strategy's floor. Every model has its own circuit breaker; models whose
+circuit is open are tried last, so decisions fail over to the next model when
+a provider degrades.
+"""
+
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from ...core.logging import get_logger
+from .circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+from .llm_exceptions import LLMAPIError
+from .llm_metrics import LLMMetricsTracker
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ModelRouteStats:
+    """Rolling routing statistics of a pool model."""
+
+    model: str
+    quality: float
+    calls: int = 0
+    p95_response_time_ms: Optional[float] = None
+    error_rate: float = 0.0
+    cost_per_call: Optional[float] = None
+    circuit_open: bool = False
+    score: float = 0.0
+
+
+class ModelRouter:
+    """Orders a model pool per request by rolling latency, cost and error rate."""
+
+    def __init__(
+        self,
+        models: Dict[str, float],
+        metrics_tracker: LLMMetricsTracker,
+        quality_floors: Optional[Dict[str, float]] = None,
+        window_minutes: float = 15.0,
+        max_error_rate: float = 50.0,
+        latency_weight: float = 1.0,
+        cost_weight: float = 1.0,
+        error_weight: float = 1.0,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+        stats_ttl_seconds: float = 5.0,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            models: Pool of model names with their quality scores (0-100)
+            metrics_tracker: Source of per-call latency, cost and error records
+            quality_floors: Minimum model quality per strategy id or strategy type
+            window_minutes: Rolling window of the routing statistics
+            max_error_rate: Error rate (percent) above which a model is tried last
+            latency_weight: Weight of the normalized p95 latency in the score
+            cost_weight: Weight of the normalized cost per call in the score
+            error_weight: Weight of the error rate in the score
+            circuit_breakers: Registry of the per-model circuit breakers (a registry with
+                the default breaker settings when not given)
+            stats_ttl_seconds: Seconds a model's window statistics are reused before the
+                metrics history is scanned again; circuit state is always current
+        """
+        self.models = dict(models)
+        self.metrics_tracker = metrics_tracker
+        self.quality_floors = dict(quality_floors or {})
+        self.window_minutes = window_minutes
+        self.max_error_rate = max_error_rate
+        self.latency_weight = latency_weight
+        self.cost_weight = cost_weight
+        self.error_weight = error_weight
+        self.circuit_breakers = circuit_breakers or CircuitBreakerRegistry(
+            expected_exception=LLMAPIError
+        )
+        self.stats_ttl_seconds = stats_ttl_seconds
+        # model -> (computed at, window statistics), so routing does not rescan the
+        # metrics history on every request
+        self._window_stats: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+        self.routed_requests = 0
+        self.failovers = 0
+        self.routes_per_model: Dict[str, int] = dict.fromkeys(self.models, 0)
+
+    def circuit_breaker(self, model: str) -> CircuitBreaker:
+        """Get the circuit breaker of a model, creating it on first use."""
+        return self.circuit_breakers.get(model)
+
+    def quality_floor(
+        self, strategy_id: Optional[str] = None, strategy_type: Optional[str] = None
+    ) -> float:
+        """Get the minimum model quality of a strategy (its id takes precedence)."""
+        for key in (strategy_id, strategy_type):
+            if key and key in self.quality_floors:
+                return self.quality_floors[key]
+        return 0.0
+
+    def get_model_stats(self) -> List[ModelRouteStats]:
+        """Get the rolling statistics and score of every pool model."""
+        stats = []
+        for model, quality in self.models.items():
+            window = self._get_window_stats(model)
+            stats.append(
+                ModelRouteStats(
+                    model=model,
+                    quality=quality,
+                    calls=window["calls"],
+                    p95_response_time_ms=window["p95_response_time_ms"],
+                    error_rate=window["error_rate"],
+                    cost_per_call=window["cost_per_call"],
+                    circuit_open=not self.circuit_breaker(model).allows_calls,
+                )
+            )
+        self._score(stats)
+        return stats
+
+    def _get_window_stats(self, model: str) -> Dict[str, Any]:
+        """Get a model's rolling window statistics, rescanning at most once per TTL."""
+        now = time.monotonic()
+        cached = self._window_stats.get(model)
+        if cached is not None and now - cached[0] < self.stats_ttl_seconds:
+            return cached[1]
+        window = self.metrics_tracker.get_model_window_stats(model, self.window_minutes)
+        self._window_stats[model] = (now, window)
+        return window
+
+    def route(
+        self, strategy_id: Optional[str] = None, strategy_type: Optional[str] = None
+    ) -> List[str]:
+        """
+        Order the pool for a request, best candidate first.
+
+        Models below the strategy's quality floor are excluded unless no model
+        meets it. Healthy models come first, then models over the error rate
+        limit, then models whose circuit is open; each group is ordered by score.
+
+        Args:
+            strategy_id: Id of the strategy making the request
+            strategy_type: Type of the strategy making the request
+
+        Returns:
+            Model names in the order they should be tried
+        """
+        stats = self.get_model_stats()
+        floor = self.quality_floor(strategy_id, strategy_type)
+        eligible = [entry for entry in stats if entry.quality >= floor]
+        if not eligible:
+            logger.warning(
+                f"No routed model meets the quality floor {floor}; using the highest quality"
+            )
+            best_quality = max(entry.quality for entry in stats)
+            eligible = [entry for entry in stats if entry.quality == best_quality]
+
+        eligible.sort(
+            key=lambda entry: (
+                entry.circuit_open,
+                entry.error_rate > self.max_error_rate,
+                entry.score,
+            )
+        )
+        candidates = [entry.model for entry in eligible]
+
+        self.routed_requests += 1
+        self.routes_per_model[candidates[0]] += 1
+        logger.debug(f"Routed decision request to {candidates[0]} (candidates: {candidates})")
+        return candidates
+
+    def record_failover(self, from_model: str, error: Exception) -> None:
+        """Record that a request moved past a failed model."""
+        self.failovers += 1
+        logger.warning(f"Model {from_model} failed, failing over: {error}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get routing counters and the current statistics of every pool model."""
+        return {
+            "routed_requests": self.routed_requests,
+            "failovers": self.failovers,
+            "routes_per_model": dict(self.routes_per_model),
+            "models": [asdict(entry) for entry in self.get_model_stats()],
+        }
+
+    def _score(self, stats: List[ModelRouteStats]) -> None:
+        """Score models; lower is better.
+
+        Latency and cost are normalized by the pool maximum. Models without
+        samples are scored at the pool mean so they are neither avoided nor
+        preferred until they have been measured.
+        """
+        latency = self._normalized([entry.p95_response_time_ms for entry in stats])
+        cost = self._normalized([entry.cost_per_call for entry in stats])
+        for entry, latency_score, cost_score in zip(stats, latency, cost, strict=True):
+            entry.score = (
+                self.latency_weight * latency_score
+                + self.cost_weight * cost_score
+                + self.error_weight * entry.error_rate / 100
+            )
+
+    @staticmethod
+    def _normalized(values: List[Optional[float]]) -> List[float]:
+        measured = [value for value in values if value is not None]
+        if not measured or max(measured) <= 0:
+            return [0.0] * len(values)
+        peak = max(measured)
+        mean = sum(measured) / len(measured)
+        return [(mean if value is None else value) / peak for value in values]
@@ -0,0 +1,242 @@
+"""
+Per-model concurrency and tokens-per-minute scheduling of LLM calls.
+
+Each model has a semaphore bounding its in-flight chat completions and a token
+bucket holding its tokens-per-minute budget. A call reserves a slot and its
+estimated prompt plus completion tokens before it is sent, and settles the
+estimate against the reported usage afterwards; overruns become debt that later
+calls wait out. Calls that cannot get a slot and tokens within their deadline
+are rejected instead of being sent into the provider's rate limit.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+
+from ...core.logging import get_logger
+from ...utils.stats import percentile
+from .llm_exceptions import ModelCapacityError
+
+logger = get_logger(__name__)
+
+
+class _TokenBucket:
+    """Tokens-per-minute bucket that may go into debt when usage exceeds estimates."""
+
+    def __init__(self, tokens_per_minute: float):
+        self.capacity = tokens_per_minute
+        self.refill_per_second = tokens_per_minute / 60
+        self.tokens = tokens_per_minute
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second
+        )
+        self.updated_at = now
+
+    def wait_seconds(self, tokens: float) -> float:
+        """Get the seconds until ``tokens`` are available."""
+        self._refill()
+        missing = min(tokens, self.capacity) - self.tokens
+        return max(0.0, missing / self.refill_per_second)
+
+    def take(self, tokens: float) -> None:
+        """Take tokens, going into debt if there are not enough."""
+        self._refill()
+        self.tokens -= tokens
+
+
+class ModelReservation:
+    """Slot and token reservation held for one LLM call."""
+
+    def __init__(self, scheduler: "ModelScheduler", model: str, tokens: int, wait_ms: float):
+        self._scheduler = scheduler
+        self.model = model
+        self.tokens = tokens
+        self.wait_ms = wait_ms
+
+    def settle(self, actual_tokens: int) -> None:
+        """Correct the reserved tokens with the tokens the call actually used."""
+        self._scheduler.adjust(self.model, actual_tokens - self.tokens)
+        self.tokens = actual_tokens
+
+
+class _ModelState:
+    def __init__(self, max_concurrency: int, tokens_per_minute: int):
+        self.max_concurrency = max_concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.bucket = _TokenBucket(tokens_per_minute)
+        self.active = 0
+        self.waiting = 0
+        # (monotonic time, tokens) of reservations and settlements in the last minute
+        self.token_usage: Deque[Tuple[float, int]] = deque()
+        self.wait_times_ms: Deque[float] = deque(maxlen=1000)
+        self.metrics = {
+            "calls": 0,
+            "queued_calls": 0,
+            "rejected_concurrency": 0,
+            "rejected_tokens": 0,
+            "peak_active": 0,
+            "peak_waiting": 0,
+        }
+
+    def tokens_last_minute(self) -> int:
+        cutoff = time.monotonic() - 60
+        while self.token_usage and self.token_usage[0][0] < cutoff:
+            self.token_usage.popleft()
+        return sum(tokens for _, tokens in self.token_usage)
+
+
+class ModelScheduler:
+    """Keeps each model's concurrent calls and token throughput under its limits."""
+
+    def __init__(
+        self,
+        default_max_concurrency: int = 8,
+        default_tokens_per_minute: int = 200000,
+        concurrency_limits: Optional[Dict[str, int]] = None,
+        tokens_per_minute_limits: Optional[Dict[str, int]] = None,
+        max_wait_seconds: float = 30.0,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            default_max_concurrency: In-flight calls allowed per model
+            default_tokens_per_minute: Estimated tokens allowed per model per minute
+            concurrency_limits: Per-model overrides of the concurrency limit
+            tokens_per_minute_limits: Per-model overrides of the tokens-per-minute limit
+            max_wait_seconds: Longest a call may wait for a slot and tokens
+        """
+        self.default_max_concurrency = default_max_concurrency
+        self.default_tokens_per_minute = default_tokens_per_minute
+        self.concurrency_limits = dict(concurrency_limits or {})
+        self.tokens_per_minute_limits = dict(tokens_per_minute_limits or {})
+        self.max_wait_seconds = max_wait_seconds
+        self._models: Dict[str, _ModelState] = {}
+
+    def _state(self, model: str) -> _ModelState:
+        if model not in self._models:
+            self._models[model] = _ModelState(
+                max_concurrency=int(
+                    self.concurrency_limits.get(model, self.default_max_concurrency)
+                ),
+                tokens_per_minute=int(
+                    self.tokens_per_minute_limits.get(model, self.default_tokens_per_minute)
+                ),
+            )
+        return self._models[model]
+
+    @asynccontextmanager
+    async def reserve(
+        self, model: str, tokens: int, timeout: Optional[float] = None
+    ) -> AsyncIterator[ModelReservation]:
+        """
+        Hold a call slot and estimated tokens of a model for the duration of the context.
+
+        Args:
+            model: Model the call is sent to
+            tokens: Estimated prompt plus completion tokens of the call
+            timeout: Optional wait deadline, capped by max_wait_seconds
+
+        Yields:
+            ModelReservation to settle with the actual token usage
+
+        Raises:
+            ModelCapacityError: If no slot or tokens are available before the deadline
+        """
+        state = self._state(model)
+        wait_limit = (
+            min(self.max_wait_seconds, timeout) if timeout is not None else self.max_wait_seconds
+        )
+        started = time.monotonic()
+        deadline = started + wait_limit
+
+        state.waiting += 1
+        state.metrics["peak_waiting"] = max(state.metrics["peak_waiting"], state.waiting)
+        try:
+            await self._acquire(state, model, tokens, deadline, wait_limit)
+        finally:
+            state.waiting -= 1
+
+        try:
+            state.bucket.take(tokens)
+            state.token_usage.append((time.monotonic(), tokens))
+            state.active += 1
+            state.metrics["calls"] += 1
+            state.metrics["peak_active"] = max(state.metrics["peak_active"], state.active)
+
+            wait_ms = (time.monotonic() - started) * 1000
+            if wait_ms >= 1:
+                state.metrics["queued_calls"] += 1
+            state.wait_times_ms.append(wait_ms)
+
+            try:
+                yield ModelReservation(self, model, tokens, wait_ms)
+            finally:
+                state.active -= 1
+        finally:
+            state.semaphore.release()
+
+    async def _acquire(
+        self, state: _ModelState, model: str, tokens: int, deadline: float, wait_limit: float
+    ) -> None:
+        """Take a call slot once the bucket holds the call's tokens.
+
+        The slot is given back while waiting for tokens, so a call throttled by the
+        token budget does not keep other calls of the model from their slots.
+        """
+        while True:
+            try:
+                await asyncio.wait_for(
+                    state.semaphore.acquire(), timeout=max(0.0, deadline - time.monotonic())
+                )
+            except asyncio.TimeoutError as e:
+                state.metrics["rejected_concurrency"] += 1
+                raise ModelCapacityError(
+                    f"No call slot for {model} within {wait_limit:.1f}s "
+                    f"({state.active}/{state.max_concurrency} in flight)"
+                ) from e
+
+            wait = state.bucket.wait_seconds(tokens)
+            if wait == 0:
+                return
+            state.semaphore.release()
+            if time.monotonic() + wait > deadline:
+                state.metrics["rejected_tokens"] += 1
+                raise ModelCapacityError(
+                    f"Tokens-per-minute budget of {model} exhausted; "
+                    f"{wait:.1f}s until {tokens} tokens are available"
+                )
+            await asyncio.sleep(wait)
+
+    def adjust(self, model: str, tokens: int) -> None:
+        """Charge (or refund, when negative) tokens to a model's budget."""
+        state = self._state(model)
+        state.bucket.take(tokens)
+        state.token_usage.append((time.monotonic(), tokens))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-model utilization, queueing and rejection metrics."""
+        models: Dict[str, Any] = {}
+        for model, state in self._models.items():
+            tokens_last_minute = state.tokens_last_minute()
+            wait_times = sorted(state.wait_times_ms)
+            models[model] = {
+                **state.metrics,
+                "active": state.active,
+                "waiting": state.waiting,
+                "max_concurrency": state.max_concurrency,
+                "concurrency_utilization": (state.active / state.max_concurrency) * 100,
+                "tokens_last_minute": tokens_last_minute,
+                "tokens_per_minute": state.tokens_per_minute,
+                "token_utilization": (tokens_last_minute / state.tokens_per_minute) * 100,
+                "wait_p95_ms": percentile(wait_times, 95),
+                "wait_max_ms": wait_times[-1] if wait_times else 0.0,
+            }
+        return {"max_wait_seconds": self.max_wait_seconds, "models": models}
@@ -0,0 +1,175 @@
+"""
+Token-budgeted prompt compilation.
+
+Prompts are assembled from named sections whose token counts are estimated. When
+the prompt exceeds the token budget, it is re-rendered with progressively more
+compact encodings of numeric series:
+
+- full: every value of the window
+- compact: latest value and bar-to-bar changes at 3 significant digits
+- summary: latest value, change over the window and its low/high
+
+Sections named as static (strategy instructions and parameters) are placed before
+the volatile ones, so consecutive prompts share a byte-identical prefix that
+providers can serve from their prompt cache.
+"""
+
+from dataclasses import dataclass, field
+from itertools import pairwise
+from typing import Callable, Collection, Dict, List, Optional, Sequence, Tuple
+
+SERIES_ENCODINGS: Tuple[str, ...] = ("full", "compact", "summary")
+
+SERIES_LEGENDS: Dict[str, str] = {
+    "full": "",
+    "compact": "Series: latest value, then bar-to-bar changes (oldest first).",
+    "summary": "Series: latest value (change over the window, window low, window high).",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate a token count at roughly four characters per token."""
+    return max(1, len(text) // 4)
+
+
+def format_series(
+    values: Optional[Sequence[float]],
+    decimals: int = 2,
+    encoding: str = "full",
+    window: int = 10,
+) -> str:
+    """
+    Format the most recent values of a numeric series.
+
+    Args:
+        values: Series values, oldest first
+        decimals: Decimal places of absolute values
+        encoding: One of SERIES_ENCODINGS
+        window: Number of most recent values to encode
+
+    Returns:
+        Encoded series, or "N/A" when there are no values
+    """
+    if not values:
+        return "N/A"
+    series = list(values[-window:])
+    latest = f"{series[-1]:.{decimals}f}"
+
+    if encoding == "full":
+        return ", ".join(f"{value:.{decimals}f}" for value in series)
+    if encoding == "compact":
+        deltas = " ".join(f"{b - a:+.3g}" for a, b in pairwise(series))
+        return f"{latest} ({deltas})" if deltas else latest
+    return (
+        f"{latest} ({series[-1] - series[0]:+.3g}, "
+        f"{min(series):.{decimals}f}, {max(series):.{decimals}f})"
+    )
+
+
+@dataclass
+class PromptSection:
+    """Named part of a prompt with its estimated token count."""
+
+    name: str
+    text: str
+    tokens: int
+    static: bool = False
+
+
+@dataclass
+class CompiledPrompt:
+    """Prompt text with per-section token counts."""
+
+    text: str
+    encoding: str
+    tokens: int
+    token_budget: Optional[int] = None
+    sections: List[PromptSection] = field(default_factory=list)
+
+    @property
+    def within_budget(self) -> bool:
+        """Whether the prompt fits the token budget."""
+        return self.token_budget is None or self.tokens <= self.token_budget
+
+    @property
+    def prefix(self) -> str:
+        """Static sections, identical across prompts of the same strategy."""
+        return "\n\n".join(section.text for section in self.sections if section.static)
+
+    @property
+    def suffix(self) -> str:
+        """Volatile sections that change with market and account state."""
+        return "\n\n".join(section.text for section in self.sections if not section.static)
+
+    @property
+    def prefix_tokens(self) -> int:
+        """Estimated token count of the static prefix."""
+        return sum(section.tokens for section in self.sections if section.static)
+
+    def section_tokens(self) -> Dict[str, int]:
+        """Get the estimated token count of each section."""
+        return {section.name: section.tokens for section in self.sections}
+
+
+class PromptCompiler:
+    """Renders prompt sections within a token budget."""
+
+    def __init__(self, token_budget: Optional[int] = None):
+        """
+        Initialize the compiler.
+
+        Args:
+            token_budget: Maximum estimated prompt tokens (None or 0 for no limit)
+        """
+        self.token_budget = token_budget or None
+
+    def compile(
+        self,
+        render: Callable[[str], List[Tuple[str, str]]],
+        static_sections: Collection[str] = (),
+    ) -> CompiledPrompt:
+        """
+        Render the prompt with the least compact encoding that fits the budget.
+
+        Args:
+            render: Builds (section name, text) pairs for a series encoding
+            static_sections: Names of sections that do not change between prompts;
+                they are moved ahead of the other sections
+
+        Returns:
+            The compiled prompt; the most compact rendering if none fits
+        """
+        compiled = self._render(render, SERIES_ENCODINGS[0], static_sections)
+        for encoding in SERIES_ENCODINGS[1:]:
+            if compiled.within_budget:
+                break
+            compiled = self._render(render, encoding, static_sections)
+        return compiled
+
+    def _render(
+        self,
+        render: Callable[[str], List[Tuple[str, str]]],
+        encoding: str,
+        static_sections: Collection[str],
+    ) -> CompiledPrompt:
+        sections = []
+        for name, text in render(encoding):
+            text = text.strip()
+            if text:
+                sections.append(
+                    PromptSection(
+                        name=name,
+                        text=text,
+                        tokens=estimate_tokens(text),
+                        static=name in static_sections,
+                    )
+                )
+        # Stable sort: static sections first, each group in render order
+        sections.sort(key=lambda section: not section.static)
+        return CompiledPrompt(
+            text="\n\n".join(section.text for section in sections),
+            encoding=encoding,
+            tokens=sum(section.tokens for section in sections),
+            token_budget=self.token_budget,
+            sections=sections,
+        )
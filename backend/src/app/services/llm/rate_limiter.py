@@ -0,0 +1,292 @@
+"""
+Token bucket rate limiting for the LLM Decision Engine.
+
+Each key owns a bucket holding up to ``max_requests`` tokens that refills at
+``max_requests / window_seconds`` tokens per second. A check is O(1): the bucket
+is refilled lazily from the elapsed time, so no per-request history is kept.
+
+Bucket state lives in a pluggable backend:
+- InMemoryRateLimitBackend: per-process buckets with idle-key eviction
+- PostgresRateLimitBackend: buckets shared by all API workers through a single
+  atomic upsert on ``trading.rate_limit_buckets``
+"""
+
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional, Tuple, cast
+
+from sqlalchemy import CursorResult, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ...core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Outcome of a rate limit check."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after_seconds: float
+
+    @property
+    def reset_time(self) -> Optional[datetime]:
+        """When the next request will be allowed, if currently rejected."""
+        if self.allowed:
+            return None
+        return datetime.now(timezone.utc) + timedelta(seconds=self.retry_after_seconds)
+
+
+class RateLimitBackend(ABC):
+    """Storage for token bucket state."""
+
+    @abstractmethod
+    async def acquire(
+        self, key: str, capacity: float, refill_per_second: float, cost: float
+    ) -> Tuple[bool, float]:
+        """Refill the bucket and take ``cost`` tokens if available.
+
+        Returns:
+            Tuple of (allowed, tokens left in the bucket)
+        """
+
+    @abstractmethod
+    async def peek(self, key: str, capacity: float, refill_per_second: float) -> float:
+        """Get the current token count of a bucket without consuming tokens."""
+
+    @abstractmethod
+    async def evict_idle(self, idle_seconds: float) -> int:
+        """Remove buckets idle for at least ``idle_seconds``.
+
+        Returns:
+            Number of evicted buckets
+        """
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Per-process token buckets ordered by last use.
+
+    A bucket idle for a full refill period is indistinguishable from a new one, so
+    it is dropped. Buckets are kept in last-use order, which makes eviction of the
+    oldest entries amortized O(1) per request.
+    """
+
+    def __init__(self, idle_seconds: float = 60.0):
+        self.idle_seconds = idle_seconds
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def _refill(self, key: str, capacity: float, refill_per_second: float, now: float) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return capacity
+        tokens, updated_at = bucket
+        return min(capacity, tokens + (now - updated_at) * refill_per_second)
+
+    def _evict_before(self, cutoff: float) -> int:
+        evicted = 0
+        while self._buckets:
+            key, (_, updated_at) = next(iter(self._buckets.items()))
+            if updated_at > cutoff:
+                break
+            del self._buckets[key]
+            evicted += 1
+        return evicted
+
+    async def acquire(
+        self, key: str, capacity: float, refill_per_second: float, cost: float
+    ) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens = self._refill(key, capacity, refill_per_second, now)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        self._evict_before(now - self.idle_seconds)
+        return allowed, tokens
+
+    async def peek(self, key: str, capacity: float, refill_per_second: float) -> float:
+        return self._refill(key, capacity, refill_per_second, time.monotonic())
+
+    async def evict_idle(self, idle_seconds: float) -> int:
+        return self._evict_before(time.monotonic() - idle_seconds)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# The refilled token count of the existing row; every reference in the ON CONFLICT
+# clause sees the pre-update values, so the whole check-and-take is one atomic step.
+_REFILLED = (
+    "LEAST(:capacity, bucket.tokens "
+    "+ EXTRACT(EPOCH FROM (now() - bucket.updated_at)) * :refill_per_second)"
+)
+
+_ACQUIRE_SQL = text(
+    f"""
+    INSERT INTO trading.rate_limit_buckets AS bucket (key, tokens, allowed, updated_at)
+    VALUES (:key, :capacity - :cost, true, now())
+    ON CONFLICT (key) DO UPDATE SET
+        tokens = CASE WHEN {_REFILLED} >= :cost THEN {_REFILLED} - :cost ELSE {_REFILLED} END,
+        allowed = {_REFILLED} >= :cost,
+        updated_at = now()
+    RETURNING allowed, tokens
+    """
+)
+
+_PEEK_SQL = text(
+    f"""
+    SELECT {_REFILLED} AS tokens
+    FROM trading.rate_limit_buckets AS bucket
+    WHERE bucket.key = :key
+    """
+)
+
+_EVICT_SQL = text(
+    """
+    DELETE FROM trading.rate_limit_buckets
+    WHERE updated_at < now() - make_interval(secs => :idle_seconds)
+    """
+)
+
+
+class PostgresRateLimitBackend(RateLimitBackend):
+    """Token buckets shared across API workers through Postgres.
+
+    Idle rows are deleted every ``evict_every`` acquisitions so the table stays
+    proportional to the number of recently active keys.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        idle_seconds: float = 60.0,
+        evict_every: int = 1000,
+    ):
+        self.session_factory = session_factory
+        self.idle_seconds = idle_seconds
+        self.evict_every = evict_every
+        self._acquires_since_eviction = 0
+
+    async def acquire(
+        self, key: str, capacity: float, refill_per_second: float, cost: float
+    ) -> Tuple[bool, float]:
+        async with self.session_factory() as session:
+            try:
+                result = await session.execute(
+                    _ACQUIRE_SQL,
+                    {
+                        "key": key,
+                        "capacity": float(capacity),
+                        "refill_per_second": float(refill_per_second),
+                        "cost": float(cost),
+                    },
+                )
+                allowed, tokens = result.one()
+
+                self._acquires_since_eviction += 1
+                if self._acquires_since_eviction >= self.evict_every:
+                    self._acquires_since_eviction = 0
+                    await session.execute(_EVICT_SQL, {"idle_seconds": float(self.idle_seconds)})
+
+                await session.commit()
+                return bool(allowed), float(tokens)
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"Failed to acquire rate limit token for {key}: {e}")
+                raise
+
+    async def peek(self, key: str, capacity: float, refill_per_second: float) -> float:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                _PEEK_SQL,
+                {
+                    "key": key,
+                    "capacity": float(capacity),
+                    "refill_per_second": float(refill_per_second),
+                },
+            )
+            tokens = result.scalar_one_or_none()
+            return float(capacity) if tokens is None else float(tokens)
+
+    async def evict_idle(self, idle_seconds: float) -> int:
+        async with self.session_factory() as session:
+            try:
+                result = cast(
+                    CursorResult[Any],
+                    await session.execute(_EVICT_SQL, {"idle_seconds": float(idle_seconds)}),
+                )
+                await session.commit()
+                return int(result.rowcount or 0)
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"Failed to evict idle rate limit buckets: {e}")
+                raise
+
+
+class RateLimiter:
+    """Token bucket rate limiter for decision requests."""
+
+    def __init__(
+        self,
+        max_requests: int = 60,
+        window_seconds: int = 60,
+        backend: Optional[RateLimitBackend] = None,
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            max_requests: Burst size and number of requests allowed per window
+            window_seconds: Time for an empty bucket to refill completely
+            backend: Bucket storage (defaults to in-process buckets)
+        """
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.refill_per_second = max_requests / window_seconds
+        self.backend = (
+            backend
+            if backend is not None
+            else InMemoryRateLimitBackend(idle_seconds=window_seconds)
+        )
+
+    def _result(self, allowed: bool, tokens: float, cost: float) -> RateLimitResult:
+        retry_after = 0.0 if allowed else (cost - tokens) / self.refill_per_second
+        return RateLimitResult(
+            allowed=allowed,
+            limit=self.max_requests,
+            remaining=max(0, math.floor(tokens)),
+            retry_after_seconds=max(0.0, retry_after),
+        )
+
+    async def acquire(self, key: str, cost: float = 1.0) -> RateLimitResult:
+        """Take tokens for a request if the bucket allows it.
+
+        Args:
+            key: Rate limit key (e.g. ``account_1``)
+            cost: Tokens consumed by the request
+
+        Returns:
+            RateLimitResult with remaining tokens and Retry-After if rejected
+        """
+        allowed, tokens = await self.backend.acquire(
+            key, self.max_requests, self.refill_per_second, cost
+        )
+        return self._result(allowed, tokens, cost)
+
+    async def get_remaining_requests(self, key: str) -> int:
+        """Get remaining requests for key."""
+        tokens = await self.backend.peek(key, self.max_requests, self.refill_per_second)
+        return max(0, math.floor(tokens))
+
+    async def evict_idle(self) -> int:
+        """Drop buckets idle long enough to have refilled completely."""
+        return await self.backend.evict_idle(self.window_seconds)
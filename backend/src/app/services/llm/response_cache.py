@@ -0,0 +1,298 @@
+"""
+Prompt-level response cache for LLM trading decisions.
+
+Accounts that share a strategy, balance band and candle build byte-identical decision
+prompts. Responses are cached under a key derived from (model, system prompt hash,
+prompt hash, temperature), so an identical prompt is answered without another API call.
+
+Entries expire after ``ttl_seconds`` but never outlive the candle they were created in:
+once the candle closes the market data in the prompt is stale anyway.
+
+Entries live in a pluggable backend:
+- InMemoryResponseCacheBackend: per-process LRU bounded by entry count
+- PostgresResponseCacheBackend: entries shared by all API workers through
+  ``trading.llm_response_cache``, consulted when the in-process cache misses
+"""
+
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple, cast
+
+from sqlalchemy import CursorResult, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ...core.logging import get_logger
+from ..market_data.utils import calculate_next_candle_close
+
+logger = get_logger(__name__)
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+class ResponseCacheBackend(ABC):
+    """Storage for cached LLM responses."""
+
+    @abstractmethod
+    async def get(self, key: str, now: datetime) -> Optional[Dict[str, Any]]:
+        """Get an unexpired response, or None."""
+
+    @abstractmethod
+    async def set(
+        self, key: str, model: str, response: Dict[str, Any], expires_at: datetime
+    ) -> None:
+        """Store a response until ``expires_at``."""
+
+    @abstractmethod
+    async def evict_expired(self, now: datetime) -> int:
+        """Remove expired responses.
+
+        Returns:
+            Number of evicted responses
+        """
+
+
+class InMemoryResponseCacheBackend(ResponseCacheBackend):
+    """Per-process responses in least-recently-used order."""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Tuple[datetime, Dict[str, Any]]]" = OrderedDict()
+
+    async def get(self, key: str, now: datetime) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    async def set(
+        self, key: str, model: str, response: Dict[str, Any], expires_at: datetime
+    ) -> None:
+        self._entries[key] = (expires_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def evict_expired(self, now: datetime) -> int:
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_GET_SQL = text(
+    """
+    SELECT response FROM trading.llm_response_cache
+    WHERE key = :key AND expires_at > :now
+    """
+)
+
+_SET_SQL = text(
+    """
+    INSERT INTO trading.llm_response_cache (key, model, response, expires_at)
+    VALUES (:key, :model, CAST(:response AS JSON), :expires_at)
+    ON CONFLICT (key) DO UPDATE SET
+        model = EXCLUDED.model,
+        response = EXCLUDED.response,
+        expires_at = EXCLUDED.expires_at
+    """
+)
+
+_EVICT_SQL = text("DELETE FROM trading.llm_response_cache WHERE expires_at <= :now")
+
+
+class PostgresResponseCacheBackend(ResponseCacheBackend):
+    """Responses shared across API workers through Postgres.
+
+    Expired rows are deleted every ``evict_every`` writes so the table stays
+    proportional to the number of live entries.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        evict_every: int = 100,
+    ):
+        self.session_factory = session_factory
+        self.evict_every = evict_every
+        self._sets_since_eviction = 0
+
+    async def get(self, key: str, now: datetime) -> Optional[Dict[str, Any]]:
+        async with self.session_factory() as session:
+            result = await session.execute(_GET_SQL, {"key": key, "now": now})
+            return result.scalar_one_or_none()
+
+    async def set(
+        self, key: str, model: str, response: Dict[str, Any], expires_at: datetime
+    ) -> None:
+        async with self.session_factory() as session:
+            try:
+                await session.execute(
+                    _SET_SQL,
+                    {
+                        "key": key,
+                        "model": model,
+                        "response": json.dumps(response),
+                        "expires_at": expires_at,
+                    },
+                )
+
+                self._sets_since_eviction += 1
+                if self._sets_since_eviction >= self.evict_every:
+                    self._sets_since_eviction = 0
+                    await session.execute(_EVICT_SQL, {"now": datetime.now(timezone.utc)})
+
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"Failed to store cached LLM response: {e}")
+                raise
+
+    async def evict_expired(self, now: datetime) -> int:
+        async with self.session_factory() as session:
+            try:
+                result = cast(CursorResult[Any], await session.execute(_EVICT_SQL, {"now": now}))
+                await session.commit()
+                return int(result.rowcount or 0)
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"Failed to evict expired LLM responses: {e}")
+                raise
+
+
+class LLMResponseCache:
+    """Cache of LLM decision responses keyed by prompt content."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300.0,
+        interval: Optional[str] = None,
+        max_entries: int = 1000,
+        shared_backend: Optional[ResponseCacheBackend] = None,
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            ttl_seconds: Maximum lifetime of a cached response
+            interval: Candle interval; responses expire at the next candle close
+            max_entries: Maximum responses kept in process
+            shared_backend: Optional backend shared by all workers (e.g. Postgres)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.interval = interval
+        self.memory = InMemoryResponseCacheBackend(max_entries=max_entries)
+        self.shared_backend = shared_backend
+        self.metrics: Dict[str, Any] = {
+            "hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "errors": 0,
+            "cost_saved_usd": 0.0,
+            # Hits on responses of unpriced models; they add nothing to cost_saved_usd
+            "unpriced_hits": 0,
+        }
+
+    @staticmethod
+    def build_key(model: str, system_prompt: str, prompt: str, temperature: float) -> str:
+        """
+        Build the cache key of a decision request.
+
+        Args:
+            model: LLM model identifier
+            system_prompt: System prompt sent with the request
+            prompt: User prompt sent with the request
+            temperature: Sampling temperature
+
+        Returns:
+            Hex SHA-256 over the model, prompt hashes and temperature
+        """
+        return _sha256(
+            "|".join((model, _sha256(system_prompt), _sha256(prompt), f"{temperature:.4f}"))
+        )
+
+    def expires_at(self, now: datetime) -> datetime:
+        """Get the expiry of a response stored at ``now``."""
+        expires_at = now + timedelta(seconds=self.ttl_seconds)
+        if self.interval:
+            expires_at = min(expires_at, calculate_next_candle_close(self.interval, now))
+        return expires_at
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached response and count the hit or miss.
+
+        Args:
+            key: Key from build_key
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        now = datetime.now(timezone.utc)
+        response = await self.memory.get(key, now)
+        if response is None and self.shared_backend is not None:
+            try:
+                response = await self.shared_backend.get(key, now)
+            except Exception as e:
+                self.metrics["errors"] += 1
+                logger.warning(f"Shared LLM response cache lookup failed: {e}")
+            if response is not None:
+                self.metrics["shared_hits"] += 1
+                await self.memory.set(key, "", response, self.expires_at(now))
+
+        if response is None:
+            self.metrics["misses"] += 1
+            return None
+
+        self.metrics["hits"] += 1
+        if response.get("cost") is None:
+            self.metrics["unpriced_hits"] += 1
+        else:
+            self.metrics["cost_saved_usd"] += response["cost"]
+        return response
+
+    async def set(self, key: str, model: str, response: Dict[str, Any]) -> None:
+        """
+        Cache a response until its TTL or the next candle close.
+
+        Args:
+            key: Key from build_key
+            model: LLM model that produced the response
+            response: JSON-serializable response data
+        """
+        expires_at = self.expires_at(datetime.now(timezone.utc))
+        await self.memory.set(key, model, response, expires_at)
+        if self.shared_backend is not None:
+            try:
+                await self.shared_backend.set(key, model, response, expires_at)
+            except Exception as e:
+                self.metrics["errors"] += 1
+                logger.warning(f"Shared LLM response cache write failed: {e}")
+        self.metrics["stores"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit rate, dollars saved and entry counts.
+
+        cost_saved_usd only sums hits whose cost is known; it stays 0.0 rather than
+        None when every hit was unpriced, and unpriced_hits counts those hits.
+        """
+        lookups = self.metrics["hits"] + self.metrics["misses"]
+        return {
+            **self.metrics,
+            "hit_rate": (self.metrics["hits"] / lookups * 100) if lookups else 0.0,
+            "entries": len(self.memory),
+            "shared": self.shared_backend is not None,
+        }
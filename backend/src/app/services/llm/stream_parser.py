@@ -0,0 +1,141 @@
+"""
+Incremental parsing of streamed LLM decision responses.
+
+The decision JSON object is recognised while the completion is still streaming, so
+the stream can be closed as soon as the object holding the ``decisions`` array is
+complete instead of waiting for the model to stop generating.
+"""
+
+from typing import List, Optional
+
+_WHITESPACE = frozenset(" \t\r\n")
+
+
+class DecisionStreamParser:
+    """Scans streamed text for the top-level JSON object holding a decisions array.
+
+    Text outside JSON objects (prose, code fences) is skipped. Objects that close
+    without a top-level ``decisions`` key are discarded and scanning continues.
+    """
+
+    def __init__(self, key: str = "decisions"):
+        """
+        Initialize the parser.
+
+        Args:
+            key: Top-level key of the array of per-asset decisions
+        """
+        self.key = key
+        self.complete = False
+        self.result: Optional[str] = None
+        self.assets_completed = 0
+
+        self._chunks: List[str] = []
+        self._length = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_chars: List[str] = []
+        self._last_string: Optional[str] = None
+        self._pending_key: Optional[str] = None
+        self._root_start = 0
+        self._root_has_key = False
+        self._array_depth: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Scan the next chunk of streamed text.
+
+        Args:
+            chunk: Text delta from the stream
+
+        Returns:
+            True once the decision object is complete; result holds its JSON text
+        """
+        if self.complete:
+            return True
+
+        offset = self._length
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+
+        for index, char in enumerate(chunk):
+            if self._in_string:
+                self._scan_string_char(char)
+            elif self._depth == 0:
+                if char == "{":
+                    self._start_root(offset + index)
+            elif self._scan_char(char):
+                self.complete = True
+                self.result = self.text[self._root_start : offset + index + 1]
+                return True
+
+        return False
+
+    def _scan_string_char(self, char: str) -> None:
+        """Consume a character inside a JSON string, handling escapes."""
+        if self._escape:
+            self._escape = False
+        elif char == "\\":
+            self._escape = True
+        elif char == '"':
+            self._in_string = False
+            self._last_string = "".join(self._string_chars)
+        else:
+            self._string_chars.append(char)
+
+    def _scan_char(self, char: str) -> bool:
+        """Consume a character of the root object outside strings.
+
+        Returns:
+            True when the character closes a root object holding the decisions key
+        """
+        if char in _WHITESPACE:
+            return False
+        if char == '"':
+            self._in_string = True
+            self._string_chars = []
+        elif char == ":":
+            self._pending_key = self._last_string
+            self._last_string = None
+        elif char == "{" or char == "[":
+            self._open_container(char)
+        elif char == "}" or char == "]":
+            return self._close_container(char)
+        elif char == ",":
+            self._pending_key = None
+            self._last_string = None
+        return False
+
+    def _open_container(self, char: str) -> None:
+        if self._depth == 1 and self._pending_key == self.key:
+            self._root_has_key = True
+            if char == "[":
+                self._array_depth = self._depth + 1
+        self._depth += 1
+        self._pending_key = None
+        self._last_string = None
+
+    def _close_container(self, char: str) -> bool:
+        self._depth -= 1
+        if char == "}" and self._depth == self._array_depth:
+            self.assets_completed += 1
+        if self._depth == 0 and self._root_has_key:
+            return True
+        self._pending_key = None
+        self._last_string = None
+        return False
+
+    def _start_root(self, position: int) -> None:
+        self._depth = 1
+        self._root_start = position
+        self._root_has_key = False
+        self._array_depth = None
+        self._pending_key = None
+        self._last_string = None
+        self.assets_completed = 0
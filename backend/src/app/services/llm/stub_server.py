@@ -0,0 +1,311 @@
+"""
+Local OpenAI-compatible LLM stub server for load testing the decision engine.
+
+Speaks the chat-completions protocol (non-streamed and streamed responses, tool
+calls and ``reasoning_content``) and answers every request with a valid
+multi-asset decision for the symbols found in the prompt. Latency, error
+injection and rate limiting are configured with ``STUB_LLM_*`` environment
+variables.
+
+Run it and point the backend at it::
+
+    uv run python -m app.services.llm.stub_server
+    OPENROUTER_BASE_URL=http://localhost:8001/v1 uv run python -m app.main
+"""
+
+import asyncio
+import json
+import os
+import random
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, fields
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from .prompt_compiler import estimate_tokens
+
+# Market data sections of the decision prompt start with "--- SYMBOL ---"
+_SECTION_SYMBOL = re.compile(r"^--- ([A-Z0-9]{2,20}) ---$", re.MULTILINE)
+_PAIR_SYMBOL = re.compile(r"\b[A-Z0-9]{2,15}USDT?\b")
+_CHUNK_SIZE = 40
+
+
+@dataclass
+class StubSettings:
+    """Behaviour of the stub server."""
+
+    host: str = "127.0.0.1"
+    port: int = 8001
+    # Non-streamed response time, and time to first chunk of streamed responses
+    latency_ms: float = 800.0
+    latency_jitter_ms: float = 200.0
+    chunk_delay_ms: float = 20.0
+    # Share of requests answered with error_status
+    error_rate: float = 0.0
+    error_status: int = 503
+    # Requests per minute before 429 responses (0 = unlimited)
+    rate_limit_rpm: int = 0
+    # Emit reasoning_content before the decision
+    reasoning: bool = True
+    # deepseek_reasoner tool call rounds before the decision
+    tool_call_rounds: int = 0
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_env(cls) -> "StubSettings":
+        """Read settings from STUB_LLM_<FIELD> environment variables."""
+        values: Dict[str, Any] = {}
+        for field in fields(cls):
+            raw = os.environ.get(f"STUB_LLM_{field.name.upper()}")
+            if raw is None:
+                continue
+            if field.name == "seed":
+                values[field.name] = int(raw)
+            elif field.type is bool:
+                values[field.name] = raw.lower() in ("1", "true", "yes")
+            else:
+                values[field.name] = type(getattr(cls, field.name))(raw)
+        return cls(**values)
+
+
+class StubLLM:
+    """Builds chat-completion responses and applies the stub's failure behaviour."""
+
+    def __init__(self, settings: StubSettings):
+        """
+        Initialize the stub.
+
+        Args:
+            settings: Latency, error injection and rate limit settings
+        """
+        self.settings = settings
+        self._random = random.Random(settings.seed)
+        self._requests: Deque[float] = deque()
+        self._next_id = 0
+        self.metrics = {"requests": 0, "rate_limited": 0, "injected_errors": 0}
+
+    @staticmethod
+    def extract_symbols(messages: List[Dict[str, Any]]) -> List[str]:
+        """Get the symbols of a decision prompt, in prompt order."""
+        text = "\n".join(_text(message.get("content")) for message in messages)
+        symbols = _SECTION_SYMBOL.findall(text) or _PAIR_SYMBOL.findall(text)
+        return list(dict.fromkeys(symbols)) or ["BTCUSDT"]
+
+    def decision(self, symbols: List[str]) -> Dict[str, Any]:
+        """Build a valid multi-asset hold decision for the symbols."""
+        return {
+            "decisions": [
+                {
+                    "asset": symbol,
+                    "action": "hold",
+                    "allocation_usd": 0.0,
+                    "exit_plan": "Reassess at the next candle close",
+                    "rationale": f"Stub decision for {symbol}: no actionable setup",
+                    "confidence": self._random.randint(50, 80),
+                    "risk_level": "low",
+                }
+                for symbol in symbols
+            ],
+            "portfolio_rationale": "Stub portfolio: holding all assets",
+            "total_allocation_usd": 0.0,
+            "portfolio_risk_level": "low",
+        }
+
+    def analysis(self, symbols: List[str]) -> Dict[str, Any]:
+        """Build a neutral market analysis for the symbols (two-stage decisions)."""
+        return {
+            "signals": [
+                {
+                    "asset": symbol,
+                    "bias": "neutral",
+                    "conviction": self._random.randint(30, 55),
+                    "risk_level": "low",
+                    "rationale": f"Stub analysis for {symbol}: no clear direction",
+                }
+                for symbol in symbols
+            ],
+            "market_summary": "Stub market: range-bound",
+            "market_risk_level": "low",
+        }
+
+    def check_limits(self) -> Optional[Tuple[int, Dict[str, Any], Dict[str, str]]]:
+        """Get the error response for a request, if it is rate limited or fails.
+
+        Returns:
+            (status, body, headers) of the error, or None to answer normally
+        """
+        self.metrics["requests"] += 1
+        now = time.monotonic()
+        while self._requests and self._requests[0] <= now - 60:
+            self._requests.popleft()
+
+        rpm = self.settings.rate_limit_rpm
+        if rpm and len(self._requests) >= rpm:
+            self.metrics["rate_limited"] += 1
+            retry_after = max(1, int(self._requests[0] + 60 - now) + 1)
+            return (
+                429,
+                _error_body("Rate limit exceeded", "rate_limit_exceeded"),
+                {"Retry-After": str(retry_after)},
+            )
+        self._requests.append(now)
+
+        if self._random.random() < self.settings.error_rate:
+            self.metrics["injected_errors"] += 1
+            return (
+                self.settings.error_status,
+                _error_body("Injected upstream error", "server_error"),
+                {},
+            )
+        return None
+
+    def latency_seconds(self) -> float:
+        """Sample the response latency (streamed: time to first chunk)."""
+        latency_ms = self._random.gauss(self.settings.latency_ms, self.settings.latency_jitter_ms)
+        return max(0.0, latency_ms) / 1000
+
+    def completion(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a non-streamed chat completion for a request."""
+        message, finish_reason = self._message(request)
+        return {
+            **self._envelope(request, "chat.completion"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": self._usage(request, message),
+        }
+
+    def stream_chunks(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build the chunks of a streamed chat completion for a request."""
+        message, finish_reason = self._message(request)
+        envelope = self._envelope(request, "chat.completion.chunk")
+
+        def chunk(delta: Dict[str, Any], finish: Optional[str] = None) -> Dict[str, Any]:
+            return {
+                **envelope,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+
+        chunks = [chunk({"role": "assistant", "content": ""})]
+        reasoning = message.get("reasoning_content") or ""
+        for start in range(0, len(reasoning), _CHUNK_SIZE):
+            chunks.append(chunk({"reasoning_content": reasoning[start : start + _CHUNK_SIZE]}))
+        for index, tool_call in enumerate(message.get("tool_calls") or []):
+            chunks.append(chunk({"tool_calls": [{**tool_call, "index": index}]}))
+        content = message.get("content") or ""
+        for start in range(0, len(content), _CHUNK_SIZE):
+            chunks.append(chunk({"content": content[start : start + _CHUNK_SIZE]}))
+        chunks.append(chunk({}, finish_reason))
+
+        if (request.get("stream_options") or {}).get("include_usage"):
+            chunks.append({**envelope, "choices": [], "usage": self._usage(request, message)})
+        return chunks
+
+    def _message(self, request: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+        messages = request.get("messages") or []
+        tool_rounds = sum(1 for message in messages if message.get("role") == "tool")
+        if tool_rounds < self.settings.tool_call_rounds:
+            self._next_id += 1
+            arguments = {
+                "reasoning": f"Stub reasoning round {tool_rounds + 1}",
+                "final": tool_rounds + 1 == self.settings.tool_call_rounds,
+            }
+            tool_call = {
+                "id": f"call_stub_{self._next_id}",
+                "type": "function",
+                "function": {"name": "deepseek_reasoner", "arguments": json.dumps(arguments)},
+            }
+            return {"role": "assistant", "content": None, "tool_calls": [tool_call]}, "tool_calls"
+
+        symbols = self.extract_symbols(messages)
+        # The market analysis system prompt asks for "signals" instead of "decisions"
+        wants_analysis = any(
+            message.get("role") == "system" and '"signals"' in _text(message.get("content"))
+            for message in messages
+        )
+        answer = self.analysis(symbols) if wants_analysis else self.decision(symbols)
+        message: Dict[str, Any] = {"role": "assistant", "content": json.dumps(answer)}
+        if self.settings.reasoning:
+            message["reasoning_content"] = (
+                f"Reviewing {', '.join(symbols)}: indicators are mixed, so holding is safest."
+            )
+        return message, "stop"
+
+    def _envelope(self, request: Dict[str, Any], kind: str) -> Dict[str, Any]:
+        self._next_id += 1
+        return {
+            "id": f"chatcmpl-stub-{self._next_id}",
+            "object": kind,
+            "created": int(time.time()),
+            "model": request.get("model", "stub/model"),
+        }
+
+    @staticmethod
+    def _usage(request: Dict[str, Any], message: Dict[str, Any]) -> Dict[str, int]:
+        prompt_tokens = estimate_tokens(json.dumps(request.get("messages") or [], default=str))
+        completion_tokens = estimate_tokens(json.dumps(message))
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+
+def _text(content: Any) -> str:
+    """Get the text of message content given as a string or a list of parts."""
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content if isinstance(content, str) else ""
+
+
+def _error_body(message: str, code: str) -> Dict[str, Any]:
+    return {"error": {"message": message, "type": code, "code": code}}
+
+
+def create_app(settings: Optional[StubSettings] = None) -> FastAPI:
+    """Create the stub server app."""
+    stub = StubLLM(settings or StubSettings.from_env())
+    app = FastAPI(title="LLM Stub Server")
+    app.state.stub = stub
+
+    async def chat_completions(request: Request) -> Any:
+        body = await request.json()
+        error = stub.check_limits()
+        if error is not None:
+            status, error_body, headers = error
+            return JSONResponse(error_body, status_code=status, headers=headers)
+
+        await asyncio.sleep(stub.latency_seconds())
+        if not body.get("stream"):
+            return JSONResponse(stub.completion(body))
+
+        async def events() -> AsyncIterator[str]:
+            for index, chunk in enumerate(stub.stream_chunks(body)):
+                if index:
+                    await asyncio.sleep(stub.settings.chunk_delay_ms / 1000)
+                yield f"data: {json.dumps(chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    async def list_models() -> Dict[str, Any]:
+        return {"object": "list", "data": [{"id": "stub/model", "object": "model"}]}
+
+    async def stats() -> Dict[str, Any]:
+        return stub.metrics
+
+    # Serve both OpenAI-style (/v1) and OpenRouter-style (/api/v1) base URLs
+    for prefix in ("/v1", "/api/v1"):
+        app.add_api_route(f"{prefix}/chat/completions", chat_completions, methods=["POST"])
+        app.add_api_route(f"{prefix}/models", list_models, methods=["GET"])
+    app.add_api_route("/stats", stats, methods=["GET"])
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    stub_settings = StubSettings.from_env()
+    uvicorn.run(create_app(stub_settings), host=stub_settings.host, port=stub_settings.port)
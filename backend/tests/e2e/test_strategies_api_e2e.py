@@ -869,6 +869,21 @@ class TestStrategyAPIE2E:
         data = get_response.json()
         assert data["strategy_id"] == strategies[0].strategy_id
 
+    @pytest.mark.asyncio
+    async def test_get_strategy_assignments_returns_active_assignments(self, assigned_strategy):
+        """
+        Test get_strategy_assignments maps accounts to their active strategy.
+
+        **Feature: strategy-management**
+        **Test ID: EDGE_09**
+        """
+        manager = assigned_strategy["manager"]
+        account_id = assigned_strategy["account"].id
+
+        assignments = await manager.get_strategy_assignments()
+
+        assert assignments[account_id] == assigned_strategy["strategy"].strategy_id
+
     @pytest.mark.asyncio
     async def test_assignment_history_preserved(
         self, client, test_users, assigned_strategy, get_auth_headers, db_session
@@ -0,0 +1,87 @@
+"""
+Benchmark for decision JSON extraction on long reasoning transcripts.
+
+Uses recorded transcripts from LLM_TRANSCRIPT_DIR (``*.txt`` files holding raw response
+text) when set, and synthetic 50-100 KB reasoning transcripts otherwise.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+from app.services.llm.json_extraction import extract_json_object
+
+DECISION = {
+    "decisions": [
+        {
+            "asset": symbol,
+            "action": "hold",
+            "allocation_usd": 0.0,
+            "exit_plan": "Reassess at next candle",
+            "rationale": "Mixed signals {RSI 55}",
+            "confidence": 60,
+            "risk_level": "low",
+        }
+        for symbol in ("BTCUSDT", "ETHUSDT", "SOLUSDT")
+    ],
+    "portfolio_rationale": "No high-conviction setups",
+    "total_allocation_usd": 0.0,
+    "portfolio_risk_level": "low",
+}
+
+REASONING_PARAGRAPH = (
+    'Let me weigh the "breakout" case: RSI {14} sits near 68, and the {4h, 1d} EMAs '
+    'cross. It\'s not a clean setup. A draft could be {"indicators": {"rsi": 68.2}, '
+    '"bias": "long"} but funding is {elevated} and \\boxed{0.03}.\n'
+)
+
+
+def synthetic_transcript(size_bytes: int) -> str:
+    """Build a reasoning transcript of about size_bytes ending in the decision JSON."""
+    answer = f"\n```json\n{json.dumps(DECISION, indent=2)}\n```\n"
+    repeats = max(1, (size_bytes - len(answer)) // len(REASONING_PARAGRAPH))
+    return REASONING_PARAGRAPH * repeats + answer
+
+
+def load_transcripts() -> List[Tuple[str, str]]:
+    """Load recorded transcripts, falling back to synthetic ones."""
+    transcript_dir = os.environ.get("LLM_TRANSCRIPT_DIR")
+    if transcript_dir:
+        paths = sorted(Path(transcript_dir).glob("*.txt"))
+        if paths:
+            return [(path.name, path.read_text(encoding="utf-8")) for path in paths]
+    return [(f"synthetic_{kb}kb", synthetic_transcript(kb * 1024)) for kb in (50, 75, 100)]
+
+
+def best_parse_seconds(text: str, repeats: int = 5) -> float:
+    """Best-of-N extraction time for a transcript."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        extract_json_object(text)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+@pytest.mark.performance
+def test_extraction_time_per_transcript():
+    """Every transcript parses to a decision object well within a decision budget."""
+    for name, text in load_transcripts():
+        seconds = best_parse_seconds(text)
+        print(f"{name}: {len(text) / 1024:.1f} KB in {seconds * 1000:.2f} ms")
+
+        assert extract_json_object(text) is not None
+        assert seconds < 0.25
+
+
+@pytest.mark.performance
+def test_extraction_time_is_linear_in_size():
+    """Doubling the transcript size roughly doubles the parse time."""
+    small = best_parse_seconds(synthetic_transcript(50 * 1024))
+    large = best_parse_seconds(synthetic_transcript(100 * 1024))
+
+    assert large / small < 3.0
@@ -0,0 +1,102 @@
+"""
+Offline benchmark of the decision pipeline over replayed LLM calls.
+
+Replays the cassette at LLM_REPLAY_CASSETTE (recorded with LLM_REPLAY_MODE=record)
+when set, and a synthetic streamed decision otherwise. Latency follows
+LLM_REPLAY_LATENCY (default ``lognormal:800,0.4``) with a fixed seed, so runs are
+reproducible and need no network access.
+"""
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services.llm.llm_replay import Cassette, ReplayClient
+from app.services.llm.llm_service import LLMService
+from app.utils.stats import percentile
+from tests.conftest import create_mock_context
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT"]
+
+DECISION = {
+    "decisions": [
+        {
+            "asset": symbol,
+            "action": "hold",
+            "allocation_usd": 0.0,
+            "exit_plan": "Reassess at next candle",
+            "rationale": "Mixed signals across timeframes",
+            "confidence": 60,
+            "risk_level": "low",
+        }
+        for symbol in SYMBOLS
+    ],
+    "portfolio_rationale": "No high-conviction setups",
+    "total_allocation_usd": 0.0,
+    "portfolio_risk_level": "low",
+}
+
+
+def synthetic_cassette(path: Path, chunk_size: int = 40) -> Path:
+    """Write a cassette holding one streamed decision, 20 ms per chunk."""
+    text = json.dumps(DECISION)
+    chunks = [
+        {
+            "offset_ms": 20.0 * (index + 1),
+            "chunk": {
+                "usage": None,
+                "choices": [{"delta": {"content": text[start : start + chunk_size]}}],
+            },
+        }
+        for index, start in enumerate(range(0, len(text), chunk_size))
+    ]
+    chunks.append(
+        {
+            "offset_ms": 20.0 * (len(chunks) + 1),
+            "chunk": {"usage": {"prompt_tokens": 3000, "completion_tokens": 400}, "choices": []},
+        }
+    )
+    Cassette(path).append(
+        {"key": "synthetic", "request": {}, "stream": True, "complete": True, "chunks": chunks}
+    )
+    return path
+
+
+def replay_client(tmp_path: Path) -> ReplayClient:
+    """Replay client over the recorded cassette, or a synthetic one."""
+    cassette = os.environ.get("LLM_REPLAY_CASSETTE")
+    path = Path(cassette) if cassette else synthetic_cassette(tmp_path / "decisions.jsonl")
+    latency = os.environ.get("LLM_REPLAY_LATENCY", "lognormal:800,0.4")
+    return ReplayClient(path, latency=latency, seed=42)
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_replayed_decision_latency(tmp_path):
+    """Concurrent decisions over replayed calls stay within the simulated LLM latency."""
+    service = LLMService()
+    service._client = replay_client(tmp_path)
+    service.stream_decisions = True
+    service.response_cache = None
+    context = create_mock_context(SYMBOLS)
+
+    async def timed_decision() -> float:
+        start = time.perf_counter()
+        result = await service.generate_trading_decision(SYMBOLS, context)
+        assert result.validation_passed, result.validation_errors
+        return (time.perf_counter() - start) * 1000
+
+    latencies = sorted(await asyncio.gather(*(timed_decision() for _ in range(20))))
+    p95 = percentile(latencies, 95)
+    print(
+        f"replayed decisions: p50 {percentile(latencies, 50):.0f} ms, p95 {p95:.0f} ms "
+        f"({service._client.metrics})"
+    )
+
+    assert service._client.metrics["calls"] >= 20
+    # Pipeline overhead on top of the simulated provider latency stays small
+    assert p95 < 5000
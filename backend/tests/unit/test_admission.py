@@ -0,0 +1,139 @@
+"""
+Unit tests for decision admission control.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.llm.admission import (
+    AdmissionController,
+    AdmissionPriority,
+    AdmissionRejectedError,
+)
+
+
+@pytest.fixture
+def controller():
+    """Create an admission controller with a single slot."""
+    return AdmissionController(
+        max_concurrent=1,
+        max_queue_size=3,
+        max_wait_seconds={AdmissionPriority.MANUAL: 1.0, AdmissionPriority.SCHEDULED: 1.0},
+    )
+
+
+async def _hold(controller, account_id, order, release, priority=AdmissionPriority.MANUAL):
+    async with controller.admit(account_id, priority):
+        order.append(account_id)
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_admits_immediately_when_idle(controller):
+    """Requests under the concurrency limit do not wait."""
+    async with controller.admit(1) as wait_ms:
+        assert wait_ms == 0.0
+        assert controller.active == 1
+    assert controller.active == 0
+    assert controller.get_stats()["admitted_without_wait"] == 1
+
+
+@pytest.mark.asyncio
+async def test_waits_instead_of_rejecting(controller):
+    """A request arriving at the limit waits for the running one to finish."""
+    order = []
+    release = asyncio.Event()
+    first = asyncio.create_task(_hold(controller, 1, order, release))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(_hold(controller, 2, order, release))
+    await asyncio.sleep(0)
+
+    assert controller.queue_depth == 1
+    release.set()
+    await asyncio.gather(first, second)
+
+    assert order == [1, 2]
+    assert controller.queue_depth == 0
+    assert controller.get_stats()["classes"]["manual"]["wait_max_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_round_robin_across_accounts(controller):
+    """A burst from one account does not starve another account."""
+    order = []
+    gate = asyncio.Event()
+    release = asyncio.Event()
+    release.set()
+
+    blocker = asyncio.create_task(_hold(controller, 0, order, gate))
+    await asyncio.sleep(0)
+    waiters = [
+        asyncio.create_task(_hold(controller, account_id, order, release))
+        for account_id in (1, 1, 2)
+    ]
+    await asyncio.sleep(0)
+
+    gate.set()
+    await asyncio.gather(blocker, *waiters)
+
+    assert order == [0, 1, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_manual_requests_ahead_of_scheduled(controller):
+    """Manual requests are admitted before queued scheduled ones."""
+    order = []
+    gate = asyncio.Event()
+    release = asyncio.Event()
+    release.set()
+
+    blocker = asyncio.create_task(_hold(controller, 0, order, gate))
+    await asyncio.sleep(0)
+    scheduled = asyncio.create_task(
+        _hold(controller, 1, order, release, AdmissionPriority.SCHEDULED)
+    )
+    await asyncio.sleep(0)
+    manual = asyncio.create_task(_hold(controller, 2, order, release))
+    await asyncio.sleep(0)
+
+    gate.set()
+    await asyncio.gather(blocker, scheduled, manual)
+
+    assert order == [0, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_full(controller):
+    """Requests beyond the queue bound are rejected with a Retry-After estimate."""
+    release = asyncio.Event()
+    tasks = [asyncio.create_task(_hold(controller, i, [], release)) for i in range(4)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        async with controller.admit(99):
+            pass
+
+    assert exc_info.value.reason == "queue_full"
+    assert exc_info.value.retry_after > 0
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_queue_deadline(controller):
+    """A waiter whose queue deadline passes is removed and rejected."""
+    release = asyncio.Event()
+    blocker = asyncio.create_task(_hold(controller, 1, [], release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        async with controller.admit(2, timeout=0.01):
+            pass
+
+    assert exc_info.value.reason == "timeout"
+    assert controller.queue_depth == 0
+    assert controller.get_stats()["rejected_timeout"] == 1
+    release.set()
+    await blocker
+    assert controller.active == 0
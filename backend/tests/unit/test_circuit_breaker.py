@@ -0,0 +1,122 @@
+"""
+Unit tests for the sliding-window circuit breaker.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.llm.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitState,
+)
+from app.services.llm.llm_exceptions import CircuitBreakerError, LLMAPIError
+
+
+async def succeed(delay: float = 0.0) -> str:
+    await asyncio.sleep(delay)
+    return "ok"
+
+
+async def fail() -> None:
+    raise LLMAPIError("provider unavailable")
+
+
+def _breaker(**settings) -> CircuitBreaker:
+    return CircuitBreaker(
+        **{
+            "failure_threshold": 2,
+            "recovery_timeout": 0,
+            "expected_exception": LLMAPIError,
+            **settings,
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_opens_on_failure_rate_in_window():
+    """Failures only open the circuit once their rate in the window crosses the threshold."""
+    breaker = _breaker(failure_rate_threshold=50.0, recovery_timeout=60)
+    for _ in range(3):
+        await breaker.call(succeed)
+    for _ in range(2):
+        with pytest.raises(LLMAPIError):
+            await breaker.call(fail)
+    # 2 of 5 calls failed (40%)
+    assert breaker.state == CircuitState.CLOSED
+
+    with pytest.raises(LLMAPIError):
+        await breaker.call(fail)
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitBreakerError):
+        await breaker.call(succeed)
+
+    stats = breaker.get_stats()
+    assert stats["window_failure_rate"] == 50.0
+    assert stats["rejected_calls"] == 1
+    assert stats["state_changes"] == {"closed_to_open": 1}
+
+
+@pytest.mark.asyncio
+async def test_half_open_limits_concurrent_probes():
+    """Only the configured number of probes run, and the circuit closes once they succeed."""
+    breaker = _breaker(half_open_max_calls=2)
+    for _ in range(2):
+        with pytest.raises(LLMAPIError):
+            await breaker.call(fail)
+
+    results = await asyncio.gather(
+        *(breaker.call(succeed, 0.01) for _ in range(4)), return_exceptions=True
+    )
+
+    assert results.count("ok") == 2
+    assert sum(isinstance(result, CircuitBreakerError) for result in results) == 2
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.get_stats()["state_changes"] == {
+        "closed_to_open": 1,
+        "open_to_half_open": 1,
+        "half_open_to_closed": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_reopens_the_circuit():
+    """A failed probe reopens the circuit instead of letting traffic through."""
+    breaker = _breaker(recovery_timeout=0)
+    for _ in range(2):
+        with pytest.raises(LLMAPIError):
+            await breaker.call(fail)
+
+    with pytest.raises(LLMAPIError):
+        await breaker.call(fail)
+
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.recent_transitions[-1]["reason"] == "probe call failed"
+
+
+@pytest.mark.asyncio
+async def test_slow_calls_open_the_circuit():
+    """Successful calls slower than the threshold count towards the slow-call rate."""
+    breaker = _breaker(slow_call_seconds=0.01, slow_call_rate_threshold=100.0)
+
+    await breaker.call(succeed, 0.02)
+    assert breaker.state == CircuitState.CLOSED
+    await breaker.call(succeed, 0.02)
+
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.get_stats()["slow_calls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_registry_isolates_models():
+    """A failing model opens only its own circuit."""
+    registry = CircuitBreakerRegistry(failure_threshold=2, expected_exception=LLMAPIError)
+    for _ in range(2):
+        with pytest.raises(LLMAPIError):
+            await registry.get("flaky/model").call(fail)
+
+    assert await registry.get("stable/model").call(succeed) == "ok"
+    assert registry.open_breakers() == ["flaky/model"]
+    assert registry.get("endpoint", failure_threshold=10).failure_threshold == 10
+    assert set(registry.get_stats()) == {"flaky/model", "stable/model", "endpoint"}
@@ -0,0 +1,210 @@
+"""
+Unit tests for sharing in-flight decisions between identical requests.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.app.services.llm.decision_engine import DecisionEngine
+
+
+@pytest.fixture
+def decision_engine():
+    """Create a DecisionEngine without a database."""
+    return DecisionEngine(session_factory=None)
+
+
+def _slow_decision(calls, release: asyncio.Event):
+    async def process(symbols, account_id, *args):
+        calls.append(account_id)
+        await release.wait()
+        return Mock(api_cost=0.02)
+
+    return process
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_share_one_pipeline_run(decision_engine):
+    """Concurrent identical requests run the pipeline once and get the same result."""
+    calls = []
+    release = asyncio.Event()
+
+    with (
+        patch.object(
+            decision_engine, "_process_multi_asset_decision", _slow_decision(calls, release)
+        ),
+        patch.object(decision_engine, "_cache_decision"),
+    ):
+        requests = [
+            asyncio.create_task(
+                decision_engine.make_trading_decision(account_id=1, symbols=["BTCUSDT"])
+            )
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        release.set()
+        results = await asyncio.gather(*requests)
+
+    assert calls == [1]
+    assert results[0] is results[1] is results[2]
+    assert decision_engine.metrics["coalesced_decisions"] == 2
+    assert decision_engine.metrics["llm_calls_saved"] == 2
+    assert decision_engine.metrics["llm_cost_saved_usd"] == pytest.approx(0.04)
+    assert decision_engine._active_decisions == {}
+
+
+@pytest.mark.asyncio
+async def test_different_accounts_are_not_shared(decision_engine):
+    """Requests for different accounts each run their own pipeline."""
+    calls = []
+    release = asyncio.Event()
+
+    with (
+        patch.object(
+            decision_engine, "_process_multi_asset_decision", _slow_decision(calls, release)
+        ),
+        patch.object(decision_engine, "_cache_decision"),
+    ):
+        requests = [
+            asyncio.create_task(
+                decision_engine.make_trading_decision(account_id=account_id, symbols=["BTCUSDT"])
+            )
+            for account_id in (1, 2)
+        ]
+        await asyncio.sleep(0.01)
+        release.set()
+        await asyncio.gather(*requests)
+
+    assert sorted(calls) == [1, 2]
+    assert decision_engine.metrics["coalesced_decisions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_joiner_does_not_cancel_shared_decision(decision_engine):
+    """Cancelling a request that joined an in-flight decision leaves the owner running."""
+    calls = []
+    release = asyncio.Event()
+
+    with (
+        patch.object(
+            decision_engine, "_process_multi_asset_decision", _slow_decision(calls, release)
+        ),
+        patch.object(decision_engine, "_cache_decision"),
+    ):
+        owner = asyncio.create_task(
+            decision_engine.make_trading_decision(account_id=1, symbols=["BTCUSDT"])
+        )
+        await asyncio.sleep(0.01)
+        joiner = asyncio.create_task(
+            decision_engine.make_trading_decision(account_id=1, symbols=["BTCUSDT"])
+        )
+        await asyncio.sleep(0.01)
+
+        joiner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await joiner
+
+        release.set()
+        result = await owner
+
+    assert result.api_cost == 0.02
+    assert calls == [1]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_originator_does_not_cancel_shared_decision(decision_engine):
+    """Cancelling the request that started a decision leaves it running for joiners."""
+    calls = []
+    release = asyncio.Event()
+
+    with (
+        patch.object(
+            decision_engine, "_process_multi_asset_decision", _slow_decision(calls, release)
+        ),
+        patch.object(decision_engine, "_cache_decision") as cache_decision,
+    ):
+        owner = asyncio.create_task(
+            decision_engine.make_trading_decision(account_id=1, symbols=["BTCUSDT"])
+        )
+        await asyncio.sleep(0.01)
+        joiner = asyncio.create_task(
+            decision_engine.make_trading_decision(account_id=1, symbols=["BTCUSDT"])
+        )
+        await asyncio.sleep(0.01)
+
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+
+        release.set()
+        result = await joiner
+
+    assert result.api_cost == 0.02
+    assert calls == [1]
+    cache_decision.assert_called_once()
+    assert decision_engine._active_decisions == {}
+
+
+@pytest.mark.asyncio
+async def test_joiners_do_not_take_rate_limit_tokens(decision_engine):
+    """Only the request that starts a decision is charged against the rate limit."""
+    calls = []
+    release = asyncio.Event()
+    acquire = AsyncMock(wraps=decision_engine.rate_limiter.acquire)
+
+    with (
+        patch.object(
+            decision_engine, "_process_multi_asset_decision", _slow_decision(calls, release)
+        ),
+        patch.object(decision_engine, "_cache_decision"),
+        patch.object(decision_engine.rate_limiter, "acquire", acquire),
+    ):
+        owner = asyncio.create_task(
+            decision_engine.make_trading_decision(account_id=1, symbols=["BTCUSDT"])
+        )
+        await asyncio.sleep(0.01)
+        joiners = [
+            asyncio.create_task(
+                decision_engine.make_trading_decision(account_id=1, symbols=["BTCUSDT"])
+            )
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0.01)
+        release.set()
+        await asyncio.gather(owner, *joiners)
+
+    assert acquire.await_count == 1
+    assert decision_engine.metrics["coalesced_decisions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_force_refresh_does_not_join_in_flight_decision(decision_engine):
+    """A forced refresh runs its own pipeline instead of sharing a running one."""
+    calls = []
+    release = asyncio.Event()
+
+    with (
+        patch.object(
+            decision_engine, "_process_multi_asset_decision", _slow_decision(calls, release)
+        ),
+        patch.object(decision_engine, "_cache_decision"),
+    ):
+        owner = asyncio.create_task(
+            decision_engine.make_trading_decision(account_id=1, symbols=["BTCUSDT"])
+        )
+        await asyncio.sleep(0.01)
+        forced = asyncio.create_task(
+            decision_engine.make_trading_decision(
+                account_id=1, symbols=["BTCUSDT"], force_refresh=True
+            )
+        )
+        await asyncio.sleep(0.01)
+        release.set()
+        results = await asyncio.gather(owner, forced)
+
+    assert calls == [1, 1]
+    assert results[0] is not results[1]
+    assert decision_engine.metrics["coalesced_decisions"] == 0
+    assert decision_engine._active_decisions == {}
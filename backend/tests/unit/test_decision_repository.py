@@ -0,0 +1,240 @@
+"""
+Unit tests for decision repository helpers.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models.decision import Decision, DecisionResult
+from app.services.llm.decision_repository import DecisionRepository, build_market_context_snapshot
+from app.services.llm.decision_rollup import COUNTER_COLUMNS
+
+
+def test_snapshot_hash_ignores_key_order():
+    """Equal market contexts hash the same regardless of key order."""
+    first = build_market_context_snapshot({"assets": {"BTCUSDT": 1, "ETHUSDT": 2}, "v": 1})
+    second = build_market_context_snapshot({"v": 1, "assets": {"ETHUSDT": 2, "BTCUSDT": 1}})
+
+    assert first["content_hash"] == second["content_hash"]
+    assert len(first["content_hash"]) == 64
+    assert first["size_bytes"] > 0
+
+
+def test_snapshot_hash_changes_with_content():
+    """Any change to the market context produces a new snapshot."""
+    first = build_market_context_snapshot({"assets": {"BTCUSDT": {"price": 100.0}}})
+    second = build_market_context_snapshot({"assets": {"BTCUSDT": {"price": 100.5}}})
+
+    assert first["content_hash"] != second["content_hash"]
+
+
+def test_symbol_filter_is_pushed_into_sql():
+    """History symbol filters compile to an indexable JSONB containment check."""
+    repository = DecisionRepository(session_factory=Mock())
+    query = (
+        select(Decision)
+        .where(*repository._history_filters(1, "BTCUSDT", None, None))
+        .limit(10)
+        .offset(20)
+    )
+
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert "trading.decisions.asset_decisions @>" in sql
+    assert "trading.decisions.symbol =" in sql
+    assert sql.index("WHERE") < sql.index("LIMIT")
+
+
+def _session_factory(*results):
+    """Create a session factory whose session returns the given results in order."""
+    session = AsyncMock()
+    session.execute = AsyncMock(side_effect=list(results))
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=session)
+    context.__aexit__ = AsyncMock(return_value=False)
+    return Mock(return_value=context), session
+
+
+def _counter_row(**values):
+    """Create an aggregate result row holding rollup counters."""
+    counters = {**dict.fromkeys(COUNTER_COLUMNS, 0), **values}
+    result = Mock()
+    result.one.return_value = SimpleNamespace(**counters)
+    return result
+
+
+@pytest.mark.asyncio
+async def test_decision_analytics_uses_aggregate_rows():
+    """A partial-day range is computed from one aggregate row and one grouped action count."""
+    totals = _counter_row(
+        decision_count=4,
+        validated_count=3,
+        executed_count=1,
+        processing_time_sum_ms=4000.0,
+        processing_le_1s=3,
+        processing_le_2s=1,
+        api_cost_sum=0.08,
+    )
+    factory, session = _session_factory(
+        totals, [("buy", 5, 300.0, 5), ("hold", 3, 100.0, 3), (None, 1, 0.0, 0)]
+    )
+
+    analytics = await DecisionRepository(factory).get_decision_analytics(
+        account_id=1,
+        start_date=datetime(2025, 1, 2, 8, 0),
+        end_date=datetime(2025, 1, 2, 20, 0),
+    )
+
+    assert analytics == {
+        "total_decisions": 4,
+        "validation_rate": 75.0,
+        "execution_rate": 25.0,
+        "action_breakdown": {"buy": 5, "hold": 3},
+        "avg_confidence": 50.0,
+        "avg_processing_time": 1000.0,
+        "processing_time_histogram": {
+            "processing_le_1s": 3,
+            "processing_le_2s": 1,
+            "processing_le_5s": 0,
+            "processing_le_10s": 0,
+            "processing_le_30s": 0,
+            "processing_gt_30s": 0,
+        },
+        "total_api_cost": 0.08,
+    }
+    assert session.execute.await_count == 2
+    actions_query = session.execute.await_args_list[1].args[0]
+    actions_sql = str(actions_query.compile(dialect=postgresql.dialect()))
+    assert "jsonb_array_elements" in actions_sql
+    assert "GROUP BY" in actions_sql
+
+
+@pytest.mark.asyncio
+async def test_decision_analytics_reads_whole_days_from_rollup():
+    """Whole days come from the rollup table and only the edge days are scanned."""
+    rollup = _counter_row(decision_count=10, validated_count=10, action_buy=20)
+    factory, session = _session_factory(
+        rollup, _counter_row(), _counter_row(decision_count=2), [("sell", 2, 0.0, 0)]
+    )
+
+    analytics = await DecisionRepository(factory).get_decision_analytics(
+        account_id=1,
+        start_date=datetime(2025, 1, 1, 12, 0),
+        end_date=datetime(2025, 1, 31, 12, 0),
+    )
+
+    assert analytics["total_decisions"] == 12
+    assert analytics["action_breakdown"] == {"buy": 20, "sell": 2}
+    rollup_sql = str(
+        session.execute.await_args_list[0].args[0].compile(dialect=postgresql.dialect())
+    )
+    assert "trading.decision_daily_rollups" in rollup_sql
+    assert "trading.decisions" not in rollup_sql
+
+
+@pytest.mark.asyncio
+async def test_model_performance_is_grouped_in_sql():
+    """Model comparison maps one grouped row per model."""
+    row = SimpleNamespace(
+        model_used="x-ai/grok-4",
+        total=10,
+        validated=9,
+        avg_confidence=None,
+        avg_processing_time=1500.0,
+        total_cost=0.5,
+    )
+    factory, session = _session_factory([row])
+
+    stats = await DecisionRepository(factory).get_model_performance(account_id=1)
+
+    assert stats == {
+        "x-ai/grok-4": {
+            "total_decisions": 10,
+            "validation_rate": 90.0,
+            "avg_confidence": 0.0,
+            "avg_processing_time": 1500.0,
+            "total_cost": 0.5,
+        }
+    }
+    sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "GROUP BY trading.decisions.model_used" in sql
+
+
+def _rowcount(count):
+    result = Mock()
+    result.rowcount = count
+    return result
+
+
+def _ids(*decision_ids):
+    result = Mock()
+    result.scalars.return_value.all.return_value = list(decision_ids)
+    return result
+
+
+@pytest.mark.asyncio
+async def test_cleanup_deletes_in_committed_batches():
+    """Retention deletes bounded batches, each in its own transaction, and reports progress."""
+    factory, session = _session_factory(
+        _ids(1, 2),
+        _rowcount(1),
+        _rowcount(2),
+        _ids(3),
+        _rowcount(0),
+        _rowcount(1),
+        _ids(),
+        _rowcount(4),
+        _rowcount(0),
+    )
+    progress = []
+
+    deleted = await DecisionRepository(factory).cleanup_old_decisions(
+        days_to_keep=30,
+        batch_size=2,
+        progress_callback=lambda p: progress.append((p.batches, p.decisions_deleted)),
+    )
+
+    assert deleted == 3
+    assert progress == [(1, 2), (2, 3), (2, 3)]
+    assert session.commit.await_count == 4
+    select_sql = str(
+        session.execute.await_args_list[0].args[0].compile(dialect=postgresql.dialect())
+    )
+    assert "LIMIT" in select_sql
+    assert "FOR UPDATE SKIP LOCKED" in select_sql
+
+
+@pytest.mark.asyncio
+async def test_cleanup_stops_after_max_batches():
+    """A bounded run leaves the remaining backlog for the next run."""
+    factory, session = _session_factory(_ids(1, 2), _rowcount(0), _rowcount(2))
+
+    deleted = await DecisionRepository(factory).cleanup_old_decisions(batch_size=2, max_batches=1)
+
+    assert deleted == 2
+    assert session.execute.await_count == 3
+
+
+def test_decision_tables_are_keyed_for_time_partitioning():
+    """Hypertable primary keys include the partitioning column."""
+    assert {c.name for c in Decision.__table__.primary_key} == {"id", "timestamp"}
+    assert {c.name for c in DecisionResult.__table__.primary_key} == {"id", "created_at"}
+    assert not DecisionResult.__table__.foreign_keys
+
+
+def test_recent_history_filters_on_partition_column():
+    """Date-bounded history queries filter on timestamp so old chunks are pruned."""
+    repository = DecisionRepository(session_factory=Mock())
+    query = select(Decision).where(
+        *repository._history_filters(1, None, datetime(2025, 1, 1), datetime(2025, 1, 2))
+    )
+
+    sql = str(query.compile(dialect=postgresql.dialect())).replace('"', "")
+
+    assert "trading.decisions.timestamp >=" in sql
+    assert "trading.decisions.timestamp <=" in sql
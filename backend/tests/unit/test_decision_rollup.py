@@ -0,0 +1,125 @@
+"""
+Unit tests for daily decision rollup helpers.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+
+from app.services.llm.decision_rollup import (
+    build_rollup_increments,
+    executed_increment,
+    processing_time_bucket,
+    split_rollup_range,
+)
+
+
+def _row(**overrides):
+    row = {
+        "timestamp": datetime(2025, 1, 2, 10, 30),
+        "account_id": 1,
+        "strategy_id": "conservative",
+        "model_used": "x-ai/grok-4",
+        "asset_decisions": [
+            {"asset": "BTCUSDT", "action": "buy", "confidence": 80.0},
+            {"asset": "ETHUSDT", "action": "hold", "confidence": 60.0},
+        ],
+        "action": None,
+        "confidence": None,
+        "processing_time_ms": 1500.0,
+        "validation_passed": True,
+        "executed": False,
+        "api_cost": 0.01,
+    }
+    row.update(overrides)
+    return row
+
+
+def test_increments_are_folded_per_key():
+    """Rows sharing a day, account, strategy and model become one increment."""
+    increments = build_rollup_increments(
+        [
+            _row(),
+            _row(timestamp=datetime(2025, 1, 2, 23, 59), validation_passed=False),
+            _row(model_used="other-model"),
+        ]
+    )
+
+    assert len(increments) == 2
+    increment = increments[0]
+    assert increment["day"] == date(2025, 1, 2)
+    assert increment["decision_count"] == 2
+    assert increment["validated_count"] == 1
+    assert increment["action_buy"] == 2
+    assert increment["action_hold"] == 2
+    assert increment["confidence_sum"] == 280.0
+    assert increment["confidence_count"] == 4
+    assert increment["processing_le_2s"] == 2
+    assert increment["api_cost_sum"] == 0.02
+
+
+def test_legacy_rows_count_their_own_action():
+    """Single-asset rows without asset decisions count their legacy action and confidence."""
+    increment = build_rollup_increments(
+        [_row(asset_decisions=None, action="sell", confidence=70.0, api_cost=None)]
+    )[0]
+
+    assert increment["action_sell"] == 1
+    assert increment["confidence_sum"] == 70.0
+    assert increment["api_cost_sum"] == 0.0
+
+
+def test_timestamps_are_bucketed_by_utc_day():
+    """Timezone-aware timestamps land on their UTC day."""
+    local = timezone(timedelta(hours=-5))
+    timestamp = datetime(2025, 1, 2, 22, 0, tzinfo=local)
+    increment = build_rollup_increments([_row(timestamp=timestamp)])[0]
+
+    assert increment["day"] == date(2025, 1, 3)
+
+
+def test_processing_time_buckets():
+    """Bucket bounds are inclusive and the last bucket is unbounded."""
+    assert processing_time_bucket(0) == "processing_le_1s"
+    assert processing_time_bucket(1000) == "processing_le_1s"
+    assert processing_time_bucket(1000.1) == "processing_le_2s"
+    assert processing_time_bucket(45000) == "processing_gt_30s"
+
+
+def test_executed_increment_only_counts_execution():
+    """Marking a decision executed adds to executed_count alone."""
+    increment = executed_increment((date(2025, 1, 2), 1, "conservative", "x-ai/grok-4"))
+
+    assert increment["executed_count"] == 1
+    assert increment["decision_count"] == 0
+
+
+def test_split_range_uses_rollup_for_whole_days():
+    """Partial edge days are returned as raw ranges around the whole days."""
+    first_day, last_day, raw_ranges = split_rollup_range(
+        datetime(2025, 1, 1, 12, 0), datetime(2025, 1, 10, 6, 0)
+    )
+
+    assert (first_day, last_day) == (date(2025, 1, 2), date(2025, 1, 10))
+    assert raw_ranges == [
+        (datetime(2025, 1, 1, 12, 0), datetime(2025, 1, 2)),
+        (datetime(2025, 1, 10), datetime(2025, 1, 10, 6, 0, 0, 1)),
+    ]
+
+
+def test_split_range_within_one_day_is_raw_only():
+    """A range inside one day is served entirely from raw decisions."""
+    first_day, last_day, raw_ranges = split_rollup_range(
+        datetime(2025, 1, 1, 8, 0), datetime(2025, 1, 1, 20, 0)
+    )
+
+    assert first_day == last_day
+    assert raw_ranges == [(datetime(2025, 1, 1, 8, 0), datetime(2025, 1, 1, 20, 0, 0, 1))]
+
+
+def test_split_range_from_midnight_has_no_leading_edge():
+    """A range starting at midnight reads its first day from the rollup."""
+    first_day, last_day, raw_ranges = split_rollup_range(
+        datetime(2025, 1, 1), datetime(2025, 1, 3, 12, 0)
+    )
+
+    assert (first_day, last_day) == (date(2025, 1, 1), date(2025, 1, 3))
+    assert raw_ranges == [(datetime(2025, 1, 3), datetime(2025, 1, 3, 12, 0, 0, 1))]
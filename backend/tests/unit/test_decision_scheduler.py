@@ -0,0 +1,156 @@
+"""
+Unit tests for the candle-driven Decision Scheduler.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.services.llm.admission import AdmissionPriority
+from app.services.llm.decision_scheduler import PRIORITY_RETRY, DecisionScheduler
+from app.services.market_data.events import CandleCloseEvent
+
+
+@pytest.fixture
+def mock_engine():
+    """Create a mock decision engine with three active accounts."""
+    engine = Mock()
+    engine.max_concurrent_decisions = 10
+    engine.strategy_manager.get_strategy_assignments = AsyncMock(
+        return_value={1: "conservative", 2: "aggressive", 3: "conservative"}
+    )
+    engine.make_trading_decision = AsyncMock(return_value=Mock())
+    return engine
+
+
+@pytest.fixture
+def scheduler(mock_engine):
+    """Create a DecisionScheduler without jitter or settle delay."""
+    return DecisionScheduler(
+        decision_engine=mock_engine,
+        interval="5m",
+        max_workers=2,
+        jitter_seconds=0.0,
+        settle_seconds=0.0,
+    )
+
+
+def test_workers_bounded_by_engine_limit(mock_engine):
+    """The worker pool never exceeds the engine's concurrency limit."""
+    scheduler = DecisionScheduler(decision_engine=mock_engine, interval="1h", max_workers=50)
+    assert scheduler.max_workers == 10
+    assert scheduler.deadline_seconds == pytest.approx(3600 * 0.8)
+
+
+@pytest.mark.asyncio
+async def test_run_cycle_dispatches_all_accounts(scheduler, mock_engine):
+    """Every active assignment gets one decision and the cycle is reported."""
+    report = await scheduler.run_cycle()
+
+    called_accounts = sorted(
+        call.kwargs["account_id"] for call in mock_engine.make_trading_decision.await_args_list
+    )
+    assert called_accounts == [1, 2, 3]
+    assert report.accounts == 3
+    assert report.succeeded == 3
+    assert len(report.latencies_ms) == 3
+    assert all(
+        call.kwargs["priority"] == AdmissionPriority.SCHEDULED
+        for call in mock_engine.make_trading_decision.await_args_list
+    )
+    assert {
+        call.kwargs["account_id"]: call.kwargs["strategy_override"]
+        for call in mock_engine.make_trading_decision.await_args_list
+    } == {1: "conservative", 2: "aggressive", 3: "conservative"}
+    assert scheduler.get_status()["recent_cycles"][0]["succeeded"] == 3
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_is_bounded(scheduler, mock_engine):
+    """No more than max_workers decisions run at the same time."""
+    in_flight = 0
+    peak = 0
+
+    async def slow_decision(account_id, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    mock_engine.make_trading_decision.side_effect = slow_decision
+    await scheduler.run_cycle()
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_and_timed_out_accounts_are_prioritized(scheduler, mock_engine):
+    """Accounts that fail or miss the deadline run first in the next cycle."""
+
+    async def decision(account_id, **kwargs):
+        if account_id == 2:
+            raise RuntimeError("LLM unavailable")
+        if account_id == 3:
+            await asyncio.sleep(1)
+
+    mock_engine.make_trading_decision.side_effect = decision
+    scheduler.deadline_seconds = 0.05
+
+    report = await scheduler.run_cycle()
+
+    assert report.succeeded == 1
+    assert report.failed == 1
+    assert report.timed_out == 1
+    assert scheduler._priorities == {2: PRIORITY_RETRY, 3: PRIORITY_RETRY}
+
+    queue = scheduler._build_queue({1: "a", 2: "b", 3: "c"}, now=0.0)
+    assert queue[0].account_id in (2, 3)
+
+
+@pytest.mark.asyncio
+async def test_decision_failing_after_deadline_is_logged(scheduler, mock_engine, caplog):
+    """A decision that fails after its deadline has its error retrieved and logged."""
+
+    async def decision(account_id, **kwargs):
+        if account_id == 3:
+            await asyncio.sleep(0.1)
+            raise RuntimeError("LLM unavailable")
+
+    mock_engine.make_trading_decision.side_effect = decision
+    scheduler.deadline_seconds = 0.05
+
+    report = await scheduler.run_cycle()
+    await asyncio.sleep(0.1)
+
+    assert report.timed_out == 1
+    assert "account 3 failed after its deadline" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_candle_close_opens_one_cycle_per_close_time(scheduler, mock_engine):
+    """Per-symbol events for the same close time open a single cycle."""
+    scheduler.start()
+    close_time = datetime.now(timezone.utc)
+
+    for symbol in ("BTCUSDT", "ETHUSDT", "SOLUSDT"):
+        await scheduler.on_candle_close(
+            CandleCloseEvent(symbol=symbol, interval="5m", close_time=close_time)
+        )
+    await scheduler._cycle_task
+
+    # Other intervals and stale close times are ignored
+    await scheduler.on_candle_close(
+        CandleCloseEvent(symbol="BTCUSDT", interval="1h", close_time=close_time)
+    )
+    await scheduler.on_candle_close(
+        CandleCloseEvent(
+            symbol="BTCUSDT", interval="5m", close_time=close_time - timedelta(minutes=5)
+        )
+    )
+
+    assert len(scheduler.history) == 1
+    assert mock_engine.make_trading_decision.await_count == 3
+    await scheduler.stop()
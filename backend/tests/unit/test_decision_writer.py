@@ -0,0 +1,108 @@
+"""
+Unit tests for the decision write-behind queue.
+"""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.services.llm.decision_writer import DecisionWriteBehindQueue
+
+
+@pytest.fixture
+def repository():
+    """Create a mock repository that records inserted batches."""
+    repo = Mock()
+    repo.batches = []
+
+    repo.snapshots = []
+
+    async def save_batch(rows, snapshots=None):
+        repo.batches.append(list(rows))
+        repo.snapshots.extend(snapshots or [])
+        return len(rows)
+
+    repo.save_decisions_batch = AsyncMock(side_effect=save_batch)
+    return repo
+
+
+@pytest.mark.asyncio
+async def test_submit_returns_before_write(repository):
+    """Submitting only buffers the row; the background task writes it."""
+    writer = DecisionWriteBehindQueue(repository, flush_interval_seconds=0.01)
+
+    await writer.submit({"account_id": 1})
+    assert repository.save_decisions_batch.await_count == 0
+    assert writer.buffer_depth == 1
+
+    await writer.stop()
+    assert repository.batches == [[{"account_id": 1}]]
+
+
+@pytest.mark.asyncio
+async def test_rows_are_written_in_batches(repository):
+    """Buffered rows are grouped into batches of at most batch_size."""
+    writer = DecisionWriteBehindQueue(repository, batch_size=4, flush_interval_seconds=0.01)
+
+    for account_id in range(10):
+        await writer.submit({"account_id": account_id})
+    await writer.stop()
+
+    assert [len(batch) for batch in repository.batches] == [4, 4, 2]
+    assert writer.get_stats()["written"] == 10
+    assert writer.get_stats()["batches"] == 3
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_writes_through(repository):
+    """A full buffer falls back to a synchronous write instead of dropping."""
+    writer = DecisionWriteBehindQueue(repository, max_buffer=2, flush_interval_seconds=0.01)
+
+    for account_id in range(3):
+        await writer.submit({"account_id": account_id})
+
+    assert repository.batches == [[{"account_id": 2}]]
+    assert writer.metrics["written_through"] == 1
+
+    await writer.stop()
+    assert writer.metrics["written"] == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_retried(repository):
+    """A batch that fails transiently is retried rather than dropped."""
+    original = repository.save_decisions_batch.side_effect
+
+    attempts = 0
+
+    async def flaky(rows, snapshots=None):
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise ConnectionError("db down")
+        return await original(rows, snapshots)
+
+    repository.save_decisions_batch.side_effect = flaky
+    writer = DecisionWriteBehindQueue(repository, flush_interval_seconds=0.01)
+
+    await writer.submit({"account_id": 1})
+    await writer.stop()
+
+    assert attempts == 2
+    assert writer.metrics["written"] == 1
+    assert writer.metrics["failed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_snapshot_is_written_once(repository):
+    """Decisions on the same market context send its snapshot only once."""
+    writer = DecisionWriteBehindQueue(repository, batch_size=2, flush_interval_seconds=0.01)
+    snapshot = {"content_hash": "abc", "market_context": {"assets": {}}, "size_bytes": 13}
+
+    for account_id in range(5):
+        await writer.submit({"account_id": account_id, "market_context_hash": "abc"}, snapshot)
+    await writer.stop()
+
+    assert repository.snapshots == [snapshot]
+    assert writer.metrics["snapshots_written"] == 1
+    assert writer.metrics["snapshots_deduplicated"] == 4
@@ -0,0 +1,107 @@
+"""
+Unit tests for hedged LLM requests.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.llm.hedging import RequestHedger
+from app.services.llm.llm_exceptions import LLMAPIError
+from app.services.llm.llm_metrics import LLMMetricsTracker
+
+
+def _call(result, delay=0.0, error=None, cancelled=None):
+    async def call():
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if cancelled is not None:
+                cancelled.set()
+            raise
+        if error is not None:
+            raise error
+        return result
+
+    return call
+
+
+@pytest.fixture
+def hedger():
+    return RequestHedger(LLMMetricsTracker(), default_delay_seconds=0.02)
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged(hedger):
+    """A primary that answers before the deadline sends no hedge."""
+    hedge_started = []
+
+    async def hedge_call():
+        hedge_started.append(True)
+        return "hedge"
+
+    outcome = await hedger.run(_call("primary"), hedge_call, "model-a")
+
+    assert outcome.result == "primary"
+    assert not outcome.hedged
+    assert not hedge_started
+    assert hedger.get_stats()["hedge_rate"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_cancelled_when_hedge_wins(hedger):
+    """The hedge answers first and the primary request is cancelled."""
+    cancelled = asyncio.Event()
+
+    outcome = await hedger.run(
+        _call("primary", delay=5.0, cancelled=cancelled), _call("hedge"), "model-a"
+    )
+
+    assert outcome.result == "hedge"
+    assert outcome.hedged and outcome.hedge_won
+    assert outcome.loser_cancelled
+    assert cancelled.is_set()
+    stats = hedger.get_stats()
+    assert stats["hedge_rate"] == 100.0
+    assert stats["hedge_win_rate"] == 100.0
+    assert stats["cancelled_requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_first_valid_response_wins(hedger):
+    """An invalid response does not win over a later valid one."""
+    outcome = await hedger.run(
+        _call("invalid", delay=0.05),
+        _call("valid", delay=0.1),
+        "model-a",
+        is_valid=lambda result: result == "valid",
+    )
+
+    assert outcome.result == "valid"
+    assert outcome.hedge_won
+    assert outcome.loser_result == "invalid"
+    assert not outcome.loser_cancelled
+
+
+@pytest.mark.asyncio
+async def test_primary_error_is_raised_when_both_fail(hedger):
+    """With no response at all the primary's error is raised."""
+    with pytest.raises(LLMAPIError, match="primary failed"):
+        await hedger.run(
+            _call(None, delay=0.05, error=LLMAPIError("primary failed")),
+            _call(None, error=LLMAPIError("hedge failed")),
+            "model-a",
+        )
+
+
+def test_hedge_delay_uses_latency_percentile():
+    """The deadline is the model's latency percentile once there are enough samples."""
+    tracker = LLMMetricsTracker()
+    hedger = RequestHedger(tracker, percentile=90, min_samples=10, default_delay_seconds=30.0)
+
+    assert hedger.hedge_delay("model-a") == 30.0
+
+    for response_time_ms in range(100, 1100, 100):
+        tracker.record_api_call("model-a", 1000, 100, float(response_time_ms))
+
+    assert hedger.hedge_delay("model-a") == pytest.approx(0.9)
@@ -0,0 +1,61 @@
+"""
+Unit tests for decision JSON extraction.
+"""
+
+import json
+
+from app.services.llm.json_extraction import extract_json_object, find_brace_spans
+
+DECISION = {
+    "decisions": [{"asset": "BTCUSDT", "action": "buy", "rationale": 'Broke "resistance" {4h}'}],
+    "portfolio_rationale": "Selective risk-on",
+}
+
+
+def test_extracts_from_code_fence_after_prose():
+    """Prose with braces and quotes before the fenced answer is skipped."""
+    text = (
+        "Let's check \\boxed{42} and the {range} case. It's \"obvious\"\n"
+        f"```json\n{json.dumps(DECISION, indent=2)}\n```\nDone."
+    )
+
+    assert extract_json_object(text) == DECISION
+
+
+def test_ignores_drafts_in_thinking_blocks():
+    """Draft decisions inside thinking blocks are not the answer."""
+    draft = {"decisions": [{"asset": "BTCUSDT", "action": "sell"}]}
+    text = f"<think>Draft: {json.dumps(draft)}</think>\n{json.dumps(DECISION)}"
+
+    assert extract_json_object(text) == DECISION
+
+
+def test_prefers_decision_object_over_larger_objects():
+    """The decision object wins over other JSON in the response."""
+    other = {"indicators": {"rsi": 71.2, "macd": 0.4}, "notes": "x" * 200}
+    text = f"{json.dumps(other)}\n{json.dumps(DECISION)}"
+
+    assert extract_json_object(text) == DECISION
+    assert extract_json_object(json.dumps(other)) == other
+
+
+def test_recovers_from_unbalanced_prose():
+    """An unclosed prose brace or stray quote does not hide the answer."""
+    text = 'Use {x as "the base\nthen {note: y}\n' + json.dumps(DECISION)
+
+    assert extract_json_object(text) == DECISION
+
+
+def test_no_json_returns_none():
+    """Text without a JSON object yields None."""
+    assert extract_json_object("No JSON here, just {prose}.") is None
+
+
+def test_brace_spans_skip_braces_in_strings():
+    """Braces inside JSON strings do not create spans."""
+    text = 'a {"k": "}{", "n": {"m": "\\"}"}} b'
+
+    spans = find_brace_spans(text)
+
+    assert [(start, end) for start, end, _ in spans] == [(2, len(text) - 2)]
+    assert len(spans[0][2]) == 1
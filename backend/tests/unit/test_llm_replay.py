@@ -0,0 +1,137 @@
+"""
+Unit tests for LLM call record/replay.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.llm.llm_exceptions import LLMAPIError
+from app.services.llm.llm_replay import LatencyModel, RecordingClient, ReplayClient
+
+MESSAGES = [{"role": "user", "content": "Decide on BTCUSDT"}]
+
+
+def _completion(content):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content, tool_calls=None))],
+        usage=SimpleNamespace(prompt_tokens=100, completion_tokens=50),
+    )
+
+
+def _chunk(content):
+    delta = SimpleNamespace(content=content, tool_calls=None, reasoning_content=None)
+    return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=delta)])
+
+
+class FakeStream:
+    def __init__(self, chunks, delay=0.0):
+        self.chunks = list(chunks)
+        self.delay = delay
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.chunks:
+            raise StopAsyncIteration
+        await asyncio.sleep(self.delay)
+        return self.chunks.pop(0)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeClient:
+    def __init__(self, response=None, stream=None, delay=0.0):
+        self.response = response
+        self.stream = stream
+        self.delay = delay
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **request):
+        self.requests.append(request)
+        await asyncio.sleep(self.delay)
+        return self.stream if request.get("stream") else self.response
+
+
+@pytest.mark.asyncio
+async def test_completion_round_trip(tmp_path):
+    """A recorded completion is replayed with attribute access."""
+    cassette = tmp_path / "llm.jsonl"
+    recorder = RecordingClient(FakeClient(response=_completion('{"decisions": []}')), cassette)
+    await recorder.chat.completions.create(model="test/model", messages=MESSAGES)
+
+    replay = ReplayClient(cassette, latency="none", strict=True)
+    response = await replay.chat.completions.create(model="test/model", messages=MESSAGES)
+
+    assert response.choices[0].message.content == '{"decisions": []}'
+    assert response.usage.prompt_tokens == 100
+    assert replay.metrics["exact_matches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_round_trip_keeps_timing(tmp_path):
+    """Streamed chunks are replayed in order at their recorded offsets."""
+    cassette = tmp_path / "llm.jsonl"
+    stream = FakeStream([_chunk('{"deci'), _chunk('sions": []}')], delay=0.05)
+    recorder = RecordingClient(FakeClient(stream=stream), cassette)
+    recorded = await recorder.chat.completions.create(
+        model="test/model", messages=MESSAGES, stream=True
+    )
+    async for _ in recorded:
+        pass
+    await recorded.close()
+
+    replay = ReplayClient(cassette, strict=True)
+    started = time.perf_counter()
+    replayed = await replay.chat.completions.create(
+        model="test/model", messages=MESSAGES, stream=True
+    )
+    content = "".join([chunk.choices[0].delta.content async for chunk in replayed])
+
+    assert content == '{"decisions": []}'
+    assert stream.closed
+    assert time.perf_counter() - started >= 0.08
+    assert len(cassette.read_text().splitlines()) == 1
+
+
+@pytest.mark.asyncio
+async def test_unrecorded_request_falls_back_to_recording_order(tmp_path):
+    """Unrecorded requests replay in recording order unless strict."""
+    cassette = tmp_path / "llm.jsonl"
+    client = FakeClient(response=_completion("first"))
+    recorder = RecordingClient(client, cassette)
+    await recorder.chat.completions.create(model="test/model", messages=MESSAGES)
+    client.response = _completion("second")
+    await recorder.chat.completions.create(model="test/model", messages=[])
+
+    other = [{"role": "user", "content": "Decide at a later candle"}]
+    replay = ReplayClient(cassette, latency="none")
+    first = await replay.chat.completions.create(model="test/model", messages=other)
+    second = await replay.chat.completions.create(model="test/model", messages=other)
+
+    assert [first.choices[0].message.content, second.choices[0].message.content] == [
+        "first",
+        "second",
+    ]
+    assert replay.metrics["fallback_matches"] == 2
+    with pytest.raises(LLMAPIError, match="No recorded interaction"):
+        await ReplayClient(cassette, strict=True).chat.completions.create(
+            model="test/model", messages=other
+        )
+
+
+def test_latency_models_are_seeded():
+    """Simulated latency distributions are reproducible with a seed."""
+    samples = [LatencyModel("lognormal:800,0.5", seed=7).duration_ms(0.0) for _ in range(2)]
+
+    assert samples[0] == samples[1]
+    assert LatencyModel("fixed:250").duration_ms(1000.0) == 250.0
+    assert LatencyModel("recorded").duration_ms(1000.0) == 1000.0
+    with pytest.raises(ValueError):
+        LatencyModel("uniform:1,2")
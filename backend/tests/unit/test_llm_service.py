@@ -5,12 +5,15 @@ Tests LLM API integration, decision generation, model switching,
 error handling, and A/B testing functionality.
 """
 
+import asyncio
 import json
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+from app.core.config import config
 from app.schemas.trading_decision import (
     AccountContext,
     DecisionResult,
@@ -24,8 +27,46 @@ from app.schemas.trading_decision import (
     TradingDecision,
     TradingStrategy,
 )
-from app.services.llm.llm_exceptions import LLMAPIError, ModelSwitchError, ValidationError
+from app.services.llm.hedging import RequestHedger
+from app.services.llm.llm_exceptions import (
+    LLMAPIError,
+    ModelCapacityError,
+    ModelSwitchError,
+    ValidationError,
+)
+from app.services.llm.llm_metrics import LLMMetricsTracker
+from app.services.llm.llm_metrics import UsageMetrics as TrackerUsageMetrics
 from app.services.llm.llm_service import LLMService, get_llm_service
+from app.services.llm.model_router import ModelRouter
+from app.services.llm.model_scheduler import ModelScheduler
+from app.services.llm.response_cache import LLMResponseCache
+
+
+class FakeStream:
+    """Streamed completion that records how far it was consumed."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.consumed = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self.chunks:
+            self.consumed += 1
+            yield chunk
+
+    async def close(self):
+        self.closed = True
+
+
+def _delta_chunk(content=None, tool_calls=None):
+    delta = SimpleNamespace(
+        content=content, tool_calls=tool_calls, reasoning_content=None, reasoning=None
+    )
+    return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=delta)])
 
 
 class TestLLMService:
@@ -34,7 +75,10 @@ class TestLLMService:
     @pytest.fixture
     def llm_service(self):
         """Create a fresh LLMService instance for each test."""
-        return LLMService()
+        service = LLMService()
+        # The mocked client returns complete (non-streamed) completions
+        service.stream_decisions = False
+        return service
 
     @pytest.fixture
     def mock_openai_client(self):
@@ -356,6 +400,320 @@ class TestLLMService:
             assert decision.portfolio_rationale is not None
             assert decision.total_allocation_usd == 1000.0
 
+    @pytest.mark.asyncio
+    async def test_generate_trading_decision_reuses_cached_response(
+        self, llm_service, mock_openai_client, sample_trading_context
+    ):
+        """Test that an identical prompt is answered from the response cache."""
+        decision_json = {
+            "decisions": [
+                {
+                    "asset": "BTCUSDT",
+                    "action": "hold",
+                    "allocation_usd": 0.0,
+                    "exit_plan": "Wait for a clearer setup",
+                    "rationale": "Range-bound market without a clear trend",
+                    "confidence": 60,
+                    "risk_level": "low",
+                }
+            ],
+            "portfolio_rationale": "No high-conviction setups",
+            "total_allocation_usd": 0.0,
+            "portfolio_risk_level": "low",
+        }
+        mock_openai_client.chat.completions.create.return_value.choices[
+            0
+        ].message.content = json.dumps(decision_json)
+
+        # A priced model, so the cached call has a known cost
+        llm_service.model = "openai/gpt-4"
+        llm_service._client = mock_openai_client
+        with patch.object(llm_service.metrics_tracker, "record_api_call"):
+            first = await llm_service.generate_trading_decision(["BTCUSDT"], sample_trading_context)
+            second = await llm_service.generate_trading_decision(
+                ["BTCUSDT"], sample_trading_context
+            )
+
+        assert mock_openai_client.chat.completions.create.call_count == 1
+        assert second.validation_passed is True
+        assert second.decision.decisions[0].action == "hold"
+        assert second.api_cost == 0.0
+
+        stats = llm_service.response_cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        # 100 prompt and 50 completion tokens at $0.03/$0.06 per 1K
+        assert first.api_cost == pytest.approx(0.006)
+        assert stats["cost_saved_usd"] == pytest.approx(first.api_cost)
+        assert stats["unpriced_hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_decision_prompt_has_stable_static_prefix(
+        self, llm_service, mock_openai_client, sample_trading_context
+    ):
+        """Test that strategy sections lead the system message and market data follows."""
+        mock_openai_client.chat.completions.create.return_value.choices[
+            0
+        ].message.content = json.dumps({"decisions": []})
+        llm_service._client = mock_openai_client
+        llm_service.response_cache = None
+
+        messages = []
+        for price in (48000.0, 48250.0):
+            sample_trading_context.market_data.assets["BTCUSDT"].current_price = price
+            with patch.object(llm_service.metrics_tracker, "record_api_call"):
+                await llm_service.generate_trading_decision(["BTCUSDT"], sample_trading_context)
+            messages.append(mock_openai_client.chat.completions.create.call_args[1]["messages"])
+
+        system, user = messages[0]
+        assert system["content"].startswith(llm_service._get_decision_system_prompt())
+        assert "STRATEGY PARAMETERS" in system["content"]
+        assert "INSTRUCTIONS" in system["content"]
+        assert "MARKET DATA FOR ALL ASSETS" in user["content"]
+        assert "STRATEGY PARAMETERS" not in user["content"]
+        # Only the volatile suffix changes between decisions
+        assert messages[1][0] == system
+        assert messages[1][1] != user
+
+    def test_cache_control_hint_for_explicit_caching_providers(self, llm_service):
+        """Test that cache_control breakpoints are only added where providers need them."""
+        llm_service.model = "anthropic/claude-3-sonnet"
+        system, user = llm_service._build_decision_messages("static", "volatile")
+
+        assert system["content"] == [
+            {"type": "text", "text": "static", "cache_control": {"type": "ephemeral"}}
+        ]
+        assert user == {"role": "user", "content": "volatile"}
+
+        llm_service.model = "openai/gpt-4"
+        system, _ = llm_service._build_decision_messages("static", "volatile")
+        assert system["content"] == "static"
+
+    @pytest.mark.asyncio
+    async def test_generate_trading_decision_fails_over_between_routed_models(
+        self, llm_service, sample_trading_context
+    ):
+        """Test that a routed decision fails over when the first model fails."""
+        decision_json = {
+            "decisions": [
+                {
+                    "asset": "BTCUSDT",
+                    "action": "hold",
+                    "allocation_usd": 0.0,
+                    "exit_plan": "Wait for a clearer setup",
+                    "rationale": "Range-bound market without a clear trend",
+                    "confidence": 60,
+                    "risk_level": "low",
+                }
+            ],
+            "portfolio_rationale": "No high-conviction setups",
+            "total_allocation_usd": 0.0,
+            "portfolio_risk_level": "low",
+        }
+        llm_service.model_router = ModelRouter(
+            {"fast/model": 80, "backup/model": 80}, LLMMetricsTracker()
+        )
+        llm_service.response_cache = None
+        original_model = llm_service.model
+        models_called = []
+
+        async def call_llm(prompt, system_prompt=None, model=None):
+            models_called.append(model)
+            if model == "fast/model":
+                raise LLMAPIError("provider unavailable")
+            return {"content": json.dumps(decision_json), "usage": None, "cost": 0.01}
+
+        with patch.object(llm_service, "_call_llm_for_decision", side_effect=call_llm):
+            result = await llm_service.generate_trading_decision(
+                ["BTCUSDT"], sample_trading_context
+            )
+
+        assert models_called == ["fast/model", "backup/model"]
+        assert result.validation_passed is True
+        assert result.model_used == "backup/model"
+        assert llm_service.model == original_model
+        assert llm_service.model_router.get_status()["failovers"] == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_decision_is_hedged_with_fallback_model(
+        self, llm_service, sample_trading_context
+    ):
+        """Test that a hedge request answers a slow decision and the slow call is cancelled."""
+        decision_json = {
+            "decisions": [
+                {
+                    "asset": "BTCUSDT",
+                    "action": "hold",
+                    "allocation_usd": 0.0,
+                    "exit_plan": "Wait for a clearer setup",
+                    "rationale": "Range-bound market without a clear trend",
+                    "confidence": 60,
+                    "risk_level": "low",
+                }
+            ],
+            "portfolio_rationale": "No high-conviction setups",
+            "total_allocation_usd": 0.0,
+            "portfolio_risk_level": "low",
+        }
+        llm_service.model = "openai/gpt-4"
+        llm_service.hedge_model = "deepseek/deepseek-r1"
+        llm_service.request_hedger = RequestHedger(LLMMetricsTracker(), default_delay_seconds=0.01)
+        llm_service.response_cache = None
+        cancelled = []
+
+        async def call_llm(prompt, system_prompt=None, model=None):
+            if model == "openai/gpt-4":
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(model)
+                    raise
+            return {"content": json.dumps(decision_json), "usage": None, "cost": 0.002}
+
+        with patch.object(llm_service, "_call_llm_for_decision", side_effect=call_llm):
+            result = await llm_service.generate_trading_decision(
+                ["BTCUSDT"], sample_trading_context
+            )
+
+        assert result.validation_passed is True
+        assert result.model_used == "deepseek/deepseek-r1"
+        assert cancelled == ["openai/gpt-4"]
+        stats = llm_service.request_hedger.get_stats()
+        assert stats["hedged_requests"] == 1
+        assert stats["hedge_wins"] == 1
+        # The cancelled request's prompt is counted as overhead
+        assert stats["cost_overhead_usd"] > 0
+
+    @pytest.mark.asyncio
+    async def test_decision_call_without_model_capacity_is_not_sent(
+        self, llm_service, mock_openai_client
+    ):
+        """Test that a call with no free model slot is rejected instead of retried."""
+        llm_service._client = mock_openai_client
+        llm_service.model_scheduler = ModelScheduler(
+            default_max_concurrency=1, max_wait_seconds=0.01
+        )
+
+        async with llm_service.model_scheduler.reserve(llm_service.model, 10):
+            with pytest.raises(ModelCapacityError):
+                await llm_service._call_llm_for_decision("Test prompt")
+
+        mock_openai_client.chat.completions.create.assert_not_called()
+        stats = llm_service.model_scheduler.get_stats()["models"][llm_service.model]
+        assert stats["rejected_concurrency"] == 1
+        assert llm_service.metrics_tracker.get_usage_metrics().failed_calls == 0
+
+    @pytest.mark.asyncio
+    async def test_two_stage_decisions_share_one_market_analysis(
+        self, llm_service, sample_trading_context
+    ):
+        """Test that concurrent accounts of a strategy family share one analysis call."""
+        analysis_json = {
+            "signals": [
+                {
+                    "asset": "BTCUSDT",
+                    "bias": "long",
+                    "conviction": 80,
+                    "risk_level": "medium",
+                    "rationale": "Trend continuation above the 20 EMA",
+                }
+            ],
+            "market_summary": "Risk-on market.",
+            "market_risk_level": "medium",
+        }
+        llm_service.two_stage_decisions = True
+        llm_service.market_analysis_cache = LLMResponseCache(interval="1h")
+        llm_service.model_router = None
+        calls = []
+
+        async def call_llm(prompt, system_prompt=None, model=None):
+            calls.append(system_prompt)
+            await asyncio.sleep(0.01)
+            return {"content": json.dumps(analysis_json), "usage": None, "cost": 0.01}
+
+        other_account = sample_trading_context.model_copy(deep=True)
+        other_account.account_state.available_balance = 1000.0
+
+        with patch.object(llm_service, "_call_llm_for_decision", side_effect=call_llm):
+            results = await asyncio.gather(
+                llm_service.generate_trading_decision(["BTCUSDT"], sample_trading_context),
+                llm_service.generate_trading_decision(["BTCUSDT"], other_account),
+            )
+            cached = await llm_service.generate_trading_decision(
+                ["BTCUSDT"], sample_trading_context
+            )
+
+        assert len(calls) == 1
+        assert '"signals"' in calls[0]
+        assert all(result.validation_passed for result in [*results, cached])
+        allocations = [result.decision.decisions[0].allocation_usd for result in results]
+        assert all(result.decision.decisions[0].action == "buy" for result in results)
+        # The smaller account gets a smaller position from the same analysis
+        assert allocations[1] < allocations[0]
+        assert [result.api_cost for result in (*results, cached)] == [0.01, 0.0, 0.0]
+        assert llm_service.two_stage_metrics["analysis_calls"] == 1
+        assert llm_service.two_stage_metrics["analysis_shared_inflight"] == 1
+        assert llm_service.two_stage_metrics["analysis_cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_ab_test_decisions_keep_their_own_model(
+        self, llm_service, sample_trading_context
+    ):
+        """Test that an A/B test model does not leak into concurrent decisions."""
+        decision_json = {
+            "decisions": [
+                {
+                    "asset": "BTCUSDT",
+                    "action": "hold",
+                    "allocation_usd": 0.0,
+                    "exit_plan": "Wait for a clearer setup",
+                    "rationale": "Range-bound market without a clear trend",
+                    "confidence": 60,
+                    "risk_level": "low",
+                }
+            ],
+            "portfolio_rationale": "No high-conviction setups",
+            "total_allocation_usd": 0.0,
+            "portfolio_risk_level": "low",
+        }
+        llm_service.model_router = None
+        llm_service.response_cache = None
+        default_model = llm_service.model
+        other_account = sample_trading_context.model_copy(deep=True)
+        other_account.account_id = sample_trading_context.account_id + 1
+        models_called = []
+
+        async def call_llm(prompt, system_prompt=None, model=None):
+            models_called.append(model)
+            # Keep the A/B test decision in flight while the other one starts
+            await asyncio.sleep(0.02 if model == "ab/model" else 0)
+            return {"content": json.dumps(decision_json), "usage": None, "cost": 0.01}
+
+        def ab_model(test_name, account_id):
+            return "ab/model" if account_id == sample_trading_context.account_id else None
+
+        record = Mock()
+        with (
+            patch.object(llm_service, "_call_llm_for_decision", side_effect=call_llm),
+            patch.object(llm_service, "get_ab_test_model", side_effect=ab_model),
+            patch.object(llm_service.ab_test_manager, "record_decision_performance", record),
+        ):
+            ab_result, other_result = await asyncio.gather(
+                llm_service.generate_trading_decision(
+                    ["BTCUSDT"], sample_trading_context, ab_test_name="model-test"
+                ),
+                llm_service.generate_trading_decision(
+                    ["BTCUSDT"], other_account, ab_test_name="model-test"
+                ),
+            )
+
+        assert models_called == ["ab/model", default_model]
+        assert ab_result.model_used == "ab/model"
+        assert other_result.model_used == default_model
+        assert llm_service.model == default_model
+        record.assert_called_once()
+        assert record.call_args.kwargs["model_name"] == "ab/model"
+
     @pytest.mark.asyncio
     async def test_generate_trading_decision_insufficient_context(
         self, llm_service, sample_trading_context
@@ -497,13 +855,19 @@ class TestLLMService:
 
     def test_get_usage_metrics(self, llm_service):
         """Test usage metrics retrieval."""
-        mock_metrics = Mock()
-        mock_metrics.total_calls = 100
-        mock_metrics.successful_calls = 95
-        mock_metrics.failed_calls = 5
-        mock_metrics.avg_response_time_ms = 250.0
-        mock_metrics.total_cost = 10.0
-        mock_metrics.error_rate = 5.0
+        mock_metrics = TrackerUsageMetrics(
+            total_calls=100,
+            successful_calls=95,
+            failed_calls=5,
+            avg_response_time_ms=250.0,
+            total_cost=10.0,
+            error_rate=5.0,
+            prompt_tokens=80000,
+            cached_prompt_tokens=60000,
+            prompt_cache_rate=75.0,
+            prompt_cache_savings=0.5,
+            avg_response_time_prompt_cached_ms=180.0,
+        )
 
         with patch.object(
             llm_service.metrics_tracker, "get_usage_metrics", return_value=mock_metrics
@@ -514,6 +878,33 @@ class TestLLMService:
             assert metrics.successful_requests == 95
             assert metrics.failed_requests == 5
             assert metrics.avg_response_time_ms == 250.0
+            assert metrics.cached_prompt_tokens == 60000
+            assert metrics.prompt_cache_rate == 75.0
+            assert metrics.prompt_cache_savings_usd == 0.5
+            assert metrics.avg_response_time_prompt_cached_ms == 180.0
+
+    def test_cached_prompt_tokens_are_tracked(self, llm_service):
+        """Test that provider prompt cache reads are counted and priced at the cached rate."""
+        usage = SimpleNamespace(
+            prompt_tokens=4000,
+            completion_tokens=500,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=3000),
+        )
+        tracker = LLMMetricsTracker()
+        model = "anthropic/claude-3-sonnet"
+
+        cached_tokens = llm_service._get_cached_tokens(usage)
+        call = tracker.record_api_call(model, 4000, 500, 200.0, cached_tokens=cached_tokens)
+        tracker.record_api_call(model, 4000, 500, 400.0)
+        metrics = tracker.get_usage_metrics()
+
+        assert cached_tokens == 3000
+        assert llm_service._get_cached_tokens(SimpleNamespace(prompt_tokens=10)) == 0
+        assert call.cost == pytest.approx(tracker._calculate_cost(model, 4000, 500) - 3 * 0.0027)
+        assert metrics.cached_prompt_tokens == 3000
+        assert metrics.prompt_cache_rate == pytest.approx(37.5)
+        assert metrics.prompt_cache_savings == pytest.approx(3 * 0.0027)
+        assert metrics.avg_response_time_prompt_cached_ms == 200.0
 
     def test_ab_testing_methods(self, llm_service):
         """Test A/B testing functionality."""
@@ -627,6 +1018,44 @@ class TestLLMService:
         # Check that prompt mentions the number of assets
         assert "1 perpetual futures" in prompt
 
+    def test_decision_prompt_compacts_large_portfolios(self, llm_service, sample_trading_context):
+        """Test that a 30-asset prompt is compacted to fit the token budget."""
+        prices = [48000.0 + 10 * i for i in range(10)]
+        indicator_set = TechnicalIndicatorsSet(
+            ema_20=prices,
+            ema_50=prices,
+            rsi=[50.0 + i for i in range(10)],
+            macd=[1.0 + 0.1 * i for i in range(10)],
+            macd_signal=[1.0] * 10,
+            bb_upper=prices,
+            bb_middle=prices,
+            bb_lower=prices,
+            atr=[500.0] * 10,
+        )
+        indicators = TechnicalIndicators(interval=indicator_set, long_interval=indicator_set)
+        btc_data = sample_trading_context.market_data.assets["BTCUSDT"]
+        symbols = [f"COIN{i}USDT" for i in range(30)]
+        sample_trading_context.market_data.assets = {
+            symbol: btc_data.model_copy(
+                update={"symbol": symbol, "technical_indicators": indicators}
+            )
+            for symbol in symbols
+        }
+
+        with patch.object(config, "LLM_PROMPT_TOKEN_BUDGET", 0):
+            full = llm_service._compile_multi_asset_decision_prompt(symbols, sample_trading_context)
+        with patch.object(config, "LLM_PROMPT_TOKEN_BUDGET", full.tokens * 2 // 3):
+            compact = llm_service._compile_multi_asset_decision_prompt(
+                symbols, sample_trading_context
+            )
+
+        assert full.encoding == "full"
+        assert compact.encoding != "full"
+        assert compact.within_budget
+        assert all(symbol in compact.text for symbol in symbols)
+        assert "STRATEGY PARAMETERS" in compact.text
+        assert compact.section_tokens()["market_data"] < full.section_tokens()["market_data"]
+
     def test_build_multi_asset_decision_prompt_with_strategy_override(
         self, llm_service, sample_trading_context
     ):
@@ -856,6 +1285,74 @@ class TestLLMService:
             # Should have made max_retries attempts
             assert mock_openai_client.chat.completions.create.call_count == llm_service.max_retries
 
+    @pytest.mark.asyncio
+    async def test_streamed_decision_stops_when_json_completes(
+        self, llm_service, mock_openai_client
+    ):
+        """Test that the stream is closed once the decision object is complete."""
+        stream = FakeStream(
+            [
+                _delta_chunk('```json\n{"decisions": ['),
+                _delta_chunk('{"asset": "BTCUSDT", "action": "hold", "rationale": "{range}"}'),
+                _delta_chunk('], "portfolio_rationale": "Wait"}'),
+                _delta_chunk("\n```\nAdditional commentary that is never needed."),
+            ]
+        )
+        mock_openai_client.chat.completions.create.return_value = stream
+
+        llm_service._client = mock_openai_client
+        llm_service.stream_decisions = True
+        with patch.object(llm_service.metrics_tracker, "record_api_call") as record_api_call:
+            result = await llm_service._call_llm_for_decision("Test prompt")
+
+        assert json.loads(result["content"])["decisions"][0]["rationale"] == "{range}"
+        assert stream.consumed == 3
+        assert stream.closed is True
+        assert mock_openai_client.chat.completions.create.call_args[1]["stream"] is True
+
+        recorded = record_api_call.call_args[1]
+        assert recorded["time_to_first_decision_ms"] is not None
+        assert recorded["time_to_first_decision_ms"] <= recorded["response_time_ms"]
+        assert recorded["completion_tokens"] > 0
+
+    @pytest.mark.asyncio
+    async def test_streamed_tool_calls_are_reassembled(self, llm_service, mock_openai_client):
+        """Test that streamed tool call fragments become one assistant message."""
+
+        def tool_call_delta(**function):
+            return SimpleNamespace(
+                index=0,
+                id="call_1" if "name" in function else None,
+                function=SimpleNamespace(
+                    name=function.get("name"), arguments=function["arguments"]
+                ),
+            )
+
+        mock_openai_client.chat.completions.create.return_value = FakeStream(
+            [
+                _delta_chunk(tool_calls=[tool_call_delta(name="deepseek_reasoner", arguments="")]),
+                _delta_chunk(tool_calls=[tool_call_delta(arguments='{"reasoning": "x", ')]),
+                _delta_chunk(tool_calls=[tool_call_delta(arguments='"final": true}')]),
+            ]
+        )
+
+        llm_service._client = mock_openai_client
+        llm_service.stream_decisions = True
+        messages = [{"role": "user", "content": "Test prompt"}]
+        with patch.object(llm_service.metrics_tracker, "record_api_call"):
+            result, messages, should_continue = await llm_service._execute_decision_loop_step(
+                messages
+            )
+
+        assert should_continue is True
+        assistant_message = messages[1]
+        assert assistant_message["tool_calls"][0]["id"] == "call_1"
+        assert assistant_message["tool_calls"][0]["function"] == {
+            "name": "deepseek_reasoner",
+            "arguments": '{"reasoning": "x", "final": true}',
+        }
+        assert messages[2] == {"role": "tool", "tool_call_id": "call_1", "content": "continue"}
+
     def test_get_decision_system_prompt(self, llm_service):
         """Test getting decision system prompt."""
         prompt = llm_service._get_decision_system_prompt()
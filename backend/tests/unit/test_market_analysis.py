@@ -0,0 +1,100 @@
+"""
+Unit tests for the shared market analysis and per-account allocation of two-stage decisions.
+"""
+
+import json
+
+import pytest
+
+from app.schemas.trading_decision import PositionSummary
+from app.services.llm.llm_exceptions import ValidationError
+from app.services.llm.market_analysis import (
+    AssetSignal,
+    MarketAnalysis,
+    PortfolioAllocator,
+    parse_market_analysis,
+)
+from tests.conftest import create_mock_context
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+
+
+def _analysis(**signals):
+    return MarketAnalysis(
+        strategy_family="conservative",
+        signals={
+            asset: AssetSignal(asset=asset, bias=bias, conviction=conviction)
+            for asset, (bias, conviction) in signals.items()
+        },
+        market_summary="Mixed market.",
+        market_risk_level="medium",
+    )
+
+
+def test_parse_fills_missing_assets_with_neutral_signals():
+    """Unknown values are normalized and assets without a signal are neutral."""
+    content = "Analysis:\n" + json.dumps(
+        {
+            "signals": [
+                {"asset": "BTCUSDT", "bias": "LONG", "conviction": 140, "sl_price": "46000"},
+                {"asset": "DOGEUSDT", "bias": "long", "conviction": 90},
+            ],
+            "market_risk_level": "extreme",
+        }
+    )
+
+    analysis = parse_market_analysis(content, SYMBOLS, "conservative")
+
+    assert analysis.signals["BTCUSDT"].bias == "long"
+    assert analysis.signals["BTCUSDT"].conviction == 100.0
+    assert analysis.signals["BTCUSDT"].sl_price == 46000.0
+    assert analysis.signals["ETHUSDT"].bias == "neutral"
+    assert "DOGEUSDT" not in analysis.signals
+    assert analysis.market_risk_level == "medium"
+    assert MarketAnalysis.from_dict(analysis.to_dict()) == analysis
+
+    with pytest.raises(ValidationError):
+        parse_market_analysis('{"signals": []}', SYMBOLS, "conservative")
+
+
+def test_allocation_sizes_by_risk_and_caps_by_position_limit():
+    """Strong signals open positions sized by risk per trade within account limits."""
+    context = create_mock_context(SYMBOLS)
+    analysis = _analysis(BTCUSDT=("long", 80), ETHUSDT=("short", 40), SOLUSDT=("neutral", 90))
+
+    decision = PortfolioAllocator(min_conviction=60).allocate(analysis, SYMBOLS, context)
+
+    btc, eth, sol = decision.decisions
+    assert btc.action == "buy"
+    # $200 risk at a 3% stop is $5,333 at 0.8 conviction, capped at the $2,000 limit
+    assert btc.allocation_usd == 2000.0
+    assert btc.sl_price == pytest.approx(46560.0)
+    assert btc.tp_price == pytest.approx(50880.0)
+    assert eth.action == "hold" and sol.action == "hold"
+    assert decision.total_allocation_usd == 2000.0
+    assert decision.validate_all_decisions({"BTCUSDT": 48000.0}) == []
+
+
+def test_allocation_respects_positions():
+    """Opposing signals close positions and free slots limit new positions."""
+    context = create_mock_context(SYMBOLS)
+    context.account_state.active_strategy.max_positions = 2
+    context.account_state.open_positions = [
+        PositionSummary(
+            symbol="ETHUSDT",
+            side="long",
+            size=1.0,
+            entry_price=3000.0,
+            current_price=3200.0,
+            unrealized_pnl=200.0,
+            percentage_pnl=6.7,
+        )
+    ]
+    analysis = _analysis(BTCUSDT=("long", 70), ETHUSDT=("short", 75), SOLUSDT=("short", 90))
+
+    decision = PortfolioAllocator().allocate(analysis, SYMBOLS, context)
+
+    actions = {entry.asset: entry.action for entry in decision.decisions}
+    assert actions == {"BTCUSDT": "hold", "ETHUSDT": "close_position", "SOLUSDT": "sell"}
+    sol = decision.get_decision_for_asset("SOLUSDT")
+    assert sol.sl_price > 120.0 > sol.tp_price
@@ -0,0 +1,168 @@
+"""
+Unit tests for the shared market context snapshot store.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.schemas.trading_decision import MarketContext
+from app.services.llm.context_builder import ContextBuilderService
+from app.services.llm.market_snapshot import MarketSnapshotStore
+from app.services.market_data.events import CandleCloseEvent
+
+
+def _market_context() -> MarketContext:
+    return MarketContext(
+        assets={}, market_sentiment="neutral", timestamp=datetime.now(timezone.utc)
+    )
+
+
+class TestMarketSnapshotStore:
+    """Test cases for MarketSnapshotStore."""
+
+    @pytest.fixture
+    def store(self):
+        """Create a MarketSnapshotStore instance for testing."""
+        return MarketSnapshotStore(ttl_seconds=300)
+
+    @pytest.mark.asyncio
+    async def test_snapshot_shared_by_reference(self, store):
+        """Same symbols and timeframes return the same snapshot regardless of order."""
+        builder = AsyncMock(return_value=(_market_context(), []))
+
+        first = await store.get_or_build(["BTCUSDT", "ETHUSDT"], ["5m", "1h"], builder)
+        second = await store.get_or_build(["ETHUSDT", "BTCUSDT"], ["5m", "1h"], builder)
+
+        assert first is second
+        assert first.market_context is second.market_context
+        assert builder.await_count == 1
+        assert store.stats["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_build_once(self, store):
+        """Concurrent requests for the same snapshot are coalesced into one build."""
+
+        async def slow_build():
+            await asyncio.sleep(0.01)
+            return _market_context(), []
+
+        builder = AsyncMock(side_effect=slow_build)
+        snapshots = await asyncio.gather(
+            *[store.get_or_build(["BTCUSDT"], ["5m", "1h"], builder) for _ in range(10)]
+        )
+
+        assert builder.await_count == 1
+        assert all(snapshot is snapshots[0] for snapshot in snapshots)
+        assert store._build_locks == {}
+
+    @pytest.mark.asyncio
+    async def test_build_lock_dropped_after_failed_build(self, store):
+        """A build lock is dropped with its last user, even when the build fails."""
+        builder = AsyncMock(side_effect=RuntimeError("market data unavailable"))
+
+        with pytest.raises(RuntimeError):
+            await store.get_or_build(["BTCUSDT"], ["5m", "1h"], builder)
+
+        assert store._build_locks == {}
+        assert store._build_lock_users == {}
+
+    @pytest.mark.asyncio
+    async def test_candle_close_supersedes_snapshot(self, store):
+        """A candle close on one of the snapshot's symbols and timeframes supersedes it."""
+        builder = AsyncMock(side_effect=lambda: (_market_context(), []))
+
+        first = await store.get_or_build(["BTCUSDT", "ETHUSDT"], ["5m", "1h"], builder)
+        assert store.is_current(first.market_context)
+
+        store.advance("BTCUSDT", "5m")
+
+        assert not store.is_current(first.market_context)
+        second = await store.get_or_build(["BTCUSDT", "ETHUSDT"], ["5m", "1h"], builder)
+        assert second is not first
+        assert second.version != first.version
+        assert builder.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unrelated_candle_close_keeps_snapshot(self, store):
+        """Candle closes on other symbols or intervals leave the snapshot valid."""
+        builder = AsyncMock(return_value=(_market_context(), []))
+
+        first = await store.get_or_build(["BTCUSDT"], ["5m", "1h"], builder)
+        store.advance("SOLUSDT", "5m")
+        store.advance("BTCUSDT", "4h")
+
+        assert await store.get_or_build(["BTCUSDT"], ["5m", "1h"], builder) is first
+
+    @pytest.mark.asyncio
+    async def test_force_refresh_rebuilds(self, store):
+        """force_refresh rebuilds the snapshot even if it is still valid."""
+        builder = AsyncMock(side_effect=lambda: (_market_context(), ["partial"]))
+
+        first = await store.get_or_build(["BTCUSDT"], ["5m", "1h"], builder)
+        second = await store.get_or_build(["BTCUSDT"], ["5m", "1h"], builder, force_refresh=True)
+
+        assert second is not first
+        assert second.errors == ("partial",)
+
+    @pytest.mark.asyncio
+    async def test_invalidate_symbol(self, store):
+        """invalidate drops only snapshots containing the symbol."""
+        builder = AsyncMock(side_effect=lambda: (_market_context(), []))
+
+        await store.get_or_build(["BTCUSDT"], ["5m", "1h"], builder)
+        await store.get_or_build(["ETHUSDT"], ["5m", "1h"], builder)
+        store.invalidate("BTCUSDT")
+
+        assert store.get(["BTCUSDT"], ["5m", "1h"]) is None
+        assert store.get(["ETHUSDT"], ["5m", "1h"]) is not None
+
+
+class TestSharedMarketContext:
+    """Test cases for market context sharing in ContextBuilderService."""
+
+    @pytest.fixture
+    def context_builder(self):
+        """Create a ContextBuilderService instance for testing."""
+        return ContextBuilderService(session_factory=None)
+
+    @pytest.mark.asyncio
+    async def test_accounts_share_market_context(self, context_builder):
+        """Market context is built once and shared across accounts."""
+        market_context = _market_context()
+        with patch.object(
+            context_builder,
+            "get_market_context",
+            new_callable=AsyncMock,
+            return_value=(market_context, []),
+        ) as mock_get_market_context:
+            first, _ = await context_builder.get_shared_market_context(["BTCUSDT"], ["5m", "1h"])
+            second, _ = await context_builder.get_shared_market_context(["BTCUSDT"], ["5m", "1h"])
+
+        assert first is market_context
+        assert second is market_context
+        assert mock_get_market_context.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_on_candle_close_supersedes_market_data(self, context_builder):
+        """Candle close events supersede the snapshot and the per-asset cache."""
+        context_builder._cache["market_context_BTCUSDT_5m-1h"] = (
+            datetime.now(timezone.utc),
+            object(),
+        )
+        with patch.object(
+            context_builder,
+            "get_market_context",
+            new_callable=AsyncMock,
+            return_value=(_market_context(), []),
+        ):
+            market_context, _ = await context_builder.get_shared_market_context(
+                ["BTCUSDT"], ["5m", "1h"]
+            )
+
+        await context_builder.on_candle_close(CandleCloseEvent(symbol="BTCUSDT", interval="5m"))
+
+        assert not context_builder.is_market_context_current(market_context)
+        assert "market_context_BTCUSDT_5m-1h" not in context_builder._cache
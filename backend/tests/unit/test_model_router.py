@@ -0,0 +1,134 @@
+"""
+Unit tests for latency- and cost-aware model routing.
+"""
+
+import pytest
+
+from app.services.llm.circuit_breaker import CircuitBreakerRegistry
+from app.services.llm.llm_exceptions import CircuitBreakerError, LLMAPIError
+from app.services.llm.llm_metrics import LLMMetricsTracker
+from app.services.llm.model_router import ModelRouter
+
+FAST = "fast/model"
+SLOW = "slow/model"
+PREMIUM = "premium/model"
+
+
+def _record(tracker, model, response_time_ms, calls=20, failures=0, tokens=1000):
+    for i in range(calls):
+        failed = i < failures
+        tracker.record_api_call(
+            model,
+            tokens,
+            100,
+            response_time_ms,
+            success=not failed,
+            error="timeout" if failed else None,
+        )
+
+
+@pytest.fixture
+def tracker():
+    return LLMMetricsTracker()
+
+
+def test_routes_to_lowest_latency_and_cost(tracker):
+    """The model with the best rolling p95 latency and cost is tried first."""
+    _record(tracker, FAST, 800.0)
+    _record(tracker, SLOW, 6000.0)
+    router = ModelRouter({SLOW: 80, FAST: 80}, tracker)
+
+    assert router.route() == [FAST, SLOW]
+    assert router.get_status()["routes_per_model"][FAST] == 1
+
+
+def test_unmeasured_models_score_at_pool_mean(tracker):
+    """A model without samples ranks between measured ones."""
+    _record(tracker, FAST, 800.0)
+    _record(tracker, SLOW, 6000.0)
+    router = ModelRouter({SLOW: 80, PREMIUM: 80, FAST: 80}, tracker)
+
+    assert router.route() == [FAST, PREMIUM, SLOW]
+
+
+def test_quality_floor_per_strategy(tracker):
+    """Models below a strategy's quality floor are excluded."""
+    _record(tracker, FAST, 800.0)
+    _record(tracker, PREMIUM, 6000.0)
+    router = ModelRouter(
+        {FAST: 70, PREMIUM: 95},
+        tracker,
+        quality_floors={"aggressive": 90, "strategy-1": 60},
+    )
+
+    assert router.route(strategy_type="aggressive") == [PREMIUM]
+    assert router.route(strategy_id="strategy-1", strategy_type="aggressive") == [FAST, PREMIUM]
+    assert router.route(strategy_type="conservative") == [FAST, PREMIUM]
+    # Unreachable floors fall back to the highest quality models
+    assert ModelRouter({FAST: 70}, tracker, quality_floors={"dca": 99}).route(
+        strategy_type="dca"
+    ) == [FAST]
+
+
+def test_high_error_rate_models_are_fallbacks(tracker):
+    """Models over the error rate limit are only tried after healthy ones."""
+    _record(tracker, FAST, 800.0, failures=15)
+    _record(tracker, SLOW, 6000.0)
+    router = ModelRouter({FAST: 80, SLOW: 80}, tracker, max_error_rate=50.0)
+
+    assert router.route() == [SLOW, FAST]
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_over(tracker):
+    """A model whose circuit opened is tried last until its recovery probe."""
+    _record(tracker, FAST, 800.0)
+    _record(tracker, SLOW, 6000.0)
+    router = ModelRouter(
+        {FAST: 80, SLOW: 80},
+        tracker,
+        circuit_breakers=CircuitBreakerRegistry(
+            failure_threshold=2, expected_exception=LLMAPIError
+        ),
+    )
+
+    async def failing_call():
+        raise LLMAPIError("provider unavailable")
+
+    for _ in range(2):
+        with pytest.raises(LLMAPIError):
+            await router.circuit_breaker(FAST).call(failing_call)
+    with pytest.raises(CircuitBreakerError):
+        await router.circuit_breaker(FAST).call(failing_call)
+
+    assert router.route() == [SLOW, FAST]
+    fast_stats = next(entry for entry in router.get_model_stats() if entry.model == FAST)
+    assert fast_stats.circuit_open
+
+
+def test_window_stats_p95(tracker):
+    """p95 latency is taken over successful calls in the window."""
+    for response_time_ms in range(1, 101):
+        tracker.record_api_call(FAST, 1000, 100, float(response_time_ms))
+    tracker.record_api_call(FAST, 0, 0, 30000.0, success=False, error="timeout")
+
+    stats = tracker.get_model_window_stats(FAST)
+
+    assert stats["calls"] == 101
+    assert stats["p95_response_time_ms"] == 95.0
+    assert stats["error_rate"] == pytest.approx(100 / 101)
+    assert tracker.get_model_window_stats(SLOW)["p95_response_time_ms"] is None
+
+
+def test_window_stats_are_reused_within_ttl(tracker):
+    """Routing reuses a model's window statistics until they are older than the TTL."""
+    _record(tracker, FAST, 800.0)
+    _record(tracker, SLOW, 6000.0)
+    router = ModelRouter({FAST: 80, SLOW: 80}, tracker, stats_ttl_seconds=60.0)
+    assert router.route() == [FAST, SLOW]
+
+    _record(tracker, FAST, 60000.0, calls=200)
+    assert router.route() == [FAST, SLOW]
+
+    router.stats_ttl_seconds = 0.0
+    assert router.route() == [SLOW, FAST]
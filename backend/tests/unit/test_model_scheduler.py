@@ -0,0 +1,109 @@
+"""
+Unit tests for per-model concurrency and tokens-per-minute scheduling.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.llm.llm_exceptions import ModelCapacityError
+from app.services.llm.model_scheduler import ModelScheduler
+
+MODEL = "test/model"
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_queues_calls():
+    """Calls over the concurrency limit wait for a slot."""
+    scheduler = ModelScheduler(default_max_concurrency=2, max_wait_seconds=1.0)
+    active = []
+    peak = []
+
+    async def call():
+        async with scheduler.reserve(MODEL, 10):
+            active.append(True)
+            peak.append(len(active))
+            await asyncio.sleep(0.02)
+            active.pop()
+
+    await asyncio.gather(*(call() for _ in range(5)))
+
+    stats = scheduler.get_stats()["models"][MODEL]
+    assert max(peak) == 2
+    assert stats["calls"] == 5
+    assert stats["peak_active"] == 2
+    assert stats["queued_calls"] >= 3
+    assert stats["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_call_rejected_after_wait_deadline():
+    """A call that gets no slot before its deadline is rejected."""
+    scheduler = ModelScheduler(default_max_concurrency=1, max_wait_seconds=1.0)
+
+    async with scheduler.reserve(MODEL, 10):
+        with pytest.raises(ModelCapacityError, match="No call slot"):
+            async with scheduler.reserve(MODEL, 10, timeout=0.01):
+                pass
+
+    assert scheduler.get_stats()["models"][MODEL]["rejected_concurrency"] == 1
+    # The slot is released for later calls
+    async with scheduler.reserve(MODEL, 10, timeout=0.01):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_token_budget_waits_for_refill():
+    """A call over the token budget waits for the bucket to refill."""
+    scheduler = ModelScheduler(default_tokens_per_minute=6000, max_wait_seconds=1.0)
+
+    async with scheduler.reserve(MODEL, 6000):
+        pass
+    async with scheduler.reserve(MODEL, 10) as reservation:
+        # 10 tokens refill in 0.1s at 100 tokens per second
+        assert reservation.wait_ms >= 50
+
+    with pytest.raises(ModelCapacityError, match="budget"):
+        async with scheduler.reserve(MODEL, 3000):
+            pass
+    assert scheduler.get_stats()["models"][MODEL]["rejected_tokens"] == 1
+
+
+@pytest.mark.asyncio
+async def test_slot_released_while_waiting_for_tokens():
+    """A call waiting for the token budget does not hold its call slot."""
+    scheduler = ModelScheduler(
+        default_max_concurrency=1, default_tokens_per_minute=6000, max_wait_seconds=1.0
+    )
+
+    async def call():
+        async with scheduler.reserve(MODEL, 10):
+            pass
+
+    async with scheduler.reserve(MODEL, 6000):
+        pass
+    waiting = asyncio.create_task(call())
+    await asyncio.sleep(0.02)
+
+    state = scheduler._models[MODEL]
+    assert state.waiting == 1
+    assert not state.semaphore.locked()
+    await waiting
+    assert state.metrics["calls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_settle_charges_actual_usage():
+    """Usage over the estimate is charged to the bucket as debt."""
+    scheduler = ModelScheduler(
+        default_tokens_per_minute=1000, tokens_per_minute_limits={MODEL: 6000}
+    )
+
+    async with scheduler.reserve(MODEL, 1000) as reservation:
+        reservation.settle(4000)
+
+    stats = scheduler.get_stats()["models"][MODEL]
+    assert stats["tokens_per_minute"] == 6000
+    assert stats["tokens_last_minute"] == 4000
+    assert stats["token_utilization"] == pytest.approx(4000 / 6000 * 100)
+    assert scheduler._models[MODEL].bucket.tokens == pytest.approx(2000, abs=10)
@@ -0,0 +1,81 @@
+"""
+Unit tests for token-budgeted prompt compilation.
+"""
+
+from app.services.llm.prompt_compiler import PromptCompiler, estimate_tokens, format_series
+
+SERIES = [100.0, 101.5, 101.0, 102.25]
+
+
+def test_series_encodings():
+    """Each encoding carries the latest value in fewer characters."""
+    full = format_series(SERIES, 2, "full")
+    compact = format_series(SERIES, 2, "compact")
+    summary = format_series(SERIES, 2, "summary")
+
+    assert full == "100.00, 101.50, 101.00, 102.25"
+    assert compact == "102.25 (+1.5 -0.5 +1.25)"
+    assert summary == "102.25 (+2.25, 100.00, 102.25)"
+    assert format_series(None) == "N/A"
+    assert format_series(list(range(20)), 0, "full").startswith("10, ")
+
+
+def _render(encoding):
+    series = format_series([float(v) for v in range(100, 110)] * 3, 2, encoding)
+    return [("header", "=== HEADER ==="), ("market_data", series * 20), ("empty", "  ")]
+
+
+def test_keeps_full_encoding_within_budget():
+    """Without budget pressure the full encoding is used."""
+    compiled = PromptCompiler(token_budget=None).compile(_render)
+
+    assert compiled.encoding == "full"
+    assert compiled.within_budget
+    assert set(compiled.section_tokens()) == {"header", "market_data"}
+    assert compiled.tokens == sum(compiled.section_tokens().values())
+
+
+def test_compacts_until_within_budget():
+    """A tight budget selects the least compact encoding that fits."""
+    full_tokens = PromptCompiler().compile(_render).tokens
+
+    compiled = PromptCompiler(token_budget=full_tokens - 1).compile(_render)
+
+    assert compiled.encoding in ("compact", "summary")
+    assert compiled.within_budget
+    assert compiled.tokens < full_tokens
+
+
+def test_returns_most_compact_when_nothing_fits():
+    """An impossible budget yields the summary encoding, flagged as over budget."""
+    compiled = PromptCompiler(token_budget=1).compile(_render)
+
+    assert compiled.encoding == "summary"
+    assert not compiled.within_budget
+    assert compiled.text.startswith("=== HEADER ===\n\n")
+
+
+def test_estimate_tokens():
+    """Token estimates are about four characters per token."""
+    assert estimate_tokens("") == 1
+    assert estimate_tokens("x" * 400) == 100
+
+
+def test_static_sections_form_a_stable_prefix():
+    """Static sections lead the prompt and do not change with the encoding."""
+
+    def render(encoding):
+        return [("instructions", "=== INSTRUCTIONS ===")] + _render(encoding)
+
+    full = PromptCompiler().compile(render, static_sections={"instructions", "header"})
+    compact = PromptCompiler(token_budget=1).compile(
+        render, static_sections={"instructions", "header"}
+    )
+
+    assert full.prefix == "=== INSTRUCTIONS ===\n\n=== HEADER ==="
+    assert compact.prefix == full.prefix
+    assert full.text == f"{full.prefix}\n\n{full.suffix}"
+    assert full.prefix_tokens == estimate_tokens("=== INSTRUCTIONS ===") + estimate_tokens(
+        "=== HEADER ==="
+    )
+    assert "=== HEADER ===" not in full.suffix
@@ -0,0 +1,95 @@
+"""
+Unit tests for the token bucket rate limiter.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.services.llm.rate_limiter import InMemoryRateLimitBackend, RateLimiter
+
+
+class FakeClock:
+    """Controllable replacement for time.monotonic."""
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Patch the rate limiter clock."""
+    fake = FakeClock()
+    with patch("app.services.llm.rate_limiter.time.monotonic", fake):
+        yield fake
+
+
+@pytest.mark.asyncio
+async def test_allows_burst_up_to_limit(clock):
+    """A fresh bucket allows max_requests requests, then rejects."""
+    limiter = RateLimiter(max_requests=3, window_seconds=60)
+
+    results = [await limiter.acquire("account_1") for _ in range(4)]
+
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert results[2].remaining == 0
+    assert results[3].reset_time is not None
+
+
+@pytest.mark.asyncio
+async def test_retry_after_matches_refill_rate(clock):
+    """Retry-After is the time until one token has refilled."""
+    limiter = RateLimiter(max_requests=60, window_seconds=60)
+    for _ in range(60):
+        await limiter.acquire("account_1")
+
+    rejected = await limiter.acquire("account_1")
+    assert not rejected.allowed
+    assert rejected.retry_after_seconds == pytest.approx(1.0)
+
+    clock.now += 0.5
+    rejected = await limiter.acquire("account_1")
+    assert rejected.retry_after_seconds == pytest.approx(0.5)
+
+    clock.now += 0.5
+    assert (await limiter.acquire("account_1")).allowed
+
+
+@pytest.mark.asyncio
+async def test_keys_are_independent(clock):
+    """Exhausting one key does not affect another."""
+    limiter = RateLimiter(max_requests=1, window_seconds=60)
+
+    assert (await limiter.acquire("account_1")).allowed
+    assert not (await limiter.acquire("account_1")).allowed
+    assert (await limiter.acquire("account_2")).allowed
+
+
+@pytest.mark.asyncio
+async def test_idle_keys_are_evicted(clock):
+    """Buckets idle for a full window are dropped on later requests."""
+    backend = InMemoryRateLimitBackend(idle_seconds=60)
+    limiter = RateLimiter(max_requests=10, window_seconds=60, backend=backend)
+
+    for account_id in range(100):
+        await limiter.acquire(f"account_{account_id}")
+    assert len(backend) == 100
+
+    clock.now += 61
+    await limiter.acquire("account_new")
+
+    assert len(backend) == 1
+    assert await limiter.get_remaining_requests("account_0") == 10
+
+
+@pytest.mark.asyncio
+async def test_remaining_requests_does_not_consume(clock):
+    """Peeking at the bucket leaves its tokens untouched."""
+    limiter = RateLimiter(max_requests=5, window_seconds=60)
+    await limiter.acquire("account_1")
+
+    assert await limiter.get_remaining_requests("account_1") == 4
+    assert await limiter.get_remaining_requests("account_1") == 4
@@ -0,0 +1,131 @@
+"""
+Unit tests for the LLM response cache.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.llm.response_cache import (
+    InMemoryResponseCacheBackend,
+    LLMResponseCache,
+    ResponseCacheBackend,
+)
+
+NOW = datetime(2026, 10, 18, 10, 30, tzinfo=timezone.utc)
+
+
+class FailingBackend(ResponseCacheBackend):
+    """Shared backend whose database is unavailable."""
+
+    async def get(self, key, now):
+        raise ConnectionError("database unavailable")
+
+    async def set(self, key, model, response, expires_at):
+        raise ConnectionError("database unavailable")
+
+    async def evict_expired(self, now):
+        return 0
+
+
+def test_key_covers_model_prompts_and_temperature():
+    """Changing any key component changes the key."""
+    key = LLMResponseCache.build_key("model-a", "system", "prompt", 0.3)
+
+    assert key == LLMResponseCache.build_key("model-a", "system", "prompt", 0.3)
+    assert key != LLMResponseCache.build_key("model-b", "system", "prompt", 0.3)
+    assert key != LLMResponseCache.build_key("model-a", "system 2", "prompt", 0.3)
+    assert key != LLMResponseCache.build_key("model-a", "system", "prompt 2", 0.3)
+    assert key != LLMResponseCache.build_key("model-a", "system", "prompt", 0.7)
+
+
+def test_expiry_is_bounded_by_candle_close():
+    """Responses never outlive the candle they were cached in."""
+    cache = LLMResponseCache(ttl_seconds=3600, interval="1h")
+
+    assert cache.expires_at(NOW) == datetime(2026, 10, 18, 11, 0, tzinfo=timezone.utc)
+    assert LLMResponseCache(ttl_seconds=60, interval="1h").expires_at(NOW) == NOW + timedelta(
+        seconds=60
+    )
+
+
+@pytest.mark.asyncio
+async def test_hits_misses_and_cost_saved():
+    """Hits are counted with the cost of the call they replaced."""
+    cache = LLMResponseCache(ttl_seconds=300)
+    key = cache.build_key("model-a", "system", "prompt", 0.3)
+
+    assert await cache.get(key) is None
+    await cache.set(key, "model-a", {"content": "{}", "cost": 0.02})
+    assert (await cache.get(key))["content"] == "{}"
+    await cache.get(key)
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == pytest.approx(200 / 3)
+    assert stats["cost_saved_usd"] == pytest.approx(0.04)
+    assert stats["unpriced_hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_unpriced_hits_save_no_cost():
+    """Hits on responses without a known cost are counted but save 0.0 dollars."""
+    cache = LLMResponseCache(ttl_seconds=300)
+    await cache.set("key", "unpriced/model", {"content": "{}", "cost": None})
+
+    await cache.get("key")
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["unpriced_hits"] == 1
+    assert stats["cost_saved_usd"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_expired_responses_are_not_returned():
+    """A response past its TTL is a miss."""
+    cache = LLMResponseCache(ttl_seconds=0)
+    await cache.set("key", "model-a", {"content": "{}", "cost": 0.02})
+
+    assert await cache.get("key") is None
+    assert cache.get_stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recently_used():
+    """The in-process backend keeps at most max_entries responses."""
+    backend = InMemoryResponseCacheBackend(max_entries=2)
+    expires_at = NOW + timedelta(minutes=5)
+    await backend.set("a", "m", {"content": "a"}, expires_at)
+    await backend.set("b", "m", {"content": "b"}, expires_at)
+    await backend.get("a", NOW)
+    await backend.set("c", "m", {"content": "c"}, expires_at)
+
+    assert await backend.get("b", NOW) is None
+    assert await backend.get("a", NOW) is not None
+    assert await backend.evict_expired(expires_at) == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_hit_fills_memory():
+    """A response cached by another worker is served and kept in process."""
+    shared = InMemoryResponseCacheBackend()
+    expires_at = datetime.now(timezone.utc) + timedelta(days=1)
+    await shared.set("key", "m", {"content": "{}", "cost": 0.01}, expires_at)
+    cache = LLMResponseCache(ttl_seconds=300, shared_backend=shared)
+
+    assert await cache.get("key") is not None
+    assert cache.get_stats()["shared_hits"] == 1
+    assert cache.get_stats()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_backend_errors_degrade_to_memory():
+    """An unavailable shared backend does not fail decisions."""
+    cache = LLMResponseCache(ttl_seconds=300, shared_backend=FailingBackend())
+
+    await cache.set("key", "m", {"content": "{}", "cost": 0.01})
+    assert await cache.get("key") is not None
+    assert await cache.get("other") is None
+    assert cache.get_stats()["errors"] == 2
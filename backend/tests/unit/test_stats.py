@@ -0,0 +1,30 @@
+"""
+Unit tests for the shared statistics helpers.
+"""
+
+import pytest
+
+from app.utils.stats import percentile
+
+
+@pytest.mark.parametrize(
+    ("values", "pct", "expected"),
+    [
+        ([1, 2, 3, 4, 5], 50, 3),
+        ([1, 2, 3, 4], 50, 2),
+        (list(range(1, 31)), 95, 29),
+        (list(range(1, 101)), 95, 95),
+        (list(range(1, 101)), 99, 99),
+        ([7], 95, 7),
+        ([1, 2, 3], 0, 1),
+        ([1, 2, 3], 100, 3),
+    ],
+)
+def test_percentile_is_nearest_rank(values, pct, expected):
+    """The percentile is the smallest value with at least pct% of values at or below it."""
+    assert percentile(values, pct) == expected
+
+
+def test_percentile_of_empty_list():
+    """An empty list has a 0.0 percentile."""
+    assert percentile([], 95) == 0.0
@@ -0,0 +1,65 @@
+"""
+Unit tests for the incremental decision stream parser.
+"""
+
+import json
+
+from app.services.llm.stream_parser import DecisionStreamParser
+
+DECISION = {
+    "decisions": [
+        {"asset": "BTCUSDT", "action": "buy", "rationale": 'Breakout above "resistance" }'},
+        {"asset": "ETHUSDT", "action": "hold", "rationale": "Range [2400, 2600]"},
+    ],
+    "portfolio_rationale": "Selective risk-on",
+}
+
+
+def _feed(parser, text, chunk_size):
+    for start in range(0, len(text), chunk_size):
+        if parser.feed(text[start : start + chunk_size]):
+            return start + chunk_size
+    return None
+
+
+def test_completes_at_closing_brace_for_any_chunking():
+    """The object is recognised however the text is split, ignoring trailing output."""
+    body = json.dumps(DECISION)
+    text = f"Here is my analysis.\n```json\n{body}\n```\nTrailing commentary"
+
+    for chunk_size in (1, 3, 7, 64, len(text)):
+        parser = DecisionStreamParser()
+        _feed(parser, text, chunk_size)
+
+        assert parser.complete
+        assert json.loads(parser.result) == DECISION
+        assert parser.assets_completed == 2
+
+
+def test_counts_asset_decisions_as_they_close():
+    """The first asset decision is reported before the object is complete."""
+    parser = DecisionStreamParser()
+
+    parser.feed('{"decisions": [{"asset": "BTCUSDT", "levels": {"tp": 1}')
+    assert parser.assets_completed == 0
+    parser.feed("}, {")
+    assert parser.assets_completed == 1
+    assert not parser.complete
+
+
+def test_skips_objects_without_decisions_key():
+    """Objects in reasoning text are discarded until the decision object appears."""
+    parser = DecisionStreamParser()
+    text = 'Consider {"rsi": 72, "nested": {"decisions": []}} first. {"decisions": []}'
+
+    assert parser.feed(text)
+    assert parser.result == '{"decisions": []}'
+
+
+def test_incomplete_stream_is_not_complete():
+    """A truncated object leaves the parser incomplete with the raw text available."""
+    parser = DecisionStreamParser()
+
+    assert not parser.feed('{"decisions": [{"asset": "BTC')
+    assert parser.result is None
+    assert parser.text == '{"decisions": [{"asset": "BTC'
@@ -0,0 +1,103 @@
+"""
+Unit tests for the local OpenAI-compatible LLM stub server.
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.llm.stub_server import StubLLM, StubSettings, create_app
+
+PROMPT = """
+=== MARKET DATA FOR ALL ASSETS ===
+
+--- BTCUSDT ---
+Current Price: $48000.00
+
+--- ETHUSDT ---
+Current Price: $3000.00
+"""
+
+REQUEST = {"model": "stub/model", "messages": [{"role": "user", "content": PROMPT}]}
+
+
+def _stub(**settings):
+    return StubLLM(StubSettings(latency_ms=0, latency_jitter_ms=0, seed=1, **settings))
+
+
+def test_completion_holds_every_prompt_symbol():
+    """The decision covers the prompt's symbols in prompt order."""
+    response = _stub().completion(REQUEST)
+
+    message = response["choices"][0]["message"]
+    decision = json.loads(message["content"])
+    assert [entry["asset"] for entry in decision["decisions"]] == ["BTCUSDT", "ETHUSDT"]
+    assert message["reasoning_content"]
+    assert response["usage"]["total_tokens"] > 0
+
+
+def test_market_analysis_requests_get_signals():
+    """A system prompt asking for signals gets a market analysis instead of decisions."""
+    system = {"role": "system", "content": 'Respond with {"signals": [...]}'}
+    request = {**REQUEST, "messages": [system] + REQUEST["messages"]}
+
+    content = json.loads(_stub().completion(request)["choices"][0]["message"]["content"])
+
+    assert [signal["asset"] for signal in content["signals"]] == ["BTCUSDT", "ETHUSDT"]
+    assert "decisions" not in content
+
+
+def test_stream_chunks_rebuild_the_completion():
+    """Streamed content deltas concatenate to the decision, followed by usage."""
+    chunks = _stub().stream_chunks({**REQUEST, "stream_options": {"include_usage": True}})
+
+    content = "".join(
+        chunk["choices"][0]["delta"].get("content") or "" for chunk in chunks if chunk["choices"]
+    )
+    assert len(json.loads(content)["decisions"]) == 2
+    assert chunks[-2]["choices"][0]["finish_reason"] == "stop"
+    assert chunks[-1]["choices"] == [] and chunks[-1]["usage"]["prompt_tokens"] > 0
+
+
+def test_tool_call_rounds_precede_the_decision():
+    """deepseek_reasoner tool calls are returned until the configured rounds are answered."""
+    stub = _stub(tool_call_rounds=1)
+
+    first = stub.completion(REQUEST)["choices"][0]
+    tool_call = first["message"]["tool_calls"][0]
+    tool_response = {"role": "tool", "tool_call_id": tool_call["id"], "content": "continue"}
+    followup = {**REQUEST, "messages": REQUEST["messages"] + [first["message"], tool_response]}
+
+    assert first["finish_reason"] == "tool_calls"
+    assert tool_call["function"]["name"] == "deepseek_reasoner"
+    assert json.loads(tool_call["function"]["arguments"])["final"] is True
+    assert stub.completion(followup)["choices"][0]["finish_reason"] == "stop"
+
+
+def test_rate_limit_and_error_injection():
+    """Requests over the rate limit get 429 and injected errors use the configured status."""
+    limited = _stub(rate_limit_rpm=2)
+    assert limited.check_limits() is None
+    assert limited.check_limits() is None
+    status, body, headers = limited.check_limits()
+    assert status == 429 and body["error"]["code"] == "rate_limit_exceeded"
+    assert int(headers["Retry-After"]) >= 1
+
+    failing = _stub(error_rate=1.0, error_status=502)
+    assert failing.check_limits()[0] == 502
+    assert failing.metrics["injected_errors"] == 1
+
+
+@pytest.mark.parametrize("prefix", ["/v1", "/api/v1"])
+def test_streamed_completion_over_http(prefix):
+    """The server streams server-sent events ending in [DONE]."""
+    settings = StubSettings(latency_ms=0, latency_jitter_ms=0, chunk_delay_ms=0)
+    client = TestClient(create_app(settings))
+
+    response = client.post(f"{prefix}/chat/completions", json={**REQUEST, "stream": True})
+
+    events = [line[len("data: ") :] for line in response.text.splitlines() if line]
+    assert response.status_code == 200
+    assert events[-1] == "[DONE]"
+    assert json.loads(events[0])["object"] == "chat.completion.chunk"